@@ -0,0 +1,185 @@
+// ================================================================
+// Filename:    angle_array.h
+//
+// Description: This is a declaration of a contiguous array of angle
+//              values, e.g. a catalogue column of declinations or
+//              right ascensions. The values are stored as a flat
+//              array of doubles and the arithmetic is done by the
+//              kernels in batch.h, not through Angle or LRA objects.
+//
+// Author:      L.R. McFarland, lrm@starbug.com
+// Created:     2026 Oct 18
+// Language:    C++
+//
+//  Angles is free software: you can redistribute it and/or modify it
+//  under the terms of the GNU General Public License as published by
+//  the Free Software Foundation, either version 3 of the License, or
+//  (at your option) any later version.
+//
+//  Angles is distributed in the hope that it will be useful, but
+//  WITHOUT ANY WARRANTY; without even the implied warranty of
+//  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+//  General Public License for more details.
+//
+//  You should have received a copy of the GNU General Public License
+//  along with Orbits.  If not, see <http://www.gnu.org/licenses/>.
+// ================================================================
+
+
+// Notes: AngleArray<T> follows the range rules of T. AngleArray<Angle>
+// ignores range. AngleArray<Declination> et al. handle arithmetic
+// results out of the valid range by T's policy(). With the default,
+// POLICY_RAISE, they raise RangeError and the array is left
+// unchanged.
+
+
+#pragma once
+
+#include <cmath>
+#include <vector>
+
+#include <angles.h>
+#include <batch.h>
+#include <utils.h>
+
+namespace Angles {
+
+  // ======================
+  // ===== AngleRange =====
+  // ======================
+
+  // Range of the element type. Angle is unlimited.
+
+  template<typename T>
+    struct AngleRange {
+      static bool   isLimited() {return false;}
+      static double minimum()   {return -HUGE_VAL;}
+      static double maximum()   {return HUGE_VAL;}
+      static Wrap   wrapConvention() {return WRAP_0_360;}
+      static Policy policy()    {return POLICY_RAISE;}
+    };
+
+  template<int A_MINIMUM, int A_MAXIMUM>
+    struct AngleRange<LRA<A_MINIMUM, A_MAXIMUM> > {
+      static bool   isLimited() {return true;}
+      static double minimum()   {return LRA<A_MINIMUM, A_MAXIMUM>::minimum();}
+      static double maximum()   {return LRA<A_MINIMUM, A_MAXIMUM>::maximum();}
+      static Wrap   wrapConvention() {return LRA<A_MINIMUM, A_MAXIMUM>::wrapConvention();}
+      static Policy policy()    {return LRA<A_MINIMUM, A_MAXIMUM>::policy();}
+    };
+
+
+  // ======================
+  // ===== AngleArray =====
+  // ======================
+
+  template<typename T>
+    class AngleArray {
+
+  public:
+
+    typedef T value_type;
+
+    // ----- ctor and dtor -----
+
+    explicit AngleArray(const size_t& a_size = 0, const double& a_value = 0.0) throw (RangeError);
+    AngleArray(const double* a_values, const size_t& a_size) throw (RangeError);
+
+    AngleArray(const AngleArray& a);
+    AngleArray& operator=(const AngleArray& rhs);
+
+    ~AngleArray() {};
+
+    // ----- accessors -----
+
+    size_t        size() const {return m_values.size();}
+    bool          empty() const {return m_values.empty();}
+
+    // contiguous storage, NULL if empty
+    const double* values() const {return m_values.empty() ? NULL : &m_values[0];}
+    double*       values()       {return m_values.empty() ? NULL : &m_values[0];}
+
+    const double& value(const size_t& a_index) const {return m_values.at(a_index);}
+    void          value(const size_t& a_index, const double& a_value) throw (RangeError);
+
+    T             at(const size_t& a_index) const {return T(m_values.at(a_index));}
+    T             operator[](const size_t& a_index) const {return T(m_values[a_index]);}
+
+    void          push_back(const T& a) {m_values.push_back(a.value());}
+    void          reserve(const size_t& a_size) {m_values.reserve(a_size);}
+    void          clear() {m_values.clear();}
+
+    void          radians(double* a_radians) const; // a_radians must hold size() values
+    std::vector<double> radians() const;
+
+    static double minimum() {return AngleRange<T>::minimum();}
+    static double maximum() {return AngleRange<T>::maximum();}
+
+    // ----- in-place operators -----
+
+    AngleArray& operator+=(const AngleArray& rhs) throw (Error);
+    AngleArray& operator-=(const AngleArray& rhs) throw (Error);
+    AngleArray& operator*=(const AngleArray& rhs) throw (Error);
+    AngleArray& operator/=(const AngleArray& rhs) throw (Error);
+
+    AngleArray& operator+=(const T& rhs) throw (RangeError);
+    AngleArray& operator-=(const T& rhs) throw (RangeError);
+    AngleArray& operator*=(const T& rhs) throw (RangeError);
+    AngleArray& operator/=(const T& rhs) throw (DivideByZeroError, RangeError);
+
+    // ----- other methods -----
+
+    void normalize() throw (RangeError) {normalize(AngleRange<T>::wrapConvention());}
+    void normalize(const Wrap& a_wrap) throw (RangeError);
+
+    // out of range values, e.g. from a bulk load, by T's policy or a_policy
+    void applyPolicy() throw (RangeError) {applyPolicy(AngleRange<T>::policy());}
+    void applyPolicy(const Policy& a_policy) throw (RangeError);
+
+    // ----- helpers -----
+    void validRange() const throw (RangeError);
+    bool isValidRange() const;
+    size_t rangeStatus(unsigned char* a_statuses) const; // one Status per value, returns number invalid
+
+  private:
+
+    typedef void (*ArrayKernel)(const double*, const double*, double*, const size_t&);
+    typedef void (*ScalarKernel)(const double*, const double&, double*, const size_t&);
+
+    void applyArray(ArrayKernel a_kernel, const AngleArray& rhs) throw (Error);
+    void applyScalar(ScalarKernel a_kernel, const double& rhs) throw (Error);
+
+    std::vector<double> m_values; // degrees, or hours for right ascension
+
+  };
+
+
+  // ===============================
+  // ===== AngleArray typedefs =====
+  // ===============================
+
+  typedef AngleArray<LimitedRangeAngle> LimitedRangeAngleArray;
+  typedef AngleArray<Declination>       DeclinationArray;
+  typedef AngleArray<Latitude>          LatitudeArray;
+  typedef AngleArray<Longitude>         LongitudeArray;
+  typedef AngleArray<RA>                RAArray;
+
+
+  // ================================
+  // ===== AngleArray operators =====
+  // ================================
+
+  template <typename T>
+    AngleArray<T> operator+(const AngleArray<T>& lhs, const AngleArray<T>& rhs) throw (Error);
+  template <typename T>
+    AngleArray<T> operator-(const AngleArray<T>& lhs, const AngleArray<T>& rhs) throw (Error);
+  template <typename T>
+    AngleArray<T> operator-(const AngleArray<T>& rhs) throw (RangeError); // unitary minus
+  template <typename T>
+    AngleArray<T> operator*(const AngleArray<T>& lhs, const AngleArray<T>& rhs) throw (Error);
+  template <typename T>
+    AngleArray<T> operator/(const AngleArray<T>& lhs, const AngleArray<T>& rhs) throw (Error);
+
+} // end namespace Angles
+
+#include <angle_array.hpp>
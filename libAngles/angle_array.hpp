@@ -0,0 +1,270 @@
+// ================================================================
+// Filename:    angle_array.hpp
+//
+// Description: This implements the AngleArray template.
+//
+// Author:      L.R. McFarland, lrm@starbug.com
+// Created:     2026 Oct 18
+// Language:    C++
+//
+//  Angles is free software: you can redistribute it and/or modify it
+//  under the terms of the GNU General Public License as published by
+//  the Free Software Foundation, either version 3 of the License, or
+//  (at your option) any later version.
+//
+//  Angles is distributed in the hope that it will be useful, but
+//  WITHOUT ANY WARRANTY; without even the implied warranty of
+//  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+//  General Public License for more details.
+//
+//  You should have received a copy of the GNU General Public License
+//  along with Orbits.  If not, see <http://www.gnu.org/licenses/>.
+// ================================================================
+
+#pragma once
+
+namespace Angles {
+
+  // constructor from size and fill value
+  template<typename T>
+    AngleArray<T>::AngleArray(const size_t& a_size, const double& a_value) throw (RangeError)
+    : m_values(a_size, a_value)
+  {
+    validRange();
+  }
+
+  // constructor from a contiguous array of values
+  template<typename T>
+    AngleArray<T>::AngleArray(const double* a_values, const size_t& a_size) throw (RangeError)
+    : m_values(a_values, a_values + a_size)
+  {
+    validRange();
+  }
+
+  // copy constructor
+  template<typename T>
+    AngleArray<T>::AngleArray(const AngleArray& a) : m_values(a.m_values) {}
+
+  // copy assign
+  template<typename T>
+    AngleArray<T>& AngleArray<T>::operator=(const AngleArray& rhs) {
+    if (this == &rhs) return *this;
+    m_values = rhs.m_values;
+    return *this;
+  }
+
+  // ----- accessors -----
+
+  template<typename T>
+    void AngleArray<T>::value(const size_t& a_index, const double& a_value) throw (RangeError) {
+    if (AngleRange<T>::isLimited())
+      Angles::validRange(&a_value, 1, minimum(), maximum());
+    m_values.at(a_index) = a_value;
+  }
+
+  template<typename T>
+    void AngleArray<T>::radians(double* a_radians) const {
+    Angles::deg2rad(values(), a_radians, size());
+  }
+
+  template<typename T>
+    std::vector<double> AngleArray<T>::radians() const {
+    std::vector<double> result(size());
+    if (!result.empty())
+      radians(&result[0]);
+    return result;
+  }
+
+  // ----- helpers -----
+
+  template<typename T>
+    void AngleArray<T>::validRange() const throw (RangeError) {
+    if (AngleRange<T>::isLimited())
+      Angles::validRange(values(), size(), minimum(), maximum());
+  }
+
+  template<typename T>
+    bool AngleArray<T>::isValidRange() const {
+    if (!AngleRange<T>::isLimited())
+      return true;
+    return Angles::isValidRange(values(), size(), minimum(), maximum());
+  }
+
+  template<typename T>
+    size_t AngleArray<T>::rangeStatus(unsigned char* a_statuses) const {
+    return Angles::rangeStatus(values(), size(), minimum(), maximum(), a_statuses);
+  }
+
+  // Unlimited arrays, and limited range arrays with a policy other
+  // than POLICY_RAISE, are updated in place. Raising arrays are
+  // computed into a scratch array and only copied back if all of the
+  // results are in range.
+
+  template<typename T>
+    void AngleArray<T>::applyArray(ArrayKernel a_kernel, const AngleArray& rhs) throw (Error) {
+
+    if (size() != rhs.size())
+      throw Error("array size mismatch");
+
+    if (empty())
+      return;
+
+    if (!AngleRange<T>::isLimited()) {
+      a_kernel(values(), rhs.values(), values(), size());
+      return;
+    }
+
+    if (AngleRange<T>::policy() != POLICY_RAISE) {
+      a_kernel(values(), rhs.values(), values(), size());
+      applyPolicy();
+      return;
+    }
+
+    std::vector<double> result(size());
+    a_kernel(values(), rhs.values(), &result[0], size());
+    Angles::validRange(&result[0], result.size(), minimum(), maximum());
+    m_values.swap(result);
+  }
+
+  template<typename T>
+    void AngleArray<T>::applyScalar(ScalarKernel a_kernel, const double& rhs) throw (Error) {
+
+    if (empty())
+      return;
+
+    if (!AngleRange<T>::isLimited()) {
+      a_kernel(values(), rhs, values(), size());
+      return;
+    }
+
+    if (AngleRange<T>::policy() != POLICY_RAISE) {
+      a_kernel(values(), rhs, values(), size());
+      applyPolicy();
+      return;
+    }
+
+    std::vector<double> result(size());
+    a_kernel(values(), rhs, &result[0], size());
+    Angles::validRange(&result[0], result.size(), minimum(), maximum());
+    m_values.swap(result);
+  }
+
+  // ----- in-place arithmetic operators -----
+
+  template<typename T>
+    AngleArray<T>& AngleArray<T>::operator+=(const AngleArray& rhs) throw (Error) {
+    applyArray(Angles::add, rhs);
+    return *this;
+  }
+
+  template<typename T>
+    AngleArray<T>& AngleArray<T>::operator-=(const AngleArray& rhs) throw (Error) {
+    applyArray(Angles::subtract, rhs);
+    return *this;
+  }
+
+  template<typename T>
+    AngleArray<T>& AngleArray<T>::operator*=(const AngleArray& rhs) throw (Error) {
+    applyArray(Angles::multiply, rhs);
+    return *this;
+  }
+
+  template<typename T>
+    AngleArray<T>& AngleArray<T>::operator/=(const AngleArray& rhs) throw (Error) {
+    applyArray(Angles::divide, rhs);
+    return *this;
+  }
+
+  template<typename T>
+    AngleArray<T>& AngleArray<T>::operator+=(const T& rhs) throw (RangeError) {
+    applyScalar(Angles::add, rhs.value());
+    return *this;
+  }
+
+  template<typename T>
+    AngleArray<T>& AngleArray<T>::operator-=(const T& rhs) throw (RangeError) {
+    applyScalar(Angles::subtract, rhs.value());
+    return *this;
+  }
+
+  template<typename T>
+    AngleArray<T>& AngleArray<T>::operator*=(const T& rhs) throw (RangeError) {
+    applyScalar(Angles::multiply, rhs.value());
+    return *this;
+  }
+
+  template<typename T>
+    AngleArray<T>& AngleArray<T>::operator/=(const T& rhs) throw (DivideByZeroError, RangeError) {
+    applyScalar(Angles::divide, rhs.value());
+    return *this;
+  }
+
+  // ----- other methods -----
+
+  template<typename T>
+    void AngleArray<T>::normalize(const Wrap& a_wrap) throw (RangeError) {
+    if (empty())
+      return;
+    if (!AngleRange<T>::isLimited()) {
+      Angles::normalize(values(), values(), size(), a_wrap);
+      return;
+    }
+    std::vector<double> result(size());
+    Angles::normalize(values(), &result[0], size(), a_wrap);
+    Angles::validRange(&result[0], result.size(), minimum(), maximum());
+    m_values.swap(result);
+  }
+
+  template<typename T>
+    void AngleArray<T>::applyPolicy(const Policy& a_policy) throw (RangeError) {
+    if (!AngleRange<T>::isLimited() || empty())
+      return;
+    throwStatus(Angles::applyPolicy(values(), values(), size(), minimum(), maximum(), a_policy));
+  }
+
+  // arithmetic operator function templates
+
+  // add
+  template <typename T>
+    AngleArray<T> operator+(const AngleArray<T>& lhs, const AngleArray<T>& rhs) throw (Error) {
+    AngleArray<T> result(lhs);
+    result += rhs;
+    return result;
+  }
+
+  // subtract
+  template <typename T>
+    AngleArray<T> operator-(const AngleArray<T>& lhs, const AngleArray<T>& rhs) throw (Error) {
+    AngleArray<T> result(lhs);
+    result -= rhs;
+    return result;
+  }
+
+  // unitary minus
+  template <typename T>
+    AngleArray<T> operator-(const AngleArray<T>& rhs) throw (RangeError) {
+    AngleArray<T> result(rhs.size());
+    if (!rhs.empty()) {
+      Angles::negate(rhs.values(), result.values(), rhs.size());
+      result.applyPolicy();
+    }
+    return result;
+  }
+
+  // multiply
+  template <typename T>
+    AngleArray<T> operator*(const AngleArray<T>& lhs, const AngleArray<T>& rhs) throw (Error) {
+    AngleArray<T> result(lhs);
+    result *= rhs;
+    return result;
+  }
+
+  // divide
+  template <typename T>
+    AngleArray<T> operator/(const AngleArray<T>& lhs, const AngleArray<T>& rhs) throw (Error) {
+    AngleArray<T> result(lhs);
+    result /= rhs;
+    return result;
+  }
+
+}
@@ -0,0 +1,128 @@
+// ================================================================
+// Filename:    angle_index.h
+//
+// Description: This is a declaration of a hash table keyed by angle
+//              values, e.g. to look up catalogue entries or cached
+//              results by declination. Keys are looked up exactly or
+//              to the nearest multiple of a quantum, e.g. a
+//              milliarcsecond.
+//
+// Author:      L.R. McFarland, lrm@starbug.com
+// Created:     2026 Oct 18
+// Language:    C++
+//
+//  Angles is free software: you can redistribute it and/or modify it
+//  under the terms of the GNU General Public License as published by
+//  the Free Software Foundation, either version 3 of the License, or
+//  (at your option) any later version.
+//
+//  Angles is distributed in the hope that it will be useful, but
+//  WITHOUT ANY WARRANTY; without even the implied warranty of
+//  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+//  General Public License for more details.
+//
+//  You should have received a copy of the GNU General Public License
+//  along with Orbits.  If not, see <http://www.gnu.org/licenses/>.
+// ================================================================
+
+
+// Notes: AngleIndex is an open addressing table with linear probing,
+// kept at most half full so a lookup is one or two probes into a
+// single contiguous array. Erase shifts the following entries back
+// rather than leaving tombstones, so lookups do not slow down after
+// many erases.
+//
+// With a quantum, keys that quantize to the same value are the same
+// key, see quantize() in utils.h. key() returns the first key
+// inserted for it. NaN keys are not allowed.
+//
+// The key and value of each slot are accessed by slot number, used or
+// not, for iteration:
+//
+//   for (size_t i = 0; i < an_index.slots(); ++i)
+//     if (an_index.isUsed(i))
+//       ... an_index.key(i), an_index.value(i) ...
+
+
+#pragma once
+
+#include <vector>
+
+#include <utils.h>
+
+namespace Angles {
+
+  // ======================
+  // ===== AngleIndex =====
+  // ======================
+
+  template<typename V>
+    class AngleIndex {
+
+  public:
+
+    typedef V value_type;
+
+    // ----- ctor and dtor -----
+
+    explicit AngleIndex(const double& a_quantum = 0) throw (Error);
+
+    ~AngleIndex() {};
+
+    // ----- accessors -----
+
+    size_t        size() const {return m_size;}
+    bool          empty() const {return m_size == 0;}
+    const double& quantum() const {return m_quantum;}
+
+    size_t        slots() const {return m_slots.size();}
+    bool          isUsed(const size_t& a_slot) const {return m_slots[a_slot].m_used;}
+    const double& key(const size_t& a_slot) const {return m_slots[a_slot].m_key;}
+    V&            value(const size_t& a_slot) {return m_slots[a_slot].m_value;}
+    const V&      value(const size_t& a_slot) const {return m_slots[a_slot].m_value;}
+
+    // ----- lookup -----
+
+    // NULL if a_key is not in the index
+    V*            find(const double& a_key);
+    const V*      find(const double& a_key) const;
+    bool          contains(const double& a_key) const {return find(a_key) != NULL;}
+
+    // ----- update -----
+
+    // returns true if a_key is new, false if its value was replaced
+    bool insert(const double& a_key, const V& a_value) throw (Error);
+
+    // returns false if a_key is not in the index
+    bool erase(const double& a_key);
+
+    void clear();
+    void reserve(const size_t& a_size);
+
+  private:
+
+    struct Slot {
+      Slot() : m_key(0), m_code(0), m_value(), m_used(false) {}
+      double m_key;  // as inserted
+      double m_code; // quantized key
+      V      m_value;
+      bool   m_used;
+    };
+
+    double code(const double& a_key) const {return quantize(a_key, m_quantum) + 0.0;}
+    size_t home(const double& a_code) const {return hashValue(a_code) & (m_slots.size() - 1);}
+
+    // slot holding a_code, or the empty slot where it would go
+    size_t locate(const double& a_code) const;
+
+    void rehash(const size_t& a_slots);
+
+    double            m_quantum;
+    size_t            m_size;
+    std::vector<Slot> m_slots; // a power of 2, at most half used
+
+  };
+
+} // end namespace Angles
+
+#include <angle_index.hpp>
@@ -0,0 +1,143 @@
+// ================================================================
+// Filename:    angle_index.hpp
+//
+// Description: This implements the AngleIndex template.
+//
+// Author:      L.R. McFarland, lrm@starbug.com
+// Created:     2026 Oct 18
+// Language:    C++
+//
+//  Angles is free software: you can redistribute it and/or modify it
+//  under the terms of the GNU General Public License as published by
+//  the Free Software Foundation, either version 3 of the License, or
+//  (at your option) any later version.
+//
+//  Angles is distributed in the hope that it will be useful, but
+//  WITHOUT ANY WARRANTY; without even the implied warranty of
+//  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+//  General Public License for more details.
+//
+//  You should have received a copy of the GNU General Public License
+//  along with Orbits.  If not, see <http://www.gnu.org/licenses/>.
+// ================================================================
+
+#pragma once
+
+namespace Angles {
+
+  // constructor from quantum
+  template<typename V>
+    AngleIndex<V>::AngleIndex(const double& a_quantum) throw (Error)
+    : m_quantum(a_quantum), m_size(0), m_slots(8)
+  {
+    if (!(a_quantum >= 0)) // catches NaN too
+      throw Error("quantum must not be negative");
+  }
+
+  // ----- lookup -----
+
+  template<typename V>
+    size_t AngleIndex<V>::locate(const double& a_code) const {
+    const size_t mask(m_slots.size() - 1);
+    size_t i(home(a_code));
+    while (m_slots[i].m_used && m_slots[i].m_code != a_code)
+      i = (i + 1) & mask;
+    return i;
+  }
+
+  template<typename V>
+    V* AngleIndex<V>::find(const double& a_key) {
+    Slot& a_slot(m_slots[locate(code(a_key))]);
+    return a_slot.m_used ? &a_slot.m_value : NULL;
+  }
+
+  template<typename V>
+    const V* AngleIndex<V>::find(const double& a_key) const {
+    const Slot& a_slot(m_slots[locate(code(a_key))]);
+    return a_slot.m_used ? &a_slot.m_value : NULL;
+  }
+
+  // ----- update -----
+
+  template<typename V>
+    bool AngleIndex<V>::insert(const double& a_key, const V& a_value) throw (Error) {
+
+    if (a_key != a_key)
+      throw Error("key must not be NaN");
+
+    const double a_code(code(a_key));
+
+    Slot* a_slot(&m_slots[locate(a_code)]);
+    if (a_slot->m_used) {
+      a_slot->m_value = a_value;
+      return false;
+    }
+
+    if (2*(m_size + 1) > m_slots.size()) {
+      rehash(2*m_slots.size());
+      a_slot = &m_slots[locate(a_code)];
+    }
+
+    a_slot->m_key = a_key;
+    a_slot->m_code = a_code;
+    a_slot->m_value = a_value;
+    a_slot->m_used = true;
+    ++m_size;
+
+    return true;
+  }
+
+  template<typename V>
+    bool AngleIndex<V>::erase(const double& a_key) {
+
+    const size_t mask(m_slots.size() - 1);
+
+    size_t i(locate(code(a_key)));
+    if (!m_slots[i].m_used)
+      return false;
+
+    // Shift back each following entry whose home is not between the
+    // hole and itself, so every entry stays reachable from its home.
+    size_t j(i);
+    while (true) {
+      j = (j + 1) & mask;
+      if (!m_slots[j].m_used)
+	break;
+      const size_t h(home(m_slots[j].m_code));
+      if (((j - h) & mask) >= ((j - i) & mask)) {
+	m_slots[i] = m_slots[j];
+	i = j;
+      }
+    }
+
+    m_slots[i] = Slot();
+    --m_size;
+
+    return true;
+  }
+
+  template<typename V>
+    void AngleIndex<V>::clear() {
+    std::vector<Slot>(8).swap(m_slots);
+    m_size = 0;
+  }
+
+  template<typename V>
+    void AngleIndex<V>::reserve(const size_t& a_size) {
+    size_t a_slots(m_slots.size());
+    while (a_slots < 2*a_size)
+      a_slots *= 2;
+    if (a_slots != m_slots.size())
+      rehash(a_slots);
+  }
+
+  template<typename V>
+    void AngleIndex<V>::rehash(const size_t& a_slots) {
+    std::vector<Slot> old_slots(a_slots);
+    old_slots.swap(m_slots);
+    for (size_t i = 0; i < old_slots.size(); ++i)
+      if (old_slots[i].m_used)
+	m_slots[locate(old_slots[i].m_code)] = old_slots[i];
+  }
+
+}
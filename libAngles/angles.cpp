@@ -22,8 +22,11 @@
 // ==================================================================
 
 #include <angles.h>
+#include <parser.h>
 #include <utils.h>
 
+#include <stdio.h>  /* snprintf */
+
 // =================
 // ===== Angle =====
 // =================
@@ -38,11 +41,11 @@ Angles::Angle::Angle(const double& a_deg_or_hr,
 
 Angles::Angle::Angle(const std::string& a_deg_or_hr,
 		     const std::string& a_min,
-		     const std::string& a_sec) {
-  value(Angle(Angles::stod(a_deg_or_hr),
-	      Angles::stod(a_min),
-	      Angles::stod(a_sec)).value());
-  // TODO bad string exception with C++11 stod
+		     const std::string& a_sec) throw (ParseError) {
+  // a_deg_or_hr may also be a whole sexagesimal string, see parser.h
+  value(degrees2seconds(Angles::parseAngle(a_deg_or_hr),
+			Angles::parseAngle(a_min),
+			Angles::parseAngle(a_sec))/3600.0);
   // TODO delegating constructors in C++11
 }
 
@@ -71,6 +74,28 @@ Angles::Angle& Angles::Angle::operator/=(const Angle& rhs) throw (DivideByZeroEr
   return *this;
 }
 
+Angles::Angle& Angles::Angle::operator+=(const double& rhs) {
+  m_value += rhs;
+  return *this;
+}
+
+Angles::Angle& Angles::Angle::operator-=(const double& rhs) {
+  m_value -= rhs;
+  return *this;
+}
+
+Angles::Angle& Angles::Angle::operator*=(const double& rhs) {
+  m_value *= rhs;
+  return *this;
+}
+
+Angles::Angle& Angles::Angle::operator/=(const double& rhs) throw (DivideByZeroError) {
+  if (rhs == 0)
+    throw DivideByZeroError();
+  m_value /= rhs;
+  return *this;
+}
+
 Angles::Angle Angles::operator+(const Angles::Angle& lhs, const Angles::Angle& rhs) {
   return Angles::Angle(lhs.value() + rhs.value());
 }
@@ -94,77 +119,118 @@ Angles::Angle Angles::operator/(const Angles::Angle& lhs, const Angles::Angle& r
   return Angles::Angle(lhs.value() / rhs.value());
 }
 
+// with a value in degrees. Set, not constructed, so the value is not
+// rounded through degrees2seconds.
 
-// other methods
-
-// TODO RA?
-// TODO this is not right
-// >>> rad2deg(math.asin(math.sin(deg2rad(45))))
-// 45.0
-// >>> rad2deg(math.asin(math.sin(deg2rad(45+360))))
-// -44.999999999999936
-// >>> rad2deg(math.asin(math.sin(deg2rad(45-360))))
-// -45.00000000000001
-// >>> rad2deg(math.asin(math.sin(deg2rad(45+360*2))))
-// 44.99999999999992
-// >>> rad2deg(math.asin(math.sin(deg2rad(45+360*3))))
-// -45.00000000000001
-// >>> rad2deg(math.asin(math.sin(deg2rad(45+360*4))))
-// 44.99999999999999
-// TODO fix this Angle(45 * 10).normalize() != 180
-// >>> rad2deg(math.acos(math.cos(deg2rad(45+360*4))))
-// 45.00000000000001
-// >>> rad2deg(math.acos(math.cos(deg2rad(45+360*5))))
-// 314.99999999999983
-
-void Angles::Angle::normalize() {
-  // bring back into 0-360 range
-  while (m_value > 360)
-    m_value -= 360;
+Angles::Angle Angles::operator+(const Angles::Angle& lhs, const double& rhs) {
+  Angles::Angle result(lhs);
+  result += rhs;
+  return result;
 }
 
+Angles::Angle Angles::operator+(const double& lhs, const Angles::Angle& rhs) {
+  return rhs + lhs;
+}
 
+Angles::Angle Angles::operator-(const Angles::Angle& lhs, const double& rhs) {
+  Angles::Angle result(lhs);
+  result -= rhs;
+  return result;
+}
 
+Angles::Angle Angles::operator-(const double& lhs, const Angles::Angle& rhs) {
+  Angles::Angle result;
+  result.value(lhs - rhs.value());
+  return result;
+}
 
+Angles::Angle Angles::operator*(const Angles::Angle& lhs, const double& rhs) {
+  Angles::Angle result(lhs);
+  result *= rhs;
+  return result;
+}
 
-// operator<<
-
-void Angles::value2DMSString(const double& a_value, std::stringstream& a_string) {
+Angles::Angle Angles::operator*(const double& lhs, const Angles::Angle& rhs) {
+  return rhs * lhs;
+}
 
-  bool isNegative(false);
+Angles::Angle Angles::operator/(const Angles::Angle& lhs, const double& rhs)
+  throw (DivideByZeroError) {
+  Angles::Angle result(lhs);
+  result /= rhs;
+  return result;
+}
 
-  if (a_value < 0)
-    isNegative = true;
+Angles::Angle Angles::operator/(const double& lhs, const Angles::Angle& rhs)
+  throw (DivideByZeroError) {
+  if (rhs.value() == 0)
+    throw DivideByZeroError();
+  Angles::Angle result;
+  result.value(lhs / rhs.value());
+  return result;
+}
 
-  double degrees = fabs(a_value);
-  double minutes = 60 * (degrees - floor(degrees));
-  double seconds = 60 * (minutes - floor(minutes));
 
-  if (isNegative)
-    degrees = -1 * floor(degrees);
-  else
-    degrees = floor(degrees);
+// other methods
 
-  a_string << degrees << "* " << floor(minutes) << "\' " << seconds << "\"";
+void Angles::Angle::normalize() {
+  // bring back into [0, 360)
+  normalize(WRAP_0_360);
+}
 
+void Angles::Angle::normalize(const Wrap& a_wrap) {
+  m_value = Angles::normalize(m_value, a_wrap);
 }
 
-void Angles::value2HMSString(const double& a_value, std::stringstream& a_string) {
 
-  bool isNegative(false);
 
-  if (a_value < 0)
-    isNegative = true;
+// operator<<
+
+// Splits a value into whole degrees (hours), whole minutes and
+// seconds. The sign is carried on the degrees.
+static void sexagesimal(const double& a_value, double* a_degrees, double* a_minutes, double* a_seconds) {
 
   double degrees = fabs(a_value);
   double minutes = 60 * (degrees - floor(degrees));
   double seconds = 60 * (minutes - floor(minutes));
 
-  if (isNegative)
+  if (a_value < 0)
     degrees = -1 * floor(degrees);
   else
     degrees = floor(degrees);
 
-  a_string << degrees << ":" << floor(minutes) << ":" << seconds; // TODO use this form for others?
+  *a_degrees = degrees;
+  *a_minutes = floor(minutes);
+  *a_seconds = seconds;
+
+}
+
+size_t Angles::value2DMSString(const double& a_value, char* a_buffer, const size_t& a_size,
+			       const int& a_precision) {
+  double degrees, minutes, seconds;
+  sexagesimal(a_value, &degrees, &minutes, &seconds);
+  int length(snprintf(a_buffer, a_size, "%.*g* %.*g' %.*g\"",
+		      a_precision, degrees, a_precision, minutes, a_precision, seconds));
+  return length < 0 ? 0 : length;
+}
+
+size_t Angles::value2HMSString(const double& a_value, char* a_buffer, const size_t& a_size,
+			       const int& a_precision) {
+  double degrees, minutes, seconds;
+  sexagesimal(a_value, &degrees, &minutes, &seconds);
+  int length(snprintf(a_buffer, a_size, "%.*g:%.*g:%.*g", // TODO use this form for others?
+		      a_precision, degrees, a_precision, minutes, a_precision, seconds));
+  return length < 0 ? 0 : length;
+}
 
+void Angles::value2DMSString(const double& a_value, std::stringstream& a_string) {
+  char buffer[MAX_SEXAGESIMAL_STRING];
+  value2DMSString(a_value, buffer, sizeof(buffer), a_string.precision());
+  a_string << buffer;
+}
+
+void Angles::value2HMSString(const double& a_value, std::stringstream& a_string) {
+  char buffer[MAX_SEXAGESIMAL_STRING];
+  value2HMSString(a_value, buffer, sizeof(buffer), a_string.precision());
+  a_string << buffer;
 }
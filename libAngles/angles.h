@@ -34,8 +34,8 @@
 // Angles "specialized" to ignore range, but Angles *
 // LimitedRangeAngle returns an Angle even if it is out of range.
 //
-// Angles has min/max but does not use them. LimitedRangeAngles
-// assumes the template sets them the same for all instances.
+// LimitedRangeAngles get their min/max from the template parameters,
+// they are not stored per instance.
 
 
 #pragma once
@@ -44,6 +44,7 @@
 #include <sstream>
 #include <stdexcept>
 
+#include <parser.h>
 #include <utils.h>
 
 namespace Angles {
@@ -68,7 +69,7 @@ namespace Angles {
 
     explicit Angle(const std::string& a_deg, // The ambiguity is in the box.
 		   const std::string& a_min = "0",
-		   const std::string& a_sec = "0");
+		   const std::string& a_sec = "0") throw (ParseError);
 
     virtual ~Angle() {};
 
@@ -107,9 +108,17 @@ namespace Angles {
     virtual Angle& operator*=(const Angle& rhs);
     virtual Angle& operator/=(const Angle& rhs) throw (DivideByZeroError);
 
+    // with a value in degrees, no temporary Angle
+    virtual Angle& operator+=(const double& rhs);
+    virtual Angle& operator-=(const double& rhs);
+
+    virtual Angle& operator*=(const double& rhs);
+    virtual Angle& operator/=(const double& rhs) throw (DivideByZeroError);
+
 
     // ----- other methods -----
     virtual void normalize();  // TODO normalized -> return a new copy?
+    virtual void normalize(const Wrap& a_wrap);
 
   private:
 
@@ -168,6 +177,17 @@ namespace Angles {
   Angle operator* (const Angle& lhs, const Angle& rhs);
   Angle operator/ (const Angle& lhs, const Angle& rhs) throw (DivideByZeroError);
 
+  // with a value in degrees
+  Angle operator+ (const Angle& lhs, const double& rhs);
+  Angle operator+ (const double& lhs, const Angle& rhs);
+  Angle operator- (const Angle& lhs, const double& rhs);
+  Angle operator- (const double& lhs, const Angle& rhs);
+
+  Angle operator* (const Angle& lhs, const double& rhs);
+  Angle operator* (const double& lhs, const Angle& rhs);
+  Angle operator/ (const Angle& lhs, const double& rhs) throw (DivideByZeroError);
+  Angle operator/ (const double& lhs, const Angle& rhs) throw (DivideByZeroError);
+
   
   // ==============================
   // ===== LimitedRangeAngles =====
@@ -190,7 +210,7 @@ namespace Angles {
 
     explicit LRA(const std::string& a_deg, // The ambiguity is in the box.
 		 const std::string& a_min = "0.0",
-		 const std::string& a_sec = "0.0") throw (RangeError);
+		 const std::string& a_sec = "0.0") throw (RangeError, ParseError);
 
     LRA(const LRA& a);
 
@@ -214,11 +234,12 @@ namespace Angles {
     void          setRadians(const double& a_value) throw (RangeError) {setValue(rad2deg(a_value));} // for not manual
     double        getRadians() const             {return deg2rad(value());} // for boost
 
-    const double& minimum() const {return m_minimum;}
-    double        getMinimum() const {return m_minimum;} // for boost
+    // compile time constants, nothing is stored per instance
+    static double minimum() {return A_MINIMUM;}
+    double        getMinimum() const {return A_MINIMUM;} // for boost
 
-    const double& maximum() const {return m_maximum;}
-    double        getMaximum() const {return m_maximum;} // for boost
+    static double maximum() {return A_MAXIMUM;}
+    double        getMaximum() const {return A_MAXIMUM;} // for boost
 
     // ----- boolean operators -----
 
@@ -240,16 +261,74 @@ namespace Angles {
     LRA& operator*=(const LRA& rhs) throw (RangeError);
     LRA& operator/=(const LRA& rhs) throw (DivideByZeroError, RangeError);
 
+    // with a value in degrees, hours for RA, no temporary LRA
+    LRA& operator+=(const double& rhs) throw (RangeError);
+    LRA& operator-=(const double& rhs) throw (RangeError);
+
+    LRA& operator*=(const double& rhs) throw (RangeError);
+    LRA& operator/=(const double& rhs) throw (DivideByZeroError, RangeError);
+
+    // ----- other methods -----
+
+    // normalize into the type's own convention, see wrapConvention()
+    void normalize() throw (RangeError) {normalize(wrapConvention());}
+    void normalize(const Wrap& a_wrap) throw (RangeError);
+
+    static Wrap wrapConvention();
+
+    // ----- out of range policy -----
+
+    // Applied to out of range arithmetic results, per type, so
+    // Declination and Latitude share one. Constructors and setValue
+    // always raise.
+    static Policy policy() {return sPolicy;}
+    static void   policy(const Policy& a_policy) {sPolicy = a_policy;}
+
+    // ----- non-throwing operators -----
+
+    // These return a status instead of throwing. An out of range
+    // result is handled by a_policy, the type's policy() if not
+    // given. POLICY_RAISE returns MINIMUM_EXCEEDED or
+    // MAXIMUM_EXCEEDED, the others SUCCESS. *this is only changed on
+    // SUCCESS.
+
+    Status trySetValue(const double& a_value)      {return trySetValue(a_value, policy());}
+    Status trySetValue(const double& a_value, const Policy& a_policy);
+
+    Status tryAdd(const LRA& rhs)      {return tryAdd(rhs, policy());}
+    Status trySubtract(const LRA& rhs) {return trySubtract(rhs, policy());}
+    Status tryMultiply(const LRA& rhs) {return tryMultiply(rhs, policy());}
+    Status tryDivide(const LRA& rhs)   {return tryDivide(rhs, policy());}
+    Status tryNegate()                 {return tryNegate(policy());}
+
+    Status tryAdd(const LRA& rhs, const Policy& a_policy)      {return trySetValue(value() + rhs.value(), a_policy);}
+    Status trySubtract(const LRA& rhs, const Policy& a_policy) {return trySetValue(value() - rhs.value(), a_policy);}
+    Status tryMultiply(const LRA& rhs, const Policy& a_policy) {return trySetValue(value() * rhs.value(), a_policy);}
+    Status tryDivide(const LRA& rhs, const Policy& a_policy)   {return tryDivide(rhs.value(), a_policy);}
+    Status tryNegate(const Policy& a_policy)                   {return trySetValue(-value(), a_policy);}
+
+    Status tryAdd(const double& rhs)      {return tryAdd(rhs, policy());}
+    Status trySubtract(const double& rhs) {return trySubtract(rhs, policy());}
+    Status tryMultiply(const double& rhs) {return tryMultiply(rhs, policy());}
+    Status tryDivide(const double& rhs)   {return tryDivide(rhs, policy());}
+
+    Status tryAdd(const double& rhs, const Policy& a_policy)      {return trySetValue(value() + rhs, a_policy);}
+    Status trySubtract(const double& rhs, const Policy& a_policy) {return trySetValue(value() - rhs, a_policy);}
+    Status tryMultiply(const double& rhs, const Policy& a_policy) {return trySetValue(value() * rhs, a_policy);}
+    Status tryDivide(const double& rhs, const Policy& a_policy);
+
     // ----- helpers -----
-    void validRange(const double& a_value) const throw (RangeError);
-    bool isValidRange(const double& a_value) const;
+    static void   validRange(const double& a_value) throw (RangeError);
+    static bool   isValidRange(const double& a_value);
+    static Status rangeStatus(const double& a_value);
 
   private:
 
+    // the only data member, so an LRA is the size of a double and
+    // arrays of them have no padding.
     double m_value; // degrees for declination, latitude, longitude, seconds for right ascension
 
-    double m_minimum;
-    double m_maximum;
+    static Policy sPolicy;
 
   };
 
@@ -268,6 +347,22 @@ namespace Angles {
   // ===== output operator<< =====
   // =============================
 
+  // These write into a caller supplied buffer with snprintf
+  // semantics: at most a_size - 1 characters and a terminating null
+  // are written and the return value is the length the whole string
+  // needs, so a return >= a_size means it was truncated. Each field is
+  // printed like an ostream with a_precision, i.e. %g.
+  //
+  // MAX_SEXAGESIMAL_STRING is enough for any one value at precisions
+  // up to 17, the most a double can use.
+
+  const size_t MAX_SEXAGESIMAL_STRING(96);
+
+  size_t value2DMSString(const double& a_value, char* a_buffer, const size_t& a_size,
+			 const int& a_precision = 6);
+  size_t value2HMSString(const double& a_value, char* a_buffer, const size_t& a_size,
+			 const int& a_precision = 6);
+
   void value2DMSString(const double& a_value, std::stringstream& a_string);
   void value2HMSString(const double& a_value, std::stringstream& a_string);
 
@@ -33,7 +33,6 @@ namespace Angles {
     LRA<A_MINIMUM, A_MAXIMUM>::LRA(const double& a_deg,
 				   const double& a_min,
 				   const double& a_sec) throw (RangeError)
-    : m_minimum(A_MINIMUM), m_maximum(A_MAXIMUM)
   {
     double temp(degrees2seconds(a_deg, a_min, a_sec)/3600.0);
     setValue(temp);
@@ -43,16 +42,15 @@ namespace Angles {
   template<int A_MINIMUM, int A_MAXIMUM>  // only ints can be non-type arguments
     LRA<A_MINIMUM, A_MAXIMUM>::LRA(const std::string& a_deg,
 				   const std::string& a_min,
-				   const std::string& a_sec) throw (RangeError)
-    : m_minimum(A_MINIMUM), m_maximum(A_MAXIMUM)
+				   const std::string& a_sec) throw (RangeError, ParseError)
   {
 
-    // TODO bad string exception with C++11 stod
+    // a_deg may also be a whole sexagesimal string, see parser.h
     // TODO delegating constructors in C++11
 
-    double temp(degrees2seconds(Angles::stod(a_deg),
-				Angles::stod(a_min),
-				Angles::stod(a_sec))/3600.0);
+    double temp(degrees2seconds(Angles::parseAngle(a_deg),
+				Angles::parseAngle(a_min),
+				Angles::parseAngle(a_sec))/3600.0);
     setValue(temp);
   };
 
@@ -60,8 +58,6 @@ namespace Angles {
   template<int A_MINIMUM, int A_MAXIMUM>
     LRA<A_MINIMUM, A_MAXIMUM>::LRA(const LRA& a) {
     m_value = a.value();
-    m_minimum = a.minimum();
-    m_maximum = a.maximum();
   }
 
   // copy assign
@@ -69,8 +65,6 @@ namespace Angles {
     LRA<A_MINIMUM, A_MAXIMUM>& LRA<A_MINIMUM, A_MAXIMUM>::operator=(const LRA& rhs) {
     if (this == &rhs) return *this;
     m_value = rhs.value();
-    m_minimum = rhs.minimum();
-    m_maximum = rhs.maximum();
     return *this;
   }
 
@@ -107,6 +101,10 @@ namespace Angles {
   }
 
 
+  // out of range policy, raise unless set
+  template<int A_MINIMUM, int A_MAXIMUM>
+    Policy LRA<A_MINIMUM, A_MAXIMUM>::sPolicy(POLICY_RAISE);
+
   // in-place arithmetic operator method templates
 
   // value
@@ -118,31 +116,76 @@ namespace Angles {
 
   // validRange
   template<int A_MINIMUM, int A_MAXIMUM>
-    void LRA<A_MINIMUM, A_MAXIMUM>::validRange(const double& a_value) const throw (RangeError) {
-    if (a_value < minimum())
-      throw RangeError("minimum exceeded");
-    if (a_value > maximum())
-      throw RangeError("maximum exceeded");
+    void LRA<A_MINIMUM, A_MAXIMUM>::validRange(const double& a_value) throw (RangeError) {
+    Status status(rangeStatus(a_value));
+    if (status != SUCCESS)
+      throw RangeError(statusString(status));
   }
 
   // isValidRange
   // less informative range check for manual python exception issues.
   template<int A_MINIMUM, int A_MAXIMUM>
-    bool LRA<A_MINIMUM, A_MAXIMUM>::isValidRange(const double& a_value) const {
+    bool LRA<A_MINIMUM, A_MAXIMUM>::isValidRange(const double& a_value) {
+    return rangeStatus(a_value) == SUCCESS;
+  }
+
+  // rangeStatus
+  template<int A_MINIMUM, int A_MAXIMUM>
+    Status LRA<A_MINIMUM, A_MAXIMUM>::rangeStatus(const double& a_value) {
     if (a_value < minimum())
-      return false;
+      return MINIMUM_EXCEEDED;
     if (a_value > maximum())
-      return false;
-    return true;
+      return MAXIMUM_EXCEEDED;
+    return SUCCESS;
+  }
+
+  // normalize
+  template<int A_MINIMUM, int A_MAXIMUM>
+    void LRA<A_MINIMUM, A_MAXIMUM>::normalize(const Wrap& a_wrap) throw (RangeError) {
+    setValue(Angles::normalize(value(), a_wrap));
+  }
+
+  // wrapConvention
+  // hours for right ascension, signed degrees for anything that can
+  // be negative, e.g. longitude, otherwise unsigned degrees.
+  template<int A_MINIMUM, int A_MAXIMUM>
+    Wrap LRA<A_MINIMUM, A_MAXIMUM>::wrapConvention() {
+    if (A_MINIMUM == 0 && A_MAXIMUM == 24)
+      return WRAP_0_24;
+    if (A_MINIMUM < 0)
+      return WRAP_180;
+    return WRAP_0_360;
+  }
+
+  // ----- non-throwing operators -----
+
+  template<int A_MINIMUM, int A_MAXIMUM>
+    Status LRA<A_MINIMUM, A_MAXIMUM>::trySetValue(const double& a_value, const Policy& a_policy) {
+    Status status(rangeStatus(a_value));
+    if (status == SUCCESS) {
+      m_value = a_value;
+      return SUCCESS;
+    }
+    if (a_policy == POLICY_RAISE)
+      return status;
+    m_value = applyPolicy(a_value, minimum(), maximum(), a_policy);
+    return SUCCESS;
+  }
+
+  template<int A_MINIMUM, int A_MAXIMUM>
+    Status LRA<A_MINIMUM, A_MAXIMUM>::tryDivide(const double& rhs, const Policy& a_policy) {
+    if (rhs == 0)
+      return DIVIDE_BY_ZERO;
+    return trySetValue(value() / rhs, a_policy);
   }
 
+  // ----- in-place operators -----
+
   // add
   template<int A_MINIMUM, int A_MAXIMUM>
     LRA<A_MINIMUM, A_MAXIMUM>& LRA<A_MINIMUM, A_MAXIMUM>::operator+=(const LRA& rhs)
     throw (RangeError) {
-    double temp(value() + rhs.value());
-    validRange(temp);
-    value(temp);
+    throwStatus(tryAdd(rhs));
     return *this;
   }
 
@@ -150,9 +193,7 @@ namespace Angles {
   template<int A_MINIMUM, int A_MAXIMUM>
     LRA<A_MINIMUM, A_MAXIMUM>& LRA<A_MINIMUM, A_MAXIMUM>::operator-=(const LRA& rhs)
     throw (RangeError) {
-    double temp(value() - rhs.value());
-    validRange(temp);
-    value(temp);
+    throwStatus(trySubtract(rhs));
     return *this;
   }
 
@@ -161,9 +202,7 @@ namespace Angles {
   template<int A_MINIMUM, int A_MAXIMUM>
     LRA<A_MINIMUM, A_MAXIMUM>& LRA<A_MINIMUM, A_MAXIMUM>::operator*=(const LRA& rhs)
     throw (RangeError) {
-    double temp(value() * rhs.value());
-    validRange(temp);
-    value(temp);
+    throwStatus(tryMultiply(rhs));
     return *this;
   }
 
@@ -172,56 +211,151 @@ namespace Angles {
   template<int A_MINIMUM, int A_MAXIMUM>
     LRA<A_MINIMUM, A_MAXIMUM>& LRA<A_MINIMUM, A_MAXIMUM>::operator/=(const LRA& rhs)
     throw (DivideByZeroError, RangeError) {
-    if (rhs.value() == 0)
-      throw DivideByZeroError();
-    double temp(value() / rhs.value());
-    validRange(temp);
-    value(temp);
+    throwStatus(tryDivide(rhs));
+    return *this;
+  }
+
+  // in-place with a value
+
+  template<int A_MINIMUM, int A_MAXIMUM>
+    LRA<A_MINIMUM, A_MAXIMUM>& LRA<A_MINIMUM, A_MAXIMUM>::operator+=(const double& rhs)
+    throw (RangeError) {
+    throwStatus(tryAdd(rhs));
+    return *this;
+  }
+
+  template<int A_MINIMUM, int A_MAXIMUM>
+    LRA<A_MINIMUM, A_MAXIMUM>& LRA<A_MINIMUM, A_MAXIMUM>::operator-=(const double& rhs)
+    throw (RangeError) {
+    throwStatus(trySubtract(rhs));
+    return *this;
+  }
+
+  template<int A_MINIMUM, int A_MAXIMUM>
+    LRA<A_MINIMUM, A_MAXIMUM>& LRA<A_MINIMUM, A_MAXIMUM>::operator*=(const double& rhs)
+    throw (RangeError) {
+    throwStatus(tryMultiply(rhs));
+    return *this;
+  }
+
+  template<int A_MINIMUM, int A_MAXIMUM>
+    LRA<A_MINIMUM, A_MAXIMUM>& LRA<A_MINIMUM, A_MAXIMUM>::operator/=(const double& rhs)
+    throw (DivideByZeroError, RangeError) {
+    throwStatus(tryDivide(rhs));
     return *this;
   }
 
  // arithmetic operator function templates
 
+  // These go through the in-place operators so the result follows
+  // the type's out of range policy.
+
   // add
   template <typename T>
     T operator+(const T& lhs, const T& rhs) throw (RangeError) {
-    double temp(lhs.value() + rhs.value());
-    lhs.validRange(temp);
-    return T(temp);
+    T result(lhs);
+    result += rhs;
+    return result;
   }
 
   // subtract
   template <typename T>
     T operator-(const T& lhs, const T& rhs) throw (RangeError) {
-    double temp(lhs.value() - rhs.value());
-    lhs.validRange(temp);
-    return T(temp);
+    T result(lhs);
+    result -= rhs;
+    return result;
   }
 
   // unitary minus
   template <typename T>
     T operator-(const T& rhs) throw(RangeError) {
-    double temp(-rhs.value());
-    rhs.validRange(temp);
-    return T(temp);
+    T result(rhs);
+    throwStatus(result.tryNegate());
+    return result;
   }
 
   // multiply
   template <typename T>
     T operator*(const T& lhs, const T& rhs) throw (RangeError) {
-    double temp(lhs.value() * rhs.value());
-    lhs.validRange(temp);
-    return T(temp);
+    T result(lhs);
+    result *= rhs;
+    return result;
   }
 
   // divide
   template <typename T>
     T operator/(const T& lhs, const T& rhs) throw (DivideByZeroError, RangeError) {
+    T result(lhs);
+    result /= rhs;
+    return result;
+  }
+
+  // with a value, e.g. Longitude(170) + 20.0
+
+  template <int A_MINIMUM, int A_MAXIMUM>
+    LRA<A_MINIMUM, A_MAXIMUM> operator+(const LRA<A_MINIMUM, A_MAXIMUM>& lhs, const double& rhs)
+    throw (RangeError) {
+    LRA<A_MINIMUM, A_MAXIMUM> result(lhs);
+    result += rhs;
+    return result;
+  }
+
+  template <int A_MINIMUM, int A_MAXIMUM>
+    LRA<A_MINIMUM, A_MAXIMUM> operator+(const double& lhs, const LRA<A_MINIMUM, A_MAXIMUM>& rhs)
+    throw (RangeError) {
+    LRA<A_MINIMUM, A_MAXIMUM> result(rhs);
+    result += lhs;
+    return result;
+  }
+
+  template <int A_MINIMUM, int A_MAXIMUM>
+    LRA<A_MINIMUM, A_MAXIMUM> operator-(const LRA<A_MINIMUM, A_MAXIMUM>& lhs, const double& rhs)
+    throw (RangeError) {
+    LRA<A_MINIMUM, A_MAXIMUM> result(lhs);
+    result -= rhs;
+    return result;
+  }
+
+  template <int A_MINIMUM, int A_MAXIMUM>
+    LRA<A_MINIMUM, A_MAXIMUM> operator-(const double& lhs, const LRA<A_MINIMUM, A_MAXIMUM>& rhs)
+    throw (RangeError) {
+    LRA<A_MINIMUM, A_MAXIMUM> result;
+    throwStatus(result.trySetValue(lhs - rhs.value()));
+    return result;
+  }
+
+  template <int A_MINIMUM, int A_MAXIMUM>
+    LRA<A_MINIMUM, A_MAXIMUM> operator*(const LRA<A_MINIMUM, A_MAXIMUM>& lhs, const double& rhs)
+    throw (RangeError) {
+    LRA<A_MINIMUM, A_MAXIMUM> result(lhs);
+    result *= rhs;
+    return result;
+  }
+
+  template <int A_MINIMUM, int A_MAXIMUM>
+    LRA<A_MINIMUM, A_MAXIMUM> operator*(const double& lhs, const LRA<A_MINIMUM, A_MAXIMUM>& rhs)
+    throw (RangeError) {
+    LRA<A_MINIMUM, A_MAXIMUM> result(rhs);
+    result *= lhs;
+    return result;
+  }
+
+  template <int A_MINIMUM, int A_MAXIMUM>
+    LRA<A_MINIMUM, A_MAXIMUM> operator/(const LRA<A_MINIMUM, A_MAXIMUM>& lhs, const double& rhs)
+    throw (DivideByZeroError, RangeError) {
+    LRA<A_MINIMUM, A_MAXIMUM> result(lhs);
+    result /= rhs;
+    return result;
+  }
+
+  template <int A_MINIMUM, int A_MAXIMUM>
+    LRA<A_MINIMUM, A_MAXIMUM> operator/(const double& lhs, const LRA<A_MINIMUM, A_MAXIMUM>& rhs)
+    throw (DivideByZeroError, RangeError) {
     if (rhs.value() == 0)
       throw DivideByZeroError();
-    double temp(lhs.value() / rhs.value());
-    lhs.validRange(temp);
-    return T(temp);
+    LRA<A_MINIMUM, A_MAXIMUM> result;
+    throwStatus(result.trySetValue(lhs / rhs.value()));
+    return result;
   }
 
 
@@ -229,34 +363,37 @@ namespace Angles {
   // ===== output operator<< =====
   // =============================
 
-  std::ostream& operator<< (std::ostream& os, const Angles::Angle& a) {
-    std::stringstream out;
-    Angles::value2DMSString(a.value(), out);
-    return os << out.str();
+  // inline, this header is included in more than one object. os
+  // precision is honored, e.g. os << std::setprecision(12) << a.
+
+  inline std::ostream& operator<< (std::ostream& os, const Angles::Angle& a) {
+    char buffer[MAX_SEXAGESIMAL_STRING];
+    Angles::value2DMSString(a.value(), buffer, sizeof(buffer), os.precision());
+    return os << buffer;
   }
 
-  std::ostream& operator<< (std::ostream& os, const Angles::LimitedRangeAngle& a) {
-    std::stringstream out;
-    Angles::value2DMSString(a.value(), out);
-    return os << out.str();
+  inline std::ostream& operator<< (std::ostream& os, const Angles::LimitedRangeAngle& a) {
+    char buffer[MAX_SEXAGESIMAL_STRING];
+    Angles::value2DMSString(a.value(), buffer, sizeof(buffer), os.precision());
+    return os << buffer;
   }
 
-  std::ostream& operator<< (std::ostream& os, const Angles::Declination& a) {
-    std::stringstream out;
-    Angles::value2DMSString(a.value(), out);
-    return os << out.str();
+  inline std::ostream& operator<< (std::ostream& os, const Angles::Declination& a) {
+    char buffer[MAX_SEXAGESIMAL_STRING];
+    Angles::value2DMSString(a.value(), buffer, sizeof(buffer), os.precision());
+    return os << buffer;
   }
 
-  std::ostream& operator<< (std::ostream& os, const Angles::Longitude& a) {
-    std::stringstream out;
-    Angles::value2DMSString(a.value(), out);
-    return os << out.str();
+  inline std::ostream& operator<< (std::ostream& os, const Angles::Longitude& a) {
+    char buffer[MAX_SEXAGESIMAL_STRING];
+    Angles::value2DMSString(a.value(), buffer, sizeof(buffer), os.precision());
+    return os << buffer;
   }
 
-  std::ostream& operator<< (std::ostream& os, const Angles::RA& a) {
-    std::stringstream out;
-    Angles::value2HMSString(a.value(), out);
-    return os << out.str();
+  inline std::ostream& operator<< (std::ostream& os, const Angles::RA& a) {
+    char buffer[MAX_SEXAGESIMAL_STRING];
+    Angles::value2HMSString(a.value(), buffer, sizeof(buffer), os.precision());
+    return os << buffer;
   }
 
 }
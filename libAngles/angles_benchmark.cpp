@@ -0,0 +1,552 @@
+// ================================================================
+// Filename:    angles_benchmark.cpp
+// Description: Times the libAngles hot paths in ns/op and ops/sec.
+//
+// Author:      L.R. McFarland, lrm@starbug.com
+// Created:     2026 Oct 18
+// Language:    C++
+//
+//  Angles is free software: you can redistribute it and/or modify it
+//  under the terms of the GNU General Public License as published by
+//  the Free Software Foundation, either version 3 of the License, or
+//  (at your option) any later version.
+//
+//  Angles is distributed in the hope that it will be useful, but
+//  WITHOUT ANY WARRANTY; without even the implied warranty of
+//  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+//  General Public License for more details.
+//
+//  You should have received a copy of the GNU General Public License
+//  along with Orbits.  If not, see <http://www.gnu.org/licenses/>.
+// ================================================================
+
+
+// Notes: Each benchmark runs over an array of input values, once to
+// warm up and then --repetitions times, and reports the minimum,
+// median and maximum time per value. The inputs come from one of
+// several distributions, sized for Declination's [-90, 90], so the
+// out of range and zero distributions make the range checks and
+// divides throw on most values. The exceptions per op are reported
+// with the times.
+//
+// usage: angles_benchmark [--sizes 1000,100000] [--repetitions 5]
+//                         [--filter substring] [--seed 1] [--json]
+//
+// make angles_benchmark builds it and its own copy of the library
+// with the Makefile's BENCHFLAGS, -O2 by default, in benchmark_build,
+// apart from the -g library and unit tests, e.g.
+//
+//   make benchmark
+//   make angles_benchmark BENCHFLAGS="-O3 -march=native -fPIC -I. -std=c++11"
+//
+// The JSON records whether each was optimized, library_optimized and
+// benchmark_optimized, and an unoptimized library is warned about.
+
+
+#include <algorithm>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <iostream>
+#include <sstream>
+#include <string>
+#include <vector>
+
+#include <stdint.h>       /* uint64_t */
+#include <sys/utsname.h>  /* uname */
+#include <time.h>         /* clock_gettime */
+#include <unistd.h>       /* sysconf */
+
+#include <angles.h>
+#include <batch.h>
+#include <utils.h>
+
+namespace {
+
+  // ------------------
+  // ----- timing -----
+  // ------------------
+
+  double nanoseconds() {
+    timespec a_time;
+    clock_gettime(CLOCK_MONOTONIC, &a_time);
+    return a_time.tv_sec*1e9 + a_time.tv_nsec;
+  }
+
+  // results are added here so the loops are not optimized away
+  volatile double sSink(0);
+
+
+  // -------------------------
+  // ----- distributions -----
+  // -------------------------
+
+  // xorshift64*, the same inputs on every platform for a seed
+  class Random {
+  public:
+    explicit Random(const uint64_t& a_seed) : m_state(a_seed != 0 ? a_seed : 1) {}
+    double uniform(const double& a_minimum, const double& a_maximum) {
+      m_state ^= m_state >> 12;
+      m_state ^= m_state << 25;
+      m_state ^= m_state >> 27;
+      const uint64_t a_bits((m_state*2685821657736338717ULL) >> 11);
+      return a_minimum + (a_maximum - a_minimum)*(a_bits/9007199254740992.0); // 2^53
+    }
+  private:
+    uint64_t m_state;
+  };
+
+  enum Distribution {
+    IN_RANGE,     // uniform in [-90, 90]
+    WIDE,         // uniform in [-360, 360], three quarters out of range
+    OUT_OF_RANGE, // uniform in 90 to 180 degrees either side, all out of range
+    ZEROS         // all 0, every divide throws
+  };
+
+  const char* sDistributions[] = {"in_range", "wide", "out_of_range", "zeros"};
+  const size_t sDistributionCount(sizeof(sDistributions)/sizeof(sDistributions[0]));
+
+  std::vector<double> inputs(const Distribution& a_distribution, const size_t& a_size, Random& a_random) {
+    std::vector<double> some_values(a_size);
+    for (size_t i = 0; i < a_size; ++i) {
+      switch (a_distribution) {
+      case IN_RANGE:
+	some_values[i] = a_random.uniform(-90, 90);
+	break;
+      case WIDE:
+	some_values[i] = a_random.uniform(-360, 360);
+	break;
+      case OUT_OF_RANGE: {
+	const double a_value(a_random.uniform(-90, 90));
+	some_values[i] = a_value < 0 ? a_value - 90.5 : a_value + 90.5;
+	break;
+      }
+      case ZEROS:
+	some_values[i] = 0;
+	break;
+      }
+    }
+    return some_values;
+  }
+
+
+  // ----------------------
+  // ----- benchmarks -----
+  // ----------------------
+
+  // The inputs of one run. The strings are made before the timing.
+  struct Inputs {
+    std::vector<double>      m_values;
+    std::vector<std::string> m_strings;
+  };
+
+  // A benchmark does one op per input value and returns the number of
+  // exceptions it caught.
+  typedef size_t (*Benchmark)(const Inputs& some_inputs);
+
+  size_t constructAngle(const Inputs& some_inputs) {
+    const std::vector<double>& some_values(some_inputs.m_values);
+    double a_sum(0);
+    for (size_t i = 0; i < some_values.size(); ++i)
+      a_sum += Angles::Angle(some_values[i]).value();
+    sSink += a_sum;
+    return 0;
+  }
+
+  size_t constructAngleDMS(const Inputs& some_inputs) {
+    const std::vector<double>& some_values(some_inputs.m_values);
+    double a_sum(0);
+    for (size_t i = 0; i < some_values.size(); ++i)
+      a_sum += Angles::Angle(some_values[i], 30, 45.5).value();
+    sSink += a_sum;
+    return 0;
+  }
+
+  size_t constructAngleString(const Inputs& some_inputs) {
+    const std::vector<std::string>& some_strings(some_inputs.m_strings);
+    double a_sum(0);
+    for (size_t i = 0; i < some_strings.size(); ++i)
+      a_sum += Angles::Angle(some_strings[i]).value();
+    sSink += a_sum;
+    return 0;
+  }
+
+  size_t constructDeclination(const Inputs& some_inputs) {
+    const std::vector<double>& some_values(some_inputs.m_values);
+    double a_sum(0);
+    size_t some_exceptions(0);
+    for (size_t i = 0; i < some_values.size(); ++i) {
+      try {
+	a_sum += Angles::Declination(some_values[i]).value();
+      } catch (Angles::RangeError&) {
+	++some_exceptions;
+      }
+    }
+    sSink += a_sum;
+    return some_exceptions;
+  }
+
+  size_t degrees2seconds(const Inputs& some_inputs) {
+    const std::vector<double>& some_values(some_inputs.m_values);
+    double a_sum(0);
+    for (size_t i = 0; i < some_values.size(); ++i)
+      a_sum += Angles::degrees2seconds(some_values[i], 30, 45.5);
+    sSink += a_sum;
+    return 0;
+  }
+
+  size_t addAngles(const Inputs& some_inputs) {
+    const std::vector<double>& some_values(some_inputs.m_values);
+    Angles::Angle a_sum;
+    for (size_t i = 0; i < some_values.size(); ++i)
+      a_sum = a_sum + Angles::Angle(some_values[i]);
+    sSink += a_sum.value();
+    return 0;
+  }
+
+  size_t addInPlace(const Inputs& some_inputs) {
+    const std::vector<double>& some_values(some_inputs.m_values);
+    Angles::Angle a_sum;
+    for (size_t i = 0; i < some_values.size(); ++i)
+      a_sum += some_values[i];
+    sSink += a_sum.value();
+    return 0;
+  }
+
+  size_t multiplyAngle(const Inputs& some_inputs) {
+    const std::vector<double>& some_values(some_inputs.m_values);
+    const Angles::Angle an_angle(1.5);
+    double a_sum(0);
+    for (size_t i = 0; i < some_values.size(); ++i)
+      a_sum += (an_angle*some_values[i]).value();
+    sSink += a_sum;
+    return 0;
+  }
+
+  size_t divideAngle(const Inputs& some_inputs) {
+    const std::vector<double>& some_values(some_inputs.m_values);
+    const Angles::Angle an_angle(1.5);
+    double a_sum(0);
+    size_t some_exceptions(0);
+    for (size_t i = 0; i < some_values.size(); ++i) {
+      try {
+	a_sum += (an_angle/some_values[i]).value();
+      } catch (Angles::DivideByZeroError&) {
+	++some_exceptions;
+      }
+    }
+    sSink += a_sum;
+    return some_exceptions;
+  }
+
+  size_t addDeclination(const Inputs& some_inputs) {
+    const std::vector<double>& some_values(some_inputs.m_values);
+    const Angles::Declination a_declination(0);
+    double a_sum(0);
+    size_t some_exceptions(0);
+    for (size_t i = 0; i < some_values.size(); ++i) {
+      try {
+	Angles::Declination a_result(a_declination);
+	a_result += some_values[i];
+	a_sum += a_result.value();
+      } catch (Angles::RangeError&) {
+	++some_exceptions;
+      }
+    }
+    sSink += a_sum;
+    return some_exceptions;
+  }
+
+  size_t validRange(const Inputs& some_inputs) {
+    const std::vector<double>& some_values(some_inputs.m_values);
+    size_t some_exceptions(0);
+    for (size_t i = 0; i < some_values.size(); ++i) {
+      try {
+	Angles::Declination::validRange(some_values[i]);
+      } catch (Angles::RangeError&) {
+	++some_exceptions;
+      }
+    }
+    return some_exceptions;
+  }
+
+  size_t validRangeArray(const Inputs& some_inputs) {
+    const std::vector<double>& some_values(some_inputs.m_values);
+    try {
+      Angles::validRange(&some_values[0], some_values.size(),
+			 Angles::Declination::minimum(), Angles::Declination::maximum());
+    } catch (Angles::RangeError&) {
+      return 1;
+    }
+    return 0;
+  }
+
+  size_t normalizeAngle(const Inputs& some_inputs) {
+    const std::vector<double>& some_values(some_inputs.m_values);
+    double a_sum(0);
+    for (size_t i = 0; i < some_values.size(); ++i) {
+      Angles::Angle an_angle(some_values[i]);
+      an_angle.normalize(Angles::WRAP_0_360);
+      a_sum += an_angle.value();
+    }
+    sSink += a_sum;
+    return 0;
+  }
+
+  size_t normalizeArray(const Inputs& some_inputs) {
+    const std::vector<double>& some_values(some_inputs.m_values);
+    std::vector<double> some_results(some_values.size());
+    Angles::normalize(&some_values[0], &some_results[0], some_values.size(), Angles::WRAP_180);
+    sSink += some_results.back();
+    return 0;
+  }
+
+  size_t streamOutput(const Inputs& some_inputs) {
+    const std::vector<double>& some_values(some_inputs.m_values);
+    std::ostringstream a_stream;
+    for (size_t i = 0; i < some_values.size(); ++i)
+      a_stream << Angles::Angle(some_values[i]) << '\n';
+    sSink += a_stream.str().size();
+    return 0;
+  }
+
+  struct BenchmarkSpec {
+    const char* m_name;
+    Benchmark   m_function;
+  };
+
+  const BenchmarkSpec sBenchmarks[] = {
+    {"Angle(double)",                constructAngle},
+    {"Angle(deg, min, sec)",         constructAngleDMS},
+    {"Angle(string)",                constructAngleString},
+    {"Declination(double)",          constructDeclination},
+    {"degrees2seconds",              degrees2seconds},
+    {"Angle + Angle",                addAngles},
+    {"Angle += double",              addInPlace},
+    {"Angle * double",               multiplyAngle},
+    {"Angle / double",               divideAngle},
+    {"Declination += double",        addDeclination},
+    {"Declination::validRange",      validRange},
+    {"validRange(array)",            validRangeArray},
+    {"Angle::normalize",             normalizeAngle},
+    {"normalize(array)",             normalizeArray},
+    {"operator<<",                   streamOutput}
+  };
+
+  const size_t sBenchmarkCount(sizeof(sBenchmarks)/sizeof(sBenchmarks[0]));
+
+
+  // -------------------
+  // ----- results -----
+  // -------------------
+
+  struct Result {
+    std::string m_benchmark;
+    std::string m_distribution;
+    size_t      m_size;
+    double      m_minimum;    // ns/op
+    double      m_median;     // ns/op
+    double      m_maximum;    // ns/op
+    double      m_exceptions; // per op
+  };
+
+  Result run(const BenchmarkSpec& a_benchmark, const char* a_distribution, const Inputs& some_inputs,
+	     const size_t& some_repetitions) {
+
+    const size_t a_size(some_inputs.m_values.size());
+
+    a_benchmark.m_function(some_inputs); // warm up
+
+    std::vector<double> some_times(some_repetitions);
+    size_t some_exceptions(0);
+    for (size_t i = 0; i < some_repetitions; ++i) {
+      const double a_start(nanoseconds());
+      some_exceptions = a_benchmark.m_function(some_inputs);
+      some_times[i] = (nanoseconds() - a_start)/a_size;
+    }
+
+    std::sort(some_times.begin(), some_times.end());
+
+    Result a_result;
+    a_result.m_benchmark = a_benchmark.m_name;
+    a_result.m_distribution = a_distribution;
+    a_result.m_size = a_size;
+    a_result.m_minimum = some_times.front();
+    a_result.m_median = some_times[some_times.size()/2];
+    a_result.m_maximum = some_times.back();
+    a_result.m_exceptions = static_cast<double>(some_exceptions)/a_size;
+    return a_result;
+  }
+
+  double opsPerSecond(const double& a_nanoseconds) {
+    return a_nanoseconds > 0 ? 1e9/a_nanoseconds : 0;
+  }
+
+  void printText(const std::vector<Result>& some_results) {
+    std::printf("%-26s %-13s %9s %12s %12s %12s %14s %10s\n", "benchmark", "distribution", "size",
+		"min ns/op", "median ns/op", "max ns/op", "ops/sec", "exc/op");
+    for (size_t i = 0; i < some_results.size(); ++i) {
+      const Result& a_result(some_results[i]);
+      std::printf("%-26s %-13s %9lu %12.2f %12.2f %12.2f %14.0f %10.3f\n", a_result.m_benchmark.c_str(),
+		  a_result.m_distribution.c_str(), static_cast<unsigned long>(a_result.m_size),
+		  a_result.m_minimum, a_result.m_median, a_result.m_maximum,
+		  opsPerSecond(a_result.m_median), a_result.m_exceptions);
+    }
+  }
+
+  // the names are all from this file, so nothing needs escaping but quotes
+  std::string jsonString(const std::string& a_string) {
+    std::string a_json("\"");
+    for (size_t i = 0; i < a_string.size(); ++i) {
+      if (a_string[i] == '"' || a_string[i] == '\\')
+	a_json += '\\';
+      a_json += a_string[i];
+    }
+    return a_json + "\"";
+  }
+
+  void printJSON(const std::vector<Result>& some_results, const size_t& some_repetitions,
+		 const uint64_t& a_seed) {
+
+    utsname a_host;
+    if (uname(&a_host) != 0)
+      std::strcpy(a_host.machine, "unknown");
+
+#ifdef __OPTIMIZE__
+    const char* is_benchmark_optimized("true");
+#else
+    const char* is_benchmark_optimized("false");
+#endif
+
+    std::printf("{\n");
+    std::printf("  \"host\": {\"system\": %s, \"machine\": %s, \"processors\": %ld},\n",
+		jsonString(a_host.sysname).c_str(), jsonString(a_host.machine).c_str(),
+		sysconf(_SC_NPROCESSORS_ONLN));
+    std::printf("  \"compiler\": %s,\n", jsonString(__VERSION__).c_str());
+    std::printf("  \"library_optimized\": %s,\n", Angles::isOptimized() ? "true" : "false");
+    std::printf("  \"benchmark_optimized\": %s,\n", is_benchmark_optimized);
+    std::printf("  \"repetitions\": %lu,\n", static_cast<unsigned long>(some_repetitions));
+    std::printf("  \"seed\": %llu,\n", static_cast<unsigned long long>(a_seed));
+    std::printf("  \"results\": [\n");
+    for (size_t i = 0; i < some_results.size(); ++i) {
+      const Result& a_result(some_results[i]);
+      std::printf("    {\"benchmark\": %s, \"distribution\": %s, \"size\": %lu, "
+		  "\"ns_per_op\": {\"min\": %.3f, \"median\": %.3f, \"max\": %.3f}, "
+		  "\"ops_per_sec\": %.1f, \"exceptions_per_op\": %.6f}%s\n",
+		  jsonString(a_result.m_benchmark).c_str(), jsonString(a_result.m_distribution).c_str(),
+		  static_cast<unsigned long>(a_result.m_size), a_result.m_minimum, a_result.m_median,
+		  a_result.m_maximum, opsPerSecond(a_result.m_median), a_result.m_exceptions,
+		  i + 1 < some_results.size() ? "," : "");
+    }
+    std::printf("  ]\n");
+    std::printf("}\n");
+  }
+
+
+  // -------------------
+  // ----- options -----
+  // -------------------
+
+  void usage(const char* a_program) {
+    std::cerr << "usage: " << a_program
+	      << " [--sizes 1000,100000] [--repetitions 5] [--filter substring] [--seed 1] [--json]"
+	      << std::endl;
+  }
+
+  // a positive count, 0 if it is not one
+  size_t toCount(const char* a_string) {
+    char* an_end(NULL);
+    const long a_count(std::strtol(a_string, &an_end, 10));
+    return an_end != a_string && *an_end == '\0' && a_count > 0 ? a_count : 0;
+  }
+
+  bool toSizes(const std::string& a_string, std::vector<size_t>& some_sizes) {
+    some_sizes.clear();
+    std::istringstream a_stream(a_string);
+    std::string a_size;
+    while (std::getline(a_stream, a_size, ',')) {
+      const size_t a_count(toCount(a_size.c_str()));
+      if (a_count == 0)
+	return false;
+      some_sizes.push_back(a_count);
+    }
+    return !some_sizes.empty();
+  }
+
+} // end anonymous namespace
+
+
+
+// ==================
+// ===== main() =====
+// ==================
+
+int main(int argc, char **argv) {
+
+  std::vector<size_t> some_sizes;
+  some_sizes.push_back(1000);
+  some_sizes.push_back(100000);
+
+  size_t some_repetitions(5);
+  std::string a_filter;
+  uint64_t a_seed(1);
+  bool is_json(false);
+
+  for (int i = 1; i < argc; ++i) {
+    const std::string an_option(argv[i]);
+    const bool has_value(i + 1 < argc);
+    if (an_option == "--json") {
+      is_json = true;
+    } else if (an_option == "--sizes" && has_value) {
+      if (!toSizes(argv[++i], some_sizes)) {
+	usage(argv[0]);
+	return 1;
+      }
+    } else if (an_option == "--repetitions" && has_value) {
+      if ((some_repetitions = toCount(argv[++i])) == 0) {
+	usage(argv[0]);
+	return 1;
+      }
+    } else if (an_option == "--filter" && has_value) {
+      a_filter = argv[++i];
+    } else if (an_option == "--seed" && has_value) {
+      a_seed = std::strtoull(argv[++i], NULL, 10);
+    } else {
+      usage(argv[0]);
+      return 1;
+    }
+  }
+
+  if (!Angles::isOptimized())
+    std::fprintf(stderr, "# warning: libAngles is not built optimized, see BENCHFLAGS in the Makefile\n");
+
+  std::vector<Result> some_results;
+
+  for (size_t s = 0; s < some_sizes.size(); ++s) {
+    for (size_t d = 0; d < sDistributionCount; ++d) {
+
+      Random a_random(a_seed);
+      Inputs some_inputs;
+      some_inputs.m_values = inputs(static_cast<Distribution>(d), some_sizes[s], a_random);
+      some_inputs.m_strings.resize(some_sizes[s]);
+      for (size_t i = 0; i < some_sizes[s]; ++i) {
+	char a_string[32];
+	std::snprintf(a_string, sizeof(a_string), "%.9f", some_inputs.m_values[i]);
+	some_inputs.m_strings[i] = a_string;
+      }
+
+      for (size_t b = 0; b < sBenchmarkCount; ++b) {
+	if (!a_filter.empty() && std::string(sBenchmarks[b].m_name).find(a_filter) == std::string::npos)
+	  continue;
+	some_results.push_back(run(sBenchmarks[b], sDistributions[d], some_inputs, some_repetitions));
+      }
+    }
+  }
+
+  if (is_json)
+    printJSON(some_results, some_repetitions, a_seed);
+  else
+    printText(some_results);
+
+  return 0;
+}
@@ -0,0 +1,10 @@
+#!/usr/bin/env bash
+#
+# Shell wrapper to set up the library path for the benchmark, e.g.
+#
+#   ./angles_benchmark.sh --json > benchmark.json
+#
+
+. ./setenv.sh >&2 # keeps stdout for the results
+
+./angles_benchmark "$@"
@@ -21,10 +21,30 @@
 // ================================================================
 
 #include <angles.h>
+#include <angle_array.h>
+#include <angle_index.h>
+#include <binary_catalogue.h>
+#include <catalogue.h>
+#include <fixed_angle.h>
+#include <htm.h>
+#include <packed_angles.h>
+#include <parallel.h>
+#include <parser.h>
+#include <shared_angle_array.h>
+#include <sky.h>
+#include <sorted_index.h>
 #include <utils.h>
+#include <zone_index.h>
 
+#include <algorithm>
+#include <cstdlib>
+#include <cstring>
+#include <iomanip>
+#include <limits>
 #include <sstream>
 
+#include <unistd.h>
+
 #include <gtest/gtest.h>
 
 namespace {
@@ -333,6 +353,22 @@ namespace {
     EXPECT_DOUBLE_EQ(45, c.value());
   }
 
+  TEST(Angle, ArithmeticWithValue) {
+    Angles::Angle a(90);
+    EXPECT_DOUBLE_EQ(90.5, (a + 0.5).value());
+    EXPECT_DOUBLE_EQ(90.5, (0.5 + a).value());
+    EXPECT_DOUBLE_EQ(89.5, (a - 0.5).value());
+    EXPECT_DOUBLE_EQ(-89.5, (0.5 - a).value());
+    EXPECT_DOUBLE_EQ(45, (a * 0.5).value());
+    EXPECT_DOUBLE_EQ(45, (0.5 * a).value());
+    EXPECT_DOUBLE_EQ(180, (a / 0.5).value());
+    EXPECT_DOUBLE_EQ(1, (90 / a).value());
+    EXPECT_THROW(a / 0.0, Angles::DivideByZeroError);
+    a += 1;
+    a *= 2;
+    EXPECT_DOUBLE_EQ(182, a.value());
+  }
+
 
   // operator<<
 
@@ -368,13 +404,73 @@ namespace {
     EXPECT_STREQ("405* 0' 0\"", out.str().c_str());
   }
 
-  // TODO fix this Angle(45 * 10).normalize() != 180
   TEST(Angle, Normalize) {
     Angles::Angle a(45 + 360);
     a.normalize();
     EXPECT_NEAR(45, a.value(), 1e-15);
   }
 
+  TEST(Angle, NormalizeMultiple) {
+    Angles::Angle a(45 * 10);
+    a.normalize();
+    EXPECT_DOUBLE_EQ(90, a.value());
+  }
+
+  TEST(Angle, NormalizeNegative) {
+    Angles::Angle a(-45 - 720);
+    a.normalize();
+    EXPECT_DOUBLE_EQ(315, a.value());
+  }
+
+  TEST(Angle, Normalize360) {
+    Angles::Angle a(360);
+    a.normalize();
+    EXPECT_EQ(0, a.value());
+  }
+
+  TEST(Angle, NormalizeLarge) {
+    Angles::Angle a;
+    a.value(1e9 + 45);
+    a.normalize();
+    EXPECT_DOUBLE_EQ(325, a.value()); // 1e9 = 2777777 * 360 + 280
+  }
+
+  TEST(Angle, Normalize180) {
+    Angles::Angle a(190);
+    a.normalize(Angles::WRAP_180);
+    EXPECT_DOUBLE_EQ(-170, a.value());
+
+    a.value(-180);
+    a.normalize(Angles::WRAP_180);
+    EXPECT_EQ(180, a.value());
+
+    a.value(180);
+    a.normalize(Angles::WRAP_180);
+    EXPECT_EQ(180, a.value());
+
+    a.value(-540 - 10);
+    a.normalize(Angles::WRAP_180);
+    EXPECT_DOUBLE_EQ(170, a.value());
+  }
+
+  TEST(Angle, Normalize24) {
+    Angles::Angle a(-1);
+    a.normalize(Angles::WRAP_0_24);
+    EXPECT_DOUBLE_EQ(23, a.value());
+
+    a.value(49.5);
+    a.normalize(Angles::WRAP_0_24);
+    EXPECT_DOUBLE_EQ(1.5, a.value());
+  }
+
+  TEST(Angle, NormalizeTinyNegative) {
+    Angles::Angle a;
+    a.value(-1e-20);
+    a.normalize();
+    EXPECT_LE(0, a.value());
+    EXPECT_GT(360, a.value());
+  }
+
 
   // -----------------------------
   // ----- LimitedRangeAngle -----
@@ -497,6 +593,28 @@ namespace {
     EXPECT_EQ(360, a.getMaximum());
   }
 
+  TEST(LimitedRangeAngle, static_accessors) {
+    EXPECT_EQ(-90, Angles::Declination::minimum());
+    EXPECT_EQ(24, Angles::RA::maximum());
+    EXPECT_TRUE(Angles::RA::isValidRange(23.5));
+    EXPECT_THROW(Angles::Declination::validRange(90.5), Angles::RangeError);
+  }
+
+  TEST(LimitedRangeAngle, size) {
+    EXPECT_EQ(sizeof(double), sizeof(Angles::LimitedRangeAngle));
+    EXPECT_EQ(sizeof(double), sizeof(Angles::Declination));
+    EXPECT_EQ(sizeof(double), sizeof(Angles::RA));
+    EXPECT_EQ(4 * sizeof(double), sizeof(Angles::Longitude[4]));
+  }
+
+  TEST(LimitedRangeAngle, CopyAssignKeepsRange) {
+    Angles::Declination a(45);
+    Angles::Declination b;
+    b = a;
+    EXPECT_EQ(45, b.value());
+    EXPECT_THROW(b.setValue(91), Angles::RangeError);
+  }
+
   TEST(LimitedRangeAngle, value_accessors) {
     Angles::LimitedRangeAngle a;
 
@@ -741,6 +859,919 @@ namespace {
   }
 
 
+  // normalize
+
+  TEST(LimitedRangeAngle, WrapConventions) {
+    EXPECT_EQ(Angles::WRAP_180, Angles::LimitedRangeAngle::wrapConvention());
+    EXPECT_EQ(Angles::WRAP_180, Angles::Longitude::wrapConvention());
+    EXPECT_EQ(Angles::WRAP_0_24, Angles::RA::wrapConvention());
+  }
+
+  TEST(Longitude, Normalize) {
+    Angles::Longitude a(-180);
+    a.normalize();
+    EXPECT_EQ(180, a.value());
+  }
+
+  TEST(RA, Normalize) {
+    Angles::RA a(24);
+    a.normalize();
+    EXPECT_EQ(0, a.value());
+  }
+
+  TEST(LimitedRangeAngle, Normalize360) {
+    Angles::LimitedRangeAngle a(-90);
+    a.normalize(Angles::WRAP_0_360);
+    EXPECT_EQ(270, a.value());
+  }
+
+  TEST(Declination, NormalizeRangeError) {
+    Angles::Declination a(-90);
+    EXPECT_THROW(a.normalize(Angles::WRAP_0_360), Angles::RangeError);
+  }
+
+
+  // non-throwing operators
+
+  TEST(LimitedRangeAngle, RangeStatus) {
+    EXPECT_EQ(Angles::SUCCESS, Angles::Declination::rangeStatus(90));
+    EXPECT_EQ(Angles::MINIMUM_EXCEEDED, Angles::Declination::rangeStatus(-90.5));
+    EXPECT_EQ(Angles::MAXIMUM_EXCEEDED, Angles::RA::rangeStatus(24.5));
+  }
+
+  TEST(LimitedRangeAngle, TryAdd) {
+    Angles::Declination a(45);
+    EXPECT_EQ(Angles::SUCCESS, a.tryAdd(Angles::Declination(40)));
+    EXPECT_EQ(85, a.value());
+    EXPECT_EQ(Angles::MAXIMUM_EXCEEDED, a.tryAdd(Angles::Declination(10)));
+    EXPECT_EQ(85, a.value());
+  }
+
+  TEST(LimitedRangeAngle, TrySubtract) {
+    Angles::RA a(1);
+    EXPECT_EQ(Angles::MINIMUM_EXCEEDED, a.trySubtract(Angles::RA(2)));
+    EXPECT_EQ(1, a.value());
+  }
+
+  TEST(LimitedRangeAngle, TryMultiply) {
+    Angles::Longitude a(100);
+    EXPECT_EQ(Angles::MINIMUM_EXCEEDED, a.tryMultiply(Angles::Longitude(-2)));
+    EXPECT_EQ(Angles::SUCCESS, a.tryMultiply(Angles::Longitude(-1)));
+    EXPECT_EQ(-100, a.value());
+  }
+
+  TEST(LimitedRangeAngle, TryDivide) {
+    Angles::Latitude a(45);
+    EXPECT_EQ(Angles::DIVIDE_BY_ZERO, a.tryDivide(Angles::Latitude(0)));
+    EXPECT_EQ(Angles::MAXIMUM_EXCEEDED, a.tryDivide(Angles::Latitude(0.25)));
+    EXPECT_EQ(Angles::SUCCESS, a.tryDivide(Angles::Latitude(2)));
+    EXPECT_EQ(22.5, a.value());
+  }
+
+  TEST(LimitedRangeAngle, TryNegate) {
+    Angles::RA a(1);
+    EXPECT_EQ(Angles::MINIMUM_EXCEEDED, a.tryNegate());
+    Angles::Declination b(1);
+    EXPECT_EQ(Angles::SUCCESS, b.tryNegate());
+    EXPECT_EQ(-1, b.value());
+  }
+
+  TEST(LimitedRangeAngle, ThrowStatus) {
+    EXPECT_NO_THROW(Angles::throwStatus(Angles::SUCCESS));
+    EXPECT_THROW(Angles::throwStatus(Angles::MAXIMUM_EXCEEDED), Angles::RangeError);
+    EXPECT_THROW(Angles::throwStatus(Angles::DIVIDE_BY_ZERO), Angles::DivideByZeroError);
+    EXPECT_STREQ("minimum exceeded", Angles::statusString(Angles::MINIMUM_EXCEEDED));
+  }
+
+  // out of range policies. The policy is per type, so each test sets
+  // it back to POLICY_RAISE.
+
+  TEST(Longitude, PolicyDefaultRaise) {
+    EXPECT_EQ(Angles::POLICY_RAISE, Angles::Longitude::policy());
+    EXPECT_THROW(Angles::Longitude(170) + Angles::Longitude(20), Angles::RangeError);
+  }
+
+  TEST(Longitude, PolicyWrap) {
+    Angles::Longitude::policy(Angles::POLICY_WRAP);
+    Angles::Longitude a(Angles::Longitude(170) + Angles::Longitude(20));
+    EXPECT_DOUBLE_EQ(-170, a.value());
+    a -= Angles::Longitude(20);
+    EXPECT_DOUBLE_EQ(170, a.value());
+    Angles::Longitude::policy(Angles::POLICY_RAISE);
+  }
+
+  TEST(Declination, PolicySharedWithLatitude) {
+    Angles::Declination::policy(Angles::POLICY_CLAMP);
+    EXPECT_EQ(Angles::POLICY_CLAMP, Angles::Latitude::policy());
+    Angles::Latitude a(Angles::Latitude(80) + Angles::Latitude(20));
+    EXPECT_EQ(90, a.value());
+    EXPECT_EQ(-90, (-Angles::Latitude(80) - Angles::Latitude(20)).value());
+    EXPECT_EQ(Angles::POLICY_RAISE, Angles::Longitude::policy());
+    Angles::Declination::policy(Angles::POLICY_RAISE);
+  }
+
+  TEST(RA, PolicyNaN) {
+    Angles::RA::policy(Angles::POLICY_NAN);
+    Angles::RA a(Angles::RA(20) * Angles::RA(2));
+    EXPECT_TRUE(a.value() != a.value());
+    EXPECT_THROW(Angles::RA(1) / Angles::RA(0), Angles::DivideByZeroError);
+    Angles::RA::policy(Angles::POLICY_RAISE);
+  }
+
+  TEST(LimitedRangeAngle, TryAddPolicy) {
+    Angles::Longitude a(170);
+    EXPECT_EQ(Angles::MAXIMUM_EXCEEDED, a.tryAdd(Angles::Longitude(20)));
+    EXPECT_EQ(170, a.value());
+    EXPECT_EQ(Angles::SUCCESS, a.tryAdd(Angles::Longitude(20), Angles::POLICY_WRAP));
+    EXPECT_DOUBLE_EQ(-170, a.value());
+    EXPECT_EQ(Angles::SUCCESS, a.trySubtract(Angles::Longitude(20), Angles::POLICY_CLAMP));
+    EXPECT_EQ(-180, a.value());
+    EXPECT_EQ(Angles::DIVIDE_BY_ZERO, a.tryDivide(Angles::Longitude(0), Angles::POLICY_WRAP));
+  }
+
+  TEST(LimitedRangeAngle, ArithmeticWithValue) {
+    Angles::Longitude a(170);
+    EXPECT_DOUBLE_EQ(175, (a + 5.0).value());
+    EXPECT_DOUBLE_EQ(-165, (5.0 - a).value());
+    EXPECT_DOUBLE_EQ(85, (a / 2.0).value());
+    EXPECT_THROW(a + 20.0, Angles::RangeError);
+    EXPECT_THROW(20.0 * a, Angles::RangeError);
+    EXPECT_THROW(1.0 / Angles::Longitude(0), Angles::DivideByZeroError);
+    EXPECT_EQ(Angles::SUCCESS, a.tryAdd(20.0, Angles::POLICY_WRAP));
+    EXPECT_DOUBLE_EQ(-170, a.value());
+    EXPECT_EQ(Angles::MINIMUM_EXCEEDED, a.trySubtract(20.0));
+    EXPECT_DOUBLE_EQ(-170, a.value());
+    a -= 10.0;
+    EXPECT_EQ(-180, a.value());
+  }
+
+  TEST(Utils, applyPolicy) {
+    EXPECT_DOUBLE_EQ(-170, Angles::applyPolicy(190, -180, 180, Angles::POLICY_WRAP));
+    EXPECT_DOUBLE_EQ(170, Angles::applyPolicy(-190, -180, 180, Angles::POLICY_WRAP));
+    EXPECT_DOUBLE_EQ(1, Angles::applyPolicy(1e3 * 24 + 1, 0, 24, Angles::POLICY_WRAP));
+    EXPECT_EQ(-90, Angles::applyPolicy(-95, -90, 90, Angles::POLICY_CLAMP));
+    EXPECT_EQ(95, Angles::applyPolicy(95, -90, 90, Angles::POLICY_RAISE));
+    double a(Angles::applyPolicy(95, -90, 90, Angles::POLICY_NAN));
+    EXPECT_TRUE(a != a);
+  }
+
+
+  // ----------------------
+  // ----- AngleArray -----
+  // ----------------------
+
+  TEST(AngleArray, DefaultConstructor) {
+    Angles::AngleArray<Angles::Angle> a;
+    EXPECT_EQ(0u, a.size());
+    EXPECT_TRUE(a.values() == NULL);
+  }
+
+  TEST(AngleArray, ConstructorFromValues) {
+    double values[] = {1, -2, 3.5};
+    Angles::AngleArray<Angles::Angle> a(values, 3);
+    EXPECT_EQ(3u, a.size());
+    EXPECT_EQ(-2, a.value(1));
+    EXPECT_TRUE(Angles::Angle(3.5) == a[2]);
+  }
+
+  TEST(AngleArray, ConstructorRangeError) {
+    double values[] = {10, 91};
+    EXPECT_THROW(Angles::DeclinationArray(values, 2), Angles::RangeError);
+  }
+
+  TEST(AngleArray, ValueRangeError) {
+    Angles::RAArray a(4);
+    EXPECT_THROW(a.value(0, 25), Angles::RangeError);
+    EXPECT_NO_THROW(a.value(0, 23));
+    EXPECT_EQ(23, a.value(0));
+  }
+
+  TEST(AngleArray, PlusArray) {
+    double v1[] = {1, 2, 3};
+    double v2[] = {10, 20, 30};
+    Angles::AngleArray<Angles::Angle> a(v1, 3);
+    Angles::AngleArray<Angles::Angle> b(v2, 3);
+    Angles::AngleArray<Angles::Angle> c(a + b);
+    EXPECT_DOUBLE_EQ(11, c.value(0));
+    EXPECT_DOUBLE_EQ(33, c.value(2));
+  }
+
+  TEST(AngleArray, SizeMismatch) {
+    Angles::AngleArray<Angles::Angle> a(3);
+    Angles::AngleArray<Angles::Angle> b(4);
+    EXPECT_THROW(a += b, Angles::Error);
+  }
+
+  TEST(AngleArray, InplaceMinusAngle) {
+    double v1[] = {45, 90};
+    Angles::AngleArray<Angles::Angle> a(v1, 2);
+    a -= Angles::Angle(45);
+    EXPECT_DOUBLE_EQ(0, a.value(0));
+    EXPECT_DOUBLE_EQ(45, a.value(1));
+  }
+
+  TEST(AngleArray, UnitaryMinus) {
+    double v1[] = {45, -90};
+    Angles::DeclinationArray a(v1, 2);
+    Angles::DeclinationArray b(-a);
+    EXPECT_DOUBLE_EQ(-45, b.value(0));
+    EXPECT_DOUBLE_EQ(90, b.value(1));
+  }
+
+  TEST(AngleArray, UnitaryMinusRangeError) {
+    double v1[] = {12};
+    Angles::RAArray a(v1, 1);
+    EXPECT_THROW(-a, Angles::RangeError);
+  }
+
+  TEST(AngleArray, InplaceMultiplyRangeErrorUnchanged) {
+    double v1[] = {10, 60};
+    Angles::LatitudeArray a(v1, 2);
+    EXPECT_THROW(a *= Angles::Latitude(2), Angles::RangeError);
+    EXPECT_EQ(10, a.value(0));
+    EXPECT_EQ(60, a.value(1));
+  }
+
+  TEST(AngleArray, DivideByZero) {
+    double v1[] = {10, 60};
+    double v2[] = {2, 0};
+    Angles::AngleArray<Angles::Angle> a(v1, 2);
+    Angles::AngleArray<Angles::Angle> b(v2, 2);
+    EXPECT_THROW(a / b, Angles::DivideByZeroError);
+    EXPECT_THROW(a /= Angles::Angle(0), Angles::DivideByZeroError);
+  }
+
+  TEST(AngleArray, Radians) {
+    double v1[] = {45, -180};
+    Angles::LongitudeArray a(v1, 2);
+    std::vector<double> r(a.radians());
+    EXPECT_DOUBLE_EQ(Angles::Angle::deg2rad(45), r[0]);
+    EXPECT_DOUBLE_EQ(-M_PI, r[1]);
+  }
+
+  TEST(AngleArray, IsValidRange) {
+    Angles::LongitudeArray a(2);
+    EXPECT_TRUE(a.isValidRange());
+    EXPECT_EQ(-180, a.minimum());
+    EXPECT_EQ(180, a.maximum());
+  }
+
+  TEST(AngleArray, RangeStatus) {
+    double v1[] = {-91, 0, 91, 90, -90};
+    unsigned char statuses[5];
+    EXPECT_EQ(2u, Angles::rangeStatus(v1, 5, -90, 90, statuses));
+    unsigned char expected[] = {Angles::MINIMUM_EXCEEDED, Angles::SUCCESS, Angles::MAXIMUM_EXCEEDED,
+				Angles::SUCCESS, Angles::SUCCESS};
+    for (size_t i = 0; i < 5; ++i)
+      EXPECT_EQ(expected[i], statuses[i]);
+  }
+
+  TEST(AngleArray, RangeStatusUnlimited) {
+    double v1[] = {-1e9, 1e9};
+    Angles::AngleArray<Angles::Angle> a(v1, 2);
+    unsigned char statuses[2] = {42, 42};
+    EXPECT_EQ(0u, a.rangeStatus(statuses));
+    EXPECT_EQ(Angles::SUCCESS, statuses[0]);
+    EXPECT_EQ(Angles::SUCCESS, statuses[1]);
+  }
+
+  TEST(AngleArray, Normalize) {
+    double v1[] = {45 + 360, 45, -45};
+    Angles::AngleArray<Angles::Angle> a(v1, 3);
+    a.normalize();
+    EXPECT_NEAR(45, a.value(0), 1e-15);
+    EXPECT_NEAR(45, a.value(1), 1e-15);
+    EXPECT_NEAR(315, a.value(2), 1e-15);
+  }
+
+  TEST(AngleArray, NormalizeLongitude) {
+    double v1[] = {-180, 90};
+    Angles::LongitudeArray a(v1, 2);
+    a.normalize();
+    EXPECT_EQ(180, a.value(0));
+    EXPECT_EQ(90, a.value(1));
+  }
+
+  TEST(AngleArray, NormalizeKernel) {
+    double v1[] = {-1, 24, 25, 1e9};
+    double v2[4];
+    Angles::normalize(v1, v2, 4, Angles::WRAP_0_24);
+    EXPECT_DOUBLE_EQ(23, v2[0]);
+    EXPECT_EQ(0, v2[1]);
+    EXPECT_DOUBLE_EQ(1, v2[2]);
+    EXPECT_DOUBLE_EQ(16, v2[3]); // 1e9 = 41666666 * 24 + 16
+  }
+
+  TEST(AngleArray, ScalarLeftKernels) {
+    double v1[] = {1, 2, 4};
+    double v2[3];
+    Angles::subtract(10.0, v1, v2, 3);
+    EXPECT_EQ(9, v2[0]);
+    EXPECT_EQ(6, v2[2]);
+    Angles::divide(8.0, v1, v2, 3);
+    EXPECT_EQ(8, v2[0]);
+    EXPECT_EQ(2, v2[2]);
+    Angles::add(1.0, v1, v2, 3);
+    EXPECT_EQ(5, v2[2]);
+    double zero[] = {1, 0};
+    EXPECT_THROW(Angles::divide(1.0, zero, v2, 2), Angles::DivideByZeroError);
+  }
+
+  TEST(AngleArray, PolicyKernel) {
+    double v1[] = {-95, 0, 95};
+    double v2[3] = {42, 42, 42};
+    EXPECT_EQ(Angles::MINIMUM_EXCEEDED, Angles::applyPolicy(v1, v2, 3, -90, 90, Angles::POLICY_RAISE));
+    EXPECT_EQ(42, v2[0]); // untouched
+    EXPECT_EQ(Angles::SUCCESS, Angles::applyPolicy(v1, v2, 3, -90, 90, Angles::POLICY_CLAMP));
+    EXPECT_EQ(-90, v2[0]);
+    EXPECT_EQ(0, v2[1]);
+    EXPECT_EQ(90, v2[2]);
+    EXPECT_EQ(Angles::SUCCESS, Angles::applyPolicy(v1, v2, 3, -90, 90, Angles::POLICY_WRAP));
+    EXPECT_DOUBLE_EQ(85, v2[0]);
+    EXPECT_DOUBLE_EQ(-85, v2[2]);
+  }
+
+  TEST(AngleArray, PolicyWrap) {
+    Angles::Longitude::policy(Angles::POLICY_WRAP);
+    double v1[] = {170, -170};
+    Angles::LongitudeArray a(v1, 2);
+    a += Angles::Longitude(20);
+    EXPECT_DOUBLE_EQ(-170, a.value(0));
+    EXPECT_DOUBLE_EQ(-150, a.value(1));
+    Angles::Longitude::policy(Angles::POLICY_RAISE);
+  }
+
+  TEST(AngleArray, ApplyPolicy) {
+    double v1[] = {-95, 95};
+    Angles::DeclinationArray a(2);
+    a.values()[0] = v1[0]; // e.g. a bulk load
+    a.values()[1] = v1[1];
+    EXPECT_THROW(a.applyPolicy(), Angles::RangeError);
+    a.applyPolicy(Angles::POLICY_CLAMP);
+    EXPECT_EQ(-90, a.value(0));
+    EXPECT_EQ(90, a.value(1));
+  }
+
+
+  // ----------------------
+  // ----- AngleIndex -----
+  // ----------------------
+
+  TEST(AngleIndex, InsertFind) {
+    Angles::AngleIndex<int> an_index;
+    EXPECT_TRUE(an_index.empty());
+    EXPECT_TRUE(an_index.insert(45.5, 1));
+    EXPECT_TRUE(an_index.insert(-45.5, 2));
+    EXPECT_FALSE(an_index.insert(45.5, 3)); // replaces
+    EXPECT_EQ(2u, an_index.size());
+    EXPECT_EQ(3, *an_index.find(45.5));
+    EXPECT_EQ(2, *an_index.find(-45.5));
+    EXPECT_TRUE(an_index.find(45.5 + 1e-9) == NULL);
+    EXPECT_TRUE(an_index.contains(-45.5));
+  }
+
+  TEST(AngleIndex, NegativeZero) {
+    Angles::AngleIndex<int> an_index;
+    an_index.insert(-0.0, 1);
+    EXPECT_EQ(1, *an_index.find(0.0));
+    EXPECT_EQ(Angles::hashValue(0.0), Angles::hashValue(-0.0));
+  }
+
+  TEST(AngleIndex, Quantum) {
+    const double a_mas(1/3600000.0);
+    Angles::AngleIndex<int> an_index(a_mas);
+    EXPECT_EQ(a_mas, an_index.quantum());
+    an_index.insert(10.0, 1);
+    EXPECT_EQ(1, *an_index.find(10.0 + a_mas/4));
+    EXPECT_EQ(1, *an_index.find(10.0 - a_mas/4));
+    EXPECT_TRUE(an_index.find(10.0 + a_mas) == NULL);
+    EXPECT_FALSE(an_index.insert(10.0 + a_mas/4, 2));
+    EXPECT_EQ(1u, an_index.size());
+    for (size_t i = 0; i < an_index.slots(); ++i)
+      if (an_index.isUsed(i))
+	EXPECT_EQ(10.0, an_index.key(i)); // first key kept
+  }
+
+  TEST(AngleIndex, Errors) {
+    EXPECT_THROW(Angles::AngleIndex<int>(-1), Angles::Error);
+    Angles::AngleIndex<int> an_index;
+    double a_nan(std::numeric_limits<double>::quiet_NaN());
+    EXPECT_THROW(an_index.insert(a_nan, 1), Angles::Error);
+    EXPECT_TRUE(an_index.find(a_nan) == NULL);
+  }
+
+  TEST(AngleIndex, GrowAndErase) {
+    Angles::AngleIndex<int> an_index;
+    an_index.reserve(100);
+    EXPECT_EQ(256u, an_index.slots());
+    for (int i = 0; i < 10000; ++i)
+      an_index.insert(i*0.01 - 50, i);
+    EXPECT_EQ(10000u, an_index.size());
+    EXPECT_TRUE(2*an_index.size() <= an_index.slots());
+    for (int i = 0; i < 10000; i += 2)
+      EXPECT_TRUE(an_index.erase(i*0.01 - 50));
+    EXPECT_FALSE(an_index.erase(-50));
+    EXPECT_EQ(5000u, an_index.size());
+    for (int i = 0; i < 10000; ++i) {
+      const int* a_value(an_index.find(i*0.01 - 50));
+      if (i % 2)
+	EXPECT_EQ(i, *a_value);
+      else
+	EXPECT_TRUE(a_value == NULL);
+    }
+    size_t used(0);
+    for (size_t i = 0; i < an_index.slots(); ++i)
+      used += an_index.isUsed(i);
+    EXPECT_EQ(5000u, used);
+    an_index.clear();
+    EXPECT_TRUE(an_index.empty());
+    EXPECT_TRUE(an_index.find(-49.99) == NULL);
+  }
+
+  TEST(Utils, quantize) {
+    EXPECT_EQ(10.5, Angles::quantize(10.5, 0));
+    EXPECT_EQ(10.5, Angles::quantize(10.4, 0.5));
+    EXPECT_EQ(-10.5, Angles::quantize(-10.6, 0.5));
+    EXPECT_EQ(Angles::hashValue(10.5), Angles::hashValue(10.4, 0.5));
+    EXPECT_NE(Angles::hashValue(10.5), Angles::hashValue(10.4));
+  }
+
+  // -----------------------
+  // ----- SortedIndex -----
+  // -----------------------
+
+  TEST(SortedIndex, Construct) {
+    double v1[] = {-30, 10, -20, 10, 45};
+    Angles::DeclinationSortedIndex an_index(v1, 5);
+    EXPECT_EQ(5u, an_index.size());
+    EXPECT_EQ(-30, an_index.value(0));
+    EXPECT_EQ(45, an_index.value(4));
+    EXPECT_EQ(2u, an_index.position(1));
+    EXPECT_EQ(1u, an_index.position(2)); // equal values in position order
+    EXPECT_EQ(3u, an_index.position(3));
+    EXPECT_FALSE(Angles::DeclinationSortedIndex::isPeriodic());
+    EXPECT_TRUE(Angles::RASortedIndex::isPeriodic());
+    EXPECT_TRUE(Angles::LongitudeSortedIndex::isPeriodic());
+    EXPECT_EQ(24, Angles::RASortedIndex::period());
+  }
+
+  TEST(SortedIndex, ConstructRangeError) {
+    double v1[] = {10, 95};
+    Angles::DeclinationSortedIndex an_index(v1, 1);
+    EXPECT_THROW(an_index.assign(v1, 2), Angles::RangeError);
+    EXPECT_EQ(1u, an_index.size()); // unchanged
+    double v2[] = {std::numeric_limits<double>::quiet_NaN()};
+    EXPECT_THROW(an_index.assign(v2, 1), Angles::RangeError);
+    Angles::SortedIndex<Angles::Angle> an_angle_index(v1, 2); // no limits
+    EXPECT_FALSE(an_angle_index.isPeriodic());
+  }
+
+  TEST(SortedIndex, Range) {
+    double v1[] = {-30, -25, -20, -10, 0, 10};
+    Angles::DeclinationSortedIndex an_index(v1, 6);
+    std::vector<size_t> some_positions;
+    EXPECT_EQ(3u, an_index.range(-30, -20, some_positions));
+    ASSERT_EQ(3u, some_positions.size());
+    EXPECT_EQ(0u, some_positions[0]);
+    EXPECT_EQ(2u, some_positions[2]);
+    EXPECT_EQ(3u, an_index.count(-30, -20));
+    EXPECT_EQ(0u, an_index.count(-20, -30)); // does not wrap
+    EXPECT_EQ(0u, an_index.count(1, 5));
+    EXPECT_EQ(6u, an_index.count(-90, 90));
+  }
+
+  TEST(SortedIndex, RangeWrap) {
+    double v1[] = {23.9, 0.1, 12, 23.7, 0, 24};
+    Angles::RASortedIndex an_index(v1, 6);
+    std::vector<size_t> some_positions;
+    EXPECT_EQ(4u, an_index.range(23.8, 0.2, some_positions));
+    ASSERT_EQ(4u, some_positions.size());
+    EXPECT_EQ(0u, some_positions[0]); // 23.9
+    EXPECT_EQ(5u, some_positions[1]); // 24
+    EXPECT_EQ(4u, some_positions[2]); // 0
+    EXPECT_EQ(1u, some_positions[3]); // 0.1
+    EXPECT_EQ(4u, an_index.count(-0.2, 0.2)); // normalized to 23.8
+    EXPECT_EQ(6u, an_index.count(0, 24));
+
+    double v2[] = {179, -179, 0};
+    Angles::LongitudeSortedIndex a_longitude_index(v2, 3);
+    EXPECT_EQ(2u, a_longitude_index.count(170, -170));
+    EXPECT_EQ(2u, a_longitude_index.count(170, 190)); // 190 is -170
+  }
+
+  TEST(SortedIndex, Nearest) {
+    double v1[] = {-30, -20, 10};
+    Angles::DeclinationSortedIndex an_index(v1, 3);
+    EXPECT_EQ(1u, an_index.nearest(-24));
+    EXPECT_EQ(0u, an_index.nearest(-25)); // tie
+    EXPECT_EQ(0u, an_index.nearest(-90));
+    EXPECT_EQ(2u, an_index.nearest(90));
+
+    double v2[] = {0.5, 12, 23};
+    Angles::RASortedIndex an_ra_index(v2, 3);
+    EXPECT_EQ(0u, an_ra_index.nearest(23.9)); // across the wrap point
+    EXPECT_EQ(2u, an_ra_index.nearest(23.6));
+    EXPECT_EQ(1u, an_ra_index.nearest(12));
+
+    Angles::RASortedIndex an_empty_index;
+    EXPECT_THROW(an_empty_index.nearest(0), Angles::Error);
+    EXPECT_THROW(an_ra_index.nearest(std::numeric_limits<double>::quiet_NaN()), Angles::RangeError);
+  }
+
+  // ---------------
+  // ----- Sky -----
+  // ---------------
+
+  TEST(Sky, Separation) {
+    EXPECT_DOUBLE_EQ(0, Angles::separation(12, 45, 12, 45));
+    EXPECT_DOUBLE_EQ(90, Angles::separation(0, 0, 6, 0));
+    EXPECT_DOUBLE_EQ(180, Angles::separation(0, 0, 12, 0));
+    EXPECT_DOUBLE_EQ(180, Angles::separation(3, -90, 15, 90));
+    EXPECT_DOUBLE_EQ(10, Angles::separation(5, 80, 17, 90)); // through the pole
+    EXPECT_NEAR(1, Angles::separation(23.9, 44.5, 23.9, 45.5), 1e-12);
+    double a_cosine(0.5 + 0.5*cos(15*M_PI/180)); // the law of cosines at dec 45
+    EXPECT_NEAR(acos(a_cosine)*180/M_PI, Angles::separation(23.5, 45, 0.5, 45), 1e-12); // across 0h
+    Angles::RA ra1(1, 2, 3);
+    Angles::RA ra2(1, 2, 3.0001);
+    Angles::Declination dec(60);
+    EXPECT_NEAR(0.0001*15/3600*0.5, Angles::separation(ra1, dec, ra2, dec), 1e-14); // tiny
+  }
+
+  TEST(Sky, SeparationArrays) {
+    double ras[] = {0, 6, 12, 18};
+    double decs[] = {0, 0, 45, -45};
+    double result[4];
+    Angles::separation(0, 90, ras, decs, result, 4);
+    EXPECT_DOUBLE_EQ(90, result[0]);
+    EXPECT_DOUBLE_EQ(90, result[1]);
+    EXPECT_DOUBLE_EQ(45, result[2]);
+    EXPECT_DOUBLE_EQ(135, result[3]);
+    Angles::separation(ras, decs, ras, decs, result, 4);
+    EXPECT_EQ(0, result[0]);
+    EXPECT_EQ(0, result[3]);
+    double ras2[] = {12, 18, 0, 6};
+    Angles::separation(ras, decs, ras2, decs, result, 4);
+    for (size_t i = 0; i < 4; ++i)
+      EXPECT_DOUBLE_EQ(Angles::separation(ras[i], decs[i], ras2[i], decs[i]), result[i]);
+  }
+
+  TEST(Sky, Horizontal) {
+    double altitude(0);
+    double azimuth(0);
+    Angles::horizontal(45, 3, 7, 90, altitude, azimuth); // the pole
+    EXPECT_NEAR(45, altitude, 1e-12);
+    EXPECT_NEAR(0, azimuth, 1e-12);
+    Angles::horizontal(45, 3, 3, 0, altitude, azimuth); // on the meridian
+    EXPECT_NEAR(45, altitude, 1e-12);
+    EXPECT_NEAR(180, azimuth, 1e-12);
+    Angles::horizontal(-30, 10, 10, -30, altitude, azimuth); // zenith
+    EXPECT_DOUBLE_EQ(90, altitude);
+    Angles::horizontal(0, 6, 0, 0, altitude, azimuth); // setting
+    EXPECT_NEAR(0, altitude, 1e-12);
+    EXPECT_NEAR(270, azimuth, 1e-12);
+    Angles::horizontal(0, 18, 0, 0, altitude, azimuth); // rising
+    EXPECT_NEAR(0, altitude, 1e-12);
+    EXPECT_NEAR(90, azimuth, 1e-12);
+    Angles::horizontal(45, 0, 12, 0, altitude, azimuth); // below the horizon
+    EXPECT_NEAR(-45, altitude, 1e-12);
+    EXPECT_NEAR(0, azimuth, 1e-12);
+
+    Angles::Angle an_altitude;
+    Angles::Angle an_azimuth;
+    Angles::horizontal(Angles::Latitude(45), Angles::RA(3), Angles::RA(3), Angles::Declination(0),
+		       an_altitude, an_azimuth);
+    EXPECT_NEAR(45, an_altitude.value(), 1e-12);
+    EXPECT_NEAR(180, an_azimuth.value(), 1e-12);
+  }
+
+  TEST(Sky, HorizontalArrays) {
+    double ras[] = {0, 6, 12, 18, 23.9};
+    double decs[] = {0, 45, -45, 89, -10};
+    double altitudes[5];
+    double azimuths[5];
+    Angles::horizontal(37.5, 20.25, ras, decs, altitudes, azimuths, 5);
+    for (size_t i = 0; i < 5; ++i) {
+      double altitude(0);
+      double azimuth(0);
+      Angles::horizontal(37.5, 20.25, ras[i], decs[i], altitude, azimuth);
+      EXPECT_DOUBLE_EQ(altitude, altitudes[i]);
+      EXPECT_DOUBLE_EQ(azimuth, azimuths[i]);
+    }
+
+    // observers by targets
+    double latitudes[] = {37.5, -30, 0};
+    double longitudes[] = {-122, 70.5, 180};
+    double grid_altitudes[15];
+    double grid_azimuths[15];
+    Angles::horizontal(latitudes, longitudes, 3, 5.5, ras, decs, 5, grid_altitudes, grid_azimuths);
+    for (size_t i = 0; i < 3; ++i) {
+      for (size_t j = 0; j < 5; ++j) {
+	double altitude(0);
+	double azimuth(0);
+	Angles::horizontal(latitudes[i], 5.5 + longitudes[i]/15, ras[j], decs[j], altitude, azimuth);
+	EXPECT_NEAR(altitude, grid_altitudes[i*5 + j], 1e-10);
+	EXPECT_NEAR(azimuth, grid_azimuths[i*5 + j], 1e-10);
+      }
+    }
+  }
+
+  // ---------------
+  // ----- HTM -----
+  // ---------------
+
+  TEST(HTM, Ids) {
+    EXPECT_EQ(15u, Angles::htmId(3, 45, 0)); // N3
+    EXPECT_EQ(8u, Angles::htmId(3, -45, 0)); // S0
+    uint64_t an_id(Angles::htmId(3, 45, 5));
+    EXPECT_EQ(15u, an_id >> 10);
+    EXPECT_EQ(5, Angles::htmDepth(an_id));
+    EXPECT_EQ(7u, Angles::htmName(an_id).size());
+    EXPECT_EQ("N3", Angles::htmName(15));
+    EXPECT_EQ("S012", Angles::htmName(8*16 + 4 + 2));
+    EXPECT_EQ(an_id, Angles::htmId(3, 45, 12) >> 14); // nested
+    EXPECT_THROW(Angles::htmDepth(7), Angles::RangeError);
+    EXPECT_THROW(Angles::htmDepth(16), Angles::RangeError);
+    EXPECT_THROW(Angles::htmId(25, 0, 5), Angles::RangeError);
+    EXPECT_THROW(Angles::htmId(0, 91, 5), Angles::RangeError);
+    EXPECT_THROW(Angles::htmId(0, 0, Angles::MAX_HTM_DEPTH + 1), Angles::RangeError);
+    double ras[] = {0, 24, 6, 12};
+    double decs[] = {90, -90, 0, 0}; // vertices and edges
+    uint64_t ids[4];
+    Angles::htmIds(ras, decs, ids, 4, 10);
+    for (size_t i = 0; i < 4; ++i)
+      EXPECT_EQ(10, Angles::htmDepth(ids[i]));
+  }
+
+  // a reproducible, roughly uniform sky
+  void randomSky(std::vector<double>& some_ras, std::vector<double>& some_decs, const size_t& a_size) {
+    srand(12345);
+    for (size_t i = 0; i < a_size; ++i) {
+      some_ras.push_back(24.0*rand()/RAND_MAX);
+      some_decs.push_back(asin(2.0*rand()/RAND_MAX - 1)*180/M_PI);
+    }
+  }
+
+  TEST(HTMIndex, Circle) {
+    std::vector<double> ras;
+    std::vector<double> decs;
+    randomSky(ras, decs, 20000);
+    Angles::HTMIndex an_index(8);
+    an_index.insert(&ras[0], &decs[0], 10000);
+    an_index.insert(&ras[10000], &decs[10000], 10000); // bulk again
+    EXPECT_EQ(20000u, an_index.size());
+
+    double centers[][3] = {{12, 30, 5}, {0.1, -10, 3}, {6, 89, 2}, {18, 0, 120}, {3, 3, 0.01}};
+    for (size_t c = 0; c < 5; ++c) {
+      std::vector<size_t> expected;
+      for (size_t i = 0; i < ras.size(); ++i)
+	if (Angles::separation(centers[c][0], centers[c][1], ras[i], decs[i]) <= centers[c][2])
+	  expected.push_back(i);
+      std::vector<size_t> some_positions;
+      EXPECT_EQ(expected.size(), an_index.circle(centers[c][0], centers[c][1], centers[c][2], some_positions));
+      EXPECT_TRUE(expected == some_positions);
+    }
+
+    std::vector<size_t> some_positions;
+    EXPECT_EQ(20000u, an_index.circle(0, 0, 180, some_positions));
+    EXPECT_EQ(0u, an_index.circle(0, 0, -1, some_positions));
+    EXPECT_EQ(0u, an_index.circle(0, std::numeric_limits<double>::quiet_NaN(), 1, some_positions));
+  }
+
+  TEST(HTMIndex, Polygon) {
+    std::vector<double> ras;
+    std::vector<double> decs;
+    randomSky(ras, decs, 20000);
+    Angles::HTMIndex an_index(10);
+    an_index.insert(&ras[0], &decs[0], ras.size());
+
+    // a box from 10h to 12h and 20 to 40 degrees, clockwise
+    double box_ras[] = {10, 10, 12, 12};
+    double box_decs[] = {20, 40, 40, 20};
+    std::vector<size_t> some_positions;
+    size_t n(an_index.polygon(box_ras, box_decs, 4, some_positions));
+    EXPECT_TRUE(n > 100);
+    // great circle edges bulge past 40 between the corners, but not
+    // below 20 or outside the meridians
+    for (size_t i = 0; i < n; ++i) {
+      EXPECT_TRUE(ras[some_positions[i]] >= 10 && ras[some_positions[i]] <= 12);
+      EXPECT_TRUE(decs[some_positions[i]] >= 20);
+    }
+    std::vector<size_t> reversed;
+    double reversed_ras[] = {12, 12, 10, 10};
+    double reversed_decs[] = {20, 40, 40, 20};
+    EXPECT_EQ(n, an_index.polygon(reversed_ras, reversed_decs, 4, reversed));
+    EXPECT_TRUE(reversed == some_positions);
+
+    double bad_ras[] = {10, 11, 12, 11};
+    double bad_decs[] = {20, 30, 20, 21}; // dented
+    EXPECT_THROW(an_index.polygon(bad_ras, bad_decs, 4, some_positions), Angles::Error);
+    EXPECT_THROW(an_index.polygon(bad_ras, bad_decs, 2, some_positions), Angles::Error);
+  }
+
+  TEST(HTMIndex, Errors) {
+    EXPECT_THROW(Angles::HTMIndex(-1), Angles::RangeError);
+    Angles::HTMIndex an_index(4);
+    double ras[] = {1, 25};
+    double decs[] = {0, 0};
+    EXPECT_THROW(an_index.insert(ras, decs, 2), Angles::RangeError);
+    EXPECT_TRUE(an_index.empty());
+    an_index.insert(Angles::RA(1), Angles::Declination(0));
+    EXPECT_EQ(1u, an_index.size());
+    an_index.clear();
+    EXPECT_TRUE(an_index.empty());
+  }
+
+  // ---------------------
+  // ----- ZoneIndex -----
+  // ---------------------
+
+  TEST(ZoneIndex, Cone) {
+    std::vector<double> ras;
+    std::vector<double> decs;
+    randomSky(ras, decs, 20000);
+    Angles::ZoneIndex an_index(2);
+    an_index.insert(&ras[0], &decs[0], 10000);
+    an_index.insert(&ras[10000], &decs[10000], 10000);
+    EXPECT_EQ(20000u, an_index.size());
+    EXPECT_EQ(90u, an_index.zones());
+
+    // across 0h, at and near the poles, big and small
+    double centers[][3] = {{12, 30, 5}, {23.9, -10, 3}, {0.1, 45, 4}, {6, 89, 2}, {18, -90, 5},
+			   {18, 0, 120}, {3, 3, 0.01}, {12, 80, 15}};
+    for (size_t c = 0; c < 8; ++c) {
+      std::vector<size_t> expected;
+      for (size_t i = 0; i < ras.size(); ++i)
+	if (Angles::separation(centers[c][0], centers[c][1], ras[i], decs[i]) <= centers[c][2])
+	  expected.push_back(i);
+      std::vector<size_t> some_positions;
+      EXPECT_EQ(expected.size(), an_index.cone(centers[c][0], centers[c][1], centers[c][2], some_positions));
+      EXPECT_TRUE(expected == some_positions);
+    }
+
+    std::vector<size_t> some_positions;
+    EXPECT_EQ(20000u, an_index.cone(0, 0, 180, some_positions));
+    EXPECT_EQ(0u, an_index.cone(0, 0, -1, some_positions));
+    EXPECT_EQ(0u, an_index.cone(0, std::numeric_limits<double>::quiet_NaN(), 1, some_positions));
+  }
+
+  TEST(ZoneIndex, Chunks) {
+    std::vector<double> ras;
+    std::vector<double> decs;
+    randomSky(ras, decs, 20000);
+    Angles::ZoneIndex an_index;
+    an_index.insert(&ras[0], &decs[0], ras.size());
+
+    std::vector<size_t> expected;
+    an_index.cone(0, 20, 10, expected);
+
+    Angles::ConeSearch a_search(an_index.cone(0, 20, 10));
+    std::vector<size_t> some_positions;
+    size_t a_chunk[7];
+    for (size_t n = a_search.next(a_chunk, 7); n > 0; n = a_search.next(a_chunk, 7)) {
+      EXPECT_TRUE(n == 7 || a_search.done());
+      some_positions.insert(some_positions.end(), a_chunk, a_chunk + n);
+    }
+    EXPECT_TRUE(a_search.done());
+    EXPECT_EQ(0u, a_search.next(a_chunk, 7));
+    std::sort(some_positions.begin(), some_positions.end());
+    EXPECT_TRUE(expected == some_positions);
+
+    Angles::ConeSearch a_stale(an_index.cone(0, 20, 10));
+    an_index.insert(&ras[0], &decs[0], 1);
+    EXPECT_THROW(a_stale.next(a_chunk, 7), Angles::Error);
+  }
+
+  TEST(ZoneIndex, Errors) {
+    EXPECT_THROW(Angles::ZoneIndex(0), Angles::RangeError);
+    EXPECT_THROW(Angles::ZoneIndex(181), Angles::RangeError);
+    EXPECT_THROW(Angles::ZoneIndex(std::numeric_limits<double>::quiet_NaN()), Angles::RangeError);
+    Angles::ZoneIndex an_index(0.7); // zones need not divide 180
+    double ras[] = {1, 2, 3};
+    double decs[] = {90, -90, 91};
+    EXPECT_THROW(an_index.insert(ras, decs, 3), Angles::RangeError);
+    EXPECT_TRUE(an_index.empty());
+    an_index.insert(ras, decs, 2);
+    std::vector<size_t> some_positions;
+    EXPECT_EQ(1u, an_index.cone(13, 89.5, 0.6, some_positions));
+    EXPECT_EQ(1u, an_index.cone(0, -90, 0, some_positions));
+    an_index.clear();
+    EXPECT_TRUE(an_index.empty());
+    EXPECT_TRUE(an_index.cone(0, 0, 180).done());
+  }
+
+  // ----------------------
+  // ----- FixedAngle -----
+  // ----------------------
+
+  TEST(FixedAngle, Construct) {
+    Angles::MilliarcsecondAngle a(45.5);
+    EXPECT_EQ(45.5*3600000, a.count());
+    EXPECT_EQ(45.5, a.value());
+    EXPECT_EQ(4u, sizeof(a));
+    EXPECT_EQ(8u, sizeof(Angles::MicroarcsecondAngle));
+    Angles::MilliarcsecondAngle b(1.0/7200000); // half a count rounds up
+    EXPECT_EQ(1, b.count());
+    EXPECT_EQ(-3, Angles::MilliarcsecondAngle::fromCount(-3).count());
+  }
+
+  TEST(FixedAngle, ConstructRangeError) {
+    EXPECT_THROW(Angles::MilliarcsecondAngle(600), Angles::RangeError);
+    EXPECT_THROW(Angles::MilliarcsecondAngle(-600), Angles::RangeError);
+    EXPECT_THROW(Angles::MilliarcsecondAngle(std::numeric_limits<double>::quiet_NaN()),
+		 Angles::RangeError);
+    EXPECT_NO_THROW(Angles::MicroarcsecondAngle(1e9));
+  }
+
+  TEST(FixedAngle, Conversions) {
+    Angles::Declination d(-45.25);
+    Angles::MilliarcsecondAngle a(d);
+    EXPECT_EQ(-45.25, a.to<Angles::Declination>().value());
+    EXPECT_EQ(-45.25, a.to<Angles::Angle>().value());
+    Angles::MilliarcsecondAngle b(Angles::Angle(120));
+    EXPECT_THROW(b.to<Angles::Declination>(), Angles::RangeError);
+    Angles::MicroarcsecondAngle c(Angles::RA(23.5));
+    EXPECT_EQ(23.5, c.to<Angles::RA>().value());
+  }
+
+  TEST(FixedAngle, ExactArithmetic) {
+    Angles::MilliarcsecondAngle a(0.1);
+    Angles::MilliarcsecondAngle b(0.2);
+    EXPECT_EQ(Angles::MilliarcsecondAngle(0.3), a + b); // not with doubles
+    EXPECT_EQ(a, a + b - b);
+    EXPECT_EQ(-0.1, (-a).value());
+    EXPECT_EQ(Angles::MilliarcsecondAngle(0.3), a*3);
+    EXPECT_EQ(Angles::MilliarcsecondAngle(0.3), 3*a);
+    a += b;
+    a -= Angles::MilliarcsecondAngle(0.3);
+    EXPECT_EQ(0, a.count());
+  }
+
+  TEST(FixedAngle, Overflow) {
+    Angles::MilliarcsecondAngle a(Angles::MilliarcsecondAngle::fromCount(std::numeric_limits<int32_t>::max()));
+    Angles::MilliarcsecondAngle b(Angles::MilliarcsecondAngle::fromCount(std::numeric_limits<int32_t>::min()));
+    Angles::MilliarcsecondAngle one(Angles::MilliarcsecondAngle::fromCount(1));
+    EXPECT_THROW(a + one, Angles::RangeError);
+    EXPECT_THROW(b - one, Angles::RangeError);
+    EXPECT_THROW(-b, Angles::RangeError);
+    EXPECT_THROW(a*2, Angles::RangeError);
+    EXPECT_THROW(b*-1, Angles::RangeError);
+    EXPECT_EQ(b, one*b.count()); // in range
+  }
+
+  TEST(FixedAngle, Compare) {
+    Angles::MicroarcsecondAngle a(10);
+    Angles::MicroarcsecondAngle b(10 + 1e-6);
+    EXPECT_TRUE(a < b);
+    EXPECT_TRUE(a <= b);
+    EXPECT_TRUE(b > a);
+    EXPECT_TRUE(a != b);
+    EXPECT_TRUE(a == Angles::MicroarcsecondAngle(Angles::Angle(10)));
+    EXPECT_EQ(a.hash(), Angles::MicroarcsecondAngle(10).hash());
+    EXPECT_NE(a.hash(), b.hash());
+  }
+
+  TEST(FixedAngle, Normalize) {
+    Angles::MilliarcsecondAngle a(-90.001);
+    a.normalize(Angles::WRAP_0_360);
+    EXPECT_EQ(Angles::MilliarcsecondAngle(269.999), a);
+    a.normalize(Angles::WRAP_180);
+    EXPECT_EQ(Angles::MilliarcsecondAngle(-90.001), a);
+    Angles::MilliarcsecondAngle b(180);
+    b.normalize(Angles::WRAP_180);
+    EXPECT_EQ(180, b.value());
+    Angles::MicroarcsecondAngle c(Angles::RA(23));
+    c += Angles::MicroarcsecondAngle(2);
+    c.normalize(Angles::WRAP_0_24);
+    EXPECT_EQ(1, c.value());
+  }
+
+  TEST(FixedAngle, Batch) {
+    double v1[] = {-45.5, 0.1, 23.999};
+    int32_t counts[3];
+    Angles::toCounts(v1, counts, 3);
+    EXPECT_EQ(-45.5*3600000, counts[0]);
+    double v2[3];
+    Angles::fromCounts(counts, v2, 3);
+    for (size_t i = 0; i < 3; ++i)
+      EXPECT_EQ(Angles::MilliarcsecondAngle(v1[i]).value(), v2[i]);
+    double v3[] = {1, 1000};
+    EXPECT_THROW(Angles::toCounts(v3, counts, 2), Angles::RangeError);
+    EXPECT_EQ(-45.5*3600000, counts[0]); // unchanged
+  }
+
+  TEST(FixedAngle, Stream) {
+    std::stringstream out;
+    out << Angles::MilliarcsecondAngle(-1.25);
+    EXPECT_EQ("-1* 15' 0\"", out.str());
+
+    // os precision is honored, like Angle
+    std::stringstream precise;
+    precise << std::setprecision(9) << Angles::MicroarcsecondAngle(1 + 12.345678/3600);
+    EXPECT_EQ("1* 0' 12.345678\"", precise.str());
+  }
+
+
+
   // -----------------
   // ----- Utils -----
   // -----------------
@@ -776,6 +1807,114 @@ namespace {
 
 
 
+  // ------------------
+  // ----- Parser -----
+  // ------------------
+
+  TEST(Parser, Decimal) {
+    EXPECT_EQ(-45.504167, Angles::parseAngle("-45.504167"));
+    EXPECT_EQ(0.1, Angles::parseAngle("0.1"));
+    EXPECT_EQ(0.5, Angles::parseAngle(".5"));
+    EXPECT_EQ(12, Angles::parseAngle(" +12. "));
+    EXPECT_EQ(1.5e-3, Angles::parseAngle("1.5e-3"));
+  }
+
+  TEST(Parser, DecimalMatchesStrtod) {
+    const char* v1[] = {"123.456789012345", "1.7976931348623157e308", "2.2250738585072014e-308",
+			"0.1234567890123456789012", "12345678901234567890123", "9007199254740993"};
+    for (size_t i = 0; i < sizeof(v1)/sizeof(char*); ++i)
+      EXPECT_EQ(strtod(v1[i], NULL), Angles::parseAngle(v1[i])) << v1[i];
+  }
+
+  TEST(Parser, Colons) {
+    EXPECT_DOUBLE_EQ(12 + 30/60.0 + 45.6/3600, Angles::parseAngle("12:30:45.6"));
+    EXPECT_DOUBLE_EQ(12.5, Angles::parseAngle("12:30"));
+  }
+
+  TEST(Parser, HMS) {
+    EXPECT_DOUBLE_EQ(12 + 30/60.0 + 45.6/3600, Angles::parseAngle("12h30m45.6s"));
+    EXPECT_DOUBLE_EQ(12, Angles::parseAngle("12h"));
+  }
+
+  TEST(Parser, DegreeSign) {
+    EXPECT_DOUBLE_EQ(45 + 30/60.0 + 15/3600.0, Angles::parseAngle("+45\xc2\xb0" "30'15\""));
+    EXPECT_DOUBLE_EQ(-(45 + 30/60.0 + 15/3600.0), Angles::parseAngle("-45* 30' 15\""));
+    EXPECT_DOUBLE_EQ(45 + 30/60.0 + 15/3600.0, Angles::parseAngle("45 30 15"));
+  }
+
+  TEST(Parser, MatchesOutput) {
+    Angles::Angle a(-53, 42, 23.6);
+    std::stringstream out;
+    out.precision(17);
+    out << a;
+    EXPECT_DOUBLE_EQ(a.value(), Angles::parseAngle(out.str()));
+  }
+
+  TEST(Parser, Sign) {
+    EXPECT_EQ(-0.5, Angles::parseAngle("-0:30"));
+    EXPECT_THROW(Angles::parseAngle("10:-30"), Angles::ParseError);
+  }
+
+  TEST(Parser, Errors) {
+    const char* v1[] = {"", " ", "abc", "12:", "12:30:45:10", "12x", "1.2.3", "12h30m45s6", "+", "--1"};
+    for (size_t i = 0; i < sizeof(v1)/sizeof(char*); ++i)
+      EXPECT_THROW(Angles::parseAngle(v1[i]), Angles::ParseError) << v1[i];
+  }
+
+  TEST(Parser, NoThrow) {
+    double a_value(42);
+    EXPECT_FALSE(Angles::parseAngle("bad", "bad" + 3, &a_value));
+    EXPECT_EQ(42, a_value);
+  }
+
+  TEST(Parser, Bulk) {
+    const char v1[] = "12:30:00\n-45.5\r\nbad\n\n1h\n";
+    size_t count(Angles::countFields(v1, strlen(v1)));
+    ASSERT_EQ(5u, count);
+    std::vector<double> values(count);
+    std::vector<unsigned char> errors(count);
+    EXPECT_EQ(2u, Angles::parseAngles(v1, strlen(v1), &values[0], &errors[0]));
+    EXPECT_EQ(12.5, values[0]);
+    EXPECT_EQ(-45.5, values[1]);
+    EXPECT_TRUE(std::isnan(values[2]));
+    EXPECT_TRUE(std::isnan(values[3]));
+    EXPECT_EQ(1, values[4]);
+    unsigned char expected[] = {0, 0, 1, 1, 0};
+    for (size_t i = 0; i < count; ++i)
+      EXPECT_EQ(expected[i], errors[i]);
+  }
+
+  TEST(Parser, BulkDelimiter) {
+    const char v1[] = "1,2:30, 3 ";
+    size_t count(Angles::countFields(v1, strlen(v1), ','));
+    ASSERT_EQ(3u, count);
+    double values[3];
+    EXPECT_EQ(0u, Angles::parseAngles(v1, strlen(v1), values, NULL, ','));
+    EXPECT_EQ(1, values[0]);
+    EXPECT_EQ(2.5, values[1]);
+    EXPECT_EQ(3, values[2]);
+  }
+
+  TEST(Angle, ConstructorFromSexagesimalString) {
+    Angles::Angle a("-44:59:60");
+    EXPECT_DOUBLE_EQ(-45, a.value());
+  }
+
+  TEST(Angle, ConstructorFromStringError) {
+    EXPECT_THROW(Angles::Angle("forty five"), Angles::ParseError);
+  }
+
+  TEST(RA, ConstructorFromHMSString) {
+    Angles::RA a("16h30m15s");
+    EXPECT_DOUBLE_EQ(16 + 30/60.0 + 15/3600.0, a.value());
+  }
+
+  TEST(Declination, ConstructorFromStringError) {
+    EXPECT_THROW(Angles::Declination("45", "thirty"), Angles::ParseError);
+    EXPECT_THROW(Angles::Declination("+95\xc2\xb0"), Angles::RangeError);
+  }
+
+
   // opeartor<<()
 
   TEST(LimitedRangeAngle, operatorStdOut) {
@@ -813,6 +1952,525 @@ namespace {
     EXPECT_STREQ("16:30:15", out.str().c_str());
   }
 
+  TEST(Latitude, operatorStdOutPrecision) {
+    Angles::Latitude a(-53, 42, 23.6);
+    std::stringstream out;
+    out.precision(3);
+    out << a;
+    EXPECT_STREQ("-53* 42' 23.6\"", out.str().c_str());
+  }
+
+  // char buffer formatters
+
+  TEST(Utils, value2DMSString) {
+    char buffer[Angles::MAX_SEXAGESIMAL_STRING];
+    size_t length(Angles::value2DMSString(Angles::Angle(44, 32, 15.4).value(), buffer, sizeof(buffer)));
+    EXPECT_STREQ("44* 32' 15.4\"", buffer);
+    EXPECT_EQ(strlen(buffer), length);
+  }
+
+  TEST(Utils, value2DMSStringPrecision) {
+    char buffer[Angles::MAX_SEXAGESIMAL_STRING];
+    Angles::value2DMSString(Angles::Angle(0, 0, 15.123456789).value(), buffer, sizeof(buffer), 10);
+    EXPECT_STREQ("0* 0' 15.12345679\"", buffer);
+  }
+
+  TEST(Utils, value2DMSStringMatchesStream) {
+    double v1[] = {0, -0.5, 1e9, -720.25, 359.9999999};
+    for (size_t i = 0; i < sizeof(v1)/sizeof(double); ++i) {
+      std::stringstream out;
+      out << Angles::Angle(v1[i]);
+      char buffer[Angles::MAX_SEXAGESIMAL_STRING];
+      Angles::value2DMSString(v1[i], buffer, sizeof(buffer));
+      EXPECT_STREQ(out.str().c_str(), buffer);
+    }
+  }
+
+  TEST(Utils, value2DMSStringTruncated) {
+    char buffer[8];
+    size_t length(Angles::value2DMSString(-53.5, buffer, sizeof(buffer)));
+    EXPECT_EQ(strlen("-53* 30' 0\""), length);
+    EXPECT_STREQ("-53* 30", buffer);
+  }
+
+  TEST(Utils, value2HMSString) {
+    char buffer[Angles::MAX_SEXAGESIMAL_STRING];
+    Angles::value2HMSString(Angles::RA(16, 30, 15).value(), buffer, sizeof(buffer));
+    EXPECT_STREQ("16:30:15", buffer);
+  }
+
+  TEST(Utils, values2DMSString) {
+    double v1[] = {44.5, -1.25, 0};
+    char buffer[3 * Angles::MAX_SEXAGESIMAL_STRING];
+    size_t length(Angles::values2DMSString(v1, 3, buffer, sizeof(buffer)));
+    EXPECT_STREQ("44* 30' 0\"\n-1* 15' 0\"\n0* 0' 0\"\n", buffer);
+    EXPECT_EQ(strlen(buffer), length);
+  }
+
+  TEST(Utils, values2HMSStringDelimiter) {
+    double v1[] = {16.5, 23.75};
+    char buffer[2 * Angles::MAX_SEXAGESIMAL_STRING];
+    Angles::values2HMSString(v1, 2, buffer, sizeof(buffer), 6, ',');
+    EXPECT_STREQ("16:30:0,23:45:0,", buffer);
+  }
+
+  TEST(Utils, values2DMSStringTruncated) {
+    double v1[] = {44.5, -1.25};
+    char buffer[12];
+    size_t length(Angles::values2DMSString(v1, 2, buffer, sizeof(buffer)));
+    EXPECT_EQ(strlen("44* 30' 0\"\n-1* 15' 0\"\n"), length);
+    EXPECT_STREQ("44* 30' 0\"\n", buffer);
+  }
+
+  // ---------------------------
+  // ----- CatalogueReader -----
+  // ---------------------------
+
+  // writes a_text to a new temporary file and returns its path
+  std::string temporaryFile(const std::string& a_text) {
+    char a_path[] = "/tmp/angles_catalogue_XXXXXX";
+    int a_descriptor(mkstemp(a_path));
+    EXPECT_TRUE(a_descriptor >= 0);
+    EXPECT_EQ(static_cast<ssize_t>(a_text.size()), write(a_descriptor, a_text.data(), a_text.size()));
+    close(a_descriptor);
+    return a_path;
+  }
+
+  TEST(CatalogueReader, Chunks) {
+    std::string a_path(temporaryFile("name,ra,dec\n"
+				     "a,12:30:00,-45.5\r\n"
+				     "# a comment\n"
+				     "b,1h2m3s,10 30 0\n"
+				     "\n"
+				     "c,23.5,89\n"
+				     "d,0,0")); // no final newline
+    Angles::CatalogueReader a_reader(a_path, ',', 3, 1);
+    a_reader.addColumn<Angles::Declination>(2); // any order
+    a_reader.addColumn<Angles::RA>(1);
+    EXPECT_EQ(2u, a_reader.columns());
+
+    EXPECT_EQ(3u, a_reader.next());
+    EXPECT_TRUE(a_reader.errors().empty());
+    EXPECT_EQ(-45.5, a_reader.values(0)[0]);
+    EXPECT_EQ(12.5, a_reader.values(1)[0]);
+    EXPECT_EQ(10.5, a_reader.values(0)[1]);
+    EXPECT_DOUBLE_EQ(1 + 2/60.0 + 3/3600.0, a_reader.values(1)[1]);
+    EXPECT_EQ(23.5, a_reader.values(1)[2]);
+    EXPECT_THROW(a_reader.addColumn(0), Angles::Error);
+
+    EXPECT_EQ(1u, a_reader.next());
+    EXPECT_EQ(0, a_reader.values(1)[0]);
+    EXPECT_TRUE(a_reader.done());
+    EXPECT_EQ(0u, a_reader.next());
+    EXPECT_EQ(7u, a_reader.line());
+    remove(a_path.c_str());
+  }
+
+  TEST(CatalogueReader, BadRows) {
+    std::string a_text("1\t2\t3\n"
+		       "25\tx\t3\n"
+		       "1\t91\n"
+		       "-1\t-91\t400\n");
+    std::string a_path(temporaryFile(a_text));
+    Angles::CatalogueReader a_reader(a_path, '\t');
+    a_reader.addColumn<Angles::RA>(0);
+    a_reader.addColumn<Angles::Declination>(1);
+    a_reader.addColumn(2);
+    EXPECT_EQ(4u, a_reader.next());
+
+    const std::vector<Angles::CatalogueError>& some_errors(a_reader.errors());
+    ASSERT_EQ(6u, some_errors.size());
+    EXPECT_EQ(1u, some_errors[0].m_row);
+    EXPECT_EQ(0u, some_errors[0].m_column);
+    EXPECT_STREQ("maximum exceeded", some_errors[0].m_reason);
+    EXPECT_EQ(2u, some_errors[0].m_line);
+    EXPECT_EQ(a_text.find("25"), some_errors[0].m_offset);
+    EXPECT_STREQ("invalid angle", some_errors[1].m_reason);
+    EXPECT_STREQ("maximum exceeded", some_errors[2].m_reason);
+    EXPECT_STREQ("missing field", some_errors[3].m_reason);
+    EXPECT_EQ(2u, some_errors[3].m_column);
+    EXPECT_STREQ("minimum exceeded", some_errors[4].m_reason);
+    EXPECT_STREQ("minimum exceeded", some_errors[5].m_reason);
+    EXPECT_EQ(a_text.find("-1"), some_errors[5].m_offset);
+    EXPECT_TRUE(std::isnan(a_reader.values(0)[1]));
+    EXPECT_TRUE(std::isnan(a_reader.values(1)[2]));
+    EXPECT_EQ(400, a_reader.values(2)[3]); // not range checked
+    EXPECT_EQ(1, a_reader.values(0)[2]);
+    remove(a_path.c_str());
+  }
+
+  TEST(CatalogueReader, LongLines) {
+    std::string a_text;
+    for (size_t i = 0; i < 3; ++i)
+      a_text += std::string(700000, ' ') + "1.5,2.5\n"; // blocks split lines
+    std::string a_path(temporaryFile(a_text));
+    Angles::CatalogueReader a_reader(a_path);
+    a_reader.addColumn(1);
+    EXPECT_EQ(3u, a_reader.next());
+    EXPECT_EQ(2.5, a_reader.values(0)[2]);
+    EXPECT_TRUE(a_reader.errors().empty());
+    remove(a_path.c_str());
+  }
+
+  TEST(CatalogueReader, Errors) {
+    EXPECT_THROW(Angles::CatalogueReader("/no/such/catalogue"), Angles::Error);
+    std::string a_path(temporaryFile("1\n"));
+    EXPECT_THROW(Angles::CatalogueReader(a_path, ',', 0), Angles::RangeError);
+    Angles::CatalogueReader a_reader(a_path);
+    EXPECT_THROW(a_reader.next(), Angles::Error); // no columns
+    a_reader.addColumn(0);
+    EXPECT_THROW(a_reader.addColumn(0), Angles::Error);
+    remove(a_path.c_str());
+  }
+
+  // ---------------------------
+  // ----- BinaryCatalogue -----
+  // ---------------------------
+
+  TEST(BinaryCatalogue, WriteAndMap) {
+    double ras[] = {0, 12.5, 23.999, std::numeric_limits<double>::quiet_NaN()};
+    double decs[] = {-90, 0, 45.25, 90};
+    std::vector<Angles::CatalogueColumn> some_columns(2);
+    some_columns[0].m_name = "ra";
+    some_columns[0].m_type = Angles::CATALOGUE_RA;
+    some_columns[0].m_values = ras;
+    some_columns[1].m_name = "dec";
+    some_columns[1].m_type = Angles::CATALOGUE_DECLINATION;
+    some_columns[1].m_values = decs;
+
+    std::string a_path(temporaryFile(""));
+    Angles::writeBinaryCatalogue(a_path, some_columns, 4);
+
+    Angles::BinaryCatalogue a_catalogue(a_path);
+    EXPECT_EQ(4u, a_catalogue.rows());
+    ASSERT_EQ(2u, a_catalogue.columns());
+    EXPECT_EQ("ra", a_catalogue.name(0));
+    EXPECT_EQ(Angles::CATALOGUE_RA, a_catalogue.type(0));
+    EXPECT_TRUE(a_catalogue.hours(0));
+    EXPECT_FALSE(a_catalogue.hours(1));
+    EXPECT_EQ(1u, a_catalogue.column("dec"));
+    EXPECT_THROW(a_catalogue.column("x"), Angles::Error);
+    for (size_t i = 0; i < 3; ++i)
+      EXPECT_EQ(ras[i], a_catalogue.values(0)[i]);
+    EXPECT_TRUE(std::isnan(a_catalogue.values(0)[3]));
+    EXPECT_EQ(0u, reinterpret_cast<size_t>(a_catalogue.values(1)) % 64); // aligned
+    EXPECT_EQ(45.25, a_catalogue.values(1)[2]);
+
+    // replacing the file leaves the open mapping as it was
+    decs[2] = 0;
+    Angles::writeBinaryCatalogue(a_path, some_columns, 4);
+    EXPECT_EQ(45.25, a_catalogue.values(1)[2]);
+    EXPECT_EQ(0, Angles::BinaryCatalogue(a_path).values(1)[2]);
+    remove(a_path.c_str());
+  }
+
+  TEST(BinaryCatalogue, Errors) {
+    double values[] = {1, 91};
+    std::vector<Angles::CatalogueColumn> some_columns(1);
+    some_columns[0].m_name = "dec";
+    some_columns[0].m_type = Angles::CATALOGUE_LATITUDE;
+    some_columns[0].m_values = values;
+    std::string a_path(temporaryFile("not a catalogue, but long enough for a header"));
+    EXPECT_THROW(Angles::writeBinaryCatalogue(a_path, some_columns, 2), Angles::RangeError);
+    EXPECT_THROW(Angles::BinaryCatalogue a_catalogue(a_path), Angles::Error);
+    some_columns[0].m_type = Angles::CATALOGUE_ANGLE;
+    some_columns.push_back(some_columns[0]);
+    EXPECT_THROW(Angles::writeBinaryCatalogue(a_path, some_columns, 2), Angles::Error); // repeated
+    some_columns[1].m_name = std::string(32, 'x');
+    EXPECT_THROW(Angles::writeBinaryCatalogue(a_path, some_columns, 2), Angles::Error); // too long
+    EXPECT_THROW(Angles::BinaryCatalogue("/no/such/catalogue"), Angles::Error);
+
+    // truncated
+    some_columns.pop_back();
+    Angles::writeBinaryCatalogue(a_path, some_columns, 2);
+    EXPECT_EQ(0, truncate(a_path.c_str(), 100));
+    EXPECT_THROW(Angles::BinaryCatalogue a_catalogue(a_path), Angles::Error);
+    remove(a_path.c_str());
+  }
+
+  // --------------------
+  // ----- Parallel -----
+  // --------------------
+
+  // counts the times each element is visited
+  struct CountVisits {
+    std::vector<int>    m_visits;
+    std::vector<size_t> m_begins;
+    void operator()(const size_t& a_part, const size_t& a_begin, const size_t& an_end) {
+      m_begins[a_part] = a_begin;
+      for (size_t i = a_begin; i < an_end; ++i)
+	++m_visits[i];
+    }
+  };
+
+  // runs a nested parallelFor in each part
+  struct Nested {
+    std::vector<int> m_visits;
+    void operator()(const size_t&, const size_t& a_begin, const size_t& an_end) {
+      CountVisits an_inner;
+      an_inner.m_visits.resize(an_end - a_begin);
+      an_inner.m_begins.resize(Angles::parallelParts(an_end - a_begin));
+      Angles::parallelFor(an_end - a_begin, an_inner.m_begins.size(), an_inner);
+      for (size_t i = a_begin; i < an_end; ++i)
+	m_visits[i] = an_inner.m_visits[i - a_begin];
+    }
+  };
+
+  TEST(Parallel, Settings) {
+    EXPECT_LE(1u, Angles::threads());
+    Angles::setThreads(3);
+    EXPECT_EQ(3u, Angles::threads());
+    Angles::setParallelThreshold(100);
+    EXPECT_EQ(100u, Angles::parallelThreshold());
+    EXPECT_EQ(1u, Angles::parallelParts(99));
+    EXPECT_EQ(3u, Angles::parallelParts(100));
+    Angles::setThreads(1);
+    EXPECT_EQ(1u, Angles::parallelParts(1000000));
+    Angles::setThreads(0);
+    EXPECT_EQ(static_cast<size_t>(sysconf(_SC_NPROCESSORS_ONLN)), Angles::threads());
+    Angles::setParallelThreshold(32768);
+  }
+
+  TEST(Parallel, Parts) {
+    const size_t some_sizes[] = {0, 1, 7, 8, 9, 63, 1000, 4097};
+    for (size_t k = 0; k < sizeof(some_sizes)/sizeof(size_t); ++k) {
+      for (size_t a_parts = 1; a_parts < 6; ++a_parts) {
+	CountVisits a_counter;
+	a_counter.m_visits.resize(some_sizes[k]);
+	a_counter.m_begins.resize(a_parts, 1);
+	Angles::parallelFor(some_sizes[k], a_parts, a_counter);
+	EXPECT_EQ(some_sizes[k], static_cast<size_t>(std::count(a_counter.m_visits.begin(),
+								    a_counter.m_visits.end(), 1)));
+	for (size_t i = 0; i < a_parts; ++i)
+	  EXPECT_EQ(0u, a_counter.m_begins[i] % 8); // cache lines
+      }
+    }
+  }
+
+  TEST(Parallel, Nested) {
+    Angles::setThreads(4);
+    Angles::setParallelThreshold(16);
+    Nested a_nested;
+    a_nested.m_visits.resize(1000);
+    Angles::parallelFor(a_nested.m_visits.size(), a_nested);
+    EXPECT_EQ(1000, std::count(a_nested.m_visits.begin(), a_nested.m_visits.end(), 1));
+    Angles::setThreads(0);
+    Angles::setParallelThreshold(32768);
+  }
+
+  TEST(Parallel, Kernels) {
+
+    // the same results split across threads as in one
+    const size_t a_size(10007);
+    std::vector<double> some_values(a_size);
+    std::vector<double> some_decs(a_size);
+    for (size_t i = 0; i < a_size; ++i) {
+      some_values[i] = (i*7919 % 4801)*0.15 - 360;
+      some_decs[i] = (i*104729 % 1801)*0.1 - 90;
+    }
+
+    std::vector<double> serial(a_size);
+    std::vector<double> parallel(a_size);
+    std::vector<double> serial2(a_size);
+    std::vector<double> parallel2(a_size);
+    std::vector<unsigned char> serial_statuses(a_size);
+    std::vector<unsigned char> parallel_statuses(a_size);
+
+    Angles::setThreads(1);
+    Angles::normalize(&some_values[0], &serial[0], a_size, Angles::WRAP_180);
+    Angles::multiply(&some_values[0], 0.5, &serial2[0], a_size);
+    size_t serial_invalid(Angles::rangeStatus(&some_values[0], a_size, -90, 90, &serial_statuses[0]));
+
+    Angles::setThreads(4);
+    Angles::setParallelThreshold(64);
+    Angles::normalize(&some_values[0], &parallel[0], a_size, Angles::WRAP_180);
+    Angles::multiply(&some_values[0], 0.5, &parallel2[0], a_size);
+    EXPECT_EQ(serial_invalid, Angles::rangeStatus(&some_values[0], a_size, -90, 90, &parallel_statuses[0]));
+    EXPECT_TRUE(serial == parallel);
+    EXPECT_TRUE(serial2 == parallel2);
+    EXPECT_TRUE(serial_statuses == parallel_statuses);
+
+    // a bad value in any part raises, out unchanged
+    std::vector<double> some_divisors(a_size, 2);
+    some_divisors[a_size - 1] = 0;
+    EXPECT_THROW(Angles::divide(&some_values[0], &some_divisors[0], &parallel[0], a_size),
+		 Angles::DivideByZeroError);
+    EXPECT_TRUE(serial == parallel);
+    EXPECT_THROW(Angles::validRange(&some_decs[0], a_size, -89, 90), Angles::RangeError);
+    EXPECT_TRUE(Angles::isValidRange(&some_decs[0], a_size, -90, 90));
+    EXPECT_EQ(Angles::MAXIMUM_EXCEEDED,
+	      Angles::applyPolicy(&some_decs[0], &parallel[0], a_size, -90, 89, Angles::POLICY_RAISE));
+
+    // sky
+    std::vector<double> some_ras(a_size);
+    for (size_t i = 0; i < a_size; ++i)
+      some_ras[i] = (i*31 % 2400)*0.01;
+    Angles::separation(12, 45, &some_ras[0], &some_decs[0], &parallel[0], a_size);
+    Angles::horizontal(37.5, 4, &some_ras[0], &some_decs[0], &parallel2[0], &serial2[0], a_size);
+    for (size_t i = 0; i < a_size; i += 101) {
+      EXPECT_NEAR(Angles::separation(12, 45, some_ras[i], some_decs[i]), parallel[i], 1e-12);
+      double an_altitude(0);
+      double an_azimuth(0);
+      Angles::horizontal(37.5, 4, some_ras[i], some_decs[i], an_altitude, an_azimuth);
+      EXPECT_NEAR(an_altitude, parallel2[i], 1e-9);
+      EXPECT_NEAR(an_azimuth, serial2[i], 1e-9);
+    }
+
+    // a grid split part way through a row
+    double some_latitudes[] = {-30, 0, 51.5};
+    double some_longitudes[] = {-70, 10, 0};
+    std::vector<double> some_altitudes(3*1000);
+    std::vector<double> some_azimuths(3*1000);
+    Angles::horizontal(some_latitudes, some_longitudes, 3, 6, &some_ras[0], &some_decs[0], 1000,
+		       &some_altitudes[0], &some_azimuths[0]);
+    for (size_t i = 0; i < 3; ++i) {
+      for (size_t j = 0; j < 1000; j += 37) {
+	double an_altitude(0);
+	double an_azimuth(0);
+	Angles::horizontal(some_latitudes[i], 6 + some_longitudes[i]/15, some_ras[j], some_decs[j],
+			   an_altitude, an_azimuth);
+	EXPECT_NEAR(an_altitude, some_altitudes[i*1000 + j], 1e-9);
+	EXPECT_NEAR(an_azimuth, some_azimuths[i*1000 + j], 1e-9);
+      }
+    }
+
+    std::vector<uint64_t> some_ids(a_size);
+    Angles::htmIds(&some_ras[0], &some_decs[0], &some_ids[0], a_size, 10);
+    for (size_t i = 0; i < a_size; i += 101)
+      EXPECT_EQ(Angles::htmId(some_ras[i], some_decs[i], 10), some_ids[i]);
+
+    Angles::setThreads(0);
+    Angles::setParallelThreshold(32768);
+  }
+
+  // ----------------------------
+  // ----- SharedAngleArray -----
+  // ----------------------------
+
+  TEST(SharedAngleArray, CreateAndAttach) {
+    double decs[] = {-90, 0, 45.25, 90};
+    const std::string a_name(Angles::SharedAngleArray::uniqueName());
+
+    Angles::SharedAngleArray an_owner(a_name, decs, 4, Angles::CATALOGUE_DECLINATION);
+    EXPECT_EQ(a_name, an_owner.name());
+    EXPECT_TRUE(an_owner.owner());
+    EXPECT_TRUE(an_owner.writable());
+    EXPECT_EQ(0u, reinterpret_cast<size_t>(an_owner.values()) % 64); // aligned
+
+    Angles::SharedAngleArray an_attached(a_name);
+    EXPECT_FALSE(an_attached.owner());
+    EXPECT_FALSE(an_attached.writable());
+    EXPECT_TRUE(an_attached.writableValues() == NULL);
+    EXPECT_EQ(4u, an_attached.size());
+    EXPECT_EQ(Angles::CATALOGUE_DECLINATION, an_attached.type());
+    EXPECT_EQ(45.25, an_attached.values()[2]);
+    EXPECT_TRUE(an_attached.values() != an_owner.values());
+
+    // the same memory, not a copy
+    an_owner.writableValues()[2] = 1.5;
+    EXPECT_EQ(1.5, an_attached.values()[2]);
+
+    // attached arrays keep the memory after the name is removed
+    an_owner.unlink();
+    EXPECT_FALSE(an_owner.owner());
+    EXPECT_THROW(Angles::SharedAngleArray a_late(a_name), Angles::Error);
+    EXPECT_EQ(90, an_attached.values()[3]);
+  }
+
+  TEST(SharedAngleArray, Errors) {
+    double decs[] = {0, 91};
+    const std::string a_name(Angles::SharedAngleArray::uniqueName());
+    EXPECT_THROW(Angles::SharedAngleArray(a_name, decs, 2, Angles::CATALOGUE_LATITUDE), Angles::RangeError);
+    EXPECT_THROW(Angles::SharedAngleArray a_missing(a_name), Angles::Error);
+    Angles::SharedAngleArray an_owner(a_name.substr(1), decs, 2); // adds the '/'
+    EXPECT_EQ(a_name, an_owner.name());
+    EXPECT_THROW(Angles::SharedAngleArray(a_name, decs, 2), Angles::Error); // exists
+    an_owner.unlink();
+    EXPECT_THROW(an_owner.unlink(), Angles::Error);
+  }
+
+  // ------------------------
+  // ----- PackedAngles -----
+  // ------------------------
+
+  TEST(PackedAngles, OneType) {
+    Angles::PackType some_types[] = {Angles::PACK_RA, Angles::PACK_RA, Angles::PACK_RA};
+    Angles::PackedValue some_values[3];
+    some_values[0].m_value = 0;
+    some_values[1].m_value = 12.345678901234567;
+    some_values[2].m_value = std::numeric_limits<double>::quiet_NaN();
+
+    const std::string a_buffer(Angles::packAngles(some_types, some_values, 3));
+    EXPECT_EQ(24 + 3*8u, a_buffer.size()); // no types
+
+    std::vector<Angles::PackType> the_types;
+    std::vector<Angles::PackedValue> the_values;
+    Angles::unpackAngles(a_buffer.data(), a_buffer.size(), the_types, the_values);
+    ASSERT_EQ(3u, the_values.size());
+    EXPECT_EQ(Angles::PACK_RA, the_types[2]);
+    EXPECT_EQ(some_values[1].m_value, the_values[1].m_value); // exact
+    EXPECT_TRUE(the_values[2].m_value != the_values[2].m_value);
+
+    const std::string an_empty(Angles::packAngles(some_types, some_values, 0));
+    Angles::unpackAngles(an_empty.data(), an_empty.size(), the_types, the_values);
+    EXPECT_EQ(0u, the_values.size());
+  }
+
+  TEST(PackedAngles, Mixed) {
+    Angles::PackType some_types[] = {Angles::PACK_ANGLE, Angles::PACK_DECLINATION,
+				     Angles::PACK_MICROARCSECOND_ANGLE};
+    Angles::PackedValue some_values[3];
+    some_values[0].m_value = -720.5;
+    some_values[1].m_value = -89.999;
+    some_values[2].m_count = -1234567890123LL;
+
+    const std::string a_buffer(Angles::packAngles(some_types, some_values, 3));
+    EXPECT_EQ(24 + 8 + 3*8u, a_buffer.size()); // types padded to 8
+
+    std::vector<Angles::PackType> the_types;
+    std::vector<Angles::PackedValue> the_values;
+    Angles::unpackAngles(a_buffer.data(), a_buffer.size(), the_types, the_values);
+    ASSERT_EQ(3u, the_types.size());
+    EXPECT_EQ(Angles::PACK_ANGLE, the_types[0]);
+    EXPECT_EQ(Angles::PACK_DECLINATION, the_types[1]);
+    EXPECT_EQ(Angles::PACK_MICROARCSECOND_ANGLE, the_types[2]);
+    EXPECT_EQ(-720.5, the_values[0].m_value);
+    EXPECT_EQ(-89.999, the_values[1].m_value);
+    EXPECT_EQ(-1234567890123LL, the_values[2].m_count);
+  }
+
+  TEST(PackedAngles, Errors) {
+    Angles::PackType some_types[] = {Angles::PACK_LATITUDE, Angles::PACK_MILLIARCSECOND_ANGLE};
+    Angles::PackedValue some_values[2];
+    some_values[0].m_value = 45;
+    some_values[1].m_count = 1;
+
+    std::vector<Angles::PackType> the_types;
+    std::vector<Angles::PackedValue> the_values;
+
+    const std::string a_buffer(Angles::packAngles(some_types, some_values, 2));
+    EXPECT_THROW(Angles::unpackAngles(a_buffer.data(), a_buffer.size() - 1, the_types, the_values),
+		 Angles::Error);
+    EXPECT_THROW(Angles::unpackAngles(a_buffer.data(), 8, the_types, the_values), Angles::Error);
+    EXPECT_THROW(Angles::unpackAngles("not packed angles at all", 24, the_types, the_values), Angles::Error);
+
+    std::string a_bad_type(a_buffer);
+    a_bad_type[24 + 1] = 42;
+    EXPECT_THROW(Angles::unpackAngles(a_bad_type.data(), a_bad_type.size(), the_types, the_values),
+		 Angles::Error);
+
+    some_values[0].m_value = 91;
+    const std::string a_high(Angles::packAngles(some_types, some_values, 2));
+    EXPECT_THROW(Angles::unpackAngles(a_high.data(), a_high.size(), the_types, the_values), Angles::RangeError);
+
+    some_values[0].m_value = 0;
+    some_values[1].m_count = -5000000000LL; // not an int32_t
+    const std::string a_low(Angles::packAngles(some_types, some_values, 2));
+    EXPECT_THROW(Angles::unpackAngles(a_low.data(), a_low.size(), the_types, the_values), Angles::RangeError);
+
+    some_types[0] = static_cast<Angles::PackType>(9);
+    EXPECT_THROW(Angles::packAngles(some_types, some_values, 2), Angles::Error);
+  }
 
 
 } // end anonymous namespace
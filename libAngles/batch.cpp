@@ -0,0 +1,507 @@
+// ================================================================
+// Filename:    batch.cpp
+// Description: Element-wise kernels over contiguous arrays of angle
+//              values.
+//
+// Author:      L.R. McFarland, lrm@starbug.com
+// Created:     2026 Oct 18
+// Language:    C++
+//
+//  Angles is free software: you can redistribute it and/or modify it
+//  under the terms of the GNU General Public License as published by
+//  the Free Software Foundation, either version 3 of the License, or
+//  (at your option) any later version.
+//
+//  Angles is distributed in the hope that it will be useful, but
+//  WITHOUT ANY WARRANTY; without even the implied warranty of
+//  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+//  General Public License for more details.
+//
+//  You should have received a copy of the GNU General Public License
+//  along with Orbits.  If not, see <http://www.gnu.org/licenses/>.
+// ================================================================
+
+#include <cmath>
+#include <vector>
+
+#include <angles.h>
+#include <batch.h>
+#include <parallel.h>
+#include <utils.h>
+
+// Each kernel is a loop over one part of the arrays, which parallelFor
+// runs on each part. The checks of the throwing kernels count in each
+// part and throw after the parts are joined.
+
+namespace {
+
+  // ----- loops -----
+
+  void addLoop(const double* a_lhs, const double* a_rhs, double* a_result, const size_t& a_size) {
+    for (size_t i = 0; i < a_size; ++i)
+      a_result[i] = a_lhs[i] + a_rhs[i];
+  }
+
+  void addLoop(const double* a_lhs, const double& a_rhs, double* a_result, const size_t& a_size) {
+    const double rhs(a_rhs); // local copy so the loop does not reload through the reference
+    for (size_t i = 0; i < a_size; ++i)
+      a_result[i] = a_lhs[i] + rhs;
+  }
+
+  void subtractLoop(const double* a_lhs, const double* a_rhs, double* a_result, const size_t& a_size) {
+    for (size_t i = 0; i < a_size; ++i)
+      a_result[i] = a_lhs[i] - a_rhs[i];
+  }
+
+  void subtractLoop(const double* a_lhs, const double& a_rhs, double* a_result, const size_t& a_size) {
+    const double rhs(a_rhs);
+    for (size_t i = 0; i < a_size; ++i)
+      a_result[i] = a_lhs[i] - rhs;
+  }
+
+  void subtractLoop(const double& a_lhs, const double* a_rhs, double* a_result, const size_t& a_size) {
+    const double lhs(a_lhs);
+    for (size_t i = 0; i < a_size; ++i)
+      a_result[i] = lhs - a_rhs[i];
+  }
+
+  void multiplyLoop(const double* a_lhs, const double* a_rhs, double* a_result, const size_t& a_size) {
+    for (size_t i = 0; i < a_size; ++i)
+      a_result[i] = a_lhs[i] * a_rhs[i];
+  }
+
+  void multiplyLoop(const double* a_lhs, const double& a_rhs, double* a_result, const size_t& a_size) {
+    const double rhs(a_rhs);
+    for (size_t i = 0; i < a_size; ++i)
+      a_result[i] = a_lhs[i] * rhs;
+  }
+
+  void divideLoop(const double* a_lhs, const double* a_rhs, double* a_result, const size_t& a_size) {
+    for (size_t i = 0; i < a_size; ++i)
+      a_result[i] = a_lhs[i] / a_rhs[i];
+  }
+
+  void divideLoop(const double* a_lhs, const double& a_rhs, double* a_result, const size_t& a_size) {
+    const double rhs(a_rhs);
+    for (size_t i = 0; i < a_size; ++i)
+      a_result[i] = a_lhs[i] / rhs;
+  }
+
+  void divideLoop(const double& a_lhs, const double* a_rhs, double* a_result, const size_t& a_size) {
+    const double lhs(a_lhs);
+    for (size_t i = 0; i < a_size; ++i)
+      a_result[i] = lhs / a_rhs[i];
+  }
+
+  void negateLoop(const double* a_values, double* a_result, const size_t& a_size) {
+    for (size_t i = 0; i < a_size; ++i)
+      a_result[i] = -a_values[i];
+  }
+
+  void deg2radLoop(const double* a_deg, double* a_rad, const size_t& a_size) {
+    const double scale(M_PI/180.0);
+    for (size_t i = 0; i < a_size; ++i)
+      a_rad[i] = a_deg[i]*scale;
+  }
+
+  void rad2degLoop(const double* a_rad, double* a_deg, const size_t& a_size) {
+    const double scale(180.0/M_PI);
+    for (size_t i = 0; i < a_size; ++i)
+      a_deg[i] = a_rad[i]*scale;
+  }
+
+  // ----- parts -----
+
+  typedef void (*UnaryLoop)(const double*, double*, const size_t&);
+  typedef void (*ArrayArrayLoop)(const double*, const double*, double*, const size_t&);
+  typedef void (*ArrayScalarLoop)(const double*, const double&, double*, const size_t&);
+  typedef void (*ScalarArrayLoop)(const double&, const double*, double*, const size_t&);
+
+  struct UnaryPart {
+    UnaryLoop     m_loop;
+    const double* m_values;
+    double*       m_result;
+    void operator()(const size_t&, const size_t& a_begin, const size_t& an_end) {
+      m_loop(m_values + a_begin, m_result + a_begin, an_end - a_begin);
+    }
+  };
+
+  struct ArrayArrayPart {
+    ArrayArrayLoop m_loop;
+    const double*  m_lhs;
+    const double*  m_rhs;
+    double*        m_result;
+    void operator()(const size_t&, const size_t& a_begin, const size_t& an_end) {
+      m_loop(m_lhs + a_begin, m_rhs + a_begin, m_result + a_begin, an_end - a_begin);
+    }
+  };
+
+  struct ArrayScalarPart {
+    ArrayScalarLoop m_loop;
+    const double*   m_lhs;
+    double          m_rhs;
+    double*         m_result;
+    void operator()(const size_t&, const size_t& a_begin, const size_t& an_end) {
+      m_loop(m_lhs + a_begin, m_rhs, m_result + a_begin, an_end - a_begin);
+    }
+  };
+
+  struct ScalarArrayPart {
+    ScalarArrayLoop m_loop;
+    double          m_lhs;
+    const double*   m_rhs;
+    double*         m_result;
+    void operator()(const size_t&, const size_t& a_begin, const size_t& an_end) {
+      m_loop(m_lhs, m_rhs + a_begin, m_result + a_begin, an_end - a_begin);
+    }
+  };
+
+  struct Degrees2SecondsPart {
+    const double* m_deg;
+    const double* m_min;
+    const double* m_sec;
+    double*       m_seconds;
+    void operator()(const size_t&, const size_t& a_begin, const size_t& an_end) {
+      for (size_t i = a_begin; i < an_end; ++i)
+	m_seconds[i] = Angles::degrees2seconds(m_deg[i], m_min[i], m_sec[i]);
+    }
+  };
+
+  struct NormalizePart {
+    const double* m_values;
+    double*       m_result;
+    Angles::Wrap  m_wrap;
+    void operator()(const size_t&, const size_t& a_begin, const size_t& an_end) {
+      for (size_t i = a_begin; i < an_end; ++i)
+	m_result[i] = Angles::normalize(m_values[i], m_wrap);
+    }
+  };
+
+  // ----- counts -----
+
+  struct ZerosPart {
+    const double*       m_values;
+    std::vector<size_t> m_zeros; // of each part
+    void operator()(const size_t& a_part, const size_t& a_begin, const size_t& an_end) {
+      size_t zeros(0);
+      for (size_t i = a_begin; i < an_end; ++i)
+	zeros += (m_values[i] == 0);
+      m_zeros[a_part] = zeros;
+    }
+  };
+
+  // counts, not early exit, so the loop vectorizes.
+  struct RangePart {
+    const double*       m_values;
+    double              m_minimum;
+    double              m_maximum;
+    std::vector<size_t> m_below; // of each part
+    std::vector<size_t> m_above;
+    void operator()(const size_t& a_part, const size_t& a_begin, const size_t& an_end) {
+      const double minimum(m_minimum);
+      const double maximum(m_maximum);
+      size_t below(0);
+      size_t above(0);
+      for (size_t i = a_begin; i < an_end; ++i) {
+	below += (m_values[i] < minimum);
+	above += (m_values[i] > maximum);
+      }
+      m_below[a_part] = below;
+      m_above[a_part] = above;
+    }
+  };
+
+  struct StatusPart {
+    const double*       m_values;
+    double              m_minimum;
+    double              m_maximum;
+    unsigned char*      m_statuses;
+    std::vector<size_t> m_invalid; // of each part
+    void operator()(const size_t& a_part, const size_t& a_begin, const size_t& an_end) {
+      const double minimum(m_minimum);
+      const double maximum(m_maximum);
+      size_t invalid(0);
+      for (size_t i = a_begin; i < an_end; ++i) {
+	const unsigned char below(m_values[i] < minimum);
+	const unsigned char above(m_values[i] > maximum);
+	m_statuses[i] = below*Angles::MINIMUM_EXCEEDED + above*Angles::MAXIMUM_EXCEEDED;
+	invalid += below | above;
+      }
+      m_invalid[a_part] = invalid;
+    }
+  };
+
+  struct PolicyPart {
+    const double*  m_values;
+    double*        m_result;
+    double         m_minimum;
+    double         m_maximum;
+    Angles::Policy m_policy;
+    void operator()(const size_t&, const size_t& a_begin, const size_t& an_end) {
+      const double minimum(m_minimum);
+      const double maximum(m_maximum);
+      if (m_policy == Angles::POLICY_CLAMP) {
+	// selects, not branches, so the loop vectorizes.
+	for (size_t i = a_begin; i < an_end; ++i) {
+	  const double value(m_values[i] < minimum ? minimum : m_values[i]);
+	  m_result[i] = value > maximum ? maximum : value;
+	}
+      } else if (m_policy == Angles::POLICY_RAISE) {
+	for (size_t i = a_begin; i < an_end; ++i)
+	  m_result[i] = m_values[i];
+      } else {
+	for (size_t i = a_begin; i < an_end; ++i) {
+	  const double value(m_values[i]);
+	  m_result[i] = (value < minimum || value > maximum) ?
+	    Angles::applyPolicy(value, minimum, maximum, m_policy) : value;
+	}
+      }
+    }
+  };
+
+  size_t sum(const std::vector<size_t>& some_counts) {
+    size_t a_sum(0);
+    for (size_t i = 0; i < some_counts.size(); ++i)
+      a_sum += some_counts[i];
+    return a_sum;
+  }
+
+  void split(const size_t& a_size, UnaryLoop a_loop, const double* a_values, double* a_result) {
+    UnaryPart a_kernel = {a_loop, a_values, a_result};
+    Angles::parallelFor(a_size, a_kernel);
+  }
+
+  void split(const size_t& a_size, ArrayArrayLoop a_loop,
+	     const double* a_lhs, const double* a_rhs, double* a_result) {
+    ArrayArrayPart a_kernel = {a_loop, a_lhs, a_rhs, a_result};
+    Angles::parallelFor(a_size, a_kernel);
+  }
+
+  void split(const size_t& a_size, ArrayScalarLoop a_loop,
+	     const double* a_lhs, const double& a_rhs, double* a_result) {
+    ArrayScalarPart a_kernel = {a_loop, a_lhs, a_rhs, a_result};
+    Angles::parallelFor(a_size, a_kernel);
+  }
+
+  void split(const size_t& a_size, ScalarArrayLoop a_loop,
+	     const double& a_lhs, const double* a_rhs, double* a_result) {
+    ScalarArrayPart a_kernel = {a_loop, a_lhs, a_rhs, a_result};
+    Angles::parallelFor(a_size, a_kernel);
+  }
+
+  size_t zeros(const double* a_values, const size_t& a_size) {
+    ZerosPart a_kernel;
+    a_kernel.m_values = a_values;
+    a_kernel.m_zeros.resize(Angles::parallelParts(a_size));
+    Angles::parallelFor(a_size, a_kernel.m_zeros.size(), a_kernel);
+    return sum(a_kernel.m_zeros);
+  }
+
+  // below and above the range
+  void outside(const double* a_values, const size_t& a_size,
+	       const double& a_minimum, const double& a_maximum,
+	       size_t* a_below, size_t* an_above) {
+    RangePart a_kernel;
+    a_kernel.m_values = a_values;
+    a_kernel.m_minimum = a_minimum;
+    a_kernel.m_maximum = a_maximum;
+    a_kernel.m_below.resize(Angles::parallelParts(a_size));
+    a_kernel.m_above.resize(a_kernel.m_below.size());
+    Angles::parallelFor(a_size, a_kernel.m_below.size(), a_kernel);
+    *a_below = sum(a_kernel.m_below);
+    *an_above = sum(a_kernel.m_above);
+  }
+
+}
+
+// ----- arithmetic -----
+
+void Angles::add(const double* a_lhs, const double* a_rhs, double* a_result, const size_t& a_size) {
+  split(a_size, addLoop, a_lhs, a_rhs, a_result);
+}
+
+void Angles::add(const double* a_lhs, const double& a_rhs, double* a_result, const size_t& a_size) {
+  split(a_size, addLoop, a_lhs, a_rhs, a_result);
+}
+
+void Angles::add(const double& a_lhs, const double* a_rhs, double* a_result, const size_t& a_size) {
+  add(a_rhs, a_lhs, a_result, a_size);
+}
+
+void Angles::subtract(const double* a_lhs, const double* a_rhs, double* a_result, const size_t& a_size) {
+  split(a_size, subtractLoop, a_lhs, a_rhs, a_result);
+}
+
+void Angles::subtract(const double* a_lhs, const double& a_rhs, double* a_result, const size_t& a_size) {
+  split(a_size, subtractLoop, a_lhs, a_rhs, a_result);
+}
+
+void Angles::subtract(const double& a_lhs, const double* a_rhs, double* a_result, const size_t& a_size) {
+  split(a_size, subtractLoop, a_lhs, a_rhs, a_result);
+}
+
+void Angles::multiply(const double* a_lhs, const double* a_rhs, double* a_result, const size_t& a_size) {
+  split(a_size, multiplyLoop, a_lhs, a_rhs, a_result);
+}
+
+void Angles::multiply(const double* a_lhs, const double& a_rhs, double* a_result, const size_t& a_size) {
+  split(a_size, multiplyLoop, a_lhs, a_rhs, a_result);
+}
+
+void Angles::multiply(const double& a_lhs, const double* a_rhs, double* a_result, const size_t& a_size) {
+  multiply(a_rhs, a_lhs, a_result, a_size);
+}
+
+void Angles::divide(const double* a_lhs, const double* a_rhs, double* a_result, const size_t& a_size)
+  throw (DivideByZeroError) {
+  // check first so the divide loop has no branches and a_result is
+  // untouched on error.
+  if (zeros(a_rhs, a_size) != 0)
+    throw DivideByZeroError();
+  split(a_size, divideLoop, a_lhs, a_rhs, a_result);
+}
+
+void Angles::divide(const double* a_lhs, const double& a_rhs, double* a_result, const size_t& a_size)
+  throw (DivideByZeroError) {
+  if (a_rhs == 0)
+    throw DivideByZeroError();
+  split(a_size, divideLoop, a_lhs, a_rhs, a_result);
+}
+
+void Angles::divide(const double& a_lhs, const double* a_rhs, double* a_result, const size_t& a_size)
+  throw (DivideByZeroError) {
+  if (zeros(a_rhs, a_size) != 0)
+    throw DivideByZeroError();
+  split(a_size, divideLoop, a_lhs, a_rhs, a_result);
+}
+
+void Angles::negate(const double* a_values, double* a_result, const size_t& a_size) {
+  split(a_size, negateLoop, a_values, a_result);
+}
+
+// ----- unit conversions -----
+
+void Angles::deg2rad(const double* a_deg, double* a_rad, const size_t& a_size) {
+  split(a_size, deg2radLoop, a_deg, a_rad);
+}
+
+void Angles::rad2deg(const double* a_rad, double* a_deg, const size_t& a_size) {
+  split(a_size, rad2degLoop, a_rad, a_deg);
+}
+
+void Angles::degrees2seconds(const double* a_deg, const double* a_min, const double* a_sec,
+			     double* a_seconds, const size_t& a_size) {
+  Degrees2SecondsPart a_kernel = {a_deg, a_min, a_sec, a_seconds};
+  parallelFor(a_size, a_kernel);
+}
+
+// ----- other methods -----
+
+void Angles::normalize(const double* a_values, double* a_result, const size_t& a_size,
+		       const Wrap& a_wrap) {
+  NormalizePart a_kernel = {a_values, a_result, a_wrap};
+  parallelFor(a_size, a_kernel);
+}
+
+// ----- formatting -----
+
+typedef size_t (*Formatter)(const double&, char*, const size_t&, const int&);
+
+static size_t formatValues(Formatter a_formatter, const double* a_values, const size_t& a_count,
+			   char* a_buffer, const size_t& a_size,
+			   const int& a_precision, const char& a_delimiter) {
+
+  // Each value is written straight into its place in a_buffer. Once
+  // the buffer is full the rest are only measured.
+
+  size_t length(0);
+
+  for (size_t i = 0; i < a_count; ++i) {
+
+    if (length < a_size)
+      length += a_formatter(a_values[i], a_buffer + length, a_size - length, a_precision);
+    else
+      length += a_formatter(a_values[i], NULL, 0, a_precision);
+
+    if (length + 1 < a_size)
+      a_buffer[length] = a_delimiter;
+    ++length;
+
+  }
+
+  if (length < a_size)
+    a_buffer[length] = 0;
+  else if (a_size > 0)
+    a_buffer[a_size - 1] = 0;
+
+  return length;
+}
+
+size_t Angles::values2DMSString(const double* a_values, const size_t& a_count,
+				char* a_buffer, const size_t& a_size,
+				const int& a_precision, const char& a_delimiter) {
+  return formatValues(Angles::value2DMSString, a_values, a_count, a_buffer, a_size,
+		      a_precision, a_delimiter);
+}
+
+size_t Angles::values2HMSString(const double* a_values, const size_t& a_count,
+				char* a_buffer, const size_t& a_size,
+				const int& a_precision, const char& a_delimiter) {
+  return formatValues(Angles::value2HMSString, a_values, a_count, a_buffer, a_size,
+		      a_precision, a_delimiter);
+}
+
+// ----- range checks -----
+
+void Angles::validRange(const double* a_values, const size_t& a_size,
+			const double& a_minimum, const double& a_maximum) throw (RangeError) {
+  size_t below(0);
+  size_t above(0);
+  outside(a_values, a_size, a_minimum, a_maximum, &below, &above);
+  if (below != 0)
+    throw RangeError("minimum exceeded");
+  if (above != 0)
+    throw RangeError("maximum exceeded");
+}
+
+bool Angles::isValidRange(const double* a_values, const size_t& a_size,
+			  const double& a_minimum, const double& a_maximum) {
+  size_t below(0);
+  size_t above(0);
+  outside(a_values, a_size, a_minimum, a_maximum, &below, &above);
+  return below == 0 && above == 0;
+}
+
+size_t Angles::rangeStatus(const double* a_values, const size_t& a_size,
+			   const double& a_minimum, const double& a_maximum,
+			   unsigned char* a_statuses) {
+  StatusPart a_kernel;
+  a_kernel.m_values = a_values;
+  a_kernel.m_minimum = a_minimum;
+  a_kernel.m_maximum = a_maximum;
+  a_kernel.m_statuses = a_statuses;
+  a_kernel.m_invalid.resize(parallelParts(a_size));
+  parallelFor(a_size, a_kernel.m_invalid.size(), a_kernel);
+  return sum(a_kernel.m_invalid);
+}
+
+Angles::Status Angles::applyPolicy(const double* a_values, double* a_result, const size_t& a_size,
+			   const double& a_minimum, const double& a_maximum, const Policy& a_policy) {
+
+  if (a_policy == POLICY_RAISE) {
+    size_t below(0);
+    size_t above(0);
+    outside(a_values, a_size, a_minimum, a_maximum, &below, &above);
+    if (below != 0)
+      return MINIMUM_EXCEEDED;
+    if (above != 0)
+      return MAXIMUM_EXCEEDED;
+    if (a_result == a_values)
+      return SUCCESS;
+  }
+
+  PolicyPart a_kernel = {a_values, a_result, a_minimum, a_maximum, a_policy};
+  parallelFor(a_size, a_kernel);
+
+  return SUCCESS;
+}
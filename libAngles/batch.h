@@ -0,0 +1,114 @@
+// ================================================================
+// Filename:    batch.h
+//
+// Description: Element-wise kernels over contiguous arrays of angle
+//              values. These are plain loops over double* with no
+//              per-element objects or virtual calls so the compiler
+//              can vectorize them. AngleArray and the python batch
+//              functions are built on top of these.
+//
+// Author:      L.R. McFarland, lrm@starbug.com
+// Created:     2026 Oct 18
+// Language:    C++
+//
+//  Angles is free software: you can redistribute it and/or modify it
+//  under the terms of the GNU General Public License as published by
+//  the Free Software Foundation, either version 3 of the License, or
+//  (at your option) any later version.
+//
+//  Angles is distributed in the hope that it will be useful, but
+//  WITHOUT ANY WARRANTY; without even the implied warranty of
+//  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+//  General Public License for more details.
+//
+//  You should have received a copy of the GNU General Public License
+//  along with Orbits.  If not, see <http://www.gnu.org/licenses/>.
+// ================================================================
+
+// Notes: a_result may be the same array as an input for in-place
+// operations. Sizes are not checked, that is up to the caller. Large
+// arrays are split across threads, see parallel.h, except formatting.
+
+#pragma once
+
+#include <cstddef>
+
+#include <utils.h>
+
+namespace Angles {
+
+  // ----- arithmetic -----
+
+  void add(const double* a_lhs, const double* a_rhs, double* a_result, const size_t& a_size);
+  void add(const double* a_lhs, const double& a_rhs, double* a_result, const size_t& a_size);
+  void add(const double& a_lhs, const double* a_rhs, double* a_result, const size_t& a_size);
+
+  void subtract(const double* a_lhs, const double* a_rhs, double* a_result, const size_t& a_size);
+  void subtract(const double* a_lhs, const double& a_rhs, double* a_result, const size_t& a_size);
+  void subtract(const double& a_lhs, const double* a_rhs, double* a_result, const size_t& a_size);
+
+  void multiply(const double* a_lhs, const double* a_rhs, double* a_result, const size_t& a_size);
+  void multiply(const double* a_lhs, const double& a_rhs, double* a_result, const size_t& a_size);
+  void multiply(const double& a_lhs, const double* a_rhs, double* a_result, const size_t& a_size);
+
+  void divide(const double* a_lhs, const double* a_rhs, double* a_result, const size_t& a_size)
+    throw (DivideByZeroError);
+  void divide(const double* a_lhs, const double& a_rhs, double* a_result, const size_t& a_size)
+    throw (DivideByZeroError);
+  void divide(const double& a_lhs, const double* a_rhs, double* a_result, const size_t& a_size)
+    throw (DivideByZeroError);
+
+  void negate(const double* a_values, double* a_result, const size_t& a_size);
+
+  // ----- unit conversions -----
+
+  void deg2rad(const double* a_deg, double* a_rad, const size_t& a_size);
+  void rad2deg(const double* a_rad, double* a_deg, const size_t& a_size);
+
+  void degrees2seconds(const double* a_deg, const double* a_min, const double* a_sec,
+		       double* a_seconds, const size_t& a_size);
+
+  // ----- other methods -----
+
+  void normalize(const double* a_values, double* a_result, const size_t& a_size,
+		 const Wrap& a_wrap = WRAP_0_360);
+
+  // ----- formatting -----
+
+  // Formats a_count values into one buffer, each followed by
+  // a_delimiter, and null terminates it. Same snprintf semantics as
+  // value2DMSString: returns the length needed, which is at most
+  // a_count * MAX_SEXAGESIMAL_STRING for precisions up to 17.
+
+  size_t values2DMSString(const double* a_values, const size_t& a_count,
+			  char* a_buffer, const size_t& a_size,
+			  const int& a_precision = 6, const char& a_delimiter = '\n');
+  size_t values2HMSString(const double* a_values, const size_t& a_count,
+			  char* a_buffer, const size_t& a_size,
+			  const int& a_precision = 6, const char& a_delimiter = '\n');
+
+  // ----- range checks -----
+
+  void validRange(const double* a_values, const size_t& a_size,
+		  const double& a_minimum, const double& a_maximum) throw (RangeError);
+
+  bool isValidRange(const double* a_values, const size_t& a_size,
+		    const double& a_minimum, const double& a_maximum);
+
+  // Non-throwing check of every value in one pass. Writes one Status
+  // byte per value, SUCCESS (0), MINIMUM_EXCEEDED or
+  // MAXIMUM_EXCEEDED, and returns the number out of range.
+
+  size_t rangeStatus(const double* a_values, const size_t& a_size,
+		     const double& a_minimum, const double& a_maximum,
+		     unsigned char* a_statuses);
+
+  // Applies a_policy to the out of range values, in range ones are
+  // copied as is. POLICY_RAISE only checks: it returns
+  // MINIMUM_EXCEEDED or MAXIMUM_EXCEEDED, without writing a_result,
+  // if any value is out of range. The others return SUCCESS.
+
+  Status applyPolicy(const double* a_values, double* a_result, const size_t& a_size,
+		     const double& a_minimum, const double& a_maximum, const Policy& a_policy);
+
+} // end namespace Angles
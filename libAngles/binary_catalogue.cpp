@@ -0,0 +1,257 @@
+// ================================================================
+// Filename:    binary_catalogue.cpp
+// Description: Memory mapped binary catalogues of angle columns.
+//
+// Author:      L.R. McFarland, lrm@starbug.com
+// Created:     2026 Oct 18
+// Language:    C++
+//
+//  Angles is free software: you can redistribute it and/or modify it
+//  under the terms of the GNU General Public License as published by
+//  the Free Software Foundation, either version 3 of the License, or
+//  (at your option) any later version.
+//
+//  Angles is distributed in the hope that it will be useful, but
+//  WITHOUT ANY WARRANTY; without even the implied warranty of
+//  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+//  General Public License for more details.
+//
+//  You should have received a copy of the GNU General Public License
+//  along with Orbits.  If not, see <http://www.gnu.org/licenses/>.
+// ================================================================
+
+#include <cstdio>
+#include <limits>
+
+#include <fcntl.h>     /* open */
+#include <string.h>    /* memcpy, memcmp, memchr */
+#include <sys/mman.h>  /* mmap */
+#include <sys/stat.h>  /* fstat */
+#include <unistd.h>    /* close */
+
+#include <angles.h>
+#include <binary_catalogue.h>
+
+namespace {
+
+  const char     sMagic[8] = {'A', 'N', 'G', 'L', 'C', 'A', 'T', '\0'};
+  const uint32_t sVersion(1);
+
+  const size_t sHeaderSize(24);
+  const size_t sEntrySize(64);
+  const size_t sNameSize(32);
+  const size_t sAlignment(64);
+
+  inline size_t align(const size_t& a_size) {return (a_size + sAlignment - 1)/sAlignment*sAlignment;}
+
+  inline bool isLittleEndian() {
+    const uint16_t one(1);
+    return *reinterpret_cast<const unsigned char*>(&one) == 1;
+  }
+
+  // copies a value into or out of the header, which need not be aligned
+  template<typename T> void put(std::vector<char>& a_header, const size_t& an_offset, const T& a_value) {
+    memcpy(&a_header[an_offset], &a_value, sizeof(T));
+  }
+
+  template<typename T> T get(const char* a_header, const size_t& an_offset) {
+    T a_value;
+    memcpy(&a_value, a_header + an_offset, sizeof(T));
+    return a_value;
+  }
+
+}
+
+
+// ----- write -----
+
+void Angles::writeBinaryCatalogue(const std::string& a_path,
+				  const std::vector<CatalogueColumn>& some_columns,
+				  const size_t& a_rows) throw (Error) {
+
+  if (!isLittleEndian())
+    throw Error("binary catalogues need a little endian host");
+
+  for (size_t i = 0; i < some_columns.size(); ++i) {
+
+    if (some_columns[i].m_name.size() >= sNameSize || some_columns[i].m_name.find('\0') != std::string::npos)
+      throw Error("catalogue column name is too long: " + some_columns[i].m_name);
+
+    for (size_t j = 0; j < i; ++j)
+      if (some_columns[j].m_name == some_columns[i].m_name)
+	throw Error("catalogue column name is repeated: " + some_columns[i].m_name);
+
+    const double a_minimum(BinaryCatalogue::minimum(some_columns[i].m_type));
+    const double a_maximum(BinaryCatalogue::maximum(some_columns[i].m_type));
+    const double* some_values(some_columns[i].m_values);
+    for (size_t k = 0; k < a_rows; ++k) {
+      if (some_values[k] < a_minimum)
+	throw RangeError("minimum exceeded");
+      if (some_values[k] > a_maximum)
+	throw RangeError("maximum exceeded");
+    }
+
+  }
+
+  const size_t a_column_size(align(a_rows*sizeof(double)));
+  const size_t a_data_start(align(sHeaderSize + sEntrySize*some_columns.size()));
+
+  std::vector<char> a_header(a_data_start, '\0');
+  memcpy(&a_header[0], sMagic, sizeof(sMagic));
+  put<uint32_t>(a_header, 8, sVersion);
+  put<uint32_t>(a_header, 12, some_columns.size());
+  put<uint64_t>(a_header, 16, a_rows);
+
+  for (size_t i = 0; i < some_columns.size(); ++i) {
+    const size_t an_entry(sHeaderSize + i*sEntrySize);
+    const CatalogueType a_type(some_columns[i].m_type);
+    memcpy(&a_header[an_entry], some_columns[i].m_name.data(), some_columns[i].m_name.size());
+    put<uint32_t>(a_header, an_entry + 32, a_type);
+    put<uint32_t>(a_header, an_entry + 36, a_type == CATALOGUE_RA ? 1 : 0);
+    put<double>(a_header, an_entry + 40, BinaryCatalogue::minimum(a_type));
+    put<double>(a_header, an_entry + 48, BinaryCatalogue::maximum(a_type));
+    put<uint64_t>(a_header, an_entry + 56, a_data_start + i*a_column_size);
+  }
+
+  // Written beside the old file and renamed over it, so processes
+  // that have the old one mapped keep it.
+  const std::string a_temporary(a_path + ".tmp");
+
+  std::FILE* a_file(std::fopen(a_temporary.c_str(), "wb"));
+  if (a_file == NULL)
+    throw Error("cannot open " + a_temporary);
+
+  bool ok(std::fwrite(&a_header[0], 1, a_header.size(), a_file) == a_header.size());
+
+  const std::vector<char> a_padding(a_column_size - a_rows*sizeof(double), '\0');
+  for (size_t i = 0; ok && i < some_columns.size(); ++i) {
+    ok = std::fwrite(some_columns[i].m_values, sizeof(double), a_rows, a_file) == a_rows;
+    if (ok && !a_padding.empty())
+      ok = std::fwrite(&a_padding[0], 1, a_padding.size(), a_file) == a_padding.size();
+  }
+
+  ok = (std::fclose(a_file) == 0) && ok;
+
+  if (!ok || std::rename(a_temporary.c_str(), a_path.c_str()) != 0) {
+    std::remove(a_temporary.c_str());
+    throw Error("cannot write " + a_path);
+  }
+}
+
+
+// ===========================
+// ===== BinaryCatalogue =====
+// ===========================
+
+Angles::BinaryCatalogue::BinaryCatalogue(const std::string& a_path) throw (Error)
+  : m_data(NULL), m_size(0), m_rows(0) {
+
+  if (!isLittleEndian())
+    throw Error("binary catalogues need a little endian host");
+
+  int a_descriptor(open(a_path.c_str(), O_RDONLY));
+  if (a_descriptor < 0)
+    throw Error("cannot open " + a_path);
+
+  struct stat some_stats;
+  if (fstat(a_descriptor, &some_stats) != 0 || some_stats.st_size < static_cast<off_t>(sHeaderSize)) {
+    close(a_descriptor);
+    throw Error("not an angle catalogue: " + a_path);
+  }
+
+  m_size = some_stats.st_size;
+  m_data = mmap(NULL, m_size, PROT_READ, MAP_SHARED, a_descriptor, 0);
+  close(a_descriptor); // the mapping keeps the file
+  if (m_data == MAP_FAILED) {
+    m_data = NULL;
+    throw Error("cannot map " + a_path);
+  }
+
+  const char* a_header(static_cast<const char*>(m_data));
+
+  try {
+
+    if (memcmp(a_header, sMagic, sizeof(sMagic)) != 0)
+      throw Error("not an angle catalogue: " + a_path);
+
+    if (get<uint32_t>(a_header, 8) != sVersion)
+      throw Error("unknown angle catalogue version: " + a_path);
+
+    const uint32_t a_columns(get<uint32_t>(a_header, 12));
+    const uint64_t a_rows(get<uint64_t>(a_header, 16));
+
+    if (a_columns > (m_size - sHeaderSize)/sEntrySize ||
+	a_rows > m_size/sizeof(double))
+      throw Error("truncated angle catalogue: " + a_path);
+
+    m_rows = a_rows;
+
+    for (size_t i = 0; i < a_columns; ++i) {
+
+      const char* an_entry(a_header + sHeaderSize + i*sEntrySize);
+
+      if (memchr(an_entry, '\0', sNameSize) == NULL)
+	throw Error("invalid angle catalogue column name: " + a_path);
+
+      const uint32_t a_type(get<uint32_t>(an_entry, 32));
+      if (a_type > CATALOGUE_RA)
+	throw Error("unknown angle catalogue column type: " + a_path);
+
+      CatalogueColumn a_column;
+      a_column.m_name = an_entry;
+      a_column.m_type = static_cast<CatalogueType>(a_type);
+
+      if (get<uint32_t>(an_entry, 36) != (a_column.m_type == CATALOGUE_RA ? 1u : 0u) ||
+	  get<double>(an_entry, 40) != minimum(a_column.m_type) ||
+	  get<double>(an_entry, 48) != maximum(a_column.m_type))
+	throw Error("angle catalogue column does not match its type: " + a_column.m_name);
+
+      const uint64_t an_offset(get<uint64_t>(an_entry, 56));
+      if (an_offset % sizeof(double) != 0 || an_offset > m_size || m_rows > (m_size - an_offset)/sizeof(double))
+	throw Error("truncated angle catalogue: " + a_path);
+
+      a_column.m_values = reinterpret_cast<const double*>(a_header + an_offset);
+      m_columns.push_back(a_column);
+    }
+
+  } catch (Error&) {
+    munmap(m_data, m_size);
+    throw;
+  }
+}
+
+Angles::BinaryCatalogue::~BinaryCatalogue() {
+  if (m_data != NULL)
+    munmap(m_data, m_size);
+}
+
+size_t Angles::BinaryCatalogue::column(const std::string& a_name) const throw (Error) {
+  for (size_t i = 0; i < m_columns.size(); ++i)
+    if (m_columns[i].m_name == a_name)
+      return i;
+  throw Error("no catalogue column named " + a_name);
+}
+
+// ----- static methods -----
+
+double Angles::BinaryCatalogue::minimum(const CatalogueType& a_type) {
+  switch (a_type) {
+  case CATALOGUE_LIMITED_RANGE_ANGLE: return LimitedRangeAngle::minimum();
+  case CATALOGUE_DECLINATION:         return Declination::minimum();
+  case CATALOGUE_LATITUDE:            return Latitude::minimum();
+  case CATALOGUE_LONGITUDE:           return Longitude::minimum();
+  case CATALOGUE_RA:                  return RA::minimum();
+  default:                            return -std::numeric_limits<double>::infinity();
+  }
+}
+
+double Angles::BinaryCatalogue::maximum(const CatalogueType& a_type) {
+  switch (a_type) {
+  case CATALOGUE_LIMITED_RANGE_ANGLE: return LimitedRangeAngle::maximum();
+  case CATALOGUE_DECLINATION:         return Declination::maximum();
+  case CATALOGUE_LATITUDE:            return Latitude::maximum();
+  case CATALOGUE_LONGITUDE:           return Longitude::maximum();
+  case CATALOGUE_RA:                  return RA::maximum();
+  default:                            return std::numeric_limits<double>::infinity();
+  }
+}
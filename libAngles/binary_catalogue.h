@@ -0,0 +1,136 @@
+// ================================================================
+// Filename:    binary_catalogue.h
+//
+// Description: This is a declaration of a binary file format for
+//              columns of angle values that is read by mapping it
+//              into memory, so every process opening it shares the
+//              page cache and nothing is parsed or copied.
+//
+// Author:      L.R. McFarland, lrm@starbug.com
+// Created:     2026 Oct 18
+// Language:    C++
+//
+//  Angles is free software: you can redistribute it and/or modify it
+//  under the terms of the GNU General Public License as published by
+//  the Free Software Foundation, either version 3 of the License, or
+//  (at your option) any later version.
+//
+//  Angles is distributed in the hope that it will be useful, but
+//  WITHOUT ANY WARRANTY; without even the implied warranty of
+//  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+//  General Public License for more details.
+//
+//  You should have received a copy of the GNU General Public License
+//  along with Orbits.  If not, see <http://www.gnu.org/licenses/>.
+// ================================================================
+
+
+// Notes: The file is a header followed by the columns, each a
+// contiguous little endian array of doubles aligned to 64 bytes.
+//
+//   offset  size
+//        0     8  magic, "ANGLCAT\0"
+//        8     4  version, 1
+//       12     4  columns
+//       16     8  rows
+//       24  64*c  one entry per column:
+//                   32  name, '\0' padded
+//                    4  type, a CatalogueType
+//                    4  units, 0 degrees or 1 hours
+//                    8  minimum
+//                    8  maximum
+//                    8  offset of the values in the file
+//
+// The type is the angle type of the values. Declination and Latitude
+// are one C++ type, LRA<-90, 90>, but keep their own names here. The
+// minimum, maximum and units repeat the type's so other readers need
+// not know the types, and opening checks they agree. NaN is allowed
+// as a missing value.
+//
+// BinaryCatalogue keeps the file mapped read only for its lifetime and
+// values() points straight into it.
+//
+// Only little endian hosts are supported, others raise Error, rather
+// than swap, which would need a copy.
+
+
+#pragma once
+
+#include <string>
+#include <vector>
+
+#include <stdint.h>  /* uint64_t */
+
+#include <utils.h>
+
+namespace Angles {
+
+  enum CatalogueType {
+    CATALOGUE_ANGLE,
+    CATALOGUE_LIMITED_RANGE_ANGLE,
+    CATALOGUE_DECLINATION,
+    CATALOGUE_LATITUDE,
+    CATALOGUE_LONGITUDE,
+    CATALOGUE_RA
+  };
+
+  // a column to write or read
+  struct CatalogueColumn {
+    std::string   m_name; // up to 31 characters
+    CatalogueType m_type;
+    const double* m_values;
+  };
+
+  // Raises RangeError if a value is out of its type's range, Error if
+  // a name is too long or repeated or the file cannot be written.
+  void writeBinaryCatalogue(const std::string& a_path,
+			    const std::vector<CatalogueColumn>& some_columns,
+			    const size_t& a_rows) throw (Error);
+
+
+  // ===========================
+  // ===== BinaryCatalogue =====
+  // ===========================
+
+  class BinaryCatalogue {
+
+  public:
+
+    // ----- ctor and dtor -----
+
+    // raises Error if the file cannot be mapped or is not valid
+    explicit BinaryCatalogue(const std::string& a_path) throw (Error);
+
+    ~BinaryCatalogue();
+
+    // ----- accessors -----
+
+    size_t rows() const {return m_rows;}
+    size_t columns() const {return m_columns.size();}
+
+    const std::string& name(const size_t& a_column) const {return m_columns[a_column].m_name;}
+    CatalogueType      type(const size_t& a_column) const {return m_columns[a_column].m_type;}
+    bool               hours(const size_t& a_column) const {return type(a_column) == CATALOGUE_RA;}
+    const double*      values(const size_t& a_column) const {return m_columns[a_column].m_values;}
+
+    // the column named a_name, raises Error if there is none
+    size_t column(const std::string& a_name) const throw (Error);
+
+    // ----- static methods -----
+
+    static double minimum(const CatalogueType& a_type);
+    static double maximum(const CatalogueType& a_type);
+
+  private:
+
+    BinaryCatalogue(const BinaryCatalogue&);            // not copyable, owns the mapping
+    BinaryCatalogue& operator=(const BinaryCatalogue&);
+
+    void*                        m_data;
+    size_t                       m_size;
+    size_t                       m_rows;
+    std::vector<CatalogueColumn> m_columns; // values in m_data
+
+  };
+
+} // end namespace Angles
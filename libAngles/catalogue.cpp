@@ -0,0 +1,252 @@
+// ================================================================
+// Filename:    catalogue.cpp
+// Description: Streaming reader of delimited text catalogues.
+//
+// Author:      L.R. McFarland, lrm@starbug.com
+// Created:     2026 Oct 18
+// Language:    C++
+//
+//  Angles is free software: you can redistribute it and/or modify it
+//  under the terms of the GNU General Public License as published by
+//  the Free Software Foundation, either version 3 of the License, or
+//  (at your option) any later version.
+//
+//  Angles is distributed in the hope that it will be useful, but
+//  WITHOUT ANY WARRANTY; without even the implied warranty of
+//  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+//  General Public License for more details.
+//
+//  You should have received a copy of the GNU General Public License
+//  along with Orbits.  If not, see <http://www.gnu.org/licenses/>.
+// ================================================================
+
+#include <algorithm>
+#include <limits>
+
+#include <string.h>  /* memchr, memmove */
+
+#include <catalogue.h>
+#include <parser.h>
+
+namespace {
+
+  // The first read. It doubles for a line that does not fit.
+  const size_t sBlockSize(1 << 20);
+
+  bool errorLess(const Angles::CatalogueError& lhs, const Angles::CatalogueError& rhs) {
+    return lhs.m_row < rhs.m_row || (lhs.m_row == rhs.m_row && lhs.m_column < rhs.m_column);
+  }
+
+}
+
+// ----- ctor and dtor -----
+
+Angles::CatalogueReader::CatalogueReader(const std::string& a_path,
+					 const char& a_delimiter,
+					 const size_t& a_chunk_rows,
+					 const size_t& a_skip_lines) throw (Error)
+  : m_file(NULL), m_delimiter(a_delimiter), m_chunk_rows(a_chunk_rows), m_skip_lines(a_skip_lines),
+    m_started(false), m_buffer(sBlockSize), m_begin(0), m_end(0), m_offset(0), m_eof(false),
+    m_line(0), m_rows(0), m_lines(a_chunk_rows), m_offsets(a_chunk_rows) {
+
+  if (a_chunk_rows == 0)
+    throw RangeError("minimum exceeded");
+
+  m_file = std::fopen(a_path.c_str(), "rb");
+  if (m_file == NULL)
+    throw Error("cannot open " + a_path);
+}
+
+Angles::CatalogueReader::~CatalogueReader() {
+  if (m_file != NULL)
+    std::fclose(m_file);
+}
+
+// ----- columns -----
+
+void Angles::CatalogueReader::addColumn(const size_t& a_field) throw (Error) {
+  addColumn(a_field, -std::numeric_limits<double>::infinity(), std::numeric_limits<double>::infinity());
+}
+
+void Angles::CatalogueReader::addColumn(const size_t& a_field,
+					const double& a_minimum, const double& a_maximum) throw (Error) {
+
+  if (m_started)
+    throw Error("columns cannot be added after reading");
+
+  if (a_field < m_field_columns.size() && m_field_columns[a_field] >= 0)
+    throw Error("field is already a column");
+
+  if (a_field >= m_field_columns.size())
+    m_field_columns.resize(a_field + 1, -1);
+
+  m_field_columns[a_field] = m_fields.size();
+  m_fields.push_back(a_field);
+  m_minimums.push_back(a_minimum);
+  m_maximums.push_back(a_maximum);
+  m_values.push_back(std::vector<double>(m_chunk_rows));
+}
+
+// ----- reading -----
+
+bool Angles::CatalogueReader::nextLine(const char** a_begin, const char** an_end, uint64_t* an_offset)
+  throw (Error) {
+
+  while (true) {
+
+    const char* a_start(&m_buffer[0] + m_begin);
+    const char* a_stop(static_cast<const char*>(memchr(a_start, '\n', m_end - m_begin)));
+
+    if (a_stop == NULL && m_eof) {
+      if (m_begin == m_end)
+	return false;
+      a_stop = &m_buffer[0] + m_end; // the last line has no '\n'
+    }
+
+    if (a_stop != NULL) {
+      *a_begin = a_start;
+      *an_end = a_stop;
+      *an_offset = m_offset + m_begin;
+      m_begin = a_stop - &m_buffer[0] + (a_stop < &m_buffer[0] + m_end ? 1 : 0);
+      ++m_line;
+      return true;
+    }
+
+    // move the partial line to the front and read more
+    if (m_begin > 0) {
+      memmove(&m_buffer[0], &m_buffer[0] + m_begin, m_end - m_begin);
+      m_offset += m_begin;
+      m_end -= m_begin;
+      m_begin = 0;
+    }
+
+    if (m_end == m_buffer.size())
+      m_buffer.resize(2*m_buffer.size());
+
+    const size_t a_request(m_buffer.size() - m_end);
+    const size_t a_count(std::fread(&m_buffer[0] + m_end, 1, a_request, m_file));
+    m_end += a_count;
+
+    if (a_count < a_request) {
+      if (std::ferror(m_file))
+	throw Error("catalogue read error");
+      if (std::feof(m_file))
+	m_eof = true;
+    }
+
+  }
+}
+
+void Angles::CatalogueReader::addError(const size_t& a_row, const size_t& a_column, const char* a_reason) {
+  CatalogueError an_error;
+  an_error.m_row = a_row;
+  an_error.m_column = a_column;
+  an_error.m_line = m_lines[a_row];
+  an_error.m_offset = m_offsets[a_row];
+  an_error.m_reason = a_reason;
+  m_errors.push_back(an_error);
+}
+
+void Angles::CatalogueReader::parseLine(const char* a_begin, const char* an_end, const uint64_t& an_offset) {
+
+  const double nan(std::numeric_limits<double>::quiet_NaN());
+
+  m_lines[m_rows] = m_line;
+  m_offsets[m_rows] = an_offset;
+
+  // only as far as the last field read
+  const char* p(a_begin);
+  bool more(true);
+
+  for (size_t a_field = 0; a_field < m_field_columns.size(); ++a_field) {
+
+    const char* a_stop(an_end);
+    if (more) {
+      a_stop = static_cast<const char*>(memchr(p, m_delimiter, an_end - p));
+      if (a_stop == NULL)
+	a_stop = an_end;
+    }
+
+    const int a_column(m_field_columns[a_field]);
+    if (a_column >= 0) {
+      double& a_value(m_values[a_column][m_rows]);
+      if (!more) {
+	a_value = nan;
+	addError(m_rows, a_column, "missing field");
+      } else if (!parseAngle(p, a_stop, &a_value)) {
+	a_value = nan;
+	addError(m_rows, a_column, "invalid angle");
+      }
+    }
+
+    if (more) {
+      more = a_stop < an_end;
+      p = a_stop + 1;
+    }
+
+  }
+}
+
+void Angles::CatalogueReader::checkRanges() {
+
+  const double nan(std::numeric_limits<double>::quiet_NaN());
+
+  for (size_t a_column = 0; a_column < m_fields.size(); ++a_column) {
+
+    double* some_values(&m_values[a_column][0]);
+    const double a_minimum(m_minimums[a_column]);
+    const double a_maximum(m_maximums[a_column]);
+
+    // a branch free count first, most chunks have nothing out of
+    // range. NaN, already an error, compares false.
+    size_t a_count(0);
+    for (size_t i = 0; i < m_rows; ++i)
+      a_count += (some_values[i] < a_minimum) | (some_values[i] > a_maximum);
+
+    if (a_count == 0)
+      continue;
+
+    for (size_t i = 0; i < m_rows; ++i) {
+      if (some_values[i] < a_minimum) {
+	some_values[i] = nan;
+	addError(i, a_column, "minimum exceeded");
+      } else if (some_values[i] > a_maximum) {
+	some_values[i] = nan;
+	addError(i, a_column, "maximum exceeded");
+      }
+    }
+
+  }
+}
+
+size_t Angles::CatalogueReader::next() throw (Error) {
+
+  if (m_fields.empty())
+    throw Error("no columns to read");
+
+  m_started = true;
+  m_rows = 0;
+  m_errors.clear();
+
+  const char* a_begin(NULL);
+  const char* an_end(NULL);
+  uint64_t an_offset(0);
+
+  while (m_rows < m_chunk_rows && nextLine(&a_begin, &an_end, &an_offset)) {
+
+    if (an_end > a_begin && an_end[-1] == '\r')
+      --an_end;
+
+    if (m_line <= m_skip_lines || a_begin == an_end || *a_begin == '#')
+      continue;
+
+    parseLine(a_begin, an_end, an_offset);
+    ++m_rows;
+  }
+
+  checkRanges();
+
+  std::stable_sort(m_errors.begin(), m_errors.end(), errorLess);
+
+  return m_rows;
+}
@@ -0,0 +1,169 @@
+// ================================================================
+// Filename:    catalogue.h
+//
+// Description: This is a declaration of a streaming reader of
+//              delimited text catalogues, e.g. CSV or TSV, that
+//              parses the selected columns into arrays of angle
+//              values a chunk of rows at a time.
+//
+// Author:      L.R. McFarland, lrm@starbug.com
+// Created:     2026 Oct 18
+// Language:    C++
+//
+//  Angles is free software: you can redistribute it and/or modify it
+//  under the terms of the GNU General Public License as published by
+//  the Free Software Foundation, either version 3 of the License, or
+//  (at your option) any later version.
+//
+//  Angles is distributed in the hope that it will be useful, but
+//  WITHOUT ANY WARRANTY; without even the implied warranty of
+//  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+//  General Public License for more details.
+//
+//  You should have received a copy of the GNU General Public License
+//  along with Orbits.  If not, see <http://www.gnu.org/licenses/>.
+// ================================================================
+
+
+// Notes: CatalogueReader reads a file a block at a time and keeps
+// only the current block and the current chunk of values, so its
+// memory does not grow with the file. Each call to next() fills up
+// to chunkRows() rows of each column.
+//
+// Fields are parsed with parseAngle, so a column may be decimal or
+// sexagesimal, "12:30:45" or "12h30m45s", but not both split over
+// several fields. Each column has the range of its type, e.g.
+// addColumn<RA>(3), checked over the whole chunk after parsing.
+//
+// Bad values do not stop the reader. They are set to NaN and listed
+// in errors() with their line and the byte offset of the line in the
+// file, so the caller can find them or drop the rows.
+//
+// Blank lines and lines starting with '#' are skipped, as are the
+// first skipLines() lines, e.g. a header. A '\r' before the '\n' is
+// ignored.
+
+
+#pragma once
+
+#include <cstdio>
+#include <string>
+#include <vector>
+
+#include <stdint.h>  /* uint64_t */
+
+#include <utils.h>
+
+namespace Angles {
+
+  // ==========================
+  // ===== CatalogueError =====
+  // ==========================
+
+  // a bad value, not an exception
+  struct CatalogueError {
+    size_t      m_row;    // in the chunk
+    size_t      m_column; // as added
+    size_t      m_line;   // in the file, from 1
+    uint64_t    m_offset; // of the line in the file
+    const char* m_reason; // e.g. "maximum exceeded"
+  };
+
+
+  // ===========================
+  // ===== CatalogueReader =====
+  // ===========================
+
+  class CatalogueReader {
+
+  public:
+
+    // ----- ctor and dtor -----
+
+    // raises Error if the file cannot be opened, RangeError if
+    // a_chunk_rows is 0
+    CatalogueReader(const std::string& a_path,
+		    const char& a_delimiter = ',',
+		    const size_t& a_chunk_rows = 65536,
+		    const size_t& a_skip_lines = 0) throw (Error);
+
+    ~CatalogueReader();
+
+    // ----- columns -----
+
+    // Fields are numbered from 0. Columns may be added in any order
+    // until the first next(), after that they raise Error.
+
+    void addColumn(const size_t& a_field) throw (Error); // any value
+
+    void addColumn(const size_t& a_field, const double& a_minimum, const double& a_maximum)
+      throw (Error);
+
+    template<typename T>
+      void addColumn(const size_t& a_field) throw (Error) {addColumn(a_field, T::minimum(), T::maximum());}
+
+    // ----- accessors -----
+
+    const char&   delimiter() const {return m_delimiter;}
+    const size_t& chunkRows() const {return m_chunk_rows;}
+    const size_t& skipLines() const {return m_skip_lines;}
+    size_t        columns() const {return m_fields.size();}
+
+    // ----- reading -----
+
+    // Reads the next chunk, returns the number of rows, 0 at the end
+    // of the file. Raises Error on a read error.
+    size_t next() throw (Error);
+
+    bool done() const {return m_eof && m_begin == m_end;}
+
+    // of the last chunk
+    size_t                             rows() const {return m_rows;}
+    const double*                      values(const size_t& a_column) const {return &m_values[a_column][0];}
+    const std::vector<CatalogueError>& errors() const {return m_errors;}
+
+    size_t line() const {return m_line;} // lines read so far
+
+  private:
+
+    CatalogueReader(const CatalogueReader&);            // not copyable, owns the file
+    CatalogueReader& operator=(const CatalogueReader&);
+
+    // returns the next line, without its '\n', or false at the end of
+    // the file
+    bool nextLine(const char** a_begin, const char** an_end, uint64_t* an_offset) throw (Error);
+
+    void parseLine(const char* a_begin, const char* an_end, const uint64_t& an_offset);
+    void checkRanges();
+    void addError(const size_t& a_row, const size_t& a_column, const char* a_reason);
+
+    std::FILE* m_file;
+    char       m_delimiter;
+    size_t     m_chunk_rows;
+    size_t     m_skip_lines;
+    bool       m_started; // columns are fixed
+
+    // columns
+    std::vector<size_t> m_fields;
+    std::vector<double> m_minimums;
+    std::vector<double> m_maximums;
+    std::vector<int>    m_field_columns; // column of each field, -1 if not read
+
+    // the current block of the file
+    std::vector<char> m_buffer;
+    size_t            m_begin;  // of the unread part
+    size_t            m_end;    // of the data
+    uint64_t          m_offset; // of m_buffer[0] in the file
+    bool              m_eof;
+    size_t            m_line;
+
+    // the current chunk
+    size_t                             m_rows;
+    std::vector<std::vector<double> >  m_values;
+    std::vector<size_t>                m_lines;
+    std::vector<uint64_t>              m_offsets;
+    std::vector<CatalogueError>        m_errors;
+
+  };
+
+} // end namespace Angles
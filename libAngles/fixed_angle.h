@@ -0,0 +1,193 @@
+// ================================================================
+// Filename:    fixed_angle.h
+//
+// Description: This is a declaration of a fixed point angle, an
+//              integer count of milli or micro seconds of arc, or of
+//              time for right ascension. Addition, subtraction and
+//              comparison are exact and cost an integer operation.
+//
+// Author:      L.R. McFarland, lrm@starbug.com
+// Created:     2026 Oct 18
+// Language:    C++
+//
+//  Angles is free software: you can redistribute it and/or modify it
+//  under the terms of the GNU General Public License as published by
+//  the Free Software Foundation, either version 3 of the License, or
+//  (at your option) any later version.
+//
+//  Angles is distributed in the hope that it will be useful, but
+//  WITHOUT ANY WARRANTY; without even the implied warranty of
+//  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+//  General Public License for more details.
+//
+//  You should have received a copy of the GNU General Public License
+//  along with Orbits.  If not, see <http://www.gnu.org/licenses/>.
+// ================================================================
+
+
+// Notes: FixedAngle<I> has no units of its own. Like Angle and LRA
+// its value() is in degrees, or hours for RA, and the count is that
+// times perUnit(). So a MilliarcsecondAngle made from an RA counts
+// milliseconds of time and normalize(WRAP_0_24) wraps it.
+//
+//   MilliarcsecondAngle, int32_t: 1 mas,  -596 to 596 degrees
+//   MicroarcsecondAngle, int64_t: 1 uas, about +/- 2.5e9 degrees
+//
+// Values are rounded to the nearest count on the way in. Arithmetic
+// that overflows the count raises RangeError. There are no range
+// limits otherwise, to<T>() applies T's on the way out.
+
+
+#pragma once
+
+#include <limits>
+#include <vector>
+
+#include <angles.h>
+#include <utils.h>
+
+namespace Angles {
+
+  // ======================
+  // ===== FixedScale =====
+  // ======================
+
+  // counts per degree, or per hour
+
+  template<typename I>
+    struct FixedScale {};
+
+  template<>
+    struct FixedScale<int32_t> {
+      static int32_t perUnit() {return 3600000;} // milliseconds
+    };
+
+  template<>
+    struct FixedScale<int64_t> {
+      static int64_t perUnit() {return 3600000000LL;} // microseconds
+    };
+
+
+  // ======================
+  // ===== FixedAngle =====
+  // ======================
+
+  template<typename I>
+    class FixedAngle {
+
+  public:
+
+    typedef I count_type;
+
+    static I      perUnit()    {return FixedScale<I>::perUnit();}
+    static double resolution() {return 1.0/perUnit();} // degrees or hours
+
+    // rounds a_value to the nearest count
+    static I      toCount(const double& a_value) throw (RangeError);
+
+    // ----- ctor and dtor -----
+
+    FixedAngle() : m_count(0) {}
+    explicit FixedAngle(const double& a_value) throw (RangeError) : m_count(toCount(a_value)) {}
+    explicit FixedAngle(const Angle& a) throw (RangeError) : m_count(toCount(a.value())) {}
+
+    template<int A_MINIMUM, int A_MAXIMUM>
+      explicit FixedAngle(const LRA<A_MINIMUM, A_MAXIMUM>& a) throw (RangeError)
+      : m_count(toCount(a.value())) {}
+
+    static FixedAngle fromCount(const I& a_count) {FixedAngle a; a.m_count = a_count; return a;}
+
+    ~FixedAngle() {};
+
+    // ----- accessors -----
+
+    void      count(const I& a_count) {m_count = a_count;}
+    const I&  count() const           {return m_count;}
+
+    void      setCount(const I& a_count) {m_count = a_count;} // for boost
+    I         getCount() const           {return m_count;}    // for boost
+
+    void      value(const double& a_value) throw (RangeError) {m_count = toCount(a_value);}
+    double    value() const {return m_count/static_cast<double>(perUnit());}
+
+    void      setValue(const double& a_value) throw (RangeError) {value(a_value);} // for boost
+    double    getValue() const {return value();}                                  // for boost
+
+    // e.g. a.to<Declination>(), raises RangeError if out of T's range
+    template<typename T>
+      T to() const throw (RangeError);
+
+    size_t    hash() const {return hashCount(m_count);}
+
+    // ----- boolean operators -----
+
+    bool operator== (const FixedAngle& rhs) const {return m_count == rhs.m_count;}
+    bool operator!= (const FixedAngle& rhs) const {return m_count != rhs.m_count;}
+
+    bool operator< (const FixedAngle& rhs) const  {return m_count < rhs.m_count;}
+    bool operator<= (const FixedAngle& rhs) const {return m_count <= rhs.m_count;}
+
+    bool operator> (const FixedAngle& rhs) const  {return m_count > rhs.m_count;}
+    bool operator>= (const FixedAngle& rhs) const {return m_count >= rhs.m_count;}
+
+    // ----- in-place operators -----
+
+    FixedAngle& operator+=(const FixedAngle& rhs) throw (RangeError);
+    FixedAngle& operator-=(const FixedAngle& rhs) throw (RangeError);
+    FixedAngle& operator*=(const I& rhs) throw (RangeError);
+
+    // ----- other methods -----
+
+    // exact, in counts
+    void normalize(const Wrap& a_wrap);
+
+  private:
+
+    I m_count;
+
+  };
+
+
+  // ===============================
+  // ===== FixedAngle typedefs =====
+  // ===============================
+
+  typedef FixedAngle<int32_t> MilliarcsecondAngle;
+  typedef FixedAngle<int64_t> MicroarcsecondAngle;
+
+
+  // ================================
+  // ===== FixedAngle operators =====
+  // ================================
+
+  template <typename I>
+    FixedAngle<I> operator+(const FixedAngle<I>& lhs, const FixedAngle<I>& rhs) throw (RangeError);
+  template <typename I>
+    FixedAngle<I> operator-(const FixedAngle<I>& lhs, const FixedAngle<I>& rhs) throw (RangeError);
+  template <typename I>
+    FixedAngle<I> operator-(const FixedAngle<I>& rhs) throw (RangeError); // unitary minus
+  template <typename I>
+    FixedAngle<I> operator*(const FixedAngle<I>& lhs, const I& rhs) throw (RangeError);
+  template <typename I>
+    FixedAngle<I> operator*(const I& lhs, const FixedAngle<I>& rhs) throw (RangeError);
+
+  template <typename I>
+    std::ostream& operator<< (std::ostream& os, const FixedAngle<I>& a);
+
+
+  // =================
+  // ===== batch =====
+  // =================
+
+  // degrees or hours to counts and back, e.g. to store a catalogue
+  // column in half the space. toCounts checks every value before
+  // writing any.
+
+  template <typename I>
+    void toCounts(const double* a_values, I* a_counts, const size_t& a_size) throw (RangeError);
+  template <typename I>
+    void fromCounts(const I* a_counts, double* a_values, const size_t& a_size);
+
+} // end namespace Angles
+
+#include <fixed_angle.hpp>
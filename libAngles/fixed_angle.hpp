@@ -0,0 +1,184 @@
+// ================================================================
+// Filename:    fixed_angle.hpp
+//
+// Description: This implements the FixedAngle template.
+//
+// Author:      L.R. McFarland, lrm@starbug.com
+// Created:     2026 Oct 18
+// Language:    C++
+//
+//  Angles is free software: you can redistribute it and/or modify it
+//  under the terms of the GNU General Public License as published by
+//  the Free Software Foundation, either version 3 of the License, or
+//  (at your option) any later version.
+//
+//  Angles is distributed in the hope that it will be useful, but
+//  WITHOUT ANY WARRANTY; without even the implied warranty of
+//  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+//  General Public License for more details.
+//
+//  You should have received a copy of the GNU General Public License
+//  along with Orbits.  If not, see <http://www.gnu.org/licenses/>.
+// ================================================================
+
+#pragma once
+
+#include <cmath>
+
+namespace Angles {
+
+  template<typename I>
+    I FixedAngle<I>::toCount(const double& a_value) throw (RangeError) {
+
+    const double a_count(floor(a_value*perUnit() + 0.5));
+
+    // -minimum is a power of 2, exact as a double, unlike maximum
+    const double a_minimum(std::numeric_limits<I>::min());
+
+    if (a_count < a_minimum)
+      throw RangeError("minimum exceeded");
+    if (!(a_count < -a_minimum)) // NaN too
+      throw RangeError(a_count != a_count ? "not a number" : "maximum exceeded");
+
+    return static_cast<I>(a_count);
+  }
+
+  template<typename I>
+    template<typename T>
+    T FixedAngle<I>::to() const throw (RangeError) {
+    T result;
+    result.setValue(value());
+    return result;
+  }
+
+  // ----- in-place operators -----
+
+  // overflow is checked before the operation, signed overflow is
+  // undefined.
+
+  template<typename I>
+    FixedAngle<I>& FixedAngle<I>::operator+=(const FixedAngle& rhs) throw (RangeError) {
+    if (rhs.m_count > 0 && m_count > std::numeric_limits<I>::max() - rhs.m_count)
+      throw RangeError("maximum exceeded");
+    if (rhs.m_count < 0 && m_count < std::numeric_limits<I>::min() - rhs.m_count)
+      throw RangeError("minimum exceeded");
+    m_count += rhs.m_count;
+    return *this;
+  }
+
+  template<typename I>
+    FixedAngle<I>& FixedAngle<I>::operator-=(const FixedAngle& rhs) throw (RangeError) {
+    if (rhs.m_count < 0 && m_count > std::numeric_limits<I>::max() + rhs.m_count)
+      throw RangeError("maximum exceeded");
+    if (rhs.m_count > 0 && m_count < std::numeric_limits<I>::min() + rhs.m_count)
+      throw RangeError("minimum exceeded");
+    m_count -= rhs.m_count;
+    return *this;
+  }
+
+  template<typename I>
+    FixedAngle<I>& FixedAngle<I>::operator*=(const I& rhs) throw (RangeError) {
+
+    const I a_maximum(std::numeric_limits<I>::max());
+    const I a_minimum(std::numeric_limits<I>::min());
+
+    bool overflow(false);
+    if (m_count > 0)
+      overflow = rhs > 0 ? m_count > a_maximum/rhs : rhs < a_minimum/m_count;
+    else if (m_count < 0)
+      overflow = rhs > 0 ? m_count < a_minimum/rhs : rhs != 0 && m_count < a_maximum/rhs;
+
+    if (overflow)
+      throw RangeError((m_count < 0) == (rhs < 0) ? "maximum exceeded" : "minimum exceeded");
+
+    m_count *= rhs;
+    return *this;
+  }
+
+  // ----- other methods -----
+
+  template<typename I>
+    void FixedAngle<I>::normalize(const Wrap& a_wrap) {
+
+    // same conventions as normalize() in utils.h
+    const I period((a_wrap == WRAP_0_24 ? 24 : 360)*perUnit());
+
+    I result(m_count % period); // (-period, period)
+
+    if (a_wrap == WRAP_180) {
+      if (result <= -period/2)
+	result += period;
+      else if (result > period/2)
+	result -= period;
+    } else if (result < 0) {
+      result += period;
+    }
+
+    m_count = result;
+  }
+
+  // ----- arithmetic operator function templates -----
+
+  // add
+  template <typename I>
+    FixedAngle<I> operator+(const FixedAngle<I>& lhs, const FixedAngle<I>& rhs) throw (RangeError) {
+    FixedAngle<I> result(lhs);
+    result += rhs;
+    return result;
+  }
+
+  // subtract
+  template <typename I>
+    FixedAngle<I> operator-(const FixedAngle<I>& lhs, const FixedAngle<I>& rhs) throw (RangeError) {
+    FixedAngle<I> result(lhs);
+    result -= rhs;
+    return result;
+  }
+
+  // unitary minus
+  template <typename I>
+    FixedAngle<I> operator-(const FixedAngle<I>& rhs) throw (RangeError) {
+    FixedAngle<I> result;
+    result -= rhs;
+    return result;
+  }
+
+  // multiply
+  template <typename I>
+    FixedAngle<I> operator*(const FixedAngle<I>& lhs, const I& rhs) throw (RangeError) {
+    FixedAngle<I> result(lhs);
+    result *= rhs;
+    return result;
+  }
+
+  template <typename I>
+    FixedAngle<I> operator*(const I& lhs, const FixedAngle<I>& rhs) throw (RangeError) {
+    return rhs*lhs;
+  }
+
+  template <typename I>
+    std::ostream& operator<< (std::ostream& os, const FixedAngle<I>& a) {
+    char buffer[MAX_SEXAGESIMAL_STRING];
+    value2DMSString(a.value(), buffer, sizeof(buffer), os.precision());
+    return os << buffer;
+  }
+
+  // ----- batch -----
+
+  template <typename I>
+    void toCounts(const double* a_values, I* a_counts, const size_t& a_size) throw (RangeError) {
+    std::vector<I> result(a_size);
+    for (size_t i = 0; i < a_size; ++i)
+      result[i] = FixedAngle<I>::toCount(a_values[i]);
+    for (size_t i = 0; i < a_size; ++i)
+      a_counts[i] = result[i];
+  }
+
+  template <typename I>
+    void fromCounts(const I* a_counts, double* a_values, const size_t& a_size) {
+    const double scale(FixedAngle<I>::perUnit()); // divide, not multiply, to match value()
+    for (size_t i = 0; i < a_size; ++i)
+      a_values[i] = a_counts[i]/scale;
+  }
+
+}
@@ -0,0 +1,457 @@
+// ================================================================
+// Filename:    htm.cpp
+// Description: Hierarchical Triangular Mesh ids and index.
+//
+// Author:      L.R. McFarland, lrm@starbug.com
+// Created:     2026 Oct 18
+// Language:    C++
+//
+//  Angles is free software: you can redistribute it and/or modify it
+//  under the terms of the GNU General Public License as published by
+//  the Free Software Foundation, either version 3 of the License, or
+//  (at your option) any later version.
+//
+//  Angles is distributed in the hope that it will be useful, but
+//  WITHOUT ANY WARRANTY; without even the implied warranty of
+//  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+//  General Public License for more details.
+//
+//  You should have received a copy of the GNU General Public License
+//  along with Orbits.  If not, see <http://www.gnu.org/licenses/>.
+// ================================================================
+
+#include <algorithm>
+#include <cmath>
+
+#include <htm.h>
+#include <parallel.h>
+#include <sky.h>
+
+// ===================
+// ===== vectors =====
+// ===================
+
+namespace {
+
+  struct Vector {
+    Vector(const double& an_x = 0, const double& a_y = 0, const double& a_z = 0)
+      : x(an_x), y(a_y), z(a_z) {}
+    double x, y, z;
+  };
+
+  inline double dot(const Vector& a, const Vector& b) {
+    return a.x*b.x + a.y*b.y + a.z*b.z;
+  }
+
+  inline Vector cross(const Vector& a, const Vector& b) {
+    return Vector(a.y*b.z - a.z*b.y, a.z*b.x - a.x*b.z, a.x*b.y - a.y*b.x);
+  }
+
+  inline Vector unit(const Vector& a) {
+    const double length(sqrt(dot(a, a)));
+    return Vector(a.x/length, a.y/length, a.z/length);
+  }
+
+  inline Vector midpoint(const Vector& a, const Vector& b) {
+    return unit(Vector(a.x + b.x, a.y + b.y, a.z + b.z));
+  }
+
+  // ra in hours, dec in degrees
+  Vector toVector(const double& a_ra, const double& a_dec) {
+    const double ra(a_ra*M_PI/12.0);
+    const double dec(a_dec*M_PI/180.0);
+    return Vector(cos(dec)*cos(ra), cos(dec)*sin(ra), sin(dec));
+  }
+
+  void checkDepth(const int& a_depth) throw (Angles::RangeError) {
+    if (a_depth < 0)
+      throw Angles::RangeError("minimum exceeded");
+    if (a_depth > Angles::MAX_HTM_DEPTH)
+      throw Angles::RangeError("maximum exceeded");
+  }
+
+
+  // ===================
+  // ===== trixels =====
+  // ===================
+
+  struct Trixel {
+    Vector v[3]; // counterclockwise seen from outside
+  };
+
+  const Vector sVertices[6] = {Vector(0, 0, 1), Vector(1, 0, 0), Vector(0, 1, 0),
+			       Vector(-1, 0, 0), Vector(0, -1, 0), Vector(0, 0, -1)};
+
+  // S0, S1, S2, S3, N0, N1, N2, N3, ids 8 to 15
+  const int sRoots[8][3] = {{1, 5, 2}, {2, 5, 3}, {3, 5, 4}, {4, 5, 1},
+			    {1, 0, 4}, {4, 0, 3}, {3, 0, 2}, {2, 0, 1}};
+
+  Trixel root(const int& i) {
+    Trixel result;
+    for (int j = 0; j < 3; ++j)
+      result.v[j] = sVertices[sRoots[i][j]];
+    return result;
+  }
+
+  void children(const Trixel& a_parent, Trixel* some_children) {
+    const Vector& a(a_parent.v[0]);
+    const Vector& b(a_parent.v[1]);
+    const Vector& c(a_parent.v[2]);
+    const Vector w0(midpoint(b, c));
+    const Vector w1(midpoint(a, c));
+    const Vector w2(midpoint(a, b));
+    some_children[0].v[0] = a;  some_children[0].v[1] = w2; some_children[0].v[2] = w1;
+    some_children[1].v[0] = b;  some_children[1].v[1] = w0; some_children[1].v[2] = w2;
+    some_children[2].v[0] = c;  some_children[2].v[1] = w1; some_children[2].v[2] = w0;
+    some_children[3].v[0] = w0; some_children[3].v[1] = w1; some_children[3].v[2] = w2;
+  }
+
+  // how far inside a trixel a point is, >= 0 if inside or on an edge
+  double inside(const Trixel& a_trixel, const Vector& a_point) {
+    const double d0(dot(cross(a_trixel.v[0], a_trixel.v[1]), a_point));
+    const double d1(dot(cross(a_trixel.v[1], a_trixel.v[2]), a_point));
+    const double d2(dot(cross(a_trixel.v[2], a_trixel.v[0]), a_point));
+    return std::min(d0, std::min(d1, d2));
+  }
+
+  // The first of some_trixels that holds a_point. Rounding can leave a
+  // point on an edge just outside all of them, then the nearest.
+  int locate(const Trixel* some_trixels, const int& a_size, const Vector& a_point) {
+    int result(0);
+    double a_best(inside(some_trixels[0], a_point));
+    for (int i = 1; i < a_size && a_best < 0; ++i) {
+      const double a_distance(inside(some_trixels[i], a_point));
+      if (a_distance > a_best) {
+	a_best = a_distance;
+	result = i;
+      }
+    }
+    return result;
+  }
+
+  uint64_t vectorId(const Vector& a_point, const int& a_depth) {
+
+    Trixel some_roots[8];
+    for (int i = 0; i < 8; ++i)
+      some_roots[i] = root(i);
+
+    int i(locate(some_roots, 8, a_point));
+    uint64_t result(8 + i);
+    Trixel a_trixel(some_roots[i]);
+
+    for (int level = 0; level < a_depth; ++level) {
+      Trixel some_children[4];
+      children(a_trixel, some_children);
+      i = locate(some_children, 4, a_point);
+      result = 4*result + i;
+      a_trixel = some_children[i];
+    }
+
+    return result;
+  }
+
+  // a part of htmIds, split across threads by parallelFor
+  struct IdsPart {
+    const double* m_ras;
+    const double* m_decs;
+    uint64_t*     m_ids;
+    int           m_depth;
+    void operator()(const size_t&, const size_t& a_begin, const size_t& an_end) {
+      for (size_t i = a_begin; i < an_end; ++i)
+	m_ids[i] = vectorId(toVector(m_ras[i], m_decs[i]), m_depth);
+    }
+  };
+
+}
+
+
+// ===================
+// ===== regions =====
+// ===================
+
+namespace Angles {
+
+  // A region classifies trixels as outside, partly inside or inside,
+  // conservatively, partly inside when in doubt, and tests points
+  // exactly.
+
+  class HTMRegion {
+  public:
+    enum Cover {OUTSIDE, PARTIAL, INSIDE};
+    virtual ~HTMRegion() {}
+    virtual Cover cover(const Trixel& a_trixel) const = 0;
+    virtual bool  contains(const Vector& a_point) const = 0;
+  };
+
+}
+
+namespace {
+
+  // A cap, compared with the bounding cap of each trixel, around the
+  // middle of its corners. That works for any radius.
+  class Cap : public Angles::HTMRegion {
+
+  public:
+
+    Cap(const Vector& a_center, const double& a_radius)
+      : m_center(a_center), m_radius(a_radius*M_PI/180.0), m_cosine(cos(m_radius)) {}
+
+    Cover cover(const Trixel& a_trixel) const {
+      const Vector a_middle(unit(Vector(a_trixel.v[0].x + a_trixel.v[1].x + a_trixel.v[2].x,
+					a_trixel.v[0].y + a_trixel.v[1].y + a_trixel.v[2].y,
+					a_trixel.v[0].z + a_trixel.v[1].z + a_trixel.v[2].z)));
+      const double a_size(std::max(angle(a_middle, a_trixel.v[0]),
+				   std::max(angle(a_middle, a_trixel.v[1]), angle(a_middle, a_trixel.v[2]))));
+      const double a_distance(angle(m_center, a_middle));
+      if (a_distance - a_size > m_radius)
+	return OUTSIDE;
+      if (a_distance + a_size <= m_radius)
+	return INSIDE;
+      return PARTIAL;
+    }
+
+    bool contains(const Vector& a_point) const {
+      return dot(m_center, a_point) >= m_cosine;
+    }
+
+  private:
+
+    static double angle(const Vector& a, const Vector& b) {
+      const double a_cosine(dot(a, b));
+      return acos(a_cosine > 1 ? 1 : (a_cosine < -1 ? -1 : a_cosine));
+    }
+
+    Vector m_center;
+    double m_radius;
+    double m_cosine;
+
+  };
+
+
+  // The intersection of the hemispheres to the inside of each edge.
+  // Each hemisphere is convex, so a trixel with all its corners outside
+  // any one is outside and one with all its corners inside every one
+  // is inside.
+  class ConvexPolygon : public Angles::HTMRegion {
+
+  public:
+
+    ConvexPolygon(const double* some_ras, const double* some_decs, const size_t& a_size)
+      throw (Angles::Error) {
+
+      if (a_size < 3)
+	throw Angles::Error("polygon needs at least 3 vertices");
+
+      std::vector<Vector> some_vertices;
+      Vector a_sum;
+      for (size_t i = 0; i < a_size; ++i) {
+	Angles::validPosition(some_ras[i], some_decs[i]);
+	some_vertices.push_back(toVector(some_ras[i], some_decs[i]));
+	a_sum = Vector(a_sum.x + some_vertices[i].x, a_sum.y + some_vertices[i].y,
+		       a_sum.z + some_vertices[i].z);
+      }
+
+      for (size_t i = 0; i < a_size; ++i)
+	m_normals.push_back(cross(some_vertices[i], some_vertices[(i + 1) % a_size]));
+
+      // clockwise vertices give inward normals pointing away from the
+      // middle, turn them round.
+      const double a_sign(dot(m_normals[0], a_sum) < 0 ? -1 : 1);
+      for (size_t i = 0; i < a_size; ++i)
+	m_normals[i] = Vector(a_sign*m_normals[i].x, a_sign*m_normals[i].y, a_sign*m_normals[i].z);
+
+      const double a_tolerance(1e-12);
+      for (size_t i = 0; i < a_size; ++i) {
+	if (dot(m_normals[i], m_normals[i]) < a_tolerance*a_tolerance)
+	  throw Angles::Error("polygon has a zero length or 180 degree edge");
+	for (size_t j = 0; j < a_size; ++j)
+	  if (!(dot(m_normals[i], some_vertices[j]) >= -a_tolerance))
+	    throw Angles::Error("polygon is not convex");
+      }
+    }
+
+    Cover cover(const Trixel& a_trixel) const {
+      bool is_inside(true);
+      for (size_t i = 0; i < m_normals.size(); ++i) {
+	size_t corners(0);
+	for (int j = 0; j < 3; ++j)
+	  corners += dot(m_normals[i], a_trixel.v[j]) >= 0;
+	if (corners == 0)
+	  return OUTSIDE;
+	is_inside = is_inside && corners == 3;
+      }
+      return is_inside ? INSIDE : PARTIAL;
+    }
+
+    bool contains(const Vector& a_point) const {
+      for (size_t i = 0; i < m_normals.size(); ++i)
+	if (dot(m_normals[i], a_point) < 0)
+	  return false;
+      return true;
+    }
+
+  private:
+
+    std::vector<Vector> m_normals; // inward
+
+  };
+
+
+  // id ranges [first, last) at the index depth, whole or to test
+  struct Span {
+    Span(const uint64_t& a_first, const uint64_t& a_last, const bool& is_whole)
+      : first(a_first), last(a_last), whole(is_whole) {}
+    uint64_t first;
+    uint64_t last;
+    bool     whole;
+  };
+
+  void cover(const Angles::HTMRegion& a_region, const Trixel& a_trixel, const uint64_t& an_id,
+	     const int& a_level, const int& a_depth, std::vector<Span>& some_spans) {
+
+    const Angles::HTMRegion::Cover a_cover(a_region.cover(a_trixel));
+    if (a_cover == Angles::HTMRegion::OUTSIDE)
+      return;
+
+    const int shift(2*(a_depth - a_level));
+
+    if (a_cover == Angles::HTMRegion::INSIDE || a_level == a_depth) {
+      some_spans.push_back(Span(an_id << shift, (an_id + 1) << shift,
+				a_cover == Angles::HTMRegion::INSIDE));
+      return;
+    }
+
+    Trixel some_children[4];
+    children(a_trixel, some_children);
+    for (int i = 0; i < 4; ++i)
+      cover(a_region, some_children[i], 4*an_id + i, a_level + 1, a_depth, some_spans);
+  }
+
+}
+
+
+// ===============
+// ===== HTM =====
+// ===============
+
+uint64_t Angles::htmId(const double& a_ra, const double& a_dec, const int& a_depth)
+  throw (RangeError) {
+  checkDepth(a_depth);
+  Angles::validPosition(a_ra, a_dec);
+  return vectorId(toVector(a_ra, a_dec), a_depth);
+}
+
+void Angles::htmIds(const double* some_ras, const double* some_decs, uint64_t* some_ids,
+		    const size_t& a_size, const int& a_depth) throw (RangeError) {
+  // check first so some_ids is untouched on error
+  checkDepth(a_depth);
+  for (size_t i = 0; i < a_size; ++i)
+    Angles::validPosition(some_ras[i], some_decs[i]);
+  IdsPart a_kernel = {some_ras, some_decs, some_ids, a_depth};
+  parallelFor(a_size, a_kernel);
+}
+
+int Angles::htmDepth(const uint64_t& an_id) throw (RangeError) {
+  int bits(0);
+  for (uint64_t an_rest = an_id; an_rest != 0; an_rest >>= 1)
+    ++bits;
+  if (bits < 4 || bits % 2 != 0 || (bits - 4)/2 > MAX_HTM_DEPTH)
+    throw RangeError("not an htm id");
+  return (bits - 4)/2;
+}
+
+std::string Angles::htmName(const uint64_t& an_id) throw (RangeError) {
+  const int a_depth(htmDepth(an_id));
+  const uint64_t a_root(an_id >> 2*a_depth);
+  std::string result(a_root < 12 ? "S" : "N");
+  result += static_cast<char>('0' + (a_root & 3));
+  for (int level = a_depth - 1; level >= 0; --level)
+    result += static_cast<char>('0' + ((an_id >> 2*level) & 3));
+  return result;
+}
+
+
+// ====================
+// ===== HTMIndex =====
+// ====================
+
+Angles::HTMIndex::HTMIndex(const int& a_depth) throw (RangeError) : m_depth(a_depth) {
+  checkDepth(a_depth);
+}
+
+// ----- update -----
+
+void Angles::HTMIndex::insert(const double* some_ras, const double* some_decs, const size_t& a_size)
+  throw (RangeError) {
+
+  for (size_t i = 0; i < a_size; ++i)
+    Angles::validPosition(some_ras[i], some_decs[i]);
+
+  const size_t a_start(m_entries.size());
+
+  m_entries.reserve(a_start + a_size);
+  m_points.reserve(m_points.size() + 3*a_size);
+
+  for (size_t i = 0; i < a_size; ++i) {
+    const Vector a_point(toVector(some_ras[i], some_decs[i]));
+    m_entries.push_back(std::make_pair(vectorId(a_point, m_depth), a_start + i));
+    m_points.push_back(a_point.x);
+    m_points.push_back(a_point.y);
+    m_points.push_back(a_point.z);
+  }
+
+  std::sort(m_entries.begin() + a_start, m_entries.end());
+  std::inplace_merge(m_entries.begin(), m_entries.begin() + a_start, m_entries.end());
+}
+
+void Angles::HTMIndex::insert(const RA& an_ra, const Declination& a_dec) {
+  const double ra(an_ra.value());
+  const double dec(a_dec.value());
+  insert(&ra, &dec, 1);
+}
+
+void Angles::HTMIndex::clear() {
+  m_entries.clear();
+  m_points.clear();
+}
+
+// ----- queries -----
+
+size_t Angles::HTMIndex::query(const HTMRegion& a_region, std::vector<size_t>& some_positions) const {
+
+  std::vector<Span> some_spans;
+  for (int i = 0; i < 8; ++i)
+    cover(a_region, root(i), 8 + i, 0, m_depth, some_spans);
+
+  const size_t a_start(some_positions.size());
+
+  for (size_t i = 0; i < some_spans.size(); ++i) {
+
+    std::vector<std::pair<uint64_t, size_t> >::const_iterator an_entry
+      (std::lower_bound(m_entries.begin(), m_entries.end(), std::make_pair(some_spans[i].first, size_t(0))));
+
+    for (; an_entry != m_entries.end() && an_entry->first < some_spans[i].last; ++an_entry) {
+      const double* a_point(&m_points[3*an_entry->second]);
+      if (some_spans[i].whole || a_region.contains(Vector(a_point[0], a_point[1], a_point[2])))
+	some_positions.push_back(an_entry->second);
+    }
+
+  }
+
+  std::sort(some_positions.begin() + a_start, some_positions.end());
+
+  return some_positions.size() - a_start;
+}
+
+size_t Angles::HTMIndex::circle(const double& a_ra, const double& a_dec, const double& a_radius,
+				std::vector<size_t>& some_positions) const {
+  // NaN would be partly inside every trixel
+  if (a_ra != a_ra || a_dec != a_dec || !(a_radius >= 0))
+    return 0;
+  return query(Cap(toVector(a_ra, a_dec), a_radius), some_positions);
+}
+
+size_t Angles::HTMIndex::polygon(const double* some_ras, const double* some_decs, const size_t& a_size,
+				 std::vector<size_t>& some_positions) const throw (Error) {
+  return query(ConvexPolygon(some_ras, some_decs, a_size), some_positions);
+}
@@ -0,0 +1,137 @@
+// ================================================================
+// Filename:    htm.h
+//
+// Description: This is a declaration of a Hierarchical Triangular
+//              Mesh (HTM) index of positions on the sky, right
+//              ascension and declination pairs, e.g. to crossmatch a
+//              catalogue or find everything in a circle or polygon
+//              without comparing every position.
+//
+// Author:      L.R. McFarland, lrm@starbug.com
+// Created:     2026 Oct 18
+// Language:    C++
+//
+//  Angles is free software: you can redistribute it and/or modify it
+//  under the terms of the GNU General Public License as published by
+//  the Free Software Foundation, either version 3 of the License, or
+//  (at your option) any later version.
+//
+//  Angles is distributed in the hope that it will be useful, but
+//  WITHOUT ANY WARRANTY; without even the implied warranty of
+//  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+//  General Public License for more details.
+//
+//  You should have received a copy of the GNU General Public License
+//  along with Orbits.  If not, see <http://www.gnu.org/licenses/>.
+// ================================================================
+
+
+// Notes: The mesh starts from the eight octants of the sphere, the
+// depth 0 trixels S0-S3 and N0-N3 with ids 8 to 15. Each level splits
+// every trixel into four at the midpoints of its edges and appends two
+// bits to its id, so a depth d id has 4 + 2d bits and all the ids under
+// a trixel form one contiguous range. Depth 12 trixels are about 1.5
+// arcminutes across, depth 20 about 0.3 arcseconds.
+//
+// HTMIndex keeps the depth d id of each position sorted, with the
+// position's number in insertion order. A region query walks down the
+// mesh from the octants. A trixel entirely inside the region takes
+// its whole id range, one that is partly inside is split further, and
+// at depth d the positions in partly covered trixels are tested
+// exactly. The cost depends on the region, not the catalogue size.
+//
+// As in sky.h right ascension is in hours and declination and radii
+// in degrees.
+//
+// Polygons are convex, with vertices in either order and each edge
+// shorter than 180 degrees.
+
+
+#pragma once
+
+#include <stdint.h>
+#include <string>
+#include <utility>
+#include <vector>
+
+#include <angles.h>
+
+namespace Angles {
+
+  // ===============
+  // ===== HTM =====
+  // ===============
+
+  const int MAX_HTM_DEPTH = 24;
+
+  // raises RangeError for an ra, dec or depth out of range
+  uint64_t htmId(const double& a_ra, const double& a_dec, const int& a_depth) throw (RangeError);
+  void htmIds(const double* some_ras, const double* some_decs, uint64_t* some_ids,
+	      const size_t& a_size, const int& a_depth) throw (RangeError);
+
+  // depth of an id, raises RangeError if it is not a valid id
+  int htmDepth(const uint64_t& an_id) throw (RangeError);
+
+  // "N0", "S312", ...
+  std::string htmName(const uint64_t& an_id) throw (RangeError);
+
+
+  // ====================
+  // ===== HTMIndex =====
+  // ====================
+
+  class HTMRegion; // a circle or polygon, see htm.cpp
+
+  class HTMIndex {
+
+  public:
+
+    // ----- ctor and dtor -----
+
+    explicit HTMIndex(const int& a_depth = 12) throw (RangeError);
+
+    ~HTMIndex() {};
+
+    // ----- accessors -----
+
+    const int& depth() const {return m_depth;}
+    size_t     size() const {return m_entries.size();}
+    bool       empty() const {return m_entries.empty();}
+
+    // ----- update -----
+
+    // Appends positions, numbered on from size(), in one sort and
+    // merge. Raises RangeError and leaves the index unchanged if any
+    // is out of range.
+    void insert(const double* some_ras, const double* some_decs, const size_t& a_size)
+      throw (RangeError);
+
+    void insert(const RA& an_ra, const Declination& a_dec);
+
+    void clear();
+
+    // ----- queries -----
+
+    // Append the numbers of the positions within a_radius of (a_ra,
+    // a_dec), or inside the polygon, to some_positions in ascending
+    // order and return the number appended. polygon raises Error for
+    // fewer than 3 vertices or a polygon that is not convex.
+
+    size_t circle(const double& a_ra, const double& a_dec, const double& a_radius,
+		  std::vector<size_t>& some_positions) const;
+
+    size_t polygon(const double* some_ras, const double* some_decs, const size_t& a_size,
+		   std::vector<size_t>& some_positions) const throw (Error);
+
+  private:
+
+    size_t query(const HTMRegion& a_region, std::vector<size_t>& some_positions) const;
+
+    int m_depth;
+
+    std::vector<std::pair<uint64_t, size_t> > m_entries; // id, position, sorted
+    std::vector<double>                       m_points;  // x, y, z of each position
+
+  };
+
+} // end namespace Angles
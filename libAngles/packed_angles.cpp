@@ -0,0 +1,168 @@
+// ================================================================
+// Filename:    packed_angles.cpp
+// Description: Packs the raw values of lists of angles into one buffer.
+//
+// Author:      L.R. McFarland, lrm@starbug.com
+// Created:     2026 Oct 18
+// Language:    C++
+//
+//  Angles is free software: you can redistribute it and/or modify it
+//  under the terms of the GNU General Public License as published by
+//  the Free Software Foundation, either version 3 of the License, or
+//  (at your option) any later version.
+//
+//  Angles is distributed in the hope that it will be useful, but
+//  WITHOUT ANY WARRANTY; without even the implied warranty of
+//  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+//  General Public License for more details.
+//
+//  You should have received a copy of the GNU General Public License
+//  along with Orbits.  If not, see <http://www.gnu.org/licenses/>.
+// ================================================================
+
+#include <limits>
+
+#include <string.h>  /* memcpy, memcmp */
+
+#include <angles.h>
+#include <packed_angles.h>
+
+namespace {
+
+  const char     sMagic[8] = {'A', 'N', 'G', 'L', 'P', 'A', 'K', '\0'};
+  const uint32_t sVersion(1);
+  const uint32_t sMixed(255);
+
+  const size_t sHeaderSize(24);
+  const size_t sAlignment(8);
+
+  inline size_t align(const size_t& a_size) {return (a_size + sAlignment - 1)/sAlignment*sAlignment;}
+
+  inline bool isLittleEndian() {
+    const uint16_t one(1);
+    return *reinterpret_cast<const unsigned char*>(&one) == 1;
+  }
+
+  inline bool isPackType(const uint32_t& a_code) {
+    return a_code <= Angles::PACK_MICROARCSECOND_ANGLE;
+  }
+
+  // raises RangeError if a_value is out of a_type's range
+  void validPacked(const Angles::PackType& a_type, const Angles::PackedValue& a_value) throw (Angles::RangeError) {
+    switch (a_type) {
+    case Angles::PACK_LIMITED_RANGE_ANGLE:
+      Angles::throwStatus(Angles::LimitedRangeAngle::rangeStatus(a_value.m_value));
+      break;
+    case Angles::PACK_DECLINATION:
+      Angles::throwStatus(Angles::Declination::rangeStatus(a_value.m_value));
+      break;
+    case Angles::PACK_LATITUDE:
+      Angles::throwStatus(Angles::Latitude::rangeStatus(a_value.m_value));
+      break;
+    case Angles::PACK_LONGITUDE:
+      Angles::throwStatus(Angles::Longitude::rangeStatus(a_value.m_value));
+      break;
+    case Angles::PACK_RA:
+      Angles::throwStatus(Angles::RA::rangeStatus(a_value.m_value));
+      break;
+    case Angles::PACK_MILLIARCSECOND_ANGLE: // an int32_t count
+      if (a_value.m_count < std::numeric_limits<int32_t>::min())
+	throw Angles::RangeError("minimum exceeded");
+      if (a_value.m_count > std::numeric_limits<int32_t>::max())
+	throw Angles::RangeError("maximum exceeded");
+      break;
+    default:
+      break;
+    }
+  }
+
+}
+
+
+// ----- pack -----
+
+std::string Angles::packAngles(const PackType* some_types, const PackedValue* some_values,
+			       const size_t& a_size) throw (Error) {
+
+  if (!isLittleEndian())
+    throw Error("packed angles need a little endian host");
+
+  uint32_t a_type(a_size > 0 ? some_types[0] : PACK_ANGLE);
+  for (size_t i = 0; i < a_size; ++i) {
+    if (!isPackType(some_types[i]))
+      throw Error("unknown packed angle type");
+    if (static_cast<uint32_t>(some_types[i]) != a_type)
+      a_type = sMixed;
+  }
+
+  const size_t a_types_size(a_type == sMixed ? align(a_size) : 0);
+
+  std::string a_buffer(sHeaderSize + a_types_size + a_size*sizeof(PackedValue), '\0');
+  char* a_data(&a_buffer[0]);
+
+  const uint64_t a_size_code(a_size);
+  memcpy(a_data, sMagic, sizeof(sMagic));
+  memcpy(a_data + 8, &sVersion, sizeof(sVersion));
+  memcpy(a_data + 12, &a_type, sizeof(a_type));
+  memcpy(a_data + 16, &a_size_code, sizeof(a_size_code));
+
+  if (a_type == sMixed)
+    for (size_t i = 0; i < a_size; ++i)
+      a_data[sHeaderSize + i] = static_cast<char>(some_types[i]);
+
+  if (a_size > 0)
+    memcpy(a_data + sHeaderSize + a_types_size, some_values, a_size*sizeof(PackedValue));
+
+  return a_buffer;
+}
+
+
+// ----- unpack -----
+
+void Angles::unpackAngles(const char* a_data, const size_t& a_length,
+			  std::vector<PackType>& some_types,
+			  std::vector<PackedValue>& some_values) throw (Error) {
+
+  if (!isLittleEndian())
+    throw Error("packed angles need a little endian host");
+
+  if (a_length < sHeaderSize || memcmp(a_data, sMagic, sizeof(sMagic)) != 0)
+    throw Error("not packed angles");
+
+  uint32_t a_version(0);
+  uint32_t a_type(0);
+  uint64_t a_size_code(0);
+  memcpy(&a_version, a_data + 8, sizeof(a_version));
+  memcpy(&a_type, a_data + 12, sizeof(a_type));
+  memcpy(&a_size_code, a_data + 16, sizeof(a_size_code));
+
+  if (a_version != sVersion || (a_type != sMixed && !isPackType(a_type)))
+    throw Error("not packed angles");
+
+  // bounds the size before it is multiplied
+  if (a_size_code > (a_length - sHeaderSize)/sizeof(PackedValue))
+    throw Error("packed angles are truncated");
+
+  const size_t a_size(a_size_code);
+  const size_t a_types_size(a_type == sMixed ? align(a_size) : 0);
+
+  if (a_length != sHeaderSize + a_types_size + a_size*sizeof(PackedValue))
+    throw Error("packed angles are truncated");
+
+  some_types.resize(a_size);
+  some_values.resize(a_size);
+
+  if (a_size == 0)
+    return;
+
+  memcpy(&some_values[0], a_data + sHeaderSize + a_types_size, a_size*sizeof(PackedValue));
+
+  for (size_t i = 0; i < a_size; ++i) {
+    const uint32_t a_code(a_type == sMixed ? static_cast<unsigned char>(a_data[sHeaderSize + i]) : a_type);
+    if (!isPackType(a_code))
+      throw Error("unknown packed angle type");
+    some_types[i] = static_cast<PackType>(a_code);
+    validPacked(some_types[i], some_values[i]);
+  }
+
+}
@@ -0,0 +1,86 @@
+// ================================================================
+// Filename:    packed_angles.h
+//
+// Description: This is a declaration of a packed buffer of angles, the
+//              raw values of a list of angles in one block of bytes,
+//              so queues and pickles move bytes and not objects.
+//
+// Author:      L.R. McFarland, lrm@starbug.com
+// Created:     2026 Oct 18
+// Language:    C++
+//
+//  Angles is free software: you can redistribute it and/or modify it
+//  under the terms of the GNU General Public License as published by
+//  the Free Software Foundation, either version 3 of the License, or
+//  (at your option) any later version.
+//
+//  Angles is distributed in the hope that it will be useful, but
+//  WITHOUT ANY WARRANTY; without even the implied warranty of
+//  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+//  General Public License for more details.
+//
+//  You should have received a copy of the GNU General Public License
+//  along with Orbits.  If not, see <http://www.gnu.org/licenses/>.
+// ================================================================
+
+
+// Notes: The buffer is a 24 byte header, the types if they differ and
+// the values.
+//
+//   offset  size
+//        0     8  magic, "ANGLPAK\0"
+//        8     4  version, 1
+//       12     4  type, a PackType, or 255 if they differ
+//       16     8  size, the number of values
+//       24     n  if they differ, one PackType byte per value, '\0'
+//                 padded to a multiple of 8
+//      ...   8*n  the values, little endian
+//
+// A value is the raw value of its angle, the degrees or hours of the
+// double types and the count of the fixed ones, so unpacking is exact.
+// A list of one type, the usual case, costs 8 bytes an angle.
+//
+// Only little endian hosts are supported, as for binary catalogues.
+
+
+#pragma once
+
+#include <string>
+#include <vector>
+
+#include <stdint.h>  /* int64_t */
+
+#include <utils.h>
+
+namespace Angles {
+
+  enum PackType {
+    PACK_ANGLE,
+    PACK_LIMITED_RANGE_ANGLE,
+    PACK_DECLINATION,
+    PACK_LATITUDE,
+    PACK_LONGITUDE,
+    PACK_RA,
+    PACK_MILLIARCSECOND_ANGLE,
+    PACK_MICROARCSECOND_ANGLE
+  };
+
+  // the degrees or hours of the double types, the count of the fixed ones
+  union PackedValue {
+    double  m_value;
+    int64_t m_count;
+  };
+
+  // Packs a_size values, some_types has one entry per value. Raises
+  // Error on a big endian host or for an unknown type.
+  std::string packAngles(const PackType* some_types, const PackedValue* some_values,
+			 const size_t& a_size) throw (Error);
+
+  // Unpacks a buffer from packAngles() into some_types and
+  // some_values. Raises Error if it is not one or is truncated and
+  // RangeError if a value is out of its type's range.
+  void unpackAngles(const char* a_data, const size_t& a_length,
+		    std::vector<PackType>& some_types,
+		    std::vector<PackedValue>& some_values) throw (Error);
+
+} // end namespace Angles
@@ -0,0 +1,219 @@
+// ================================================================
+// Filename:    parallel.cpp
+// Description: A pool of threads for the batch kernels.
+//
+// Author:      L.R. McFarland, lrm@starbug.com
+// Created:     2026 Oct 18
+// Language:    C++
+//
+//  Angles is free software: you can redistribute it and/or modify it
+//  under the terms of the GNU General Public License as published by
+//  the Free Software Foundation, either version 3 of the License, or
+//  (at your option) any later version.
+//
+//  Angles is distributed in the hope that it will be useful, but
+//  WITHOUT ANY WARRANTY; without even the implied warranty of
+//  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+//  General Public License for more details.
+//
+//  You should have received a copy of the GNU General Public License
+//  along with Orbits.  If not, see <http://www.gnu.org/licenses/>.
+// ================================================================
+
+#include <pthread.h>
+#include <signal.h>  /* pthread_sigmask */
+#include <unistd.h>  /* sysconf */
+
+#include <parallel.h>
+
+namespace {
+
+  const size_t sLineSize(8); // doubles in a cache line
+
+  pthread_mutex_t sBusy = PTHREAD_MUTEX_INITIALIZER;  // held by the call using the pool
+  pthread_mutex_t sMutex = PTHREAD_MUTEX_INITIALIZER; // guards the rest
+  pthread_cond_t  sStart = PTHREAD_COND_INITIALIZER;
+  pthread_cond_t  sFinish = PTHREAD_COND_INITIALIZER;
+
+  // settings
+  size_t sThreads(0); // 0 for the processors online
+  size_t sThreshold(32768);
+
+  // the pool
+  size_t sWorkers(0);
+  bool   sForkHandlers(false);
+
+  // the current call
+  Angles::RangeFunction sFunction(NULL);
+  void*                 sContext(NULL);
+  size_t                sSize(0);
+  size_t                sParts(0);
+  size_t                sNext(0); // part to start
+  size_t                sDone(0); // parts finished
+
+  size_t processors() {
+    const long a_count(sysconf(_SC_NPROCESSORS_ONLN));
+    return a_count > 0 ? a_count : 1;
+  }
+
+  // the start of a_part, the end of the last part is a_size
+  size_t partBegin(const size_t& a_part, const size_t& a_size, const size_t& a_parts) {
+    if (a_part >= a_parts)
+      return a_size;
+    const size_t a_begin((a_size/a_parts)*a_part + (a_size%a_parts)*a_part/a_parts);
+    return a_begin - a_begin%sLineSize;
+  }
+
+  // Runs parts of the current call until none are left. Called and
+  // returns with sMutex held.
+  void runParts() {
+    while (sNext < sParts) {
+      const size_t a_part(sNext++);
+      const Angles::RangeFunction a_function(sFunction);
+      void* a_context(sContext);
+      const size_t a_size(sSize);
+      const size_t a_parts(sParts);
+      pthread_mutex_unlock(&sMutex);
+      a_function(a_part, partBegin(a_part, a_size, a_parts), partBegin(a_part + 1, a_size, a_parts),
+		 a_context);
+      pthread_mutex_lock(&sMutex);
+      if (++sDone == sParts)
+	pthread_cond_signal(&sFinish);
+    }
+  }
+
+  void* work(void*) {
+    pthread_mutex_lock(&sMutex);
+    while (true) {
+      while (sNext >= sParts)
+	pthread_cond_wait(&sStart, &sMutex);
+      runParts();
+    }
+    return NULL;
+  }
+
+  // ----- fork -----
+
+  // The child has only the forking thread. Holding both locks over the
+  // fork means it copies the pool idle.
+
+  void prepareFork() {
+    pthread_mutex_lock(&sBusy);
+    pthread_mutex_lock(&sMutex);
+  }
+
+  void parentFork() {
+    pthread_mutex_unlock(&sMutex);
+    pthread_mutex_unlock(&sBusy);
+  }
+
+  void childFork() {
+    sWorkers = 0;
+    pthread_cond_init(&sStart, NULL);
+    pthread_cond_init(&sFinish, NULL);
+    pthread_mutex_unlock(&sMutex);
+    pthread_mutex_unlock(&sBusy);
+  }
+
+  // Starts workers up to a_count. Called with sMutex held. If a thread
+  // cannot be started the caller does more of the parts.
+  void startWorkers(const size_t& a_count) {
+
+    if (sWorkers >= a_count)
+      return;
+
+    if (!sForkHandlers)
+      sForkHandlers = pthread_atfork(prepareFork, parentFork, childFork) == 0;
+
+    // signals are for the caller's threads, e.g. python's main thread
+    sigset_t all_signals;
+    sigset_t some_signals;
+    sigfillset(&all_signals);
+    pthread_sigmask(SIG_SETMASK, &all_signals, &some_signals);
+
+    while (sWorkers < a_count) {
+      pthread_t a_thread;
+      if (pthread_create(&a_thread, NULL, work, NULL) != 0)
+	break;
+      pthread_detach(a_thread);
+      ++sWorkers;
+    }
+
+    pthread_sigmask(SIG_SETMASK, &some_signals, NULL);
+  }
+
+}
+
+// ----- settings -----
+
+size_t Angles::threads() {
+  pthread_mutex_lock(&sMutex);
+  const size_t a_threads(sThreads > 0 ? sThreads : processors());
+  pthread_mutex_unlock(&sMutex);
+  return a_threads;
+}
+
+void Angles::setThreads(const size_t& a_threads) {
+  pthread_mutex_lock(&sMutex);
+  sThreads = a_threads;
+  pthread_mutex_unlock(&sMutex);
+}
+
+size_t Angles::parallelThreshold() {
+  pthread_mutex_lock(&sMutex);
+  const size_t a_threshold(sThreshold);
+  pthread_mutex_unlock(&sMutex);
+  return a_threshold;
+}
+
+void Angles::setParallelThreshold(const size_t& a_threshold) {
+  pthread_mutex_lock(&sMutex);
+  sThreshold = a_threshold;
+  pthread_mutex_unlock(&sMutex);
+}
+
+// ----- parallel for -----
+
+size_t Angles::parallelParts(const size_t& a_size) {
+  if (a_size < parallelThreshold())
+    return 1;
+  const size_t a_threads(threads());
+  const size_t a_lines((a_size + sLineSize - 1)/sLineSize);
+  const size_t a_parts(a_threads < a_lines ? a_threads : a_lines);
+  return a_parts > 0 ? a_parts : 1;
+}
+
+void Angles::parallelFor(const size_t& a_size, const size_t& a_parts,
+			 RangeFunction a_function, void* a_context) {
+
+  if (a_parts < 2 || pthread_mutex_trylock(&sBusy) != 0) {
+    for (size_t a_part = 0; a_part < a_parts; ++a_part)
+      a_function(a_part, partBegin(a_part, a_size, a_parts), partBegin(a_part + 1, a_size, a_parts),
+		 a_context);
+    return;
+  }
+
+  pthread_mutex_lock(&sMutex);
+
+  startWorkers(a_parts - 1);
+
+  sFunction = a_function;
+  sContext = a_context;
+  sSize = a_size;
+  sParts = a_parts;
+  sNext = 0;
+  sDone = 0;
+
+  pthread_cond_broadcast(&sStart);
+
+  runParts();
+
+  while (sDone < sParts)
+    pthread_cond_wait(&sFinish, &sMutex);
+
+  sFunction = NULL;
+  sContext = NULL;
+
+  pthread_mutex_unlock(&sMutex);
+  pthread_mutex_unlock(&sBusy);
+}
@@ -0,0 +1,97 @@
+// ================================================================
+// Filename:    parallel.h
+//
+// Description: This is a declaration of a small pool of threads that
+//              the batch kernels split large arrays across, so one
+//              call uses all the cores.
+//
+// Author:      L.R. McFarland, lrm@starbug.com
+// Created:     2026 Oct 18
+// Language:    C++
+//
+//  Angles is free software: you can redistribute it and/or modify it
+//  under the terms of the GNU General Public License as published by
+//  the Free Software Foundation, either version 3 of the License, or
+//  (at your option) any later version.
+//
+//  Angles is distributed in the hope that it will be useful, but
+//  WITHOUT ANY WARRANTY; without even the implied warranty of
+//  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+//  General Public License for more details.
+//
+//  You should have received a copy of the GNU General Public License
+//  along with Orbits.  If not, see <http://www.gnu.org/licenses/>.
+// ================================================================
+
+
+// Notes: parallelFor splits [0, a_size) into parts and calls a
+// function on each, the caller's thread doing one part and the pool
+// the rest. Arrays smaller than parallelThreshold() are one part, run
+// by the caller, where starting threads would cost more than the loop.
+//
+// The pool is started on first use with threads() - 1 workers, and
+// only one call uses it at a time. A call made while it is busy, from
+// another thread or from inside a part, runs its parts in the caller,
+// so results never depend on how the work was split. Part boundaries
+// are multiples of 8 elements, a cache line of doubles, so parts do
+// not write to the same line.
+//
+// The functions run on other threads, so they must not throw. A kernel
+// that raises counts the errors in each part and throws after.
+//
+// Forking a process with a pool, e.g. python's multiprocessing, waits
+// for the current call and the child starts a new pool when it needs
+// one.
+
+
+#pragma once
+
+#include <cstddef>
+
+namespace Angles {
+
+  // ----- settings -----
+
+  // the default is the number of processors online, 1 runs everything
+  // in the caller, 0 restores the default
+  size_t threads();
+  void   setThreads(const size_t& a_threads);
+
+  // the smallest array split across threads, default 32768
+  size_t parallelThreshold();
+  void   setParallelThreshold(const size_t& a_threshold);
+
+  // ----- parallel for -----
+
+  // a_part is from 0 to the number of parts, e.g. to index per part
+  // results
+  typedef void (*RangeFunction)(const size_t& a_part,
+				const size_t& a_begin, const size_t& an_end,
+				void* a_context);
+
+  // the number of parts parallelFor splits a_size elements into, 1
+  // below the threshold
+  size_t parallelParts(const size_t& a_size);
+
+  void parallelFor(const size_t& a_size, const size_t& a_parts,
+		   RangeFunction a_function, void* a_context);
+
+  // with a functor, a_functor(a_part, a_begin, an_end)
+
+  template<typename F>
+    void callRange(const size_t& a_part, const size_t& a_begin, const size_t& an_end,
+		   void* a_context) {
+    (*static_cast<F*>(a_context))(a_part, a_begin, an_end);
+  }
+
+  template<typename F>
+    void parallelFor(const size_t& a_size, const size_t& a_parts, F& a_functor) {
+    parallelFor(a_size, a_parts, callRange<F>, &a_functor);
+  }
+
+  template<typename F>
+    void parallelFor(const size_t& a_size, F& a_functor) {
+    parallelFor(a_size, parallelParts(a_size), callRange<F>, &a_functor);
+  }
+
+} // end namespace Angles
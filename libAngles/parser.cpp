@@ -0,0 +1,287 @@
+// ================================================================
+// Filename:    parser.cpp
+// Description: Sexagesimal and decimal angle string parser.
+//
+// Author:      L.R. McFarland, lrm@starbug.com
+// Created:     2026 Oct 18
+// Language:    C++
+//
+//  Angles is free software: you can redistribute it and/or modify it
+//  under the terms of the GNU General Public License as published by
+//  the Free Software Foundation, either version 3 of the License, or
+//  (at your option) any later version.
+//
+//  Angles is distributed in the hope that it will be useful, but
+//  WITHOUT ANY WARRANTY; without even the implied warranty of
+//  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+//  General Public License for more details.
+//
+//  You should have received a copy of the GNU General Public License
+//  along with Orbits.  If not, see <http://www.gnu.org/licenses/>.
+// ================================================================
+
+#include <limits>
+
+#include <stdint.h>  /* uint64_t */
+#include <stdio.h>   /* snprintf */
+#include <stdlib.h>  /* strtod */
+#include <string.h>  /* memchr */
+
+#include <parser.h>
+
+namespace {
+
+  // 10^0 to 10^22 are exact doubles
+  const double sPow10[] = {
+    1e0,  1e1,  1e2,  1e3,  1e4,  1e5,  1e6,  1e7,  1e8,  1e9,  1e10, 1e11,
+    1e12, 1e13, 1e14, 1e15, 1e16, 1e17, 1e18, 1e19, 1e20, 1e21, 1e22
+  };
+
+  const uint64_t sMaxExactMantissa(9007199254740992ULL); // 2^53
+  const int      sMaxDigits(19); // fits in a uint64_t
+
+  inline bool isDigit(const char& c) {return c >= '0' && c <= '9';}
+  inline bool isSpace(const char& c) {return c == ' ' || c == '\t' || c == '\r' || c == '\n';}
+
+  const char* skipSpace(const char* a_begin, const char* an_end) {
+    while (a_begin < an_end && isSpace(*a_begin))
+      ++a_begin;
+    return a_begin;
+  }
+
+  // Parses an unsigned number, digits[.digits][e[+-]digits], and
+  // returns the character after it or NULL if there are no digits.
+  const char* parseNumber(const char* a_begin, const char* an_end, double* a_value) {
+
+    const char* p(a_begin);
+
+    uint64_t mantissa(0);
+    int      digits(0);        // significant digits in mantissa
+    int      fraction(0);      // digits after the decimal point
+    int      power(0);         // explicit exponent
+    bool     found(false);     // any digits at all
+    bool     truncated(false); // more digits than mantissa holds
+
+    for (; p < an_end && isDigit(*p); ++p) {
+      found = true;
+      if (digits < sMaxDigits) {
+	mantissa = mantissa*10 + (*p - '0');
+	if (mantissa != 0)
+	  ++digits;
+      } else {
+	truncated = true;
+      }
+    }
+
+    const char* fraction_end(p);
+    if (p < an_end && *p == '.') {
+      for (++p; p < an_end && isDigit(*p); ++p) {
+	found = true;
+	++fraction;
+	if (digits < sMaxDigits) {
+	  mantissa = mantissa*10 + (*p - '0');
+	  if (mantissa != 0)
+	    ++digits;
+	} else {
+	  truncated = true;
+	}
+      }
+      fraction_end = p;
+    }
+
+    if (!found)
+      return NULL;
+
+    if (p < an_end && (*p == 'e' || *p == 'E')) {
+      const char* q(p + 1);
+      int sign(1);
+      if (q < an_end && (*q == '+' || *q == '-')) {
+	if (*q == '-')
+	  sign = -1;
+	++q;
+      }
+      if (q < an_end && isDigit(*q)) {
+	for (; q < an_end && isDigit(*q); ++q)
+	  if (power < 100000)
+	    power = power*10 + (*q - '0');
+	power *= sign;
+	p = q;
+      }
+    }
+
+    int exponent(power - fraction);
+
+    if (!truncated && mantissa <= sMaxExactMantissa && exponent >= -22 && exponent <= 22) {
+      // one correctly rounded operation on exact operands
+      if (exponent < 0)
+	*a_value = mantissa / sPow10[-exponent];
+      else
+	*a_value = mantissa * sPow10[exponent];
+      return p;
+    }
+
+    // Slow path for long mantissas and big exponents. The digits are
+    // passed to strtod without the decimal point so the locale does
+    // not matter.
+
+    std::string a_string;
+    for (const char* q = a_begin; q < fraction_end; ++q)
+      if (*q != '.')
+	a_string += *q;
+
+    char an_exponent[16];
+    snprintf(an_exponent, sizeof(an_exponent), "e%d", exponent);
+    a_string += an_exponent;
+
+    *a_value = strtod(a_string.c_str(), NULL);
+    return p;
+  }
+
+  // Returns the length of a valid separator after a_field, 0 if none.
+  size_t separator(const int& a_field, const char* a_begin, const char* an_end) {
+
+    const unsigned char c(*a_begin);
+    const size_t remaining(an_end - a_begin);
+
+    if (a_field == 0) {
+      if (c == ':' || c == 'd' || c == 'D' || c == 'h' || c == 'H' || c == '*' || isSpace(c))
+	return 1;
+      if (c == 0xB0) // latin-1 degree sign
+	return 1;
+      if (c == 0xC2 && remaining > 1 && (unsigned char)a_begin[1] == 0xB0) // utf-8 degree sign
+	return 2;
+    } else if (a_field == 1) {
+      if (c == ':' || c == 'm' || c == 'M' || c == '\'' || isSpace(c))
+	return 1;
+      if (c == 0xE2 && remaining > 2 && (unsigned char)a_begin[1] == 0x80 &&
+	  (unsigned char)a_begin[2] == 0xB2) // utf-8 prime
+	return 3;
+    } else {
+      if (c == 's' || c == 'S' || c == '"')
+	return 1;
+      if (c == 0xE2 && remaining > 2 && (unsigned char)a_begin[1] == 0x80 &&
+	  (unsigned char)a_begin[2] == 0xB3) // utf-8 double prime
+	return 3;
+    }
+
+    return 0;
+  }
+
+} // end anonymous namespace
+
+
+// ----- scalar -----
+
+bool Angles::parseAngle(const char* a_begin, const char* an_end, double* a_value) {
+
+  const char* p(skipSpace(a_begin, an_end));
+  const char* end(an_end);
+  while (end > p && isSpace(end[-1]))
+    --end;
+
+  double sign(1);
+  if (p < end && (*p == '+' || *p == '-')) {
+    if (*p == '-')
+      sign = -1;
+    ++p;
+  }
+
+  double fields[3] = {0, 0, 0};
+  int field(0);
+
+  while (true) {
+
+    p = parseNumber(p, end, &fields[field]);
+    if (p == NULL)
+      return false;
+
+    if (p == end)
+      break;
+
+    size_t length(separator(field, p, end));
+    if (length == 0)
+      return false;
+
+    const char a_separator(*p);
+
+    p = skipSpace(p + length, end);
+    if (p == end) {
+      if (a_separator == ':')
+	return false; // a colon needs a field after it
+      break; // trailing unit, e.g. 12h or 15"
+    }
+
+    if (field == 2)
+      return false; // nothing after seconds
+
+    ++field;
+  }
+
+  if (field == 0)
+    *a_value = sign*fields[0]; // decimal, no rounding through seconds
+  else
+    *a_value = sign*(3600*fields[0] + 60*fields[1] + fields[2])/3600.0; // as degrees2seconds
+
+  return true;
+}
+
+double Angles::parseAngle(const char* a_begin, const char* an_end) throw (ParseError) {
+  double a_value(0);
+  if (!parseAngle(a_begin, an_end, &a_value))
+    throw ParseError("invalid angle string: " + std::string(a_begin, an_end));
+  return a_value;
+}
+
+double Angles::parseAngle(const std::string& a_string) throw (ParseError) {
+  const char* a_begin(a_string.data());
+  return parseAngle(a_begin, a_begin + a_string.size());
+}
+
+
+// ----- bulk -----
+
+size_t Angles::countFields(const char* a_buffer, const size_t& a_size, const char& a_delimiter) {
+  const char* p(a_buffer);
+  const char* end(a_buffer + a_size);
+  size_t count(0);
+  while (p < end) {
+    const char* stop(static_cast<const char*>(memchr(p, a_delimiter, end - p)));
+    ++count;
+    if (stop == NULL)
+      break;
+    p = stop + 1;
+  }
+  return count;
+}
+
+size_t Angles::parseAngles(const char* a_buffer, const size_t& a_size,
+			   double* a_values, unsigned char* a_errors,
+			   const char& a_delimiter) {
+
+  const double nan(std::numeric_limits<double>::quiet_NaN());
+
+  const char* p(a_buffer);
+  const char* end(a_buffer + a_size);
+  size_t i(0);
+  size_t errors(0);
+
+  while (p < end) {
+
+    const char* stop(static_cast<const char*>(memchr(p, a_delimiter, end - p)));
+    if (stop == NULL)
+      stop = end;
+
+    bool ok(parseAngle(p, stop, &a_values[i]));
+    if (!ok) {
+      a_values[i] = nan;
+      ++errors;
+    }
+    if (a_errors != NULL)
+      a_errors[i] = !ok;
+
+    ++i;
+    p = stop + 1;
+  }
+
+  return errors;
+}
@@ -0,0 +1,77 @@
+// ================================================================
+// Filename:    parser.h
+//
+// Description: Parses sexagesimal and decimal angle strings, e.g.
+//              "12:30:45.6", "12h30m45.6s", "+45°30'15\"",
+//              "45* 30' 15\"", "45 30 15" or "-45.504167", one at a
+//              time or a whole buffer of delimited fields at once.
+//
+// Author:      L.R. McFarland, lrm@starbug.com
+// Created:     2026 Oct 18
+// Language:    C++
+//
+//  Angles is free software: you can redistribute it and/or modify it
+//  under the terms of the GNU General Public License as published by
+//  the Free Software Foundation, either version 3 of the License, or
+//  (at your option) any later version.
+//
+//  Angles is distributed in the hope that it will be useful, but
+//  WITHOUT ANY WARRANTY; without even the implied warranty of
+//  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+//  General Public License for more details.
+//
+//  You should have received a copy of the GNU General Public License
+//  along with Orbits.  If not, see <http://www.gnu.org/licenses/>.
+// ================================================================
+
+// Notes: The result is in the units of the first field, degrees or
+// hours, i.e. "12h30m" is 12.5. The sign is only allowed on the
+// first field and applies to the whole value, so "-0:30" is -0.5.
+// Minutes and seconds are not range checked, like degrees2seconds.
+//
+// The parser does not use the C locale, '.' is always the decimal
+// point. Numbers with up to 15 significant digits and small
+// exponents are converted exactly with a power of 10 table. Longer
+// ones fall back to strtod.
+//
+// Separators after each field:
+//
+//   degrees or hours: ':', 'd', 'D', 'h', 'H', '*', '°' or a space
+//   minutes:          ':', 'm', 'M', '\'' or a space
+//   seconds:          's', 'S', '"' or nothing
+
+#pragma once
+
+#include <cstddef>
+#include <string>
+
+#include <utils.h>
+
+namespace Angles {
+
+  // ----- scalar -----
+
+  // returns false, and leaves a_value unchanged, on a syntax error.
+  bool parseAngle(const char* a_begin, const char* an_end, double* a_value);
+
+  double parseAngle(const char* a_begin, const char* an_end) throw (ParseError);
+  double parseAngle(const std::string& a_string) throw (ParseError);
+
+  // ----- bulk -----
+
+  // Fields are separated by a_delimiter. A final delimiter does not
+  // start an empty field, so a file ending in a newline is ok. With
+  // '\n', a '\r' before it is ignored.
+
+  size_t countFields(const char* a_buffer, const size_t& a_size, const char& a_delimiter = '\n');
+
+  // Parses the fields of a_buffer into a_values, which must hold
+  // countFields() values. Bad fields are set to NaN and their a_errors
+  // entry to 1, good ones 0. a_errors may be NULL. Returns the number
+  // of bad fields.
+
+  size_t parseAngles(const char* a_buffer, const size_t& a_size,
+		     double* a_values, unsigned char* a_errors,
+		     const char& a_delimiter = '\n');
+
+} // end namespace Angles
@@ -0,0 +1,166 @@
+// ================================================================
+// Filename:    shared_angle_array.cpp
+// Description: Angle arrays in named POSIX shared memory.
+//
+// Author:      L.R. McFarland, lrm@starbug.com
+// Created:     2026 Oct 18
+// Language:    C++
+//
+//  Angles is free software: you can redistribute it and/or modify it
+//  under the terms of the GNU General Public License as published by
+//  the Free Software Foundation, either version 3 of the License, or
+//  (at your option) any later version.
+//
+//  Angles is distributed in the hope that it will be useful, but
+//  WITHOUT ANY WARRANTY; without even the implied warranty of
+//  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+//  General Public License for more details.
+//
+//  You should have received a copy of the GNU General Public License
+//  along with Orbits.  If not, see <http://www.gnu.org/licenses/>.
+// ================================================================
+
+#include <cstdio>
+#include <limits>
+
+#include <fcntl.h>     /* O_* */
+#include <string.h>    /* memcpy, memcmp */
+#include <sys/mman.h>  /* shm_open, mmap */
+#include <sys/stat.h>  /* fstat */
+#include <unistd.h>    /* ftruncate, close, getpid */
+
+#include <batch.h>
+#include <shared_angle_array.h>
+
+namespace {
+
+  const char     sMagic[8] = {'A', 'N', 'G', 'L', 'S', 'H', 'M', '\0'};
+  const uint32_t sVersion(1);
+
+  const size_t sHeaderSize(64);
+
+  std::string sharedName(const std::string& a_name) {
+    return !a_name.empty() && a_name[0] == '/' ? a_name : "/" + a_name;
+  }
+
+}
+
+// ----- ctor and dtor -----
+
+Angles::SharedAngleArray::SharedAngleArray(const std::string& a_name, const double* some_values,
+					   const size_t& a_size, const CatalogueType& a_type) throw (Error)
+  : m_name(sharedName(a_name)), m_data(NULL), m_length(0), m_size(a_size), m_type(a_type),
+    m_writable(true), m_owner(0), m_values(NULL) {
+
+  validRange(some_values, a_size, BinaryCatalogue::minimum(a_type), BinaryCatalogue::maximum(a_type));
+
+  if (a_size > (std::numeric_limits<size_t>::max() - sHeaderSize)/sizeof(double))
+    throw RangeError("maximum exceeded");
+
+  const int a_descriptor(shm_open(m_name.c_str(), O_RDWR | O_CREAT | O_EXCL, 0600));
+  if (a_descriptor < 0)
+    throw Error("cannot create shared memory " + m_name);
+
+  const size_t a_length(sHeaderSize + a_size*sizeof(double));
+
+  try {
+    if (ftruncate(a_descriptor, a_length) != 0)
+      throw Error("cannot size shared memory " + m_name);
+    map(a_descriptor, a_length);
+  } catch (Error&) {
+    shm_unlink(m_name.c_str());
+    throw;
+  }
+
+  m_owner = getpid();
+
+  if (a_size > 0)
+    memcpy(m_values, some_values, a_size*sizeof(double));
+
+  // the magic last, so a header that has it is complete
+  char* a_header(static_cast<char*>(m_data));
+  const uint32_t a_type_code(a_type);
+  const uint64_t a_size_code(a_size);
+  memcpy(a_header + 8, &sVersion, sizeof(sVersion));
+  memcpy(a_header + 12, &a_type_code, sizeof(a_type_code));
+  memcpy(a_header + 16, &a_size_code, sizeof(a_size_code));
+  memcpy(a_header, sMagic, sizeof(sMagic));
+}
+
+Angles::SharedAngleArray::SharedAngleArray(const std::string& a_name, const bool& a_writable) throw (Error)
+  : m_name(sharedName(a_name)), m_data(NULL), m_length(0), m_size(0), m_type(CATALOGUE_ANGLE),
+    m_writable(a_writable), m_owner(0), m_values(NULL) {
+
+  const int a_descriptor(shm_open(m_name.c_str(), a_writable ? O_RDWR : O_RDONLY, 0));
+  if (a_descriptor < 0)
+    throw Error("cannot open shared memory " + m_name);
+
+  struct stat some_stats;
+  if (fstat(a_descriptor, &some_stats) != 0 || some_stats.st_size < static_cast<off_t>(sHeaderSize)) {
+    close(a_descriptor);
+    throw Error("not a shared angle array: " + m_name);
+  }
+
+  map(a_descriptor, some_stats.st_size);
+
+  const char* a_header(static_cast<const char*>(m_data));
+  uint32_t a_version(0);
+  uint32_t a_type_code(0);
+  uint64_t a_size_code(0);
+  memcpy(&a_version, a_header + 8, sizeof(a_version));
+  memcpy(&a_type_code, a_header + 12, sizeof(a_type_code));
+  memcpy(&a_size_code, a_header + 16, sizeof(a_size_code));
+
+  if (memcmp(a_header, sMagic, sizeof(sMagic)) != 0 || a_version != sVersion ||
+      a_type_code > CATALOGUE_RA || a_size_code > (m_length - sHeaderSize)/sizeof(double)) {
+    munmap(m_data, m_length);
+    m_data = NULL;
+    throw Error("not a shared angle array: " + m_name);
+  }
+
+  m_type = static_cast<CatalogueType>(a_type_code);
+  m_size = a_size_code;
+}
+
+Angles::SharedAngleArray::~SharedAngleArray() {
+  if (m_data != NULL)
+    munmap(m_data, m_length);
+  if (owner())
+    shm_unlink(m_name.c_str());
+}
+
+// ----- accessors -----
+
+bool Angles::SharedAngleArray::owner() const {
+  return m_owner != 0 && m_owner == getpid();
+}
+
+// ----- shared memory -----
+
+void Angles::SharedAngleArray::unlink() throw (Error) {
+  m_owner = 0;
+  if (shm_unlink(m_name.c_str()) != 0)
+    throw Error("cannot unlink shared memory " + m_name);
+}
+
+std::string Angles::SharedAngleArray::uniqueName() {
+  static unsigned long sCount(0);
+  char a_name[32];
+  snprintf(a_name, sizeof(a_name), "/angles.%ld.%lu", static_cast<long>(getpid()), sCount++);
+  return a_name;
+}
+
+// ----- private -----
+
+// maps a_descriptor and closes it, the mapping keeps the memory
+void Angles::SharedAngleArray::map(const int& a_descriptor, const size_t& a_length) throw (Error) {
+  m_data = mmap(NULL, a_length, m_writable ? PROT_READ | PROT_WRITE : PROT_READ, MAP_SHARED,
+		a_descriptor, 0);
+  close(a_descriptor);
+  if (m_data == MAP_FAILED) {
+    m_data = NULL;
+    throw Error("cannot map shared memory " + m_name);
+  }
+  m_length = a_length;
+  m_values = reinterpret_cast<double*>(static_cast<char*>(m_data) + sHeaderSize);
+}
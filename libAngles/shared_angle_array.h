@@ -0,0 +1,117 @@
+// ================================================================
+// Filename:    shared_angle_array.h
+//
+// Description: This is a declaration of an array of angle values in
+//              named POSIX shared memory, so worker processes attach
+//              to one copy by name instead of each receiving its own.
+//
+// Author:      L.R. McFarland, lrm@starbug.com
+// Created:     2026 Oct 18
+// Language:    C++
+//
+//  Angles is free software: you can redistribute it and/or modify it
+//  under the terms of the GNU General Public License as published by
+//  the Free Software Foundation, either version 3 of the License, or
+//  (at your option) any later version.
+//
+//  Angles is distributed in the hope that it will be useful, but
+//  WITHOUT ANY WARRANTY; without even the implied warranty of
+//  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+//  General Public License for more details.
+//
+//  You should have received a copy of the GNU General Public License
+//  along with Orbits.  If not, see <http://www.gnu.org/licenses/>.
+// ================================================================
+
+
+// Notes: The shared memory object is a 64 byte header followed by the
+// values.
+//
+//   offset  size
+//        0     8  magic, "ANGLSHM\0"
+//        8     4  version, 1
+//       12     4  type, a CatalogueType
+//       16     8  size, the number of values
+//       64   8*n  the values, native doubles
+//
+// The creating process owns the name. Its destructor, or unlink(),
+// removes the name, after which no one else can attach, but arrays
+// already attached keep their mapping until they are destroyed. A
+// child forked from the owner does not own it, so an exiting worker
+// does not remove the name from under the others.
+//
+// Names start with '/', one is added if not. Keep them short, macOS
+// allows 31 characters.
+
+
+#pragma once
+
+#include <string>
+
+#include <sys/types.h>  /* pid_t */
+
+#include <binary_catalogue.h>
+#include <utils.h>
+
+namespace Angles {
+
+  // ============================
+  // ===== SharedAngleArray =====
+  // ============================
+
+  class SharedAngleArray {
+
+  public:
+
+    // ----- ctor and dtor -----
+
+    // Creates a_name with a copy of some_values. Raises RangeError if a
+    // value is out of a_type's range, Error if a_name exists or cannot
+    // be created.
+    SharedAngleArray(const std::string& a_name, const double* some_values, const size_t& a_size,
+		     const CatalogueType& a_type = CATALOGUE_ANGLE) throw (Error);
+
+    // Attaches to an existing a_name, read only unless a_writable.
+    // Raises Error if there is none or it is not a shared angle array.
+    explicit SharedAngleArray(const std::string& a_name, const bool& a_writable = false) throw (Error);
+
+    ~SharedAngleArray();
+
+    // ----- accessors -----
+
+    const std::string& name() const {return m_name;}
+    size_t             size() const {return m_size;}
+    CatalogueType      type() const {return m_type;}
+    bool               writable() const {return m_writable;}
+    bool               owner() const;
+
+    const double* values() const {return m_values;}
+    double*       writableValues() {return m_writable ? m_values : NULL;} // NULL if read only
+
+    // ----- shared memory -----
+
+    // removes the name, raises Error if it was already removed
+    void unlink() throw (Error);
+
+    // a new name unique to this process, e.g. for the Python bindings
+    static std::string uniqueName();
+
+  private:
+
+    SharedAngleArray(const SharedAngleArray&);            // not copyable, owns the mapping
+    SharedAngleArray& operator=(const SharedAngleArray&);
+
+    void map(const int& a_descriptor, const size_t& a_length) throw (Error);
+
+    std::string   m_name;
+    void*         m_data;
+    size_t        m_length; // of the mapping
+    size_t        m_size;
+    CatalogueType m_type;
+    bool          m_writable;
+    pid_t         m_owner;  // 0 if attached or unlinked
+    double*       m_values; // in m_data
+
+  };
+
+} // end namespace Angles
@@ -0,0 +1,265 @@
+// ================================================================
+// Filename:    sky.cpp
+// Description: Angular separation of positions on the sky.
+//
+// Author:      L.R. McFarland, lrm@starbug.com
+// Created:     2026 Oct 18
+// Language:    C++
+//
+//  Angles is free software: you can redistribute it and/or modify it
+//  under the terms of the GNU General Public License as published by
+//  the Free Software Foundation, either version 3 of the License, or
+//  (at your option) any later version.
+//
+//  Angles is distributed in the hope that it will be useful, but
+//  WITHOUT ANY WARRANTY; without even the implied warranty of
+//  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+//  General Public License for more details.
+//
+//  You should have received a copy of the GNU General Public License
+//  along with Orbits.  If not, see <http://www.gnu.org/licenses/>.
+// ================================================================
+
+#include <algorithm>
+#include <cmath>
+#include <vector>
+
+#include <parallel.h>
+#include <sky.h>
+
+namespace {
+
+  const double sHourToRadian(M_PI/12.0);
+  const double sDegreeToRadian(M_PI/180.0);
+  const double sRadianToDegree(180.0/M_PI);
+
+  // Vincenty's formula from the sines and cosines of the two
+  // declinations and the difference in right ascension, in degrees.
+  inline double vincenty(const double& sin_dec1, const double& cos_dec1,
+			 const double& sin_dec2, const double& cos_dec2,
+			 const double& a_delta_ra) {
+    const double sin_dra(sin(a_delta_ra));
+    const double cos_dra(cos(a_delta_ra));
+    const double x(cos_dec2*sin_dra);
+    const double y(cos_dec1*sin_dec2 - sin_dec1*cos_dec2*cos_dra);
+    const double z(sin_dec1*sin_dec2 + cos_dec1*cos_dec2*cos_dra);
+    return atan2(sqrt(x*x + y*y), z)*sRadianToDegree;
+  }
+
+  // Altitude and azimuth in degrees from the sines and cosines of the
+  // latitude, the hour angle and the declination. atan2 of the east,
+  // north and up components keeps both accurate near the zenith.
+  inline void toHorizontal(const double& sin_lat, const double& cos_lat,
+			   const double& sin_ha, const double& cos_ha,
+			   const double& sin_dec, const double& cos_dec,
+			   double& an_altitude, double& an_azimuth) {
+    const double east(-cos_dec*sin_ha);
+    const double north(sin_dec*cos_lat - cos_dec*cos_ha*sin_lat);
+    const double up(sin_dec*sin_lat + cos_dec*cos_ha*cos_lat);
+    an_altitude = atan2(up, sqrt(east*east + north*north))*sRadianToDegree;
+    an_azimuth = atan2(east, north)*sRadianToDegree;
+    if (an_azimuth < 0) {
+      an_azimuth += 360;
+      if (an_azimuth >= 360) // -tiny rounds to 360
+	an_azimuth = 0;
+    }
+  }
+
+  // ----- parts -----
+
+  // The array kernels are split across threads by parallelFor, see
+  // parallel.h, a part of the arrays each.
+
+  struct OneToManyPart {
+    double        m_ra; // radians
+    double        m_sin_dec;
+    double        m_cos_dec;
+    const double* m_ras;
+    const double* m_decs;
+    double*       m_result;
+    void operator()(const size_t&, const size_t& a_begin, const size_t& an_end) {
+      for (size_t i = a_begin; i < an_end; ++i) {
+	const double dec2(m_decs[i]*sDegreeToRadian);
+	m_result[i] = vincenty(m_sin_dec, m_cos_dec, sin(dec2), cos(dec2), m_ras[i]*sHourToRadian - m_ra);
+      }
+    }
+  };
+
+  struct PairwisePart {
+    const double* m_ras1;
+    const double* m_decs1;
+    const double* m_ras2;
+    const double* m_decs2;
+    double*       m_result;
+    void operator()(const size_t&, const size_t& a_begin, const size_t& an_end) {
+      for (size_t i = a_begin; i < an_end; ++i) {
+	const double dec1(m_decs1[i]*sDegreeToRadian);
+	const double dec2(m_decs2[i]*sDegreeToRadian);
+	m_result[i] = vincenty(sin(dec1), cos(dec1), sin(dec2), cos(dec2),
+			       (m_ras2[i] - m_ras1[i])*sHourToRadian);
+      }
+    }
+  };
+
+  struct ObserverPart {
+    double        m_sin_lat;
+    double        m_cos_lat;
+    double        m_lst;
+    const double* m_ras;
+    const double* m_decs;
+    double*       m_altitudes;
+    double*       m_azimuths;
+    void operator()(const size_t&, const size_t& a_begin, const size_t& an_end) {
+      for (size_t i = a_begin; i < an_end; ++i) {
+	const double ha((m_lst - m_ras[i])*sHourToRadian);
+	const double dec(m_decs[i]*sDegreeToRadian);
+	toHorizontal(m_sin_lat, m_cos_lat, sin(ha), cos(ha), sin(dec), cos(dec),
+		     m_altitudes[i], m_azimuths[i]);
+      }
+    }
+  };
+
+  // the targets' sines and cosines of right ascension and declination
+  struct TargetTrigPart {
+    const double* m_ras;
+    const double* m_decs;
+    double*       m_trig; // 4 per target
+    void operator()(const size_t&, const size_t& a_begin, const size_t& an_end) {
+      for (size_t j = a_begin; j < an_end; ++j) {
+	const double ra(m_ras[j]*sHourToRadian);
+	const double dec(m_decs[j]*sDegreeToRadian);
+	m_trig[4*j] = sin(ra);
+	m_trig[4*j + 1] = cos(ra);
+	m_trig[4*j + 2] = sin(dec);
+	m_trig[4*j + 3] = cos(dec);
+      }
+    }
+  };
+
+  // A part of the observers by targets results, which may start and
+  // end part way through an observer's row, so one observer with many
+  // targets splits as well as many observers.
+  struct GridPart {
+    const double* m_latitudes;
+    const double* m_longitudes;
+    double        m_gst;
+    const double* m_trig;
+    size_t        m_targets;
+    double*       m_altitudes;
+    double*       m_azimuths;
+    void operator()(const size_t&, const size_t& a_begin, const size_t& an_end) {
+
+      for (size_t k = a_begin; k < an_end; ) {
+
+	const size_t i(k/m_targets);
+	const size_t a_stop(std::min(an_end, (i + 1)*m_targets));
+
+	const double lat(m_latitudes[i]*sDegreeToRadian);
+	const double lst((m_gst + m_longitudes[i]/15)*sHourToRadian);
+	const double sin_lat(sin(lat));
+	const double cos_lat(cos(lat));
+	const double sin_lst(sin(lst));
+	const double cos_lst(cos(lst));
+
+	for (; k < a_stop; ++k) {
+	  const double* trig(m_trig + 4*(k - i*m_targets));
+	  const double sin_ha(sin_lst*trig[1] - cos_lst*trig[0]);
+	  const double cos_ha(cos_lst*trig[1] + sin_lst*trig[0]);
+	  toHorizontal(sin_lat, cos_lat, sin_ha, cos_ha, trig[2], trig[3], m_altitudes[k], m_azimuths[k]);
+	}
+
+      }
+    }
+  };
+
+}
+
+void Angles::validPosition(const double& a_ra, const double& a_dec) throw (RangeError) {
+  if (a_ra != a_ra || a_dec != a_dec)
+    throw RangeError("not a number");
+  if (a_ra < RA::minimum() || a_dec < Declination::minimum())
+    throw RangeError("minimum exceeded");
+  if (a_ra > RA::maximum() || a_dec > Declination::maximum())
+    throw RangeError("maximum exceeded");
+}
+
+// ----- scalar -----
+
+double Angles::separation(const double& a_ra1, const double& a_dec1,
+			  const double& a_ra2, const double& a_dec2) {
+  const double dec1(a_dec1*sDegreeToRadian);
+  const double dec2(a_dec2*sDegreeToRadian);
+  return vincenty(sin(dec1), cos(dec1), sin(dec2), cos(dec2), (a_ra2 - a_ra1)*sHourToRadian);
+}
+
+double Angles::separation(const RA& a_ra1, const Declination& a_dec1,
+			  const RA& a_ra2, const Declination& a_dec2) {
+  return separation(a_ra1.value(), a_dec1.value(), a_ra2.value(), a_dec2.value());
+}
+
+// ----- arrays -----
+
+void Angles::separation(const double& a_ra, const double& a_dec,
+			const double* some_ras, const double* some_decs,
+			double* a_result, const size_t& a_size) {
+  // the trigonometry of the one position is done once
+  const double dec(a_dec*sDegreeToRadian);
+  OneToManyPart a_kernel = {a_ra*sHourToRadian, sin(dec), cos(dec), some_ras, some_decs, a_result};
+  parallelFor(a_size, a_kernel);
+}
+
+void Angles::separation(const double* some_ras1, const double* some_decs1,
+			const double* some_ras2, const double* some_decs2,
+			double* a_result, const size_t& a_size) {
+  PairwisePart a_kernel = {some_ras1, some_decs1, some_ras2, some_decs2, a_result};
+  parallelFor(a_size, a_kernel);
+}
+
+// ----- horizontal -----
+
+void Angles::horizontal(const double& a_latitude, const double& a_lst,
+			const double& a_ra, const double& a_dec,
+			double& an_altitude, double& an_azimuth) {
+  const double lat(a_latitude*sDegreeToRadian);
+  const double ha((a_lst - a_ra)*sHourToRadian);
+  const double dec(a_dec*sDegreeToRadian);
+  toHorizontal(sin(lat), cos(lat), sin(ha), cos(ha), sin(dec), cos(dec), an_altitude, an_azimuth);
+}
+
+void Angles::horizontal(const Latitude& a_latitude, const RA& a_lst,
+			const RA& a_ra, const Declination& a_dec,
+			Angle& an_altitude, Angle& an_azimuth) {
+  double altitude(0);
+  double azimuth(0);
+  horizontal(a_latitude.value(), a_lst.value(), a_ra.value(), a_dec.value(), altitude, azimuth);
+  an_altitude.setValue(altitude);
+  an_azimuth.setValue(azimuth);
+}
+
+void Angles::horizontal(const double& a_latitude, const double& a_lst,
+			const double* some_ras, const double* some_decs,
+			double* some_altitudes, double* some_azimuths, const size_t& a_size) {
+  // the trigonometry of the observer is done once
+  const double lat(a_latitude*sDegreeToRadian);
+  ObserverPart a_kernel = {sin(lat), cos(lat), a_lst, some_ras, some_decs, some_altitudes, some_azimuths};
+  parallelFor(a_size, a_kernel);
+}
+
+void Angles::horizontal(const double* some_latitudes, const double* some_longitudes,
+			const size_t& a_observers, const double& a_gst,
+			const double* some_ras, const double* some_decs, const size_t& a_targets,
+			double* some_altitudes, double* some_azimuths) {
+
+  if (a_targets == 0)
+    return;
+
+  // The targets' sines and cosines, once for all the observers. The
+  // hour angle's follow from the difference formulas.
+  std::vector<double> some_trig(4*a_targets);
+  TargetTrigPart a_trig_kernel = {some_ras, some_decs, &some_trig[0]};
+  parallelFor(a_targets, a_trig_kernel);
+
+  GridPart a_kernel = {some_latitudes, some_longitudes, a_gst, &some_trig[0], a_targets,
+		       some_altitudes, some_azimuths};
+  parallelFor(a_observers*a_targets, a_kernel);
+}
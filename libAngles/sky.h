@@ -0,0 +1,105 @@
+// ================================================================
+// Filename:    sky.h
+//
+// Description: Positions on the sky, right ascension and declination
+//              pairs. The angular separation between two positions,
+//              one at a time or over contiguous arrays, e.g. for
+//              crossmatches and cone searches, and the transform to
+//              an observer's altitude and azimuth.
+//
+// Author:      L.R. McFarland, lrm@starbug.com
+// Created:     2026 Oct 18
+// Language:    C++
+//
+//  Angles is free software: you can redistribute it and/or modify it
+//  under the terms of the GNU General Public License as published by
+//  the Free Software Foundation, either version 3 of the License, or
+//  (at your option) any later version.
+//
+//  Angles is distributed in the hope that it will be useful, but
+//  WITHOUT ANY WARRANTY; without even the implied warranty of
+//  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+//  General Public License for more details.
+//
+//  You should have received a copy of the GNU General Public License
+//  along with Orbits.  If not, see <http://www.gnu.org/licenses/>.
+// ================================================================
+
+// Notes: right ascension is in hours and declination in degrees, as
+// the values of RA and Declination are. Separations are in degrees,
+// 0 to 180.
+//
+// separation uses the Vincenty form of the great circle distance,
+// atan2 of the two components rather than acos or the haversine
+// asin, so it is accurate for both tiny and nearly antipodal
+// separations.
+//
+// horizontal transforms right ascension and declination to altitude
+// and azimuth, in degrees, for an observer at a latitude at a local
+// sidereal time, in hours. Azimuth is from north through east, 0 to
+// 360. The observer's sines and cosines are found once per call, and
+// in the observer by target form each target's once per call too, so
+// the inner loop has no sines or cosines in it. That form takes
+// longitudes, east positive, and the Greenwich sidereal time, each
+// observer's local sidereal time is that plus their longitude.
+// Refraction, precession and the like are left to the caller.
+//
+// Like batch.h, the array forms do not check range or sizes.
+
+#pragma once
+
+#include <cstddef>
+
+#include <angles.h>
+
+namespace Angles {
+
+  // raises RangeError, as RA and Declination do, for NaN or a value
+  // out of range
+  void validPosition(const double& a_ra, const double& a_dec) throw (RangeError);
+
+  // ----- scalar -----
+
+  double separation(const double& a_ra1, const double& a_dec1,
+		    const double& a_ra2, const double& a_dec2);
+
+  double separation(const RA& a_ra1, const Declination& a_dec1,
+		    const RA& a_ra2, const Declination& a_dec2);
+
+  // ----- arrays -----
+
+  // one to many, from (a_ra, a_dec) to each of some_ras, some_decs
+  void separation(const double& a_ra, const double& a_dec,
+		  const double* some_ras, const double* some_decs,
+		  double* a_result, const size_t& a_size);
+
+  // pairwise, a_result[i] is from position i of the first arrays to
+  // position i of the second
+  void separation(const double* some_ras1, const double* some_decs1,
+		  const double* some_ras2, const double* some_decs2,
+		  double* a_result, const size_t& a_size);
+
+  // ----- horizontal -----
+
+  void horizontal(const double& a_latitude, const double& a_lst,
+		  const double& a_ra, const double& a_dec,
+		  double& an_altitude, double& an_azimuth);
+
+  void horizontal(const Latitude& a_latitude, const RA& a_lst,
+		  const RA& a_ra, const Declination& a_dec,
+		  Angle& an_altitude, Angle& an_azimuth);
+
+  // one observer, many targets
+  void horizontal(const double& a_latitude, const double& a_lst,
+		  const double* some_ras, const double* some_decs,
+		  double* some_altitudes, double* some_azimuths, const size_t& a_size);
+
+  // Observers by targets. The results are a_observers rows of
+  // a_targets, the altitude of target j from observer i is at
+  // some_altitudes[i*a_targets + j].
+  void horizontal(const double* some_latitudes, const double* some_longitudes,
+		  const size_t& a_observers, const double& a_gst,
+		  const double* some_ras, const double* some_decs, const size_t& a_targets,
+		  double* some_altitudes, double* some_azimuths);
+
+} // end namespace Angles
@@ -0,0 +1,139 @@
+// ================================================================
+// Filename:    sorted_index.h
+//
+// Description: This is a declaration of a sorted index of angle
+//              values, e.g. to find all the catalogue entries with
+//              right ascension between 23h50m and 0h10m, or the
+//              declination nearest to -25, in O(log n + k).
+//
+// Author:      L.R. McFarland, lrm@starbug.com
+// Created:     2026 Oct 18
+// Language:    C++
+//
+//  Angles is free software: you can redistribute it and/or modify it
+//  under the terms of the GNU General Public License as published by
+//  the Free Software Foundation, either version 3 of the License, or
+//  (at your option) any later version.
+//
+//  Angles is distributed in the hope that it will be useful, but
+//  WITHOUT ANY WARRANTY; without even the implied warranty of
+//  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+//  General Public License for more details.
+//
+//  You should have received a copy of the GNU General Public License
+//  along with Orbits.  If not, see <http://www.gnu.org/licenses/>.
+// ================================================================
+
+
+// Notes: SortedIndex<T> keeps the values in ascending order in one
+// contiguous array, with the position each had in the buffer it was
+// built from in another. It is built once, O(n log n), and rebuilt
+// with assign(). Queries are binary searches.
+//
+// A rank is a position in sorted order, 0 to size() - 1. value(rank)
+// is the value, position(rank) where it came from.
+//
+// RA and Longitude are periodic, their range is one full turn. For
+// these range(lower, upper) with lower > upper crosses the wrap point,
+// e.g. RASortedIndex range(23.8, 0.2) is [23.8, 24] and [0, 0.2], and
+// bounds outside the range are normalized first, e.g. -0.2 hours is
+// 23.8. nearest() measures the distance the short way around. The
+// other types do not wrap, lower > upper is an empty range.
+
+
+#pragma once
+
+#include <vector>
+
+#include <angles.h>
+#include <angle_array.h>
+#include <utils.h>
+
+namespace Angles {
+
+  // =======================
+  // ===== SortedIndex =====
+  // =======================
+
+  template<typename T>
+    class SortedIndex {
+
+  public:
+
+    typedef T value_type;
+
+    // ----- ctor and dtor -----
+
+    SortedIndex() {}
+    SortedIndex(const double* a_values, const size_t& a_size) throw (RangeError);
+
+    ~SortedIndex() {};
+
+    // replaces the contents, raises RangeError for NaN or a value out
+    // of T's range and leaves the index unchanged.
+    void assign(const double* a_values, const size_t& a_size) throw (RangeError);
+    void clear() {m_values.clear(); m_positions.clear();}
+
+    // ----- accessors -----
+
+    size_t        size() const {return m_values.size();}
+    bool          empty() const {return m_values.empty();}
+
+    const double& value(const size_t& a_rank) const {return m_values[a_rank];}
+    const size_t& position(const size_t& a_rank) const {return m_positions[a_rank];}
+
+    // in sorted order, NULL if empty
+    const double* values() const {return m_values.empty() ? NULL : &m_values[0];}
+    const size_t* positions() const {return m_positions.empty() ? NULL : &m_positions[0];}
+
+    static bool   isPeriodic();
+    static double period(); // 24 or 360, a full turn in T's units
+
+    // ----- lookup -----
+
+    // rank of the first value >= a_value, or > a_value, size() if none
+    size_t lowerBound(const double& a_value) const;
+    size_t upperBound(const double& a_value) const;
+
+    // number of values in [a_lower, a_upper], see the wrap notes above
+    size_t count(const double& a_lower, const double& a_upper) const;
+
+    // appends the positions of the values in [a_lower, a_upper] to
+    // some_positions, in ascending order of value from a_lower, and
+    // returns the number appended.
+    size_t range(const double& a_lower, const double& a_upper,
+		 std::vector<size_t>& some_positions) const;
+
+    // rank of the value nearest a_value, the lowest rank on a tie,
+    // raises Error if empty
+    size_t nearest(const double& a_value) const throw (Error);
+
+  private:
+
+    // bound of a query, normalized if periodic and out of range
+    static double bound(const double& a_value);
+
+    // a_lower to a_upper as one or two rank spans, [first, last)
+    size_t spans(const double& a_lower, const double& a_upper, size_t* some_ranks) const;
+
+    double distance(const double& a_lhs, const double& a_rhs) const;
+
+    std::vector<double> m_values;    // ascending
+    std::vector<size_t> m_positions; // in the source buffer
+
+  };
+
+
+  // ================================
+  // ===== SortedIndex typedefs =====
+  // ================================
+
+  typedef SortedIndex<LimitedRangeAngle> LimitedRangeAngleSortedIndex;
+  typedef SortedIndex<Declination>       DeclinationSortedIndex;
+  typedef SortedIndex<Latitude>          LatitudeSortedIndex;
+  typedef SortedIndex<Longitude>         LongitudeSortedIndex;
+  typedef SortedIndex<RA>                RASortedIndex;
+
+} // end namespace Angles
+
+#include <sorted_index.hpp>
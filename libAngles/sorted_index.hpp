@@ -0,0 +1,192 @@
+// ================================================================
+// Filename:    sorted_index.hpp
+//
+// Description: This implements the SortedIndex template.
+//
+// Author:      L.R. McFarland, lrm@starbug.com
+// Created:     2026 Oct 18
+// Language:    C++
+//
+//  Angles is free software: you can redistribute it and/or modify it
+//  under the terms of the GNU General Public License as published by
+//  the Free Software Foundation, either version 3 of the License, or
+//  (at your option) any later version.
+//
+//  Angles is distributed in the hope that it will be useful, but
+//  WITHOUT ANY WARRANTY; without even the implied warranty of
+//  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+//  General Public License for more details.
+//
+//  You should have received a copy of the GNU General Public License
+//  along with Orbits.  If not, see <http://www.gnu.org/licenses/>.
+// ================================================================
+
+#pragma once
+
+#include <algorithm>
+#include <cmath>
+#include <utility>
+
+namespace Angles {
+
+  // constructor from buffer
+  template<typename T>
+    SortedIndex<T>::SortedIndex(const double* a_values, const size_t& a_size) throw (RangeError) {
+    assign(a_values, a_size);
+  }
+
+  template<typename T>
+    void SortedIndex<T>::assign(const double* a_values, const size_t& a_size) throw (RangeError) {
+
+    for (size_t i = 0; i < a_size; ++i)
+      if (a_values[i] != a_values[i])
+	throw RangeError("not a number");
+
+    validRange(a_values, a_size, AngleRange<T>::minimum(), AngleRange<T>::maximum());
+
+    // sorting pairs keeps equal values in position order
+    std::vector<std::pair<double, size_t> > some_pairs(a_size);
+    for (size_t i = 0; i < a_size; ++i)
+      some_pairs[i] = std::make_pair(a_values[i], i);
+
+    std::sort(some_pairs.begin(), some_pairs.end());
+
+    std::vector<double> some_values(a_size);
+    std::vector<size_t> some_positions(a_size);
+    for (size_t i = 0; i < a_size; ++i) {
+      some_values[i] = some_pairs[i].first;
+      some_positions[i] = some_pairs[i].second;
+    }
+
+    m_values.swap(some_values);
+    m_positions.swap(some_positions);
+  }
+
+  // ----- static methods -----
+
+  template<typename T>
+    double SortedIndex<T>::period() {
+    return AngleRange<T>::wrapConvention() == WRAP_0_24 ? 24 : 360;
+  }
+
+  template<typename T>
+    bool SortedIndex<T>::isPeriodic() {
+    return AngleRange<T>::isLimited() &&
+      AngleRange<T>::maximum() - AngleRange<T>::minimum() == period();
+  }
+
+  template<typename T>
+    double SortedIndex<T>::bound(const double& a_value) {
+    if (isPeriodic() && (a_value < AngleRange<T>::minimum() || a_value > AngleRange<T>::maximum()))
+      return normalize(a_value, AngleRange<T>::wrapConvention());
+    return a_value;
+  }
+
+  // ----- lookup -----
+
+  template<typename T>
+    size_t SortedIndex<T>::lowerBound(const double& a_value) const {
+    return std::lower_bound(m_values.begin(), m_values.end(), a_value) - m_values.begin();
+  }
+
+  template<typename T>
+    size_t SortedIndex<T>::upperBound(const double& a_value) const {
+    return std::upper_bound(m_values.begin(), m_values.end(), a_value) - m_values.begin();
+  }
+
+  template<typename T>
+    size_t SortedIndex<T>::spans(const double& a_lower, const double& a_upper, size_t* some_ranks) const {
+
+    const double lower(bound(a_lower));
+    const double upper(bound(a_upper));
+
+    if (lower != lower || upper != upper)
+      return 0;
+
+    if (lower <= upper) {
+      some_ranks[0] = lowerBound(lower);
+      some_ranks[1] = upperBound(upper);
+      return 1;
+    }
+
+    if (!isPeriodic())
+      return 0;
+
+    // across the wrap point, lower to the end then the start to upper
+    some_ranks[0] = lowerBound(lower);
+    some_ranks[1] = size();
+    some_ranks[2] = 0;
+    some_ranks[3] = upperBound(upper);
+    return 2;
+  }
+
+  template<typename T>
+    size_t SortedIndex<T>::count(const double& a_lower, const double& a_upper) const {
+    size_t some_ranks[4];
+    size_t result(0);
+    for (size_t i = 0, n = spans(a_lower, a_upper, some_ranks); i < n; ++i)
+      result += some_ranks[2*i + 1] - some_ranks[2*i];
+    return result;
+  }
+
+  template<typename T>
+    size_t SortedIndex<T>::range(const double& a_lower, const double& a_upper,
+				 std::vector<size_t>& some_positions) const {
+    size_t some_ranks[4];
+    const size_t n(spans(a_lower, a_upper, some_ranks));
+    const size_t result(count(a_lower, a_upper));
+    some_positions.reserve(some_positions.size() + result);
+    for (size_t i = 0; i < n; ++i)
+      some_positions.insert(some_positions.end(),
+			    m_positions.begin() + some_ranks[2*i],
+			    m_positions.begin() + some_ranks[2*i + 1]);
+    return result;
+  }
+
+  template<typename T>
+    double SortedIndex<T>::distance(const double& a_lhs, const double& a_rhs) const {
+    const double result(fabs(a_lhs - a_rhs));
+    if (isPeriodic() && result > period()/2)
+      return period() - result;
+    return result;
+  }
+
+  template<typename T>
+    size_t SortedIndex<T>::nearest(const double& a_value) const throw (Error) {
+
+    if (empty())
+      throw Error("index is empty");
+
+    if (a_value != a_value)
+      throw RangeError("not a number");
+
+    const double a_target(bound(a_value));
+    const size_t i(lowerBound(a_target));
+
+    // the neighbours of a_target, and the ends if it may be nearer
+    // the other way around, lowest rank first.
+    size_t some_ranks[4];
+    size_t n(0);
+    if (isPeriodic())
+      some_ranks[n++] = 0;
+    if (i > 0)
+      some_ranks[n++] = i - 1;
+    if (i < size())
+      some_ranks[n++] = i;
+    if (isPeriodic())
+      some_ranks[n++] = size() - 1;
+
+    size_t result(some_ranks[0]);
+    double a_minimum(distance(m_values[result], a_target));
+    for (size_t j = 1; j < n; ++j) {
+      const double a_distance(distance(m_values[some_ranks[j]], a_target));
+      if (a_distance < a_minimum) {
+	a_minimum = a_distance;
+	result = some_ranks[j];
+      }
+    }
+
+    return result;
+  }
+
+}
@@ -20,9 +20,14 @@
 //  along with Orbits.  If not, see <http://www.gnu.org/licenses/>.
 // ================================================================
 
+#include <limits>
+
 #include <utils.h>
 
+#include <math.h>    /* fmod, floor */
+#include <stdint.h>  /* uint64_t */
 #include <stdlib.h>  /* strtod */
+#include <string.h>  /* memcpy */
 
 
 double Angles::stod(const std::string& a_string) {
@@ -50,6 +55,28 @@ int Angles::stoi(const std::string& a_string) {
   return an_int;
 }
 
+const char* Angles::statusString(const Status& a_status) {
+  switch (a_status) {
+  case SUCCESS:
+    return "success";
+  case MINIMUM_EXCEEDED:
+    return "minimum exceeded";
+  case MAXIMUM_EXCEEDED:
+    return "maximum exceeded";
+  case DIVIDE_BY_ZERO:
+    return "division by zero is undefined";
+  }
+  return "unknown status";
+}
+
+void Angles::throwStatus(const Status& a_status) throw (DivideByZeroError, RangeError) {
+  if (a_status == SUCCESS)
+    return;
+  if (a_status == DIVIDE_BY_ZERO)
+    throw DivideByZeroError();
+  throw RangeError(statusString(a_status));
+}
+
 double Angles::degrees2seconds(const double& a_deg, const double& a_min, const double& a_sec) {
   // for angles and times with deg == hours Expects the minus sign to
   // be only once with the largest non-zero element.  All other
@@ -109,3 +136,107 @@ double Angles::degrees2seconds(const double& a_deg, const double& a_min, const d
   return seconds;
 
 }
+
+double Angles::normalize(const double& a_value, const Wrap& a_wrap) {
+  // Constant time for any magnitude. fmod is exact so there is no
+  // drift from repeated subtraction.
+
+  double result(0);
+
+  if (a_wrap == WRAP_180) {
+
+    result = fmod(a_value, 360.0); // (-360, 360)
+    if (result <= -180)
+      result += 360;
+    else if (result > 180)
+      result -= 360;
+
+  } else {
+
+    double period(a_wrap == WRAP_0_24 ? 24.0 : 360.0);
+
+    result = fmod(a_value, period); // (-period, period)
+    if (result < 0)
+      result += period;
+    if (result >= period) // a tiny negative remainder can round up to period
+      result = 0;
+
+  }
+
+  return result;
+
+}
+
+double Angles::applyPolicy(const double& a_value, const double& a_minimum, const double& a_maximum,
+			   const Policy& a_policy) {
+
+  switch (a_policy) {
+
+  case POLICY_WRAP: {
+    // same fmod reduction as normalize, offset to the minimum
+    double width(a_maximum - a_minimum);
+    double result(fmod(a_value - a_minimum, width));
+    if (result < 0)
+      result += width;
+    if (result >= width)
+      result = 0;
+    return a_minimum + result;
+  }
+
+  case POLICY_CLAMP:
+    if (a_value < a_minimum)
+      return a_minimum;
+    if (a_value > a_maximum)
+      return a_maximum;
+    return a_value;
+
+  case POLICY_NAN:
+    return std::numeric_limits<double>::quiet_NaN();
+
+  case POLICY_RAISE:
+    break;
+
+  }
+
+  return a_value;
+
+}
+
+double Angles::quantize(const double& a_value, const double& a_quantum) {
+  if (a_quantum == 0)
+    return a_value;
+  return floor(a_value/a_quantum + 0.5)*a_quantum;
+}
+
+namespace {
+
+  // murmur3 finalizer, so nearby values spread over the table
+  size_t mix(uint64_t a_bits) {
+    a_bits ^= a_bits >> 33;
+    a_bits *= 0xff51afd7ed558ccdULL;
+    a_bits ^= a_bits >> 33;
+    a_bits *= 0xc4ceb9fe1a85ec53ULL;
+    a_bits ^= a_bits >> 33;
+    return static_cast<size_t>(a_bits);
+  }
+
+} // end anonymous namespace
+
+size_t Angles::hashValue(const double& a_value, const double& a_quantum) {
+  const double a_key(quantize(a_value, a_quantum) + 0.0); // -0 + 0 is 0
+  uint64_t bits(0);
+  memcpy(&bits, &a_key, sizeof(bits));
+  return mix(bits);
+}
+
+size_t Angles::hashCount(const int64_t& a_count) {
+  return mix(static_cast<uint64_t>(a_count));
+}
+
+bool Angles::isOptimized() {
+#ifdef __OPTIMIZE__
+  return true;
+#else
+  return false;
+#endif
+}
@@ -25,6 +25,8 @@
 
 #include <sstream>
 
+#include <stdint.h>  /* int64_t */
+
 namespace Angles {
 
   // exceptions
@@ -44,6 +46,46 @@ namespace Angles {
   RangeError(const std::string& msg) : Error(msg) {}
   };
 
+  class ParseError : public Error {
+  public:
+  ParseError(const std::string& msg) : Error(msg) {}
+  };
+
+
+  // status codes for the non-throwing checks. Fits in a byte for
+  // batch status arrays.
+
+  enum Status {
+    SUCCESS = 0,
+    MINIMUM_EXCEEDED,
+    MAXIMUM_EXCEEDED,
+    DIVIDE_BY_ZERO
+  };
+
+  const char* statusString(const Status& a_status);
+
+  // throws the exception that matches a_status, if any
+  void throwStatus(const Status& a_status) throw (DivideByZeroError, RangeError);
+
+
+  // normalization conventions
+
+  enum Wrap {
+    WRAP_0_360, // degrees in [0, 360)
+    WRAP_180,   // degrees in (-180, 180]
+    WRAP_0_24   // hours in [0, 24)
+  };
+
+
+  // what limited range types do with an out of range result
+
+  enum Policy {
+    POLICY_RAISE, // RangeError, the default
+    POLICY_WRAP,  // modulo the range into [minimum, maximum)
+    POLICY_CLAMP, // to the nearest bound
+    POLICY_NAN    // quiet NaN
+  };
+
 
   // converters
 
@@ -52,4 +94,31 @@ namespace Angles {
 
   double degrees2seconds(const double& a_deg, const double& a_min, const double& a_sec);
 
+  double normalize(const double& a_value, const Wrap& a_wrap);
+
+  // Applies a_policy to a_value, which the caller has found out of
+  // range. POLICY_RAISE returns a_value unchanged, raising is up to
+  // the caller.
+  double applyPolicy(const double& a_value, const double& a_minimum, const double& a_maximum,
+		     const Policy& a_policy);
+
+  // hashing
+
+  // a_value rounded to the nearest multiple of a_quantum, e.g.
+  // 1/3600000.0 degrees for a milliarcsecond. a_value if a_quantum
+  // is 0.
+  double quantize(const double& a_value, const double& a_quantum);
+
+  // Equal values, and 0 and -0, hash the same. With a_quantum, so do
+  // values that quantize the same.
+  size_t hashValue(const double& a_value, const double& a_quantum = 0);
+
+  // for integer counts, e.g. FixedAngle
+  size_t hashCount(const int64_t& a_count);
+
+  // build
+
+  // true if the library itself was compiled optimized, e.g. -O2
+  bool isOptimized();
+
 } // end namespace Angles
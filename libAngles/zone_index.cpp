@@ -0,0 +1,234 @@
+// ================================================================
+// Filename:    zone_index.cpp
+// Description: Declination zone index and cone search.
+//
+// Author:      L.R. McFarland, lrm@starbug.com
+// Created:     2026 Oct 18
+// Language:    C++
+//
+//  Angles is free software: you can redistribute it and/or modify it
+//  under the terms of the GNU General Public License as published by
+//  the Free Software Foundation, either version 3 of the License, or
+//  (at your option) any later version.
+//
+//  Angles is distributed in the hope that it will be useful, but
+//  WITHOUT ANY WARRANTY; without even the implied warranty of
+//  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+//  General Public License for more details.
+//
+//  You should have received a copy of the GNU General Public License
+//  along with Orbits.  If not, see <http://www.gnu.org/licenses/>.
+// ================================================================
+
+#include <algorithm>
+#include <cmath>
+
+#include <sky.h>
+#include <utils.h>
+#include <zone_index.h>
+
+namespace {
+
+  const double sHourToRadian(M_PI/12.0);
+  const double sDegreeToRadian(M_PI/180.0);
+
+  // widens the right ascension windows so rounding does not lose a
+  // position on the edge, the exact test follows anyway.
+  const double sSlack(1e-9);
+
+}
+
+// =====================
+// ===== ZoneIndex =====
+// =====================
+
+Angles::ZoneIndex::ZoneIndex(const double& a_height) throw (RangeError)
+  : m_height(a_height), m_version(0) {
+  if (!(a_height > 0)) // NaN too
+    throw RangeError("minimum exceeded");
+  if (a_height > 180)
+    throw RangeError("maximum exceeded");
+  m_starts.assign(static_cast<size_t>(ceil(180/a_height)) + 1, 0);
+}
+
+int Angles::ZoneIndex::zone(const double& a_dec) const {
+  const int result(static_cast<int>(floor((a_dec + 90)/m_height)));
+  const int last(static_cast<int>(zones()) - 1);
+  return result < 0 ? 0 : (result > last ? last : result);
+}
+
+// ----- update -----
+
+void Angles::ZoneIndex::insert(const double* some_ras, const double* some_decs, const size_t& a_size)
+  throw (RangeError) {
+
+  for (size_t i = 0; i < a_size; ++i)
+    validPosition(some_ras[i], some_decs[i]);
+
+  const size_t a_start(m_entries.size());
+  m_entries.reserve(a_start + a_size);
+
+  for (size_t i = 0; i < a_size; ++i) {
+    const double ra(some_ras[i]*sHourToRadian);
+    const double dec(some_decs[i]*sDegreeToRadian);
+    Entry an_entry;
+    an_entry.m_zone = zone(some_decs[i]);
+    an_entry.m_ra = some_ras[i];
+    an_entry.m_position = a_start + i;
+    an_entry.m_x = cos(dec)*cos(ra);
+    an_entry.m_y = cos(dec)*sin(ra);
+    an_entry.m_z = sin(dec);
+    m_entries.push_back(an_entry);
+  }
+
+  std::sort(m_entries.begin() + a_start, m_entries.end());
+  std::inplace_merge(m_entries.begin(), m_entries.begin() + a_start, m_entries.end());
+
+  // zone starts, one pass
+  size_t i(0);
+  for (size_t a_zone = 0; a_zone < zones(); ++a_zone) {
+    m_starts[a_zone] = i;
+    while (i < m_entries.size() && m_entries[i].m_zone == static_cast<int>(a_zone))
+      ++i;
+  }
+  m_starts[zones()] = m_entries.size();
+
+  ++m_version;
+}
+
+void Angles::ZoneIndex::clear() {
+  m_entries.clear();
+  std::fill(m_starts.begin(), m_starts.end(), 0);
+  ++m_version;
+}
+
+// ----- queries -----
+
+Angles::ConeSearch Angles::ZoneIndex::cone(const double& a_ra, const double& a_dec,
+					   const double& a_radius) const {
+  return ConeSearch(*this, a_ra, a_dec, a_radius);
+}
+
+size_t Angles::ZoneIndex::cone(const double& a_ra, const double& a_dec, const double& a_radius,
+			       std::vector<size_t>& some_positions) const {
+
+  const size_t a_start(some_positions.size());
+
+  ConeSearch a_search(*this, a_ra, a_dec, a_radius);
+  size_t a_chunk[256];
+  for (size_t n = a_search.next(a_chunk, 256); n > 0; n = a_search.next(a_chunk, 256))
+    some_positions.insert(some_positions.end(), a_chunk, a_chunk + n);
+
+  std::sort(some_positions.begin() + a_start, some_positions.end());
+
+  return some_positions.size() - a_start;
+}
+
+
+// ======================
+// ===== ConeSearch =====
+// ======================
+
+Angles::ConeSearch::ConeSearch(const ZoneIndex& an_index, const double& a_ra, const double& a_dec,
+			       const double& a_radius)
+  : m_index(&an_index), m_version(an_index.m_version),
+    m_x(0), m_y(0), m_z(0), m_cosine(0),
+    m_zone(1), m_last_zone(0), m_window_count(0), m_window(0), m_rank(0), m_end(0) {
+
+  // NaN or a negative radius finds nothing
+  if (a_ra != a_ra || a_dec != a_dec || !(a_radius >= 0) || an_index.empty())
+    return;
+
+  const double radius(a_radius < 180 ? a_radius : 180);
+  const double ra(normalize(a_ra, WRAP_0_24));
+  const double dec(a_dec);
+
+  m_x = cos(dec*sDegreeToRadian)*cos(ra*sHourToRadian);
+  m_y = cos(dec*sDegreeToRadian)*sin(ra*sHourToRadian);
+  m_z = sin(dec*sDegreeToRadian);
+  m_cosine = cos(radius*sDegreeToRadian);
+
+  m_zone = an_index.zone(dec - radius - sSlack);
+  m_last_zone = an_index.zone(dec + radius + sSlack);
+
+  // The half width of the window, in hours, where the cone is widest.
+  // It covers every right ascension if the cone holds a pole.
+  double a_width(12);
+  if (fabs(dec) + radius < 90) {
+    const double r(radius*sDegreeToRadian);
+    const double d(dec*sDegreeToRadian);
+    a_width = atan(sin(r)/sqrt(fabs(cos(d - r)*cos(d + r))))/sHourToRadian + sSlack;
+  }
+
+  if (a_width >= 12) {
+    m_windows[0] = 0;
+    m_windows[1] = 24;
+    m_window_count = 1;
+  } else if (ra - a_width < 0) {
+    m_windows[0] = ra - a_width + 24;
+    m_windows[1] = 24;
+    m_windows[2] = 0;
+    m_windows[3] = ra + a_width;
+    m_window_count = 2;
+  } else if (ra + a_width > 24) {
+    m_windows[0] = ra - a_width;
+    m_windows[1] = 24;
+    m_windows[2] = 0;
+    m_windows[3] = ra + a_width - 24;
+    m_window_count = 2;
+  } else {
+    m_windows[0] = ra - a_width;
+    m_windows[1] = ra + a_width;
+    m_window_count = 1;
+  }
+
+  startWindow();
+}
+
+namespace {
+
+  // compares an entry's right ascension, within one zone
+  struct RaLess {
+    template<typename E>
+      bool operator()(const E& an_entry, const double& a_ra) const {return an_entry.m_ra < a_ra;}
+    template<typename E>
+      bool operator()(const double& a_ra, const E& an_entry) const {return a_ra < an_entry.m_ra;}
+  };
+
+}
+
+void Angles::ConeSearch::startWindow() {
+  const std::vector<ZoneIndex::Entry>& some_entries(m_index->m_entries);
+  const std::vector<ZoneIndex::Entry>::const_iterator a_first(some_entries.begin() + m_index->m_starts[m_zone]);
+  const std::vector<ZoneIndex::Entry>::const_iterator a_last(some_entries.begin() + m_index->m_starts[m_zone + 1]);
+  m_rank = std::lower_bound(a_first, a_last, m_windows[2*m_window], RaLess()) - some_entries.begin();
+  m_end = std::upper_bound(a_first, a_last, m_windows[2*m_window + 1], RaLess()) - some_entries.begin();
+}
+
+size_t Angles::ConeSearch::next(size_t* some_positions, const size_t& a_size) throw (Error) {
+
+  if (m_version != m_index->m_version)
+    throw Error("index changed during the search");
+
+  size_t result(0);
+
+  while (result < a_size && !done()) {
+
+    if (m_rank < m_end) {
+      const ZoneIndex::Entry& an_entry(m_index->m_entries[m_rank++]);
+      if (an_entry.m_x*m_x + an_entry.m_y*m_y + an_entry.m_z*m_z >= m_cosine)
+	some_positions[result++] = an_entry.m_position;
+      continue;
+    }
+
+    if (++m_window == m_window_count) {
+      m_window = 0;
+      ++m_zone;
+    }
+    if (!done())
+      startWindow();
+
+  }
+
+  return result;
+}
@@ -0,0 +1,160 @@
+// ================================================================
+// Filename:    zone_index.h
+//
+// Description: This is a declaration of a declination zone index of
+//              positions on the sky for cone searches, all the
+//              positions within a radius of a right ascension and
+//              declination, streamed back in chunks.
+//
+// Author:      L.R. McFarland, lrm@starbug.com
+// Created:     2026 Oct 18
+// Language:    C++
+//
+//  Angles is free software: you can redistribute it and/or modify it
+//  under the terms of the GNU General Public License as published by
+//  the Free Software Foundation, either version 3 of the License, or
+//  (at your option) any later version.
+//
+//  Angles is distributed in the hope that it will be useful, but
+//  WITHOUT ANY WARRANTY; without even the implied warranty of
+//  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+//  General Public License for more details.
+//
+//  You should have received a copy of the GNU General Public License
+//  along with Orbits.  If not, see <http://www.gnu.org/licenses/>.
+// ================================================================
+
+
+// Notes: ZoneIndex splits the sky into declination zones of a fixed
+// height and keeps each zone sorted by right ascension. A cone search
+// visits only the zones the cone overlaps and, in each, binary searches
+// the right ascension window the cone spans at its widest, in two
+// parts if it crosses 24h to 0h. Near a pole the window is the whole
+// zone. Each candidate is then tested exactly.
+//
+// ConeSearch is a cursor over one search. It holds only its place, not
+// the results, so any number can run at once with bounded memory, and
+// next() fills a caller's buffer a chunk at a time. Inserting into the
+// index invalidates the cursors on it, their next() raises Error.
+//
+// As in sky.h right ascension is in hours and declination, heights and
+// radii in degrees.
+
+
+#pragma once
+
+#include <vector>
+
+#include <angles.h>
+
+namespace Angles {
+
+  class ConeSearch;
+
+  // =====================
+  // ===== ZoneIndex =====
+  // =====================
+
+  class ZoneIndex {
+
+  public:
+
+    // ----- ctor and dtor -----
+
+    explicit ZoneIndex(const double& a_height = 0.5) throw (RangeError);
+
+    ~ZoneIndex() {};
+
+    // ----- accessors -----
+
+    const double& height() const {return m_height;}
+    size_t        zones() const {return m_starts.size() - 1;}
+    size_t        size() const {return m_entries.size();}
+    bool          empty() const {return m_entries.empty();}
+
+    // ----- update -----
+
+    // Appends positions, numbered on from size(), in one sort and
+    // merge. Raises RangeError and leaves the index unchanged if any
+    // is out of range.
+    void insert(const double* some_ras, const double* some_decs, const size_t& a_size)
+      throw (RangeError);
+
+    void clear();
+
+    // ----- queries -----
+
+    // a cursor over the positions within a_radius of (a_ra, a_dec)
+    ConeSearch cone(const double& a_ra, const double& a_dec, const double& a_radius) const;
+
+    // all of them at once, in ascending order, returns the number appended
+    size_t cone(const double& a_ra, const double& a_dec, const double& a_radius,
+		std::vector<size_t>& some_positions) const;
+
+  private:
+
+    friend class ConeSearch;
+
+    struct Entry {
+      int    m_zone;
+      double m_ra;
+      size_t m_position;
+      double m_x, m_y, m_z;
+      bool operator<(const Entry& rhs) const {
+	return m_zone < rhs.m_zone || (m_zone == rhs.m_zone &&
+				       (m_ra < rhs.m_ra || (m_ra == rhs.m_ra && m_position < rhs.m_position)));
+      }
+    };
+
+    int zone(const double& a_dec) const;
+
+    double              m_height;
+    std::vector<Entry>  m_entries; // by zone then ra
+    std::vector<size_t> m_starts;  // first entry of each zone, and size()
+    size_t              m_version; // changes on every update
+
+  };
+
+
+  // ======================
+  // ===== ConeSearch =====
+  // ======================
+
+  class ConeSearch {
+
+  public:
+
+    ConeSearch(const ZoneIndex& an_index, const double& a_ra, const double& a_dec,
+	       const double& a_radius);
+
+    // Fills up to a_size positions, returns the number filled, 0 when
+    // the search is done. Within a zone positions come in right
+    // ascension order, not position order.
+    size_t next(size_t* some_positions, const size_t& a_size) throw (Error);
+
+    bool done() const {return m_zone > m_last_zone;}
+
+  private:
+
+    // finds the ranks of the current window in the current zone
+    void startWindow();
+
+    const ZoneIndex* m_index;
+    size_t           m_version;
+
+    double m_x, m_y, m_z; // center
+    double m_cosine;      // of the radius
+
+    int    m_zone;
+    int    m_last_zone;
+
+    double m_windows[4]; // right ascension windows, lower and upper
+    int    m_window_count;
+    int    m_window;
+
+    size_t m_rank;
+    size_t m_end;
+
+  };
+
+} // end namespace Angles
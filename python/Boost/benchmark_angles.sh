@@ -0,0 +1,7 @@
+#!/usr/bin/env bash
+
+. ./setenv.sh
+
+python ../benchmark_angles.py "$@"
+
+# EoF
@@ -16,22 +16,188 @@ module_header = """// THIS IS A GENERATED FILE. EDITS WILL BE OVERWRITTEN.
 // Created:     2014sep29
 // ==========================================================================
 
+#include <vector>
+
 #include <boost/python.hpp>
 
 #include "angles.h"
+#include "fixed_angle.h"
+#include "packed_angles.h"
+#include "parser.h"
+#include "sky.h"
 
 using namespace boost::python;
 
 // overload wrappers
+
+double (*parseAngleString)(const std::string&) = &Angles::parseAngle;
+
+double (*separationValues)(const double&, const double&, const double&, const double&) = &Angles::separation;
+double (*separationAngles)(const Angles::RA&, const Angles::Declination&,
+			   const Angles::RA&, const Angles::Declination&) = &Angles::separation;
+
+// returns an (altitude, azimuth) tuple in place of the references
+tuple horizontalValues(const double& a_latitude, const double& a_lst,
+		       const double& a_ra, const double& a_dec) {
+  double altitude(0);
+  double azimuth(0);
+  Angles::horizontal(a_latitude, a_lst, a_ra, a_dec, altitude, azimuth);
+  return make_tuple(altitude, azimuth);
+}
+
+// copy and pickle the raw value, the degrees, hours or count, so the
+// round trip is exact
+
+template<typename T> T copyAngle(const T& an_angle) {return an_angle;}
+template<typename T> T deepcopyAngle(const T& an_angle, object a_memo) {return an_angle;}
+
+template<typename T> struct AnglePickle : pickle_suite {
+  static tuple getstate(const T& an_angle) {return make_tuple(an_angle.getValue());}
+  static void setstate(T& an_angle, tuple a_state) {an_angle.setValue(extract<double>(a_state[0]));}
+};
+
+template<typename T> struct FixedAnglePickle : pickle_suite {
+  static tuple getstate(const T& an_angle) {return make_tuple(an_angle.getCount());}
+  static void setstate(T& an_angle, tuple a_state) {
+    an_angle.setCount(extract<typename T::count_type>(a_state[0]));
+  }
+};
+
+// packed angles, see packed_angles.h. Declination and Latitude are one
+// C++ type, so both pack, and unpack, as Declination.
+
+template<typename T> bool packValue(object an_object, const Angles::PackType& a_pack_type,
+				    Angles::PackType& a_type, Angles::PackedValue& a_value) {
+  extract<const T&> an_angle(an_object);
+  if (!an_angle.check())
+    return false;
+  a_type = a_pack_type;
+  a_value.m_value = an_angle().getValue();
+  return true;
+}
+
+template<typename T> bool packCount(object an_object, const Angles::PackType& a_pack_type,
+				    Angles::PackType& a_type, Angles::PackedValue& a_value) {
+  extract<const T&> an_angle(an_object);
+  if (!an_angle.check())
+    return false;
+  a_type = a_pack_type;
+  a_value.m_count = an_angle().getCount();
+  return true;
+}
+
+template<typename T> object unpackValue(const Angles::PackedValue& a_value) {
+  T an_angle;
+  an_angle.setValue(a_value.m_value);
+  return object(an_angle);
+}
+
+template<typename T> object unpackCount(const Angles::PackedValue& a_value) {
+  T an_angle;
+  an_angle.setCount(static_cast<typename T::count_type>(a_value.m_count));
+  return object(an_angle);
+}
+
+str dumps(object some_angles) {
+
+  const long a_size(len(some_angles));
+  std::vector<Angles::PackType> some_types(a_size);
+  std::vector<Angles::PackedValue> some_values(a_size);
+
+  for (long i = 0; i < a_size; ++i) {
+    object an_angle(some_angles[i]);
+    Angles::PackType& a_type(some_types[i]);
+    Angles::PackedValue& a_value(some_values[i]);
+    if (!packValue<Angles::Angle>(an_angle, Angles::PACK_ANGLE, a_type, a_value) &&
+	!packValue<Angles::LimitedRangeAngle>(an_angle, Angles::PACK_LIMITED_RANGE_ANGLE, a_type, a_value) &&
+	!packValue<Angles::Declination>(an_angle, Angles::PACK_DECLINATION, a_type, a_value) &&
+	!packValue<Angles::Longitude>(an_angle, Angles::PACK_LONGITUDE, a_type, a_value) &&
+	!packValue<Angles::RA>(an_angle, Angles::PACK_RA, a_type, a_value) &&
+	!packCount<Angles::MilliarcsecondAngle>(an_angle, Angles::PACK_MILLIARCSECOND_ANGLE, a_type, a_value) &&
+	!packCount<Angles::MicroarcsecondAngle>(an_angle, Angles::PACK_MICROARCSECOND_ANGLE, a_type, a_value)) {
+      PyErr_SetString(PyExc_TypeError, "dumps needs a sequence of angles");
+      throw_error_already_set();
+    }
+  }
+
+  const std::string a_buffer(Angles::packAngles(a_size > 0 ? &some_types[0] : NULL,
+						a_size > 0 ? &some_values[0] : NULL, a_size));
+  return str(a_buffer.data(), a_buffer.size());
+}
+
+list loads(const std::string& a_data) {
+
+  std::vector<Angles::PackType> some_types;
+  std::vector<Angles::PackedValue> some_values;
+  Angles::unpackAngles(a_data.data(), a_data.size(), some_types, some_values);
+
+  list result;
+  for (size_t i = 0; i < some_values.size(); ++i) {
+    switch (some_types[i]) {
+    case Angles::PACK_ANGLE:                result.append(unpackValue<Angles::Angle>(some_values[i])); break;
+    case Angles::PACK_LIMITED_RANGE_ANGLE:  result.append(unpackValue<Angles::LimitedRangeAngle>(some_values[i])); break;
+    case Angles::PACK_DECLINATION:          result.append(unpackValue<Angles::Declination>(some_values[i])); break;
+    case Angles::PACK_LATITUDE:             result.append(unpackValue<Angles::Latitude>(some_values[i])); break;
+    case Angles::PACK_LONGITUDE:            result.append(unpackValue<Angles::Longitude>(some_values[i])); break;
+    case Angles::PACK_RA:                   result.append(unpackValue<Angles::RA>(some_values[i])); break;
+    case Angles::PACK_MILLIARCSECOND_ANGLE: result.append(unpackCount<Angles::MilliarcsecondAngle>(some_values[i])); break;
+    case Angles::PACK_MICROARCSECOND_ANGLE: result.append(unpackCount<Angles::MicroarcsecondAngle>(some_values[i])); break;
+    }
+  }
+
+  return result;
+}
 """
 
 wrapper_template = """
 void (Angles::%(TypeName)s::*set%(TypeName)sValue)(const double&) = &Angles::%(TypeName)s::setValue;
 void (Angles::%(TypeName)s::*set%(TypeName)sRadians)(const double&) = &Angles::%(TypeName)s::setRadians;
+void (Angles::%(TypeName)s::*normalize%(TypeName)s)() = &Angles::%(TypeName)s::normalize;
+void (Angles::%(TypeName)s::*normalize%(TypeName)sWrap)(const Angles::Wrap&) = &Angles::%(TypeName)s::normalize;
+size_t hash%(TypeName)s(const Angles::%(TypeName)s& an_angle) {return Angles::hashValue(an_angle.getValue());}
+"""
+
+policy_wrapper_template = """
+Angles::Policy (*get%(TypeName)sPolicy)() = &Angles::%(TypeName)s::policy;
+void (*set%(TypeName)sPolicy)(const Angles::Policy&) = &Angles::%(TypeName)s::policy;
+"""
+
+fixed_wrapper_template = """
+Angles::Angle (Angles::%(TypeName)s::*to%(TypeName)sAngle)() const = &Angles::%(TypeName)s::to<Angles::Angle>;
+void (Angles::%(TypeName)s::*normalize%(TypeName)sWrap)(const Angles::Wrap&) = &Angles::%(TypeName)s::normalize;
+size_t hash%(TypeName)s(const Angles::%(TypeName)s& an_angle) {return an_angle.hash();}
 """
 
 module_init = """
 BOOST_PYTHON_MODULE(angles) {
+
+  enum_<Angles::Wrap>("Wrap")
+    .value("WRAP_0_360", Angles::WRAP_0_360)
+    .value("WRAP_180", Angles::WRAP_180)
+    .value("WRAP_0_24", Angles::WRAP_0_24)
+    .export_values()
+    ;
+
+  enum_<Angles::Policy>("Policy")
+    .value("POLICY_RAISE", Angles::POLICY_RAISE)
+    .value("POLICY_WRAP", Angles::POLICY_WRAP)
+    .value("POLICY_CLAMP", Angles::POLICY_CLAMP)
+    .value("POLICY_NAN", Angles::POLICY_NAN)
+    .export_values()
+    ;
+
+  def("parseAngle", parseAngleString);
+
+  // scalar only, degrees
+  def("separation", separationValues);
+  def("separation", separationAngles);
+
+  // scalar only, (altitude, azimuth) in degrees
+  def("horizontal", horizontalValues);
+
+  // lists of angles to and from one string of raw values
+  def("dumps", dumps);
+  def("loads", loads);
 """
 
 angle_class_template = """
@@ -50,6 +216,8 @@ angle_class_template = """
     .def(init<double, double>()) // degrees, minutes
     .def(init<double, double, double>()) // degrees, minutes, seconds
 
+    .def(init<std::string>()) // e.g. "12:30:45.6" or "-45d30m"
+
     .def(init<Angles::Angle>()) // copy
 
     // accessors
@@ -62,7 +230,13 @@ angle_class_template = """
     .def("setRadians", setAngleRadians)
     .add_property("radians", &Angles::Angle::getRadians, setAngleRadians)
 
-    // TODO rich compare
+    // rich compare, exact as the hash is
+    .def(self == self)
+    .def(self != self)
+    .def(self < self)
+    .def(self <= self)
+    .def(self > self)
+    .def(self >= self)
 
     // operators
     .def(self + Angles::Angle())
@@ -77,7 +251,36 @@ angle_class_template = """
     .def(self / Angles::Angle())
     .def(Angles::Angle() / self)
 
-    .def("normalize", &Angles::Angle::normalize)
+    // with floats and ints
+    .def(self + double())
+    .def(double() + self)
+    .def(self - double())
+    .def(double() - self)
+    .def(self * double())
+    .def(double() * self)
+    .def(self / double())
+    .def(double() / self)
+
+    // in-place, these return self
+    .def(self += Angles::Angle())
+    .def(self -= Angles::Angle())
+    .def(self *= Angles::Angle())
+    .def(self /= Angles::Angle())
+    .def(self += double())
+    .def(self -= double())
+    .def(self *= double())
+    .def(self /= double())
+
+    .def("normalize", normalizeAngle)
+    .def("normalize", normalizeAngleWrap)
+
+    // copies and pickles are the raw value
+    .def("__copy__", copyAngle<Angles::Angle>)
+    .def("__deepcopy__", deepcopyAngle<Angles::Angle>)
+    .def_pickle(AnglePickle<Angles::Angle>())
+
+    // equal angles hash the same
+    .def("__hash__", hashAngle)
 
     // operator<<(), str not repr
     .def(self_ns::str(self_ns::self))
@@ -103,6 +306,8 @@ angle_template_template = """
     .def(init<double, double>()) // degrees, minutes
     .def(init<double, double, double>()) // degrees, minutes, seconds
 
+    .def(init<std::string>()) // e.g. "12:30:45.6" or "-45d30m"
+
     // accessors
 
     .def("getValue", &Angles::%(TypeName)s::getValue)
@@ -119,7 +324,13 @@ angle_template_template = """
     .def("maximum", &Angles::%(TypeName)s::getMaximum)
     .add_property("maximum", &Angles::%(TypeName)s::getMaximum)
 
-    // TODO rich compare
+    // rich compare, exact as the hash is
+    .def(self == self)
+    .def(self != self)
+    .def(self < self)
+    .def(self <= self)
+    .def(self > self)
+    .def(self >= self)
 
     // operators
     .def(self + Angles::%(TypeName)s())
@@ -134,6 +345,42 @@ angle_template_template = """
     .def(self / Angles::%(TypeName)s())
     .def(Angles::%(TypeName)s() / self)
 
+    // with floats and ints
+    .def(self + double())
+    .def(double() + self)
+    .def(self - double())
+    .def(double() - self)
+    .def(self * double())
+    .def(double() * self)
+    .def(self / double())
+    .def(double() / self)
+
+    // in-place, these return self
+    .def(self += Angles::%(TypeName)s())
+    .def(self -= Angles::%(TypeName)s())
+    .def(self *= Angles::%(TypeName)s())
+    .def(self /= Angles::%(TypeName)s())
+    .def(self += double())
+    .def(self -= double())
+    .def(self *= double())
+    .def(self /= double())
+
+    .def("normalize", normalize%(TypeName)s)
+    .def("normalize", normalize%(TypeName)sWrap)
+
+    // copies and pickles are the raw value
+    .def("__copy__", copyAngle<Angles::%(TypeName)s>)
+    .def("__deepcopy__", deepcopyAngle<Angles::%(TypeName)s>)
+    .def_pickle(AnglePickle<Angles::%(TypeName)s>())
+
+    // equal angles hash the same
+    .def("__hash__", hash%(TypeName)s)
+
+    // out of range policy, shared by Declination and Latitude
+    .def("getPolicy", get%(TypeName)sPolicy)
+    .staticmethod("getPolicy")
+    .def("setPolicy", set%(TypeName)sPolicy)
+    .staticmethod("setPolicy")
 
     // operator<<(), str not repr
     .def(self_ns::str(self_ns::self))
@@ -142,6 +389,58 @@ angle_template_template = """
     ; // end of %(TypeName)s class_
 """
 
+fixed_angle_template = """
+
+  class_<Angles::%(TypeName)s>("%(TypeName)s")
+
+    .def("perUnit", &Angles::%(TypeName)s::perUnit)
+    .staticmethod("perUnit")
+
+    .def("resolution", &Angles::%(TypeName)s::resolution)
+    .staticmethod("resolution")
+
+    // constructors, rounded to the nearest count
+    .def(init<>()) // default
+    .def(init<double>()) // degrees or hours
+    .def(init<Angles::Angle>())
+    .def(init<Angles::%(TypeName)s>()) // copy
+
+    // accessors
+
+    .add_property("value", &Angles::%(TypeName)s::getValue, &Angles::%(TypeName)s::setValue)
+    .add_property("count", &Angles::%(TypeName)s::getCount, &Angles::%(TypeName)s::setCount)
+
+    .def("to", to%(TypeName)sAngle) // Angle only
+
+    // operators, exact
+    .def(self + self)
+    .def(self - self)
+    .def(-self)
+    .def(self * %(CountType)s())
+    .def(%(CountType)s() * self)
+
+    .def(self == self)
+    .def(self != self)
+    .def(self < self)
+    .def(self <= self)
+    .def(self > self)
+    .def(self >= self)
+
+    .def("__hash__", hash%(TypeName)s)
+
+    .def("normalize", normalize%(TypeName)sWrap)
+
+    // copies and pickles are the raw value
+    .def("__copy__", copyAngle<Angles::%(TypeName)s>)
+    .def("__deepcopy__", deepcopyAngle<Angles::%(TypeName)s>)
+    .def_pickle(FixedAnglePickle<Angles::%(TypeName)s>())
+
+    // operator<<(), str not repr
+    .def(self_ns::str(self_ns::self))
+
+    ; // end of %(TypeName)s class_
+"""
+
 module_close = """
 };
 """
@@ -162,6 +461,10 @@ if __name__ == '__main__':
     angle_templates.append({'TypeName': 'Longitude'})
     angle_templates.append({'TypeName': 'RA'})
 
+    fixed_angles = list()
+    fixed_angles.append({'TypeName': 'MilliarcsecondAngle', 'CountType': 'int32_t'})
+    fixed_angles.append({'TypeName': 'MicroarcsecondAngle', 'CountType': 'int64_t'})
+
 
     flnm = 'angles.cpp'
     afp = open(flnm, 'w')
@@ -173,6 +476,10 @@ if __name__ == '__main__':
 
     for angle_template in angle_templates:
         afp.write(wrapper_template % angle_template)
+        afp.write(policy_wrapper_template % angle_template)
+
+    for fixed_angle in fixed_angles:
+        afp.write(fixed_wrapper_template % fixed_angle)
 
     afp.write(module_init)
 
@@ -182,6 +489,9 @@ if __name__ == '__main__':
     for angle_template in angle_templates:
         afp.write(angle_template_template % angle_template)
 
+    for fixed_angle in fixed_angles:
+        afp.write(fixed_angle_template % fixed_angle)
+
     afp.write(module_close) # final brace
 
     afp.close()
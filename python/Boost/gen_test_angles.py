@@ -13,6 +13,7 @@ which case the test should be investigated.
 
 import copy
 import math
+import pickle
 import random
 import time
 import unittest
@@ -67,84 +68,72 @@ class TestAngle(unittest.TestCase):
 
     # booleans
 
-    @unittest.skip('TODO boost wrap operator==()')
     def test_angle1_lt_angle1(self):
         \"\"\"Test richcompare operator<()\"\"\"
         a = angles.Angle(10)
         b = angles.Angle(20)
         self.assertTrue(a < b)
 
-    @unittest.skip('TODO boost wrap operator==()')
     def test_angle1_lt_angle2(self):
         \"\"\"Test richcompare operator<()\"\"\"
         a = angles.Angle(10)
         b = angles.Angle(20)
         self.assertFalse(b < a)
 
-    @unittest.skip('TODO boost wrap operator==()')
     def test_angle1_le_angle1(self):
         \"\"\"Test richcompare operator<=()\"\"\"
         a = angles.Angle(10)
         b = angles.Angle(10)
         self.assertTrue(a <= b)
 
-    @unittest.skip('TODO boost wrap operator==()')
     def test_angle1_le_angle2(self):
         \"\"\"Test richcompare operator<=()\"\"\"
         a = angles.Angle(20)
         b = angles.Angle(20.6)
         self.assertFalse(b <= a)
 
-    @unittest.skip('TODO boost wrap operator==()')
     def test_angle1_eq_angle1(self):
         \"\"\"Test richcompare operator==()\"\"\"
         an_angle = angles.Angle(1)
         another_angle = angles.Angle(1)
         self.assertTrue(an_angle == another_angle)
 
-    @unittest.skip('TODO boost wrap operator==()')
     def test_angle1_eq_angle2(self):
         \"\"\"Test richcompare operator==()\"\"\"
         an_angle = angles.Angle(1)
         another_angle = angles.Angle(-1)
         self.assertFalse(an_angle == another_angle)
 
-    @unittest.skip('TODO boost wrap operator!=()')
     def test_angle1_ne_angle1(self):
         \"\"\"Test richcompare operator!=()\"\"\"
         an_angle = angles.Angle(1)
         another_angle = angles.Angle(1)
         self.assertFalse(an_angle != another_angle)
 
-    @unittest.skip('TODO boost wrap operator!=()')
     def test_angle1_ne_angle2(self):
         \"\"\"Test richcompare operator==()\"\"\"
         an_angle = angles.Angle(1)
         another_angle = angles.Angle(-1)
         self.assertTrue(an_angle != another_angle)
 
-    @unittest.skip('TODO boost wrap operator!=()')
     def test_angle1_gt_angle1(self):
         \"\"\"Test richcompare operato>()\"\"\"
         a = angles.Angle(30)
         b = angles.Angle(20)
         self.assertTrue(a > b)
 
-    @unittest.skip('TODO boost wrap operator!=()')
     def test_angle1_gt_angle2(self):
         \"\"\"Test richcompare operator>()\"\"\"
         a = angles.Angle(30)
         b = angles.Angle(20)
         self.assertFalse(b > a)
 
-    @unittest.skip('TODO boost wrap operator!=()')
     def test_angle1_ge_angle1(self):
         \"\"\"Test richcompare operator>=()\"\"\"
         a = angles.Angle(10)
         b = angles.Angle(10)
         self.assertTrue(a >= b)
 
-    @unittest.skip('TODO boost wrap operator!=()')
     def test_angle1_ge_angle2(self):
         \"\"\"Test richcompare operator>=()\"\"\"
         a = angles.Angle(20.9)
@@ -167,13 +156,29 @@ class TestAngle(unittest.TestCase):
         another_angle = an_angle
         self.assertAlmostEqual(self.rd1, another_angle.value, self.places)
 
-    @unittest.skip('TODO Not available in boost, or manual')
     def test_deep_copy(self):
         \"\"\"Test deep copy\"\"\"
         an_angle = angles.Angle(self.rd1)
         another_angle = copy.deepcopy(an_angle)
         self.assertAlmostEqual(self.rd1, another_angle.value, self.places)
 
+    def test_copy(self):
+        \"\"\"Test copies are new objects with the same value\"\"\"
+        an_angle = angles.Angle(self.rd1)
+        a_value = an_angle.value
+        another_angle = copy.copy(an_angle)
+        self.assertFalse(another_angle is an_angle)
+        self.assertEqual(a_value, another_angle.value)
+        another_angle.value = 0
+        self.assertEqual(a_value, an_angle.value)
+
+    def test_pickle(self):
+        \"\"\"Test pickles restore the exact value\"\"\"
+        an_angle = angles.Angle(self.rd1)
+        for a_protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            another_angle = pickle.loads(pickle.dumps(an_angle, a_protocol))
+            self.assertEqual(an_angle.value, another_angle.value)
+
     def test_default_constructor(self):
         \"\"\"Test default constructor\"\"\"
         an_angle = angles.Angle()
@@ -198,6 +203,17 @@ class TestAngle(unittest.TestCase):
         self.assertEqual(-45.0, an_angle.value)
 
 
+    def test_construct_string(self):
+        \"\"\"Test construct from string\"\"\"
+        an_angle = angles.Angle('-44:59:60')
+        self.assertAlmostEqual(-45, an_angle.value, self.places)
+
+
+    def test_parse_angle(self):
+        \"\"\"Test parseAngle\"\"\"
+        self.assertAlmostEqual(12.5, angles.parseAngle('12h30m'), self.places)
+
+
     def test_mixed_sign_constructor_1(self):
         \"\"\"Test mixed sign constructor 1\"\"\"
         # divide 2 to keep in range
@@ -248,6 +264,48 @@ class TestAngle(unittest.TestCase):
         a1 += a2
         self.assertAlmostEqual(self.rd1 + self.rd2, a1.value, self.places)
 
+    def test_inplace_is_self(self):
+        \"\"\"Test inplace operators update the object\"\"\"
+        a1 = angles.Angle(self.rd1)
+        a0 = a1
+        a1 += angles.Angle(1)
+        a1 *= angles.Angle(2)
+        a1 /= angles.Angle(2)
+        a1 -= angles.Angle(1)
+        self.assertTrue(a0 is a1)
+        self.assertAlmostEqual(self.rd1, a0.value, self.places)
+
+    def test_hash(self):
+        \"\"\"Test equal angles hash the same\"\"\"
+        a1 = angles.Angle(self.rd1)
+        a2 = angles.Angle(self.rd1)
+        self.assertEqual(hash(a1), hash(a2))
+        self.assertEqual(1, len(set([a1, a2])))
+
+    def test_separation(self):
+        \"\"\"Test great circle separation\"\"\"
+        self.assertAlmostEqual(90, angles.separation(0, 0, 6, 0), self.places)
+        self.assertAlmostEqual(15, angles.separation(angles.RA(23.5), angles.Declination(0),
+                                                     angles.RA(0.5), angles.Declination(0)),
+                               self.places)
+
+    def test_horizontal(self):
+        \"\"\"Test altitude and azimuth\"\"\"
+        altitude, azimuth = angles.horizontal(45, 3, 3, 0)
+        self.assertAlmostEqual(45, altitude, self.places)
+        self.assertAlmostEqual(180, azimuth, self.places)
+
+    def test_angle_and_float(self):
+        \"\"\"Test angle arithmetic with floats\"\"\"
+        a1 = angles.Angle(self.rd1)
+        self.assertAlmostEqual(self.rd1 + 0.5, (a1 + 0.5).value, self.places)
+        self.assertAlmostEqual(1 - self.rd1, (1 - a1).value, self.places)
+        self.assertAlmostEqual(2 * self.rd1, (2 * a1).value, self.places)
+        a0 = a1
+        a1 /= 2.0
+        self.assertTrue(a0 is a1)
+        self.assertAlmostEqual(self.rd1 / 2, a1.value, self.places)
+
     def test_angle_plus_angle(self):
         \"\"\"Test angle + angle\"\"\"
         a1 = angles.Angle(self.rd1)
@@ -325,6 +383,22 @@ class TestAngle(unittest.TestCase):
         self.assertRaises(RuntimeError, lambda a, b: a / b, a1, a2)
 
 
+    # normalize
+
+    def test_normalize(self):
+        \"\"\"Test normalize\"\"\"
+        an_angle = angles.Angle(45 - 720)
+        an_angle.normalize()
+        self.assertAlmostEqual(45, an_angle.value, self.places)
+
+
+    def test_normalize_180(self):
+        \"\"\"Test normalize -180 to 180\"\"\"
+        an_angle = angles.Angle(-180)
+        an_angle.normalize(angles.WRAP_180)
+        self.assertEqual(180, an_angle.value)
+
+
    # strings
 
     def test_str(self):
@@ -408,84 +482,72 @@ class Test%(TypeName)s(unittest.TestCase):
 
     # booleans
 
-    @unittest.skip('TODO boost wrap operator<()')
     def test_angle1_lt_angle1(self):
         \"\"\"Test richcompare operator<()\"\"\"
         a = angles.%(TypeName)s(10)
         b = angles.%(TypeName)s(20)
         self.assertTrue(a < b)
 
-    @unittest.skip('TODO boost wrap operator<()')
     def test_angle1_lt_angle2(self):
         \"\"\"Test richcompare operator<()\"\"\"
         a = angles.%(TypeName)s(10)
         b = angles.%(TypeName)s(20)
         self.assertFalse(b < a)
 
-    @unittest.skip('TODO boost wrap operator<=()')
     def test_angle1_le_angle1(self):
         \"\"\"Test richcompare operator<=()\"\"\"
         a = angles.%(TypeName)s(10)
         b = angles.%(TypeName)s(10)
         self.assertTrue(a <= b)
 
-    @unittest.skip('TODO boost wrap operator<=()')
     def test_angle1_le_angle2(self):
         \"\"\"Test richcompare operator<=()\"\"\"
         a = angles.%(TypeName)s(20)
         b = angles.%(TypeName)s(20.6)
         self.assertFalse(b <= a)
 
-    @unittest.skip('TODO boost wrap operator==()')
     def test_angle1_eq_angle1(self):
         \"\"\"Test richcompare operator==()\"\"\"
         an_angle = angles.%(TypeName)s(1)
         another_angle = angles.%(TypeName)s(1)
         self.assertTrue(an_angle == another_angle)
 
-    @unittest.skip('TODO boost wrap operator==()')
     def test_angle1_eq_angle2(self):
         \"\"\"Test richcompare operator==()\"\"\"
         an_angle = angles.%(TypeName)s(1)
         another_angle = angles.%(TypeName)s(2)
         self.assertFalse(an_angle == another_angle)
 
-    @unittest.skip('TODO boost wrap operator!=()')
     def test_angle1_ne_angle1(self):
         \"\"\"Test richcompare operator!=()\"\"\"
         an_angle = angles.%(TypeName)s(1)
         another_angle = angles.%(TypeName)s(1)
         self.assertFalse(an_angle != another_angle)
 
-    @unittest.skip('TODO boost wrap operator!=()')
     def test_angle1_ne_angle2(self):
         \"\"\"Test richcompare operator!=()\"\"\"
         an_angle = angles.%(TypeName)s(1)
         another_angle = angles.%(TypeName)s(2)
         self.assertTrue(an_angle != another_angle)
 
-    @unittest.skip('TODO boost wrap operator>()')
     def test_angle1_gt_angle1(self):
         \"\"\"Test richcompare operator>()\"\"\"
         a = angles.%(TypeName)s(12)
         b = angles.%(TypeName)s(6)
         self.assertTrue(a > b)
 
-    @unittest.skip('TODO boost wrap operator>()')
     def test_angle1_gt_angle2(self):
         \"\"\"Test richcompare operator>()\"\"\"
         a = angles.%(TypeName)s(12)
         b = angles.%(TypeName)s(6)
         self.assertFalse(b > a)
 
-    @unittest.skip('TODO boost wrap operator>=()')
     def test_angle1_ge_angle1(self):
         \"\"\"Test richcompare operator>=()\"\"\"
         a = angles.%(TypeName)s(12)
         b = angles.%(TypeName)s(6)
         self.assertTrue(a >= b)
 
-    @unittest.skip('TODO boost wrap operator>=()')
     def test_angle1_ge_angle2(self):
         \"\"\"Test richcompare operator>=()\"\"\"
         a = angles.%(TypeName)s(12)
@@ -508,13 +570,29 @@ class Test%(TypeName)s(unittest.TestCase):
         another_angle = an_angle
         self.assertAlmostEqual(self.rd1, another_angle.value, self.places)
 
-    @unittest.skip('Not available in boost')
     def test_deep_copy(self):
         \"\"\"Test deep copy\"\"\"
         an_angle = angles.%(TypeName)s(self.rd1)
         another_angle = copy.deepcopy(an_angle)
         self.assertAlmostEqual(self.rd1, another_angle.value, self.places)
 
+    def test_copy(self):
+        \"\"\"Test copies are new objects with the same value\"\"\"
+        an_angle = angles.%(TypeName)s(self.rd1)
+        a_value = an_angle.value
+        another_angle = copy.copy(an_angle)
+        self.assertFalse(another_angle is an_angle)
+        self.assertEqual(a_value, another_angle.value)
+        another_angle.value = 0
+        self.assertEqual(a_value, an_angle.value)
+
+    def test_pickle(self):
+        \"\"\"Test pickles restore the exact value\"\"\"
+        an_angle = angles.%(TypeName)s(self.rd1)
+        for a_protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            another_angle = pickle.loads(pickle.dumps(an_angle, a_protocol))
+            self.assertEqual(an_angle.value, another_angle.value)
+
     def test_default_constructor(self):
         \"\"\"Test default constructor\"\"\"
         an_angle = angles.%(TypeName)s()
@@ -627,6 +705,28 @@ class Test%(TypeName)s(unittest.TestCase):
         a1 += a2
         self.assertAlmostEqual(self.rd1 + self.rd2, a1.value, self.places)
 
+    def test_inplace_is_self(self):
+        \"\"\"Test inplace operators update the object\"\"\"
+        a1 = angles.%(TypeName)s(self.rd1)
+        a0 = a1
+        a1 += angles.%(TypeName)s(0.5)
+        a1 -= angles.%(TypeName)s(0.5)
+        self.assertTrue(a0 is a1)
+        self.assertAlmostEqual(self.rd1, a0.value, self.places)
+
+    def test_hash(self):
+        \"\"\"Test equal angles hash the same\"\"\"
+        a1 = angles.%(TypeName)s(self.rd1)
+        a2 = angles.%(TypeName)s(self.rd1)
+        self.assertEqual(hash(a1), hash(a2))
+        self.assertEqual('a1', {a1: 'a1'}[a2])
+
+    def test_angle_and_float_exception(self):
+        \"\"\"Test angle arithmetic with floats range errors\"\"\"
+        a1 = angles.%(TypeName)s(%(upper_range_limit)s)
+        self.assertAlmostEqual(%(upper_range_limit)s / 2.0, (a1 * 0.5).value, self.places)
+        self.assertRaises(RuntimeError, lambda a: a + 1.0, a1)
+
     def test_inplace_add_exception(self):
         \"\"\"Test inplace add exception\"\"\"
         a1 = angles.%(TypeName)s(%(upper_range_limit)s)
@@ -789,6 +889,18 @@ class Test%(TypeName)s(unittest.TestCase):
         a2 = angles.%(TypeName)s(0)
         self.assertRaises(RuntimeError, lambda a, b: a / b, a1, a2)
 
+    # out of range policy
+
+    def test_policy_clamp(self):
+        \"\"\"Test add with POLICY_CLAMP\"\"\"
+        self.assertEqual(angles.POLICY_RAISE, angles.%(TypeName)s.getPolicy())
+        angles.%(TypeName)s.setPolicy(angles.POLICY_CLAMP)
+        try:
+            a1 = angles.%(TypeName)s(%(upper_range_limit)s)
+            self.assertEqual(%(upper_range_limit)s, (a1 + a1).value)
+        finally:
+            angles.%(TypeName)s.setPolicy(angles.POLICY_RAISE)
+
 
 """
 
@@ -829,6 +941,91 @@ test_hms_string = """
 
 """
 
+fixed_angle_template = """
+
+class Test%(TypeName)s(unittest.TestCase):
+
+    def setUp(self):
+        self.places = %(places)s
+        self.rd1 = random.uniform(-180, 180)
+
+    def test_construct(self):
+        \"\"\"Test fixed point construction, rounded to a count\"\"\"
+        a1 = angles.%(TypeName)s(self.rd1)
+        self.assertAlmostEqual(self.rd1, a1.value, self.places)
+        self.assertEqual(round(self.rd1 * angles.%(TypeName)s.perUnit()), a1.count)
+        a2 = angles.%(TypeName)s(angles.Angle(self.rd1))
+        self.assertEqual(a1, a2)
+        self.assertAlmostEqual(self.rd1, a1.to().value, self.places)
+
+    def test_exact_add(self):
+        \"\"\"Test fixed point addition is exact\"\"\"
+        a1 = angles.%(TypeName)s()
+        a2 = angles.%(TypeName)s()
+        a2.count = 1
+        for i in range(1000):
+            a1 = a1 + a2
+        self.assertEqual(1000, a1.count)
+        self.assertEqual(0, (a1 - a1).count)
+        self.assertEqual(-1000, (-a1).count)
+        self.assertEqual(2000, (a1 * 2).count)
+        self.assertEqual(2000, (2 * a1).count)
+
+    def test_compare_hash(self):
+        \"\"\"Test equal fixed point angles compare and hash the same\"\"\"
+        a1 = angles.%(TypeName)s(self.rd1)
+        a2 = angles.%(TypeName)s(self.rd1)
+        self.assertTrue(a1 == a2)
+        self.assertFalse(a1 < a2)
+        self.assertEqual(hash(a1), hash(a2))
+        self.assertEqual(1, len(set([a1, a2])))
+
+    def test_normalize(self):
+        \"\"\"Test fixed point normalize\"\"\"
+        a1 = angles.%(TypeName)s(-90)
+        a1.normalize(angles.WRAP_0_360)
+        self.assertEqual(270 * angles.%(TypeName)s.perUnit(), a1.count)
+
+    def test_copy_and_pickle(self):
+        \"\"\"Test copies and pickles keep the count\"\"\"
+        a1 = angles.%(TypeName)s(self.rd1)
+        for a2 in (copy.copy(a1), copy.deepcopy(a1), pickle.loads(pickle.dumps(a1, pickle.HIGHEST_PROTOCOL))):
+            self.assertFalse(a2 is a1)
+            self.assertEqual(a1.count, a2.count)
+
+"""
+
+pickle_template = """
+
+class TestPickle(unittest.TestCase):
+
+    def setUp(self):
+        self.size = 1000
+        self.ras = [angles.RA(random.uniform(0, 24)) for i in range(self.size)]
+
+    def test_dumps_and_loads(self):
+        \"\"\"Test packing a list of one type, 8 bytes an angle\"\"\"
+        a_buffer = angles.dumps(self.ras)
+        self.assertEqual(24 + 8 * self.size, len(a_buffer))
+        some_ras = angles.loads(a_buffer)
+        self.assertEqual([an_ra.value for an_ra in self.ras], [an_ra.value for an_ra in some_ras])
+        self.assertEqual([], angles.loads(angles.dumps([])))
+
+    def test_mixed(self):
+        \"\"\"Test packing a list of different types\"\"\"
+        some_angles = [angles.Angle(-720.5), angles.Longitude(-170), angles.MilliarcsecondAngle(1.5)]
+        the_angles = angles.loads(angles.dumps(some_angles))
+        self.assertEqual([an_angle.value for an_angle in some_angles],
+                         [an_angle.value for an_angle in the_angles])
+        self.assertEqual(1.5 * angles.MilliarcsecondAngle.perUnit(), the_angles[2].count)
+
+    def test_errors(self):
+        \"\"\"Test non angles and invalid buffers\"\"\"
+        self.assertRaises(TypeError, angles.dumps, [angles.RA(1), 1.0])
+        self.assertRaises(RuntimeError, angles.loads, angles.dumps(self.ras)[:-1])
+
+"""
+
 test_main = """
 
 if __name__ == '__main__':
@@ -895,6 +1092,15 @@ if __name__ == '__main__':
 
     # TODO different string template for RA
 
+    fixed_angles = list()
+    fixed_angles.append({'TypeName': 'MilliarcsecondAngle', 'places': 6})
+    fixed_angles.append({'TypeName': 'MicroarcsecondAngle', 'places': 9})
+
+    for fixed_angle in fixed_angles:
+        afp.write(fixed_angle_template % fixed_angle)
+
+    afp.write(pickle_template)
+
     afp.write(test_main)
 
     afp.close()
@@ -3,6 +3,8 @@
 ASSUMES: ../../libAngle exists and /usr/local/[include,lib] has boost installed.
 """
 
+import sys
+
 from distutils.core import setup, Extension
 
 name = 'angles'
@@ -18,7 +20,9 @@ library_dirs=['../../libAngles',
               BOOST_ROOT + '/lib'
               ]
 
-libraries = ['boost_python', 'Angles']
+libraries = ['boost_python', 'Angles', 'pthread']
+if sys.platform.startswith('linux'):
+    libraries.append('rt') # shm_open
 
 sources = ['angles.cpp']
 
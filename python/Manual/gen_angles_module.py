@@ -27,9 +27,25 @@ module_header = """// THIS IS A GENERATED FILE. EDITS WILL BE OVERWRITTEN.
 #include <Python.h> // must be first
 #include <structmember.h> // part of python
 
-#include <sstream>
+#include <algorithm>
+#include <limits>
+#include <new> // placement new
+#include <vector>
 
 #include <angles.h>
+#include <angle_index.h>
+#include <batch.h>
+#include <binary_catalogue.h>
+#include <catalogue.h>
+#include <fixed_angle.h>
+#include <htm.h>
+#include <packed_angles.h>
+#include <parallel.h>
+#include <parser.h>
+#include <shared_angle_array.h>
+#include <sky.h>
+#include <sorted_index.h>
+#include <zone_index.h>
 
 // ===================
 // ===== statics =====
@@ -46,12 +62,592 @@ static char sMaximumStr[] = "maximum";
 
 static char sValueStr[] = "value";
 static char sRadiansStr[] = "radians";
+static char sOutStr[] = "out";
+static char sWrapStr[] = "wrap";
+static char sPrecisionStr[] = "precision";
+static char sDelimiterStr[] = "delimiter";
+static char sBufferStr[] = "buffer";
+static char sPolicyStr[] = "policy";
+static char sOtherStr[] = "other";
+static char sLhsStr[] = "lhs";
+static char sRhsStr[] = "rhs";
+static char sQuantumStr[] = "quantum";
+static char sKeyStr[] = "key";
+static char sDefaultStr[] = "default";
+static char sValuesStr[] = "values";
+static char sCountStr[] = "count";
+static char sTypeStr[] = "type";
+static char sLowerStr[] = "lower";
+static char sUpperStr[] = "upper";
+static char sRa1Str[] = "ra1";
+static char sDec1Str[] = "dec1";
+static char sRa2Str[] = "ra2";
+static char sDec2Str[] = "dec2";
+static char sRaStr[] = "ra";
+static char sDecStr[] = "dec";
+static char sDepthStr[] = "depth";
+static char sRadiusStr[] = "radius";
+static char sIdStr[] = "id";
+static char sHeightStr[] = "height";
+static char sSizeStr[] = "size";
+static char sLatitudeStr[] = "latitude";
+static char sLongitudeStr[] = "longitude";
+static char sLstStr[] = "lst";
+static char sGstStr[] = "gst";
+static char sAltitudeStr[] = "altitude";
+static char sAzimuthStr[] = "azimuth";
+static char sPathStr[] = "path";
+static char sColumnsStr[] = "columns";
+static char sChunkStr[] = "chunk";
+static char sSkipStr[] = "skip";
+static char sColumnStr[] = "column";
+static char sNameStr[] = "name";
+static char sWritableStr[] = "writable";
+static char sAnglesStr[] = "angles";
+static char sDataStr[] = "data";
+
+static PyObject* sArrayType; // array.array, for batch results
 
 
 // TODO: make precision configuralble on build, not hardcoded.
 static const unsigned int sPrintPrecision(12); // matches defaut %s precision for unit test
 
 
+// --------------------------
+// ----- buffer helpers -----
+// --------------------------
+
+// Batch functions take any object that exports a contiguous float64
+// buffer, e.g. numpy arrays, array.array('d') or memoryviews of them.
+// New style buffers are checked for format and itemsize. Old style
+// buffers (array.array in python 2) have no format so only the length
+// and, if present, the typecode are checked.
+
+class DoubleBuffer {
+
+public:
+
+  DoubleBuffer() : m_data(NULL), m_size(0), m_hasView(false) {}
+  ~DoubleBuffer() {release();}
+
+  int acquire(PyObject* an_object, const bool& writable);
+  void release();
+
+  double*    data() const {return m_data;}
+  Py_ssize_t size() const {return m_size;}
+
+  // True if the values cannot move while the GIL is released: a new
+  // style buffer, which cannot be resized while it is viewed, or none,
+  // e.g. an out array made here. An old style buffer, e.g. python 2's
+  // array.array, may be resized by another thread.
+  bool pinned() const {return m_hasView || m_data == NULL;}
+
+private:
+
+  DoubleBuffer(const DoubleBuffer&);
+  DoubleBuffer& operator=(const DoubleBuffer&);
+
+  Py_buffer  m_view;
+  double*    m_data;
+  Py_ssize_t m_size;
+  bool       m_hasView;
+
+};
+
+
+int DoubleBuffer::acquire(PyObject* an_object, const bool& writable) {
+
+  release();
+
+  if (PyObject_CheckBuffer(an_object)) {
+
+    int flags(PyBUF_C_CONTIGUOUS | PyBUF_FORMAT);
+    if (writable)
+      flags |= PyBUF_WRITABLE;
+
+    if (PyObject_GetBuffer(an_object, &m_view, flags) < 0)
+      return -1;
+    m_hasView = true;
+
+    const char* a_format(m_view.format);
+    if (a_format != NULL && (*a_format == '@' || *a_format == '=' || *a_format == '<'))
+      ++a_format;
+
+    if (m_view.itemsize != sizeof(double) ||
+	(a_format != NULL && (a_format[0] != 'd' || a_format[1] != 0))) {
+      PyErr_SetString(sAngleException, "buffer must contain float64 values");
+      release();
+      return -1;
+    }
+
+    m_data = (double*)m_view.buf;
+    m_size = m_view.len/sizeof(double);
+    return 0;
+  }
+
+  PyObject* a_typecode(PyObject_GetAttrString(an_object, "typecode"));
+  if (a_typecode == NULL) {
+    PyErr_Clear();
+  } else {
+    bool is_double(PyString_Check(a_typecode) && strcmp(PyString_AsString(a_typecode), "d") == 0);
+    Py_DECREF(a_typecode);
+    if (!is_double) {
+      PyErr_SetString(sAngleException, "buffer must contain float64 values");
+      return -1;
+    }
+  }
+
+  void* a_buffer(NULL);
+  Py_ssize_t a_length(0);
+
+  if (writable) {
+    if (PyObject_AsWriteBuffer(an_object, &a_buffer, &a_length) < 0)
+      return -1;
+  } else {
+    if (PyObject_AsReadBuffer(an_object, (const void**)&a_buffer, &a_length) < 0)
+      return -1;
+  }
+
+  if (a_length % sizeof(double) != 0) {
+    PyErr_SetString(sAngleException, "buffer must contain float64 values");
+    return -1;
+  }
+
+  m_data = (double*)a_buffer;
+  m_size = a_length/sizeof(double);
+  return 0;
+}
+
+
+void DoubleBuffer::release() {
+  if (m_hasView)
+    PyBuffer_Release(&m_view);
+  m_hasView = false;
+  m_data = NULL;
+  m_size = 0;
+}
+
+
+// Releases the GIL for its lifetime, if a_release, so other python
+// threads run while a batch kernel does, e.g.
+//
+//   try {
+//     AllowThreads allow(values.pinned() && out.pinned());
+//     Angles::divide(...);
+//   } catch (Angles::Error& err) {
+//     PyErr_SetString(...); // the GIL is back
+//   }
+//
+// Nothing inside may use python objects.
+
+class AllowThreads {
+
+public:
+
+  explicit AllowThreads(const bool& a_release) : m_state(a_release ? PyEval_SaveThread() : NULL) {}
+  ~AllowThreads() {if (m_state != NULL) PyEval_RestoreThread(m_state);}
+
+private:
+
+  AllowThreads(const AllowThreads&);
+  AllowThreads& operator=(const AllowThreads&);
+
+  PyThreadState* m_state;
+
+};
+
+
+static bool isBuffer(PyObject* an_object) {
+  // true for new and old style buffers but not for strings.
+  if (PyString_Check(an_object) || PyUnicode_Check(an_object))
+    return false;
+  if (PyObject_CheckBuffer(an_object))
+    return true;
+  PyBufferProcs* procs(an_object->ob_type->tp_as_buffer);
+  return procs != NULL && procs->bf_getreadbuffer != NULL;
+}
+
+
+// Creates a new array.array('d') of a_size zeros and sets a_data to
+// its storage.
+static PyObject* newDoubleArray(const Py_ssize_t& a_size, double** a_data) {
+
+  PyObject* a_seed(PyObject_CallFunction(sArrayType, (char*)"s[d]", "d", 0.0));
+  if (a_seed == NULL)
+    return NULL;
+
+  PyObject* an_array(PySequence_Repeat(a_seed, a_size));
+  Py_DECREF(a_seed);
+  if (an_array == NULL)
+    return NULL;
+
+  void* a_buffer(NULL);
+  Py_ssize_t a_length(0);
+  if (PyObject_AsWriteBuffer(an_array, &a_buffer, &a_length) < 0) {
+    Py_DECREF(an_array);
+    return NULL;
+  }
+
+  *a_data = (double*)a_buffer;
+  return an_array;
+}
+
+
+// Creates a new list of the ints in some_positions.
+static PyObject* newPositionList(const std::vector<size_t>& some_positions) {
+
+  PyObject* result(PyList_New(some_positions.size()));
+  if (result == NULL)
+    return NULL;
+
+  for (size_t i = 0; i < some_positions.size(); ++i) {
+    PyObject* a_position(PyInt_FromSize_t(some_positions[i]));
+    if (a_position == NULL) {
+      Py_DECREF(result);
+      return NULL;
+    }
+    PyList_SET_ITEM(result, i, a_position);
+  }
+
+  return result;
+}
+
+
+// Gets the output buffer for a batch function. Uses an_out if given,
+// otherwise creates a new array. Returns a new reference.
+static PyObject* batchOutput(PyObject* an_out, const Py_ssize_t& a_size, DoubleBuffer& a_buffer, double** a_data) {
+
+  if (an_out == NULL || an_out == Py_None)
+    return newDoubleArray(a_size, a_data);
+
+  if (a_buffer.acquire(an_out, true) < 0)
+    return NULL;
+
+  if (a_buffer.size() != a_size) {
+    PyErr_SetString(sAngleException, "out buffer size does not match input");
+    return NULL;
+  }
+
+  *a_data = a_buffer.data();
+  Py_INCREF(an_out);
+  return an_out;
+}
+
+
+// Converts a constructor argument to a double. Floats and ints are
+// used as is, strings are parsed, e.g. "12:30:45.6" or "45d30m", see
+// parser.h.
+static int toValue(PyObject* an_object, double* a_value) {
+
+  if (an_object == NULL) {
+    *a_value = 0;
+    return 0;
+  }
+
+  if (PyUnicode_Check(an_object)) {
+    PyObject* a_string(PyUnicode_AsUTF8String(an_object));
+    if (a_string == NULL)
+      return -1;
+    int result(toValue(a_string, a_value));
+    Py_DECREF(a_string);
+    return result;
+  }
+
+  if (PyString_Check(an_object)) {
+    const char* a_begin(PyString_AS_STRING(an_object));
+    if (!Angles::parseAngle(a_begin, a_begin + PyString_GET_SIZE(an_object), a_value)) {
+      PyErr_Format(sAngleException, "invalid angle string: %s", a_begin);
+      return -1;
+    }
+    return 0;
+  }
+
+  *a_value = PyFloat_AsDouble(an_object);
+  if (*a_value == -1 && PyErr_Occurred())
+    return -1;
+
+  return 0;
+}
+
+
+// Gets the value of a python float or int for the mixed arithmetic
+// fast paths, so a + 0.5 does not need a temporary angle object.
+// Returns 1 on success, 0 for any other type and -1 on error, e.g. a
+// long too big for a double.
+static int toNumber(PyObject* an_object, double* a_value) {
+
+  if (PyFloat_Check(an_object)) {
+    *a_value = PyFloat_AS_DOUBLE(an_object);
+    return 1;
+  }
+
+  if (PyInt_Check(an_object)) {
+    *a_value = PyInt_AS_LONG(an_object);
+    return 1;
+  }
+
+  if (PyLong_Check(an_object)) {
+    *a_value = PyLong_AsDouble(an_object);
+    if (*a_value == -1 && PyErr_Occurred())
+      return -1;
+    return 1;
+  }
+
+  return 0;
+}
+
+
+// Return value of a number method whose operands did not convert,
+// NotImplemented for an unsupported type or NULL on error.
+static PyObject* notImplemented(const int& a_status) {
+  if (a_status < 0)
+    return NULL;
+  Py_INCREF(Py_NotImplemented);
+  return Py_NotImplemented;
+}
+
+
+// Checks a wrap argument, one of the module WRAP_* constants.
+static int toWrap(const int& a_value, Angles::Wrap* a_wrap) {
+  if (a_value != Angles::WRAP_0_360 && a_value != Angles::WRAP_180 && a_value != Angles::WRAP_0_24) {
+    PyErr_SetString(sAngleException, "wrap must be WRAP_0_360, WRAP_180 or WRAP_0_24");
+    return -1;
+  }
+  *a_wrap = static_cast<Angles::Wrap>(a_value);
+  return 0;
+}
+
+
+// Gets the value of any of the angle types, including the fixed
+// point ones, or of a float or int. Defined after all the types.
+static int angleValue(PyObject* an_object, double* a_value);
+
+
+// ------------------------------
+// ----- fixed point counts -----
+// ------------------------------
+
+// A python int, or a long if it does not fit.
+static PyObject* countObject(const int64_t& a_count) {
+  if (a_count >= LONG_MIN && a_count <= LONG_MAX)
+    return PyInt_FromLong(static_cast<long>(a_count));
+  return PyLong_FromLongLong(a_count);
+}
+
+// Converts a python int or long to a count, raises angles.Error if
+// it does not fit in I.
+template<typename I>
+  int toCount(PyObject* an_object, I* a_count) {
+
+  bool overflow(false);
+
+  PY_LONG_LONG a_value(PyLong_AsLongLong(an_object));
+  if (a_value == -1 && PyErr_Occurred()) {
+    if (!PyErr_ExceptionMatches(PyExc_OverflowError))
+      return -1;
+    PyErr_Clear(); // too big for a long long, so for I too
+    overflow = true;
+  }
+
+  if (overflow || a_value < std::numeric_limits<I>::min() || a_value > std::numeric_limits<I>::max()) {
+    PyErr_SetString(sAngleException, "count out of range");
+    return -1;
+  }
+
+  *a_count = static_cast<I>(a_value);
+  return 0;
+}
+
+
+// ---------------------
+// ----- free list -----
+// ---------------------
+
+// A bounded cache of dealloc'ed objects, one per type. The number
+// methods create a result object per call and most are dropped soon
+// after, so reusing them saves a malloc and free each time. Only
+// exact instances of the type are cached, subclasses may be bigger.
+// Each list adds itself to a linked list of all of them for
+// freeListStats().
+
+static const Py_ssize_t sFreeListCapacity(256);
+
+class FreeList {
+
+public:
+
+  explicit FreeList(const char* a_name)
+    : m_name(a_name), m_size(0), m_hits(0), m_misses(0), m_next(sFirst) {
+    sFirst = this;
+  }
+
+  // returns a cached object, or NULL if empty, and counts a hit or a miss
+  PyObject* pop() {
+    if (m_size == 0) {
+      ++m_misses;
+      return NULL;
+    }
+    ++m_hits;
+    return m_objects[--m_size];
+  }
+
+  // returns false if full
+  bool push(PyObject* an_object) {
+    if (m_size == sFreeListCapacity)
+      return false;
+    m_objects[m_size++] = an_object;
+    return true;
+  }
+
+  // frees the cached objects and resets the counters
+  void clear() {
+    while (m_size > 0)
+      PyObject_Del(m_objects[--m_size]);
+    m_hits = 0;
+    m_misses = 0;
+  }
+
+  PyObject* stats() const {
+    return Py_BuildValue("{s:n,s:k,s:k}", "size", m_size, "hits", m_hits, "misses", m_misses);
+  }
+
+  const char*     name() const {return m_name;}
+  const FreeList* next() const {return m_next;}
+  FreeList*       next()       {return m_next;}
+
+  static FreeList* first() {return sFirst;}
+
+private:
+
+  const char*   m_name;
+  PyObject*     m_objects[sFreeListCapacity];
+  Py_ssize_t    m_size;
+  unsigned long m_hits;
+  unsigned long m_misses;
+  FreeList*     m_next;
+
+  static FreeList* sFirst;
+
+};
+
+FreeList* FreeList::sFirst(NULL);
+
+
+// Checks a policy argument, one of the module POLICY_* constants.
+static int toPolicy(const int& a_value, Angles::Policy* a_policy) {
+  if (a_value != Angles::POLICY_RAISE && a_value != Angles::POLICY_WRAP &&
+      a_value != Angles::POLICY_CLAMP && a_value != Angles::POLICY_NAN) {
+    PyErr_SetString(sAngleException, "policy must be POLICY_RAISE, POLICY_WRAP, POLICY_CLAMP or POLICY_NAN");
+    return -1;
+  }
+  *a_policy = static_cast<Angles::Policy>(a_value);
+  return 0;
+}
+
+
+// ---------------------------
+// ----- copy and pickle -----
+// ---------------------------
+
+// Angles copy and pickle as their raw value, the degrees, hours or
+// count, with the __dict__ of an instance of a python subclass if it
+// has one. Pickles name the type, e.g. angles.RA, and __setstate__
+// sets the value as is, so the round trip is exact.
+
+// the __dict__ of an_object, NULL if it has none or it is empty. Borrowed.
+static PyObject* instanceDict(PyObject* an_object) {
+  PyObject** a_dict(_PyObject_GetDictPtr(an_object));
+  if (a_dict == NULL || *a_dict == NULL || PyDict_Size(*a_dict) == 0)
+    return NULL;
+  return *a_dict;
+}
+
+// The state __reduce__ returns, a_value or (a_value, __dict__). Steals
+// a_value.
+static PyObject* pickleState(PyObject* an_object, PyObject* a_value) {
+  PyObject* a_dict(instanceDict(an_object));
+  if (a_value == NULL || a_dict == NULL)
+    return a_value;
+  return Py_BuildValue("(NO)", a_value, a_dict);
+}
+
+// The value in a state from pickleState(), restoring the __dict__ if it
+// has one. Borrowed, NULL on error.
+static PyObject* unpickleState(PyObject* an_object, PyObject* a_state) {
+
+  if (!PyTuple_Check(a_state))
+    return a_state;
+
+  PyObject* a_value(NULL);
+  PyObject* a_dict(NULL);
+  if (!PyArg_ParseTuple(a_state, "OO!", &a_value, &PyDict_Type, &a_dict))
+    return NULL;
+
+  PyObject** an_object_dict(_PyObject_GetDictPtr(an_object));
+  if (an_object_dict == NULL) {
+    PyErr_SetString(PyExc_TypeError, "state has a __dict__ but the angle does not");
+    return NULL;
+  }
+
+  if (*an_object_dict == NULL && (*an_object_dict = PyDict_New()) == NULL)
+    return NULL;
+
+  if (PyDict_Update(*an_object_dict, a_dict) < 0)
+    return NULL;
+
+  return a_value;
+}
+
+// Copies the __dict__ of a_source, if it has one, to a_copy, with
+// copy.deepcopy() if a_memo is not NULL. Returns 0 on success and -1
+// on error.
+static int copyDict(PyObject* a_source, PyObject* a_copy, PyObject* a_memo) {
+
+  PyObject* a_dict(instanceDict(a_source));
+  if (a_dict == NULL)
+    return 0;
+
+  PyObject* a_dict_copy(NULL);
+
+  if (a_memo == NULL) {
+    a_dict_copy = PyDict_Copy(a_dict);
+  } else {
+
+    // so references back to a_source in the __dict__ get a_copy
+    if (PyDict_Check(a_memo)) {
+      PyObject* an_id(PyLong_FromVoidPtr(a_source));
+      if (an_id == NULL)
+	return -1;
+      const int status(PyDict_SetItem(a_memo, an_id, a_copy));
+      Py_DECREF(an_id);
+      if (status < 0)
+	return -1;
+    }
+
+    PyObject* copy_module(PyImport_ImportModule("copy"));
+    if (copy_module == NULL)
+      return -1;
+    a_dict_copy = PyObject_CallMethod(copy_module, (char*)"deepcopy", (char*)"OO", a_dict, a_memo);
+    Py_DECREF(copy_module);
+  }
+
+  if (a_dict_copy == NULL)
+    return -1;
+
+  PyObject** a_copy_dict(_PyObject_GetDictPtr(a_copy));
+  if (a_copy_dict == NULL) {
+    Py_DECREF(a_dict_copy);
+    PyErr_SetString(PyExc_TypeError, "the copy has no __dict__");
+    return -1;
+  }
+
+  Py_XDECREF(*a_copy_dict);
+  *a_copy_dict = a_dict_copy;
+
+  return 0;
+}
+
+
 """ # end header
 
 
@@ -77,25 +673,60 @@ typedef struct {
 
 // Forward declarations for as_number methods. Wraps Type definition.
 static void new_%(TypeName)sType(%(TypeName)s** an_angle);
+static void free_%(TypeName)sType(%(TypeName)s* an_angle);
 static int is_%(TypeName)sType(PyObject* an_angle);
+static int is_%(TypeName)sTypeExact(PyObject* an_angle);
+
+static FreeList s%(TypeName)sFreeList("%(TypeName)s");
+
+
+// Gets the value of an operand, a %(TypeName)s or a float or int in
+// its units. Returns 1 on success, 0 for an unsupported type and -1 on
+// error, see toNumber().
+static int %(TypeName)s_operand(PyObject* an_object, double* a_value) {
+  if (is_%(TypeName)sType(an_object)) {
+    *a_value = ((%(TypeName)s*)an_object)->m_angle.value();
+    return 1;
+  }
+  return toNumber(an_object, a_value);
+}
+
+static int %(TypeName)s_operands(PyObject* o1, PyObject* o2, double* a_lhs, double* a_rhs) {
+  int status(%(TypeName)s_operand(o1, a_lhs));
+  if (status <= 0)
+    return status;
+  return %(TypeName)s_operand(o2, a_rhs);
+}
 
 
 static PyObject* %(TypeName)s_new(PyTypeObject* type, PyObject* args, PyObject* kwds) {
   %(TypeName)s* self(NULL);
   self = (%(TypeName)s*)type->tp_alloc(type, 0);
+  if (self != NULL)
+    new (&self->m_angle) Angles::%(TypeName)s(); // tp_alloc does not run constructors
   return (PyObject*)self;
 }
 
 
 static int %(TypeName)s_init(%(TypeName)s* self, PyObject* args, PyObject* kwds) {
 
+  PyObject* some_degrees(NULL);
+  PyObject* some_minutes(NULL);
+  PyObject* some_seconds(NULL);
+
+  static char* kwlist[] = {sDegreeStr, sMinuteStr, sSecondStr, NULL};
+
+  if (! PyArg_ParseTupleAndKeywords(args, kwds, "|OOO", kwlist, &some_degrees, &some_minutes, &some_seconds))
+    return -1;
+
+  // floats or strings
   double degrees(0);
   double minutes(0);
   double seconds(0);
 
-  static char* kwlist[] = {sDegreeStr, sMinuteStr, sSecondStr, NULL};
-
-  if (! PyArg_ParseTupleAndKeywords(args, kwds, "|ddd", kwlist, &degrees, &minutes, &seconds))
+  if (toValue(some_degrees, &degrees) < 0 ||
+      toValue(some_minutes, &minutes) < 0 ||
+      toValue(some_seconds, &seconds) < 0)
     return -1;
 
   // value initialized to 0 by new.
@@ -106,7 +737,7 @@ static int %(TypeName)s_init(%(TypeName)s* self, PyObject* args, PyObject* kwds)
 
 
 static void %(TypeName)s_dealloc(%(TypeName)s* self) {
-  self->ob_type->tp_free((PyObject*)self);
+  free_%(TypeName)sType(self);
 }
 
 
@@ -115,18 +746,29 @@ static void %(TypeName)s_dealloc(%(TypeName)s* self) {
 // -----------------
 
 PyObject* %(TypeName)s_str(PyObject* self) {
-  std::stringstream result;
-  result.precision(sPrintPrecision);
-  result << ((%(TypeName)s*)self)->m_angle;
-  return PyString_FromString(result.str().c_str());
+  char result[Angles::MAX_SEXAGESIMAL_STRING];
+  Angles::value2%(Sexagesimal)sString(((%(TypeName)s*)self)->m_angle.value(), result, sizeof(result), sPrintPrecision);
+  return PyString_FromString(result);
 }
 
 // TODO a different repr? for constructor?
 PyObject* %(TypeName)s_repr(PyObject* self) {
-  std::stringstream result;
-  result.precision(sPrintPrecision);
-  result << ((%(TypeName)s*)self)->m_angle;
-  return PyString_FromString(result.str().c_str());
+  char result[Angles::MAX_SEXAGESIMAL_STRING];
+  Angles::value2%(Sexagesimal)sString(((%(TypeName)s*)self)->m_angle.value(), result, sizeof(result), sPrintPrecision);
+  return PyString_FromString(result);
+}
+
+
+// ----------------
+// ----- hash -----
+// ----------------
+
+// Exact, like ==, so equal angles hash the same and a hash never
+// changes while the value does not. AngleIndex(quantum=) is for
+// lookups to the nearest quantum.
+static long %(TypeName)s_hash(PyObject* self) {
+  // same as hash(float)
+  return _Py_HashDouble(((%(TypeName)s*)self)->m_angle.value());
 }
 
 
@@ -185,53 +827,49 @@ static int %(TypeName)s_setRadians(%(TypeName)s* self, PyObject* radians, void*
 // --------------------------
 
 
-static PyObject* %(TypeName)s_nb_add(PyObject* o1, PyObject* o2) {
+// Either operand of a binary number method may be a float or int in
+// degrees, e.g. a + 0.5 or 2 * a, without boxing it in an Angle. The
+// result is always a new %(TypeName)s.
 
-  if (!is_%(TypeName)sType(o1) || !is_%(TypeName)sType(o2)) {
-    Py_INCREF(Py_NotImplemented);
-    return Py_NotImplemented;
-  }
+static PyObject* %(TypeName)s_result(const double& a_value) {
 
   %(TypeName)s* result_angle(NULL);
-
   new_%(TypeName)sType(&result_angle);
 
   if (result_angle == NULL) {
-    PyErr_SetString(sAngleException, "add failed to create angle");
+    PyErr_SetString(sAngleException, "failed to create angle");
     return NULL;
   }
 
-  Angles::%(TypeName)s the_sum(((%(TypeName)s*)o1)->m_angle + ((%(TypeName)s*)o2)->m_angle);
-
-  // copy because m_angle constructor is TBD.
-  result_angle->m_angle = the_sum;
+  result_angle->m_angle.value(a_value);
 
   return (PyObject*) result_angle;
 }
 
 
-static PyObject* %(TypeName)s_nb_subtract(PyObject* o1, PyObject* o2) {
+static PyObject* %(TypeName)s_nb_add(PyObject* o1, PyObject* o2) {
 
-  if (!is_%(TypeName)sType(o1) || !is_%(TypeName)sType(o2)) {
-    Py_INCREF(Py_NotImplemented);
-    return Py_NotImplemented;
-  }
+  double lhs(0);
+  double rhs(0);
 
-  %(TypeName)s* result_angle(NULL);
+  int status(%(TypeName)s_operands(o1, o2, &lhs, &rhs));
+  if (status <= 0)
+    return notImplemented(status);
 
-  new_%(TypeName)sType(&result_angle);
+  return %(TypeName)s_result(lhs + rhs);
+}
 
-  if (result_angle == NULL) {
-    PyErr_SetString(sAngleException, "subtract failed to create angle");
-    return NULL;
-  }
 
-  Angles::%(TypeName)s the_difference(((%(TypeName)s*)o1)->m_angle - ((%(TypeName)s*)o2)->m_angle);
+static PyObject* %(TypeName)s_nb_subtract(PyObject* o1, PyObject* o2) {
 
-  // copy because m_angle constructor is TBD.
-  result_angle->m_angle = the_difference;
+  double lhs(0);
+  double rhs(0);
 
-  return (PyObject*) result_angle;
+  int status(%(TypeName)s_operands(o1, o2, &lhs, &rhs));
+  if (status <= 0)
+    return notImplemented(status);
+
+  return %(TypeName)s_result(lhs - rhs);
 }
 
 
@@ -263,48 +901,32 @@ static PyObject* %(TypeName)s_nb_negative(PyObject* o1) {
 
 static PyObject* %(TypeName)s_nb_multiply(PyObject* o1, PyObject* o2) {
 
-  if (!is_%(TypeName)sType(o1) || !is_%(TypeName)sType(o2)) {
-    Py_INCREF(Py_NotImplemented);
-    return Py_NotImplemented;
-  }
-
-  %(TypeName)s* result_angle(NULL);
-  new_%(TypeName)sType(&result_angle);
-
-  if (result_angle == NULL) {
-    PyErr_SetString(sAngleException, "multiply failed to create angle");
-    return NULL;
-  }
+  double lhs(0);
+  double rhs(0);
 
-  result_angle->m_angle = ((%(TypeName)s*)o1)->m_angle * ((%(TypeName)s*)o2)->m_angle;
+  int status(%(TypeName)s_operands(o1, o2, &lhs, &rhs));
+  if (status <= 0)
+    return notImplemented(status);
 
-  return (PyObject*) result_angle;
+  return %(TypeName)s_result(lhs * rhs);
 }
 
 
 static PyObject* %(TypeName)s_nb_divide(PyObject* o1, PyObject* o2) {
 
-  if (!is_%(TypeName)sType(o1) || !is_%(TypeName)sType(o2)) {
-    Py_INCREF(Py_NotImplemented);
-    return Py_NotImplemented;
-  }
-
-  %(TypeName)s* result_angle(NULL);
-  new_%(TypeName)sType(&result_angle);
+  double lhs(0);
+  double rhs(0);
 
-  if (result_angle == NULL) {
-    PyErr_SetString(sAngleException, "divide failed to create angle");
-    return NULL;
-  }
+  int status(%(TypeName)s_operands(o1, o2, &lhs, &rhs));
+  if (status <= 0)
+    return notImplemented(status);
 
-  try {
-    result_angle->m_angle = ((%(TypeName)s*)o1)->m_angle / ((%(TypeName)s*)o2)->m_angle;
-  } catch (Angles::Error err) {
-    PyErr_SetString(sAngleException, err.what());
+  if (rhs == 0) {
+    PyErr_SetString(sAngleException, Angles::statusString(Angles::DIVIDE_BY_ZERO));
     return NULL;
   }
 
-  return (PyObject*) result_angle;
+  return %(TypeName)s_result(lhs / rhs);
 }
 
 
@@ -321,44 +943,44 @@ static PyObject* %(TypeName)s_tp_richcompare(PyObject* o1, PyObject* o2, int op)
   if (op == Py_LT) {
 
     if (((%(TypeName)s*)o1)->m_angle < ((%(TypeName)s*)o2)->m_angle)
-      return Py_True;
+      Py_RETURN_TRUE;
     else
-      return Py_False;
+      Py_RETURN_FALSE;
 
   } else if (op == Py_LE) {
 
     if (((%(TypeName)s*)o1)->m_angle <= ((%(TypeName)s*)o2)->m_angle)
-      return Py_True;
+      Py_RETURN_TRUE;
     else
-      return Py_False;
+      Py_RETURN_FALSE;
 
   } else if (op == Py_EQ) {
 
     if (((%(TypeName)s*)o1)->m_angle == ((%(TypeName)s*)o2)->m_angle)
-      return Py_True;
+      Py_RETURN_TRUE;
     else
-      return Py_False;
+      Py_RETURN_FALSE;
 
   } else if (op == Py_NE) {
 
     if (((%(TypeName)s*)o1)->m_angle != ((%(TypeName)s*)o2)->m_angle)
-      return Py_True;
+      Py_RETURN_TRUE;
     else
-      return Py_False;
+      Py_RETURN_FALSE;
 
   } else if (op == Py_GT) {
 
     if (((%(TypeName)s*)o1)->m_angle > ((%(TypeName)s*)o2)->m_angle)
-      return Py_True;
+      Py_RETURN_TRUE;
     else
-      return Py_False;
+      Py_RETURN_FALSE;
 
   } else if (op == Py_GE) {
 
     if (((%(TypeName)s*)o1)->m_angle >= ((%(TypeName)s*)o2)->m_angle)
-      return Py_True;
+      Py_RETURN_TRUE;
     else
-      return Py_False;
+      Py_RETURN_FALSE;
 
   } else {
 
@@ -373,25 +995,148 @@ static PyObject* %(TypeName)s_tp_richcompare(PyObject* o1, PyObject* o2, int op)
 // ----- inplace methods -----
 // ---------------------------
 
+// These update o1 with the C++ in-place operators and return it with
+// a new reference, as python expects, so nothing is allocated. o2 may
+// be an Angle or a float or int.
+
 static PyObject* %(TypeName)s_nb_inplace_add(PyObject* o1, PyObject* o2) {
-  // TODO can this be implement directly using space::operator+=()?
-  // problem with refence going out of scope, segfault.
-  return %(TypeName)s_nb_add(o1, o2);
+
+  double rhs(0);
+
+  int status(is_%(TypeName)sType(o1) ? %(TypeName)s_operand(o2, &rhs) : 0);
+  if (status <= 0)
+    return notImplemented(status);
+
+  ((%(TypeName)s*)o1)->m_angle += rhs;
+
+  Py_INCREF(o1);
+  return o1;
 }
 
 static PyObject* %(TypeName)s_nb_inplace_subtract(PyObject* o1, PyObject* o2) {
-  // TOOD implement directly?
-  return %(TypeName)s_nb_subtract(o1, o2);
+
+  double rhs(0);
+
+  int status(is_%(TypeName)sType(o1) ? %(TypeName)s_operand(o2, &rhs) : 0);
+  if (status <= 0)
+    return notImplemented(status);
+
+  ((%(TypeName)s*)o1)->m_angle -= rhs;
+
+  Py_INCREF(o1);
+  return o1;
 }
 
 static PyObject* %(TypeName)s_nb_inplace_multiply(PyObject* o1, PyObject* o2) {
-  // TOOD implement directly?
-  return %(TypeName)s_nb_multiply(o1, o2);
+
+  double rhs(0);
+
+  int status(is_%(TypeName)sType(o1) ? %(TypeName)s_operand(o2, &rhs) : 0);
+  if (status <= 0)
+    return notImplemented(status);
+
+  ((%(TypeName)s*)o1)->m_angle *= rhs;
+
+  Py_INCREF(o1);
+  return o1;
 }
 
 static PyObject* %(TypeName)s_nb_inplace_divide(PyObject* o1, PyObject* o2) {
-  // TOOD implement directly?
-  return %(TypeName)s_nb_divide(o1, o2);
+
+  double rhs(0);
+
+  int status(is_%(TypeName)sType(o1) ? %(TypeName)s_operand(o2, &rhs) : 0);
+  if (status <= 0)
+    return notImplemented(status);
+
+  try {
+    ((%(TypeName)s*)o1)->m_angle /= rhs;
+  } catch (Angles::Error& err) {
+    PyErr_SetString(sAngleException, err.what());
+    return NULL;
+  }
+
+  Py_INCREF(o1);
+  return o1;
+}
+
+// -------------------------
+// ----- other methods -----
+// -------------------------
+
+static PyObject* %(TypeName)s_normalize(%(TypeName)s* self, PyObject* args, PyObject* kwds) {
+
+  int a_wrap(Angles::WRAP_0_360);
+
+  static char* kwlist[] = {sWrapStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "|i", kwlist, &a_wrap))
+    return NULL;
+
+  Angles::Wrap wrap;
+  if (toWrap(a_wrap, &wrap) < 0)
+    return NULL;
+
+  self->m_angle.normalize(wrap);
+
+  Py_RETURN_NONE;
+}
+
+// ---------------------------
+// ----- copy and pickle -----
+// ---------------------------
+
+// a new angle of self's type with its value
+static PyObject* %(TypeName)s_duplicate(%(TypeName)s* self, PyObject* a_memo) {
+
+  %(TypeName)s* an_angle(NULL);
+  if (is_%(TypeName)sTypeExact((PyObject*)self))
+    new_%(TypeName)sType(&an_angle);
+  else
+    an_angle = (%(TypeName)s*)%(TypeName)s_new(Py_TYPE(self), NULL, NULL);
+  if (an_angle == NULL)
+    return NULL;
+
+  an_angle->m_angle = self->m_angle;
+  PyObject* result((PyObject*)an_angle);
+
+  if (copyDict((PyObject*)self, result, a_memo) < 0) {
+    Py_DECREF(result);
+    return NULL;
+  }
+
+  return result;
+}
+
+static PyObject* %(TypeName)s_copy(%(TypeName)s* self) {
+  return %(TypeName)s_duplicate(self, NULL);
+}
+
+static PyObject* %(TypeName)s_deepcopy(%(TypeName)s* self, PyObject* a_memo) {
+  return %(TypeName)s_duplicate(self, a_memo);
+}
+
+// (type, (), state), see pickleState()
+static PyObject* %(TypeName)s_reduce(%(TypeName)s* self) {
+  PyObject* a_state(pickleState((PyObject*)self, PyFloat_FromDouble(self->m_angle.value())));
+  if (a_state == NULL)
+    return NULL;
+  return Py_BuildValue("(O()N)", Py_TYPE(self), a_state);
+}
+
+static PyObject* %(TypeName)s_setstate(%(TypeName)s* self, PyObject* a_state) {
+
+  PyObject* a_value(unpickleState((PyObject*)self, a_state));
+  if (a_value == NULL)
+    return NULL;
+
+  double d_value(PyFloat_AsDouble(a_value));
+  if (d_value == -1 && PyErr_Occurred())
+    return NULL;
+
+  self->m_angle.value(d_value);
+
+  Py_RETURN_NONE;
 }
 
 // --------------------------
@@ -399,6 +1144,12 @@ static PyObject* %(TypeName)s_nb_inplace_divide(PyObject* o1, PyObject* o2) {
 // --------------------------
 
 static PyMethodDef %(TypeName)s_methods[] = {
+    {"normalize", (PyCFunction)%(TypeName)s_normalize, METH_VARARGS | METH_KEYWORDS,
+     "normalize(wrap=WRAP_0_360), wraps the value into the given convention"},
+    {"__copy__", (PyCFunction)%(TypeName)s_copy, METH_NOARGS, "returns a copy"},
+    {"__deepcopy__", (PyCFunction)%(TypeName)s_deepcopy, METH_O, "returns a copy, the value is not shared"},
+    {"__reduce__", (PyCFunction)%(TypeName)s_reduce, METH_NOARGS, "pickles the raw value"},
+    {"__setstate__", (PyCFunction)%(TypeName)s_setstate, METH_O, "sets the pickled raw value"},
     {NULL}  /* Sentinel */
 };
 
@@ -466,7 +1217,7 @@ static PyNumberMethods %(TypeName)s_as_number = {
 PyTypeObject %(TypeName)sType = {
   PyObject_HEAD_INIT(NULL)
   0,                                        /* ob_size */
-  "angle",                                  /* tp_name */
+  "angles.%(TypeName)s",                    /* tp_name, with the module for pickle */
   sizeof(%(TypeName)s),                     /* tp_basicsize */
   0,                                        /* tp_itemsize */
   (destructor) %(TypeName)s_dealloc,        /* tp_dealloc */
@@ -478,7 +1229,7 @@ PyTypeObject %(TypeName)sType = {
   &%(TypeName)s_as_number,                  /* tp_as_number */
   0,                                        /* tp_as_sequence */
   0,                                        /* tp_as_mapping */
-  0,                                        /* tp_hash */
+  (hashfunc) %(TypeName)s_hash,             /* tp_hash */
   0,                                        /* tp_call */
   %(TypeName)s_str,                         /* tp_str */
   0,                                        /* tp_getattro */
@@ -506,10 +1257,24 @@ PyTypeObject %(TypeName)sType = {
 };
 
 
-// Create new objects with PyObject_New() for binary operators that
-// return a new instance of %(TypeName)s, like add.
+// Create new objects for binary operators that return a new instance
+// of %(TypeName)s, like add. Reuses one from the free list if it can,
+// otherwise PyObject_New().
 static void new_%(TypeName)sType(%(TypeName)s** an_angle) {
-  *an_angle = PyObject_New(%(TypeName)s, &%(TypeName)sType);
+  PyObject* an_object(s%(TypeName)sFreeList.pop());
+  if (an_object != NULL)
+    *an_angle = (%(TypeName)s*)PyObject_INIT(an_object, &%(TypeName)sType);
+  else
+    *an_angle = PyObject_New(%(TypeName)s, &%(TypeName)sType);
+  if (*an_angle != NULL)
+    new (&(*an_angle)->m_angle) Angles::%(TypeName)s();
+}
+
+// Keeps exact instances on the free list until it is full.
+static void free_%(TypeName)sType(%(TypeName)s* an_angle) {
+  if (Py_TYPE(an_angle) == &%(TypeName)sType && s%(TypeName)sFreeList.push((PyObject*)an_angle))
+    return;
+  Py_TYPE(an_angle)->tp_free((PyObject*)an_angle);
 }
 
 static int is_%(TypeName)sType(PyObject* an_angle) {
@@ -517,6 +1282,10 @@ static int is_%(TypeName)sType(PyObject* an_angle) {
   return PyObject_TypeCheck(an_angle, &%(TypeName)sType);
 }
 
+static int is_%(TypeName)sTypeExact(PyObject* an_angle) {
+  return Py_TYPE(an_angle) == &%(TypeName)sType;
+}
+
 """ # end angle_class_template
 
 
@@ -554,33 +1323,71 @@ typedef struct {
 
 // Forward declarations for as_number methods. Wraps Type definition.
 static void new_%(TypeName)sType(%(TypeName)s** an_angle);
+static void free_%(TypeName)sType(%(TypeName)s* an_angle);
 static int is_%(TypeName)sType(PyObject* an_angle);
+static int is_%(TypeName)sTypeExact(PyObject* an_angle);
+
+static FreeList s%(TypeName)sFreeList("%(TypeName)s");
+
+
+// Gets the value of an operand, a %(TypeName)s or a float or int in
+// its units. Returns 1 on success, 0 for an unsupported type and -1 on
+// error, see toNumber().
+static int %(TypeName)s_operand(PyObject* an_object, double* a_value) {
+  if (is_%(TypeName)sType(an_object)) {
+    *a_value = ((%(TypeName)s*)an_object)->m_angle.value();
+    return 1;
+  }
+  return toNumber(an_object, a_value);
+}
+
+static int %(TypeName)s_operands(PyObject* o1, PyObject* o2, double* a_lhs, double* a_rhs) {
+  int status(%(TypeName)s_operand(o1, a_lhs));
+  if (status <= 0)
+    return status;
+  return %(TypeName)s_operand(o2, a_rhs);
+}
+
+
+// Out of range policy for arithmetic results. One per python type,
+// so unlike the C++ typedefs Declination and Latitude do not share
+// it.
+static Angles::Policy s%(TypeName)sPolicy(Angles::POLICY_RAISE);
 
 
 static PyObject* %(TypeName)s_new(PyTypeObject* type, PyObject* args, PyObject* kwds) {
   %(TypeName)s* self(NULL);
   self = (%(TypeName)s*)type->tp_alloc(type, 0);
+  if (self != NULL)
+    new (&self->m_angle) Angles::%(TypeName)s(); // tp_alloc does not run constructors
   return (PyObject*)self;
 }
 
 
 static int %(TypeName)s_init(%(TypeName)s* self, PyObject* args, PyObject* kwds) {
 
-  double degrees(0);
-  double minutes(0);
-  double seconds(0);
+  PyObject* some_degrees(NULL);
+  PyObject* some_minutes(NULL);
+  PyObject* some_seconds(NULL);
 
   static char* kwlist[] = {sDegreeStr, sMinuteStr, sSecondStr, NULL};
 
-  if (! PyArg_ParseTupleAndKeywords(args, kwds, "|ddd", kwlist, &degrees, &minutes, &seconds))
+  if (! PyArg_ParseTupleAndKeywords(args, kwds, "|OOO", kwlist, &some_degrees, &some_minutes, &some_seconds))
     return -1;
 
-  // TODO self->m_angle not working at this point. All methods return 0 so it needs this stand-in.
-  Angles::%(TypeName)s an_angle; // this has validator max min
+  // floats or strings
+  double degrees(0);
+  double minutes(0);
+  double seconds(0);
+
+  if (toValue(some_degrees, &degrees) < 0 ||
+      toValue(some_minutes, &minutes) < 0 ||
+      toValue(some_seconds, &seconds) < 0)
+    return -1;
 
   double a_value(Angles::degrees2seconds(degrees, minutes, seconds)/3600);
 
-  if (!an_angle.isValidRange(a_value)) {
+  if (!Angles::%(TypeName)s::isValidRange(a_value)) {
     PyErr_SetString(sAngleException, "invalid range");
     return -1;
   }
@@ -592,7 +1399,7 @@ static int %(TypeName)s_init(%(TypeName)s* self, PyObject* args, PyObject* kwds)
 
 
 static void %(TypeName)s_dealloc(%(TypeName)s* self) {
-  self->ob_type->tp_free((PyObject*)self);
+  free_%(TypeName)sType(self);
 }
 
 
@@ -601,18 +1408,29 @@ static void %(TypeName)s_dealloc(%(TypeName)s* self) {
 // -----------------
 
 PyObject* %(TypeName)s_str(PyObject* self) {
-  std::stringstream result;
-  result.precision(sPrintPrecision);
-  result << ((%(TypeName)s*)self)->m_angle;
-  return PyString_FromString(result.str().c_str());
+  char result[Angles::MAX_SEXAGESIMAL_STRING];
+  Angles::value2%(Sexagesimal)sString(((%(TypeName)s*)self)->m_angle.value(), result, sizeof(result), sPrintPrecision);
+  return PyString_FromString(result);
 }
 
 // TODO a different repr? for constructor?
 PyObject* %(TypeName)s_repr(PyObject* self) {
-  std::stringstream result;
-  result.precision(sPrintPrecision);
-  result << ((%(TypeName)s*)self)->m_angle;
-  return PyString_FromString(result.str().c_str());
+  char result[Angles::MAX_SEXAGESIMAL_STRING];
+  Angles::value2%(Sexagesimal)sString(((%(TypeName)s*)self)->m_angle.value(), result, sizeof(result), sPrintPrecision);
+  return PyString_FromString(result);
+}
+
+
+// ----------------
+// ----- hash -----
+// ----------------
+
+// Exact, like ==, so equal angles hash the same and a hash never
+// changes while the value does not. AngleIndex(quantum=) is for
+// lookups to the nearest quantum.
+static long %(TypeName)s_hash(PyObject* self) {
+  // same as hash(float)
+  return _Py_HashDouble(((%(TypeName)s*)self)->m_angle.value());
 }
 
 
@@ -638,12 +1456,9 @@ static int %(TypeName)s_setValue(%(TypeName)s* self, PyObject* a_value, void* cl
     return 0;
   }
 
-  // TODO self->m_angle not working at this point. All methods return 0 so it needs this stand-in.
-  Angles::%(TypeName)s an_angle; // this has validator max min
-
   double d_value(PyFloat_AsDouble(a_value));
 
-  if (!an_angle.isValidRange(d_value)) {
+  if (!Angles::%(TypeName)s::isValidRange(d_value)) {
     PyErr_SetString(sAngleException, "invalid range");
     return -1;
   }
@@ -688,249 +1503,579 @@ static PyObject* %(TypeName)s_getMaximum(%(TypeName)s* self, void* closure) {
   return PyFloat_FromDouble(self->m_angle.maximum());
 }
 
-// --------------------------
-// ----- number methods -----
-// --------------------------
-
+// -----------------------------
+// ----- batch range check -----
+// -----------------------------
 
-static PyObject* %(TypeName)s_nb_add(PyObject* o1, PyObject* o2) {
+static PyObject* %(TypeName)s_validRange(PyObject* unused, PyObject* args) {
 
-  if (!is_%(TypeName)sType(o1) || !is_%(TypeName)sType(o2)) {
-    Py_INCREF(Py_NotImplemented);
-    return Py_NotImplemented;
-  }
+  PyObject* some_values(NULL);
 
-  %(TypeName)s* result_angle(NULL);
+  if (!PyArg_ParseTuple(args, "O", &some_values))
+    return NULL;
 
-  new_%(TypeName)sType(&result_angle);
+  DoubleBuffer values;
+  if (values.acquire(some_values, false) < 0)
+    return NULL;
 
-  if (result_angle == NULL) {
-    PyErr_SetString(sAngleException, "add failed to create angle");
+  try {
+    AllowThreads allow(values.pinned());
+    Angles::validRange(values.data(), values.size(), Angles::%(TypeName)s::minimum(), Angles::%(TypeName)s::maximum());
+  } catch (Angles::RangeError& err) {
+    PyErr_SetString(sAngleException, err.what());
     return NULL;
   }
 
-  // TODO self->m_angle not working at this point. All methods return 0 so it needs this stand-in.
-  Angles::%(TypeName)s an_angle; // this has validator max min
+  Py_RETURN_NONE;
+}
 
-  double the_sum(((%(TypeName)s*)o1)->m_angle.value() + ((%(TypeName)s*)o2)->m_angle.value());
+// Non-throwing checks. isValidRange returns a bool for a float or a
+// whole buffer. rangeStatus returns a status code for a float or a
+// bytearray of them, one per value, for a buffer.
 
-  if (!an_angle.isValidRange(the_sum)) {
-    PyErr_SetString(sAngleException, "invalid range");
-    return NULL;
-  }
+static PyObject* %(TypeName)s_isValidRange(PyObject* unused, PyObject* args) {
 
-  result_angle->m_angle.value(the_sum);
+  PyObject* some_values(NULL);
 
-  return (PyObject*) result_angle;
-}
+  if (!PyArg_ParseTuple(args, "O", &some_values))
+    return NULL;
 
+  if (!isBuffer(some_values)) {
+    double d_value(PyFloat_AsDouble(some_values));
+    if (d_value == -1 && PyErr_Occurred())
+      return NULL;
+    return PyBool_FromLong(Angles::%(TypeName)s::isValidRange(d_value));
+  }
 
-static PyObject* %(TypeName)s_nb_subtract(PyObject* o1, PyObject* o2) {
+  DoubleBuffer values;
+  if (values.acquire(some_values, false) < 0)
+    return NULL;
 
-  if (!is_%(TypeName)sType(o1) || !is_%(TypeName)sType(o2)) {
-    Py_INCREF(Py_NotImplemented);
-    return Py_NotImplemented;
+  bool is_valid(false);
+  {
+    AllowThreads allow(values.pinned());
+    is_valid = Angles::isValidRange(values.data(), values.size(),
+				    Angles::%(TypeName)s::minimum(), Angles::%(TypeName)s::maximum());
   }
 
-  %(TypeName)s* result_angle(NULL);
+  return PyBool_FromLong(is_valid);
+}
 
-  new_%(TypeName)sType(&result_angle);
+static PyObject* %(TypeName)s_rangeStatus(PyObject* unused, PyObject* args, PyObject* kwds) {
 
-  if (result_angle == NULL) {
-    PyErr_SetString(sAngleException, "subtract failed to create angle");
+  PyObject* some_values(NULL);
+  PyObject* an_out(NULL);
+
+  static char* kwlist[] = {sValueStr, sOutStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|O", kwlist, &some_values, &an_out))
     return NULL;
+
+  if (!isBuffer(some_values)) {
+    double d_value(PyFloat_AsDouble(some_values));
+    if (d_value == -1 && PyErr_Occurred())
+      return NULL;
+    return PyInt_FromLong(Angles::%(TypeName)s::rangeStatus(d_value));
   }
 
-  // TODO self->m_angle not working at this point. All methods return 0 so it needs this stand-in.
-  Angles::%(TypeName)s an_angle; // this has validator max min
+  DoubleBuffer values;
+  if (values.acquire(some_values, false) < 0)
+    return NULL;
 
-  double the_difference(((%(TypeName)s*)o1)->m_angle.value() - ((%(TypeName)s*)o2)->m_angle.value());
+  PyObject* result(NULL);
+  unsigned char* statuses(NULL);
 
-  if (!an_angle.isValidRange(the_difference)) {
-    PyErr_SetString(sAngleException, "invalid range");
-    return NULL;
+  if (an_out == NULL || an_out == Py_None) {
+    result = PyByteArray_FromStringAndSize(NULL, values.size());
+    if (result == NULL)
+      return NULL;
+    statuses = (unsigned char*)PyByteArray_AS_STRING(result);
+  } else {
+    void* a_buffer(NULL);
+    Py_ssize_t a_length(0);
+    if (PyObject_AsWriteBuffer(an_out, &a_buffer, &a_length) < 0)
+      return NULL;
+    if (a_length != values.size()) {
+      PyErr_SetString(sAngleException, "out buffer size does not match input");
+      return NULL;
+    }
+    statuses = (unsigned char*)a_buffer;
+    Py_INCREF(an_out);
+    result = an_out;
   }
 
-  result_angle->m_angle.value(the_difference);
+  {
+    AllowThreads allow(values.pinned() && (an_out == NULL || an_out == Py_None));
+    Angles::rangeStatus(values.data(), values.size(),
+			Angles::%(TypeName)s::minimum(), Angles::%(TypeName)s::maximum(),
+			statuses);
+  }
 
-  return (PyObject*) result_angle;
+  return result;
 }
 
+// ---------------------
+// ----- normalize -----
+// ---------------------
 
-static PyObject* %(TypeName)s_nb_negative(PyObject* o1) {
-  // Unitary minus
+static PyObject* %(TypeName)s_normalize(%(TypeName)s* self, PyObject* args, PyObject* kwds) {
 
-  if (!is_%(TypeName)sType(o1)) {
-    Py_INCREF(Py_NotImplemented);
-    return Py_NotImplemented;
-  }
+  int a_wrap(Angles::%(TypeName)s::wrapConvention());
 
-  %(TypeName)s* result_angle(NULL);
+  static char* kwlist[] = {sWrapStr, NULL};
 
-  new_%(TypeName)sType(&result_angle);
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "|i", kwlist, &a_wrap))
+    return NULL;
 
-  if (result_angle == NULL) {
-    PyErr_SetString(sAngleException, "negative failed to create angle");
+  Angles::Wrap wrap;
+  if (toWrap(a_wrap, &wrap) < 0)
+    return NULL;
+
+  try {
+    self->m_angle.normalize(wrap);
+  } catch (Angles::RangeError& err) {
+    PyErr_SetString(sAngleException, err.what());
     return NULL;
   }
 
-  // TODO self->m_angle not working at this point. All methods return 0 so it needs this stand-in.
-  Angles::%(TypeName)s an_angle; // this has validator max min
+  Py_RETURN_NONE;
+}
+
+// ------------------
+// ----- policy -----
+// ------------------
+
+static PyObject* %(TypeName)s_getPolicy(PyObject* unused) {
+  return PyInt_FromLong(s%(TypeName)sPolicy);
+}
 
-  double the_inverse(-((%(TypeName)s*)o1)->m_angle.value());
+static PyObject* %(TypeName)s_setPolicy(PyObject* unused, PyObject* args) {
 
-  if (!an_angle.isValidRange(the_inverse)) {
-    PyErr_SetString(sAngleException, "invalid range");
+  int a_policy(0);
+
+  if (!PyArg_ParseTuple(args, "i", &a_policy))
     return NULL;
-  }
 
-  result_angle->m_angle.value(the_inverse);
+  if (toPolicy(a_policy, &s%(TypeName)sPolicy) < 0)
+    return NULL;
 
-  return (PyObject*) result_angle;
+  Py_RETURN_NONE;
 }
 
+// Per call arithmetic, e.g. a.add(b, policy=angles.POLICY_WRAP),
+// for when the type's policy is not the one wanted.
 
-static PyObject* %(TypeName)s_nb_multiply(PyObject* o1, PyObject* o2) {
-
-  if (!is_%(TypeName)sType(o1) || !is_%(TypeName)sType(o2)) {
-    Py_INCREF(Py_NotImplemented);
-    return Py_NotImplemented;
-  }
+typedef Angles::Status (Angles::%(TypeName)s::*%(TypeName)s_TryOp)(const double&, const Angles::Policy&);
 
-  %(TypeName)s* result_angle(NULL);
-  new_%(TypeName)sType(&result_angle);
+static PyObject* %(TypeName)s_tryOp(%(TypeName)s* self, PyObject* args, PyObject* kwds,
+				    %(TypeName)s_TryOp a_try) {
 
-  if (result_angle == NULL) {
-    PyErr_SetString(sAngleException, "multiply failed to create angle");
-    return NULL;
-  }
+  PyObject* an_other(NULL);
+  int a_policy(s%(TypeName)sPolicy);
 
-  // TODO self->m_angle not working at this point. All methods return 0 so it needs this stand-in.
-  Angles::%(TypeName)s an_angle; // this has validator max min
+  static char* kwlist[] = {sOtherStr, sPolicyStr, NULL};
 
-  double the_product(((%(TypeName)s*)o1)->m_angle.value() * ((%(TypeName)s*)o2)->m_angle.value());
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|i", kwlist, &an_other, &a_policy))
+    return NULL;
 
-  if (!an_angle.isValidRange(the_product)) {
-    PyErr_SetString(sAngleException, "invalid range");
+  double rhs(0);
+  int is_operand(%(TypeName)s_operand(an_other, &rhs));
+  if (is_operand < 0)
+    return NULL;
+  if (is_operand == 0) {
+    PyErr_SetString(PyExc_TypeError, "other must be a %(TypeName)s, float or int");
     return NULL;
   }
 
-  result_angle->m_angle.value(the_product);
-
-  return (PyObject*) result_angle;
-}
-
+  Angles::Policy policy;
+  if (toPolicy(a_policy, &policy) < 0)
+    return NULL;
 
-static PyObject* %(TypeName)s_nb_divide(PyObject* o1, PyObject* o2) {
+  Angles::%(TypeName)s the_result(self->m_angle);
+  Angles::Status status((the_result.*a_try)(rhs, policy));
 
-  if (!is_%(TypeName)sType(o1) || !is_%(TypeName)sType(o2)) {
-    Py_INCREF(Py_NotImplemented);
-    return Py_NotImplemented;
+  if (status != Angles::SUCCESS) {
+    PyErr_SetString(sAngleException, Angles::statusString(status));
+    return NULL;
   }
 
   %(TypeName)s* result_angle(NULL);
   new_%(TypeName)sType(&result_angle);
 
   if (result_angle == NULL) {
-    PyErr_SetString(sAngleException, "divide failed to create angle");
+    PyErr_SetString(sAngleException, "failed to create angle");
     return NULL;
   }
 
-  try {
-    // use constructor to raise an exception if the value is 
-    // not in the valid range or has a divide by zero error.
-    Angles::%(TypeName)s the_quotient(((%(TypeName)s*)o1)->m_angle.value() /
-                                      ((%(TypeName)s*)o2)->m_angle.value());
-    result_angle->m_angle = the_quotient;
-    return (PyObject*) result_angle;
-  } catch (Angles::Error err) {
-    PyErr_SetString(sAngleException, err.what());
-    return NULL;
-  }
+  result_angle->m_angle = the_result;
+
+  return (PyObject*) result_angle;
 }
 
+static PyObject* %(TypeName)s_add(%(TypeName)s* self, PyObject* args, PyObject* kwds) {
+  return %(TypeName)s_tryOp(self, args, kwds, &Angles::%(TypeName)s::tryAdd);
+}
 
-static PyObject* %(TypeName)s_tp_richcompare(PyObject* o1, PyObject* o2, int op) {
+static PyObject* %(TypeName)s_subtract(%(TypeName)s* self, PyObject* args, PyObject* kwds) {
+  return %(TypeName)s_tryOp(self, args, kwds, &Angles::%(TypeName)s::trySubtract);
+}
 
-  if (!is_%(TypeName)sType(o1) || !is_%(TypeName)sType(o2)) {
-    Py_INCREF(Py_NotImplemented);
-    return Py_NotImplemented;
-  }
+static PyObject* %(TypeName)s_multiply(%(TypeName)s* self, PyObject* args, PyObject* kwds) {
+  return %(TypeName)s_tryOp(self, args, kwds, &Angles::%(TypeName)s::tryMultiply);
+}
 
-  if (op == Py_LT) {
+static PyObject* %(TypeName)s_divide(%(TypeName)s* self, PyObject* args, PyObject* kwds) {
+  return %(TypeName)s_tryOp(self, args, kwds, &Angles::%(TypeName)s::tryDivide);
+}
 
-    if (((%(TypeName)s*)o1)->m_angle < ((%(TypeName)s*)o2)->m_angle)
-      return Py_True;
-    else
-      return Py_False;
+// Applies a policy to every value of a float64 buffer, e.g. a column
+// of catalogue values that may be out of range. Returns out, or a new
+// array('d').
 
-  } else if (op == Py_LE) {
+static PyObject* %(TypeName)s_applyPolicy(PyObject* unused, PyObject* args, PyObject* kwds) {
 
-    if (((%(TypeName)s*)o1)->m_angle <= ((%(TypeName)s*)o2)->m_angle)
-      return Py_True;
-    else
-      return Py_False;
+  PyObject* some_values(NULL);
+  int a_policy(s%(TypeName)sPolicy);
+  PyObject* an_out(NULL);
 
-  } else if (op == Py_EQ) {
+  static char* kwlist[] = {sValueStr, sPolicyStr, sOutStr, NULL};
 
-    if (((%(TypeName)s*)o1)->m_angle == ((%(TypeName)s*)o2)->m_angle)
-      return Py_True;
-    else
-      return Py_False;
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|iO", kwlist, &some_values, &a_policy, &an_out))
+    return NULL;
 
-  } else if (op == Py_NE) {
+  Angles::Policy policy;
+  if (toPolicy(a_policy, &policy) < 0)
+    return NULL;
 
-    if (((%(TypeName)s*)o1)->m_angle != ((%(TypeName)s*)o2)->m_angle)
-      return Py_True;
-    else
-      return Py_False;
+  DoubleBuffer values;
+  if (values.acquire(some_values, false) < 0)
+    return NULL;
 
-  } else if (op == Py_GT) {
+  DoubleBuffer out;
+  double* result_data(NULL);
+  PyObject* result(batchOutput(an_out, values.size(), out, &result_data));
+  if (result == NULL)
+    return NULL;
 
-    if (((%(TypeName)s*)o1)->m_angle > ((%(TypeName)s*)o2)->m_angle)
-      return Py_True;
-    else
-      return Py_False;
+  Angles::Status status(Angles::SUCCESS);
+  {
+    AllowThreads allow(values.pinned() && out.pinned());
+    status = Angles::applyPolicy(values.data(), result_data, values.size(),
+				 Angles::%(TypeName)s::minimum(), Angles::%(TypeName)s::maximum(),
+				 policy);
+  }
+  if (status != Angles::SUCCESS) {
+    Py_DECREF(result);
+    PyErr_SetString(sAngleException, Angles::statusString(status));
+    return NULL;
+  }
 
-  } else if (op == Py_GE) {
+  return result;
+}
 
-    if (((%(TypeName)s*)o1)->m_angle >= ((%(TypeName)s*)o2)->m_angle)
-      return Py_True;
-    else
-      return Py_False;
+// --------------------------
+// ----- number methods -----
+// --------------------------
 
-  } else {
 
-    PyErr_SetString(PyExc_TypeError, "richcompare op not supported");
+// Either operand of a binary number method may be a float or int in
+// degrees, hours for RA, e.g. a + 0.5 or 2 * a, without boxing it in
+// an object. The result is a new %(TypeName)s, range checked without
+// C++ exceptions by the type's policy.
+
+static PyObject* %(TypeName)s_result(const double& a_value) {
+
+  Angles::%(TypeName)s the_result;
+  Angles::Status status(the_result.trySetValue(a_value, s%(TypeName)sPolicy));
+
+  if (status != Angles::SUCCESS) {
+    PyErr_SetString(sAngleException, Angles::statusString(status));
     return NULL;
+  }
+
+  %(TypeName)s* result_angle(NULL);
+  new_%(TypeName)sType(&result_angle);
 
+  if (result_angle == NULL) {
+    PyErr_SetString(sAngleException, "failed to create angle");
+    return NULL;
   }
 
-}
+  result_angle->m_angle = the_result;
+
+  return (PyObject*) result_angle;
+}
+
+
+static PyObject* %(TypeName)s_nb_add(PyObject* o1, PyObject* o2) {
+
+  double lhs(0);
+  double rhs(0);
+
+  int status(%(TypeName)s_operands(o1, o2, &lhs, &rhs));
+  if (status <= 0)
+    return notImplemented(status);
+
+  return %(TypeName)s_result(lhs + rhs);
+}
+
+
+static PyObject* %(TypeName)s_nb_subtract(PyObject* o1, PyObject* o2) {
+
+  double lhs(0);
+  double rhs(0);
+
+  int status(%(TypeName)s_operands(o1, o2, &lhs, &rhs));
+  if (status <= 0)
+    return notImplemented(status);
+
+  return %(TypeName)s_result(lhs - rhs);
+}
+
+
+static PyObject* %(TypeName)s_nb_negative(PyObject* o1) {
+  // Unitary minus
+
+  if (!is_%(TypeName)sType(o1)) {
+    Py_INCREF(Py_NotImplemented);
+    return Py_NotImplemented;
+  }
+
+  // range checked without C++ exceptions
+  Angles::%(TypeName)s the_inverse(((%(TypeName)s*)o1)->m_angle);
+  Angles::Status status(the_inverse.tryNegate(s%(TypeName)sPolicy));
+
+  if (status != Angles::SUCCESS) {
+    PyErr_SetString(sAngleException, Angles::statusString(status));
+    return NULL;
+  }
+
+  %(TypeName)s* result_angle(NULL);
+  new_%(TypeName)sType(&result_angle);
+
+  if (result_angle == NULL) {
+    PyErr_SetString(sAngleException, "negative failed to create angle");
+    return NULL;
+  }
+
+  result_angle->m_angle = the_inverse;
+
+  return (PyObject*) result_angle;
+}
+
+
+static PyObject* %(TypeName)s_nb_multiply(PyObject* o1, PyObject* o2) {
+
+  double lhs(0);
+  double rhs(0);
+
+  int status(%(TypeName)s_operands(o1, o2, &lhs, &rhs));
+  if (status <= 0)
+    return notImplemented(status);
+
+  return %(TypeName)s_result(lhs * rhs);
+}
+
+
+static PyObject* %(TypeName)s_nb_divide(PyObject* o1, PyObject* o2) {
+
+  double lhs(0);
+  double rhs(0);
+
+  int status(%(TypeName)s_operands(o1, o2, &lhs, &rhs));
+  if (status <= 0)
+    return notImplemented(status);
+
+  if (rhs == 0) {
+    PyErr_SetString(sAngleException, Angles::statusString(Angles::DIVIDE_BY_ZERO));
+    return NULL;
+  }
+
+  return %(TypeName)s_result(lhs / rhs);
+}
+
+
+static PyObject* %(TypeName)s_tp_richcompare(PyObject* o1, PyObject* o2, int op) {
+
+  if (!is_%(TypeName)sType(o1) || !is_%(TypeName)sType(o2)) {
+    Py_INCREF(Py_NotImplemented);
+    return Py_NotImplemented;
+  }
+
+  if (op == Py_LT) {
+
+    if (((%(TypeName)s*)o1)->m_angle < ((%(TypeName)s*)o2)->m_angle)
+      Py_RETURN_TRUE;
+    else
+      Py_RETURN_FALSE;
+
+  } else if (op == Py_LE) {
+
+    if (((%(TypeName)s*)o1)->m_angle <= ((%(TypeName)s*)o2)->m_angle)
+      Py_RETURN_TRUE;
+    else
+      Py_RETURN_FALSE;
+
+  } else if (op == Py_EQ) {
+
+    if (((%(TypeName)s*)o1)->m_angle == ((%(TypeName)s*)o2)->m_angle)
+      Py_RETURN_TRUE;
+    else
+      Py_RETURN_FALSE;
+
+  } else if (op == Py_NE) {
+
+    if (((%(TypeName)s*)o1)->m_angle != ((%(TypeName)s*)o2)->m_angle)
+      Py_RETURN_TRUE;
+    else
+      Py_RETURN_FALSE;
+
+  } else if (op == Py_GT) {
+
+    if (((%(TypeName)s*)o1)->m_angle > ((%(TypeName)s*)o2)->m_angle)
+      Py_RETURN_TRUE;
+    else
+      Py_RETURN_FALSE;
+
+  } else if (op == Py_GE) {
+
+    if (((%(TypeName)s*)o1)->m_angle >= ((%(TypeName)s*)o2)->m_angle)
+      Py_RETURN_TRUE;
+    else
+      Py_RETURN_FALSE;
+
+  } else {
+
+    PyErr_SetString(PyExc_TypeError, "richcompare op not supported");
+    return NULL;
+
+  }
+
+}
 
 // ---------------------------
 // ----- inplace methods -----
 // ---------------------------
 
+// These update o1 in place and return it with a new reference, as
+// python expects, so nothing is allocated. o2 may be a %(TypeName)s
+// or a float or int. The try versions of the
+// C++ in-place operators apply the type's policy without exceptions
+// and leave o1 unchanged on error.
+
+static PyObject* %(TypeName)s_inplaceResult(PyObject* o1, const Angles::Status& a_status) {
+  if (a_status != Angles::SUCCESS) {
+    PyErr_SetString(sAngleException, Angles::statusString(a_status));
+    return NULL;
+  }
+  Py_INCREF(o1);
+  return o1;
+}
+
 static PyObject* %(TypeName)s_nb_inplace_add(PyObject* o1, PyObject* o2) {
-  // TODO can this be implement directly using space::operator+=()?
-  // problem with refence going out of scope, segfault.
-  return %(TypeName)s_nb_add(o1, o2);
+
+  double rhs(0);
+
+  int status(is_%(TypeName)sType(o1) ? %(TypeName)s_operand(o2, &rhs) : 0);
+  if (status <= 0)
+    return notImplemented(status);
+
+  return %(TypeName)s_inplaceResult(o1, ((%(TypeName)s*)o1)->m_angle.tryAdd(rhs, s%(TypeName)sPolicy));
 }
 
 static PyObject* %(TypeName)s_nb_inplace_subtract(PyObject* o1, PyObject* o2) {
-  // TOOD implement directly?
-  return %(TypeName)s_nb_subtract(o1, o2);
+
+  double rhs(0);
+
+  int status(is_%(TypeName)sType(o1) ? %(TypeName)s_operand(o2, &rhs) : 0);
+  if (status <= 0)
+    return notImplemented(status);
+
+  return %(TypeName)s_inplaceResult(o1, ((%(TypeName)s*)o1)->m_angle.trySubtract(rhs, s%(TypeName)sPolicy));
 }
 
 static PyObject* %(TypeName)s_nb_inplace_multiply(PyObject* o1, PyObject* o2) {
-  // TOOD implement directly?
-  return %(TypeName)s_nb_multiply(o1, o2);
+
+  double rhs(0);
+
+  int status(is_%(TypeName)sType(o1) ? %(TypeName)s_operand(o2, &rhs) : 0);
+  if (status <= 0)
+    return notImplemented(status);
+
+  return %(TypeName)s_inplaceResult(o1, ((%(TypeName)s*)o1)->m_angle.tryMultiply(rhs, s%(TypeName)sPolicy));
 }
 
 static PyObject* %(TypeName)s_nb_inplace_divide(PyObject* o1, PyObject* o2) {
-  // TOOD implement directly?
-  return %(TypeName)s_nb_divide(o1, o2);
+
+  double rhs(0);
+
+  int status(is_%(TypeName)sType(o1) ? %(TypeName)s_operand(o2, &rhs) : 0);
+  if (status <= 0)
+    return notImplemented(status);
+
+  return %(TypeName)s_inplaceResult(o1, ((%(TypeName)s*)o1)->m_angle.tryDivide(rhs, s%(TypeName)sPolicy));
+}
+
+// ---------------------------
+// ----- copy and pickle -----
+// ---------------------------
+
+// a new angle of self's type with its value
+static PyObject* %(TypeName)s_duplicate(%(TypeName)s* self, PyObject* a_memo) {
+
+  %(TypeName)s* an_angle(NULL);
+  if (is_%(TypeName)sTypeExact((PyObject*)self))
+    new_%(TypeName)sType(&an_angle);
+  else
+    an_angle = (%(TypeName)s*)%(TypeName)s_new(Py_TYPE(self), NULL, NULL);
+  if (an_angle == NULL)
+    return NULL;
+
+  an_angle->m_angle = self->m_angle;
+  PyObject* result((PyObject*)an_angle);
+
+  if (copyDict((PyObject*)self, result, a_memo) < 0) {
+    Py_DECREF(result);
+    return NULL;
+  }
+
+  return result;
+}
+
+static PyObject* %(TypeName)s_copy(%(TypeName)s* self) {
+  return %(TypeName)s_duplicate(self, NULL);
+}
+
+static PyObject* %(TypeName)s_deepcopy(%(TypeName)s* self, PyObject* a_memo) {
+  return %(TypeName)s_duplicate(self, a_memo);
+}
+
+// (type, (), state), see pickleState()
+static PyObject* %(TypeName)s_reduce(%(TypeName)s* self) {
+  PyObject* a_state(pickleState((PyObject*)self, PyFloat_FromDouble(self->m_angle.value())));
+  if (a_state == NULL)
+    return NULL;
+  return Py_BuildValue("(O()N)", Py_TYPE(self), a_state);
+}
+
+static PyObject* %(TypeName)s_setstate(%(TypeName)s* self, PyObject* a_state) {
+
+  PyObject* a_value(unpickleState((PyObject*)self, a_state));
+  if (a_value == NULL)
+    return NULL;
+
+  double d_value(PyFloat_AsDouble(a_value));
+  if (d_value == -1 && PyErr_Occurred())
+    return NULL;
+
+  if (!Angles::%(TypeName)s::isValidRange(d_value)) {
+    PyErr_SetString(sAngleException, "invalid range");
+    return NULL;
+  }
+
+  self->m_angle.value(d_value);
+
+  Py_RETURN_NONE;
 }
 
 // --------------------------
@@ -940,6 +2085,34 @@ static PyObject* %(TypeName)s_nb_inplace_divide(PyObject* o1, PyObject* o2) {
 static PyMethodDef %(TypeName)s_methods[] = {
     {sMinimumStr, (PyCFunction)%(TypeName)s_getMinimum, METH_NOARGS, NULL},
     {sMaximumStr, (PyCFunction)%(TypeName)s_getMaximum, METH_NOARGS, NULL},
+    {"validRange", (PyCFunction)%(TypeName)s_validRange, METH_VARARGS | METH_STATIC,
+     "raises angles.Error if any value in a float64 buffer is out of range"},
+    {"isValidRange", (PyCFunction)%(TypeName)s_isValidRange, METH_VARARGS | METH_STATIC,
+     "returns True if a float, or every value in a float64 buffer, is in range"},
+    {"rangeStatus", (PyCFunction)%(TypeName)s_rangeStatus, METH_VARARGS | METH_KEYWORDS | METH_STATIC,
+     "rangeStatus(value or buffer, out=None), returns SUCCESS, MINIMUM_EXCEEDED or MAXIMUM_EXCEEDED"
+     " for a float, or a bytearray of them for a float64 buffer"},
+    {"normalize", (PyCFunction)%(TypeName)s_normalize, METH_VARARGS | METH_KEYWORDS,
+     "normalize(wrap), wraps the value into the given convention, defaults to the type's own"},
+    {"getPolicy", (PyCFunction)%(TypeName)s_getPolicy, METH_NOARGS | METH_STATIC,
+     "returns the out of range policy for arithmetic, one of the POLICY_* constants"},
+    {"setPolicy", (PyCFunction)%(TypeName)s_setPolicy, METH_VARARGS | METH_STATIC,
+     "setPolicy(policy), sets the out of range policy for arithmetic on this type"},
+    {"add", (PyCFunction)%(TypeName)s_add, METH_VARARGS | METH_KEYWORDS,
+     "add(other, policy), returns self + other with the given out of range policy"},
+    {"subtract", (PyCFunction)%(TypeName)s_subtract, METH_VARARGS | METH_KEYWORDS,
+     "subtract(other, policy), returns self - other with the given out of range policy"},
+    {"multiply", (PyCFunction)%(TypeName)s_multiply, METH_VARARGS | METH_KEYWORDS,
+     "multiply(other, policy), returns self * other with the given out of range policy"},
+    {"divide", (PyCFunction)%(TypeName)s_divide, METH_VARARGS | METH_KEYWORDS,
+     "divide(other, policy), returns self / other with the given out of range policy"},
+    {"applyPolicy", (PyCFunction)%(TypeName)s_applyPolicy, METH_VARARGS | METH_KEYWORDS | METH_STATIC,
+     "applyPolicy(buffer, policy, out=None), applies the policy to the out of range values"
+     " of a float64 buffer, returns out or a new array('d')"},
+    {"__copy__", (PyCFunction)%(TypeName)s_copy, METH_NOARGS, "returns a copy"},
+    {"__deepcopy__", (PyCFunction)%(TypeName)s_deepcopy, METH_O, "returns a copy, the value is not shared"},
+    {"__reduce__", (PyCFunction)%(TypeName)s_reduce, METH_NOARGS, "pickles the raw value"},
+    {"__setstate__", (PyCFunction)%(TypeName)s_setstate, METH_O, "sets the pickled raw value"},
     {NULL}  /* Sentinel */
 };
 
@@ -1007,7 +2180,7 @@ static PyNumberMethods %(TypeName)s_as_number = {
 PyTypeObject %(TypeName)sType = {
   PyObject_HEAD_INIT(NULL)
   0,                                        /* ob_size */
-  "angle",                                  /* tp_name */
+  "angles.%(TypeName)s",                    /* tp_name, with the module for pickle */
   sizeof(%(TypeName)s),                     /* tp_basicsize */
   0,                                        /* tp_itemsize */
   (destructor) %(TypeName)s_dealloc,        /* tp_dealloc */
@@ -1019,7 +2192,7 @@ PyTypeObject %(TypeName)sType = {
   &%(TypeName)s_as_number,                  /* tp_as_number */
   0,                                        /* tp_as_sequence */
   0,                                        /* tp_as_mapping */
-  0,                                        /* tp_hash */
+  (hashfunc) %(TypeName)s_hash,             /* tp_hash */
   0,                                        /* tp_call */
   %(TypeName)s_str,                         /* tp_str */
   0,                                        /* tp_getattro */
@@ -1047,10 +2220,24 @@ PyTypeObject %(TypeName)sType = {
 };
 
 
-// Create new objects with PyObject_New() for binary operators that
-// return a new instance of %(TypeName)s, like add.
+// Create new objects for binary operators that return a new instance
+// of %(TypeName)s, like add. Reuses one from the free list if it can,
+// otherwise PyObject_New().
 static void new_%(TypeName)sType(%(TypeName)s** an_angle) {
-  *an_angle = PyObject_New(%(TypeName)s, &%(TypeName)sType);
+  PyObject* an_object(s%(TypeName)sFreeList.pop());
+  if (an_object != NULL)
+    *an_angle = (%(TypeName)s*)PyObject_INIT(an_object, &%(TypeName)sType);
+  else
+    *an_angle = PyObject_New(%(TypeName)s, &%(TypeName)sType);
+  if (*an_angle != NULL)
+    new (&(*an_angle)->m_angle) Angles::%(TypeName)s();
+}
+
+// Keeps exact instances on the free list until it is full.
+static void free_%(TypeName)sType(%(TypeName)s* an_angle) {
+  if (Py_TYPE(an_angle) == &%(TypeName)sType && s%(TypeName)sFreeList.push((PyObject*)an_angle))
+    return;
+  Py_TYPE(an_angle)->tp_free((PyObject*)an_angle);
 }
 
 static int is_%(TypeName)sType(PyObject* an_angle) {
@@ -1058,120 +2245,3984 @@ static int is_%(TypeName)sType(PyObject* an_angle) {
   return PyObject_TypeCheck(an_angle, &%(TypeName)sType);
 }
 
+static int is_%(TypeName)sTypeExact(PyObject* an_angle) {
+  return Py_TYPE(an_angle) == &%(TypeName)sType;
+}
+
 """ # end angle_class_template
 
 
 
-module_init = """
-// --------------------------
-// ----- module methods -----
-// --------------------------
+# --------------------------------
+# ----- fixed angle template -----
+# --------------------------------
 
-// -------------------
-// ----- deg2rad -----
-// -------------------
+# integer counts, see fixed_angle.h
 
-PyDoc_STRVAR(angles_deg2rad__doc__, "converts degrees into radians");
+fixed_angle_template = """
 
-static PyObject* deg2rad(PyObject* self, PyObject *args) {
-  double radians(0);
-  if (!PyArg_ParseTuple(args, "d", &radians))
-    return NULL;
-  double degrees = Angles::Angle::deg2rad(radians);
-  return (PyObject*)  Py_BuildValue("d", degrees);
-}
+// -----------------
+// ----- %(TypeName)s -----
+// -----------------
+
+// %(TypeName)s object definition. A %(CountType)s count of
+// 1/perUnit() degrees, or hours.
+typedef struct {
+  PyObject_HEAD
+  Angles::%(TypeName)s m_angle;
+} %(TypeName)s;
 
 
-// -------------------
-// ----- rad2deg -----
-// -------------------
+// Forward declarations for as_number methods. Wraps Type definition.
+static PyObject* new_%(TypeName)sType(const Angles::%(TypeName)s& an_angle);
+static int is_%(TypeName)sType(PyObject* an_angle);
+static int is_%(TypeName)sTypeExact(PyObject* an_angle);
 
-PyDoc_STRVAR(angles_rad2deg__doc__, "converts radians into degrees");
 
-static PyObject* rad2deg(PyObject* self, PyObject *args) {
-  double radians(0);
-  if (!PyArg_ParseTuple(args, "d", &radians))
-    return NULL;
-  double degrees = Angles::Angle::rad2deg(radians);
-  return (PyObject*)  Py_BuildValue("d", degrees);
+static PyObject* %(TypeName)s_new(PyTypeObject* type, PyObject* args, PyObject* kwds) {
+  %(TypeName)s* self(NULL);
+  self = (%(TypeName)s*)type->tp_alloc(type, 0);
+  if (self != NULL)
+    new (&self->m_angle) Angles::%(TypeName)s(); // tp_alloc does not run constructors
+  return (PyObject*)self;
 }
 
 
-// -----------------------
-// ----- method list -----
-// -----------------------
-
-PyMethodDef angles_module_methods[] = {
-  {"deg2rad", (PyCFunction) deg2rad, METH_VARARGS, angles_deg2rad__doc__},
-  {"rad2deg", (PyCFunction) rad2deg, METH_VARARGS, angles_rad2deg__doc__},
-  {NULL, NULL}  /* Sentinel */
-};
+// From any angle type, a float or int in degrees or hours, or a
+// string, rounded to the nearest count.
+static int %(TypeName)s_init(%(TypeName)s* self, PyObject* args, PyObject* kwds) {
 
+  PyObject* a_value(NULL);
 
-// ------------------------------
-// ----- init angles module -----
-// ------------------------------
+  static char* kwlist[] = {sValueStr, NULL};
 
-// PyMODINIT_FUNC declares extern "C" too.
-PyMODINIT_FUNC initangles(void) {
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "|O", kwlist, &a_value))
+    return -1;
 
-  PyObject* m(Py_InitModule3("angles", angles_module_methods, "python wrappers for angle objects."));
+  if (a_value == NULL)
+    return 0;
 
-  // error
-  char eMsgStr[] = "angles.Error";
-  sAngleException = PyErr_NewException(eMsgStr, NULL, NULL);
-  Py_INCREF(sAngleException);
-  PyModule_AddObject(m, "Error", sAngleException);
+  if (is_%(TypeName)sType(a_value)) {
+    self->m_angle = ((%(TypeName)s*)a_value)->m_angle;
+    return 0;
+  }
 
-"""
+  double value(0);
+  int status(angleValue(a_value, &value));
+  if (status == 0)
+    status = toValue(a_value, &value) < 0 ? -1 : 1;
+  if (status < 0)
+    return -1;
 
-module_type_init = """
+  try {
+    self->m_angle.value(value);
+  } catch (Angles::RangeError& err) {
+    PyErr_SetString(sAngleException, err.what());
+    return -1;
+  }
 
-  %(TypeName)sType.tp_new = PyType_GenericNew;
-  if (PyType_Ready(&%(TypeName)sType) < 0)
-    return;
-  Py_INCREF(&%(TypeName)sType);
-  PyModule_AddObject(m, "%(TypeName)s", (PyObject *)&%(TypeName)sType);
+  return 0;
+}
 
-"""
 
-# ================
-# ===== main =====
-# ================
+static void %(TypeName)s_dealloc(%(TypeName)s* self) {
+  Py_TYPE(self)->tp_free((PyObject*)self);
+}
 
-if __name__ == '__main__':
 
-    angle_classes = list()
-    angle_classes.append({'TypeName': 'Angle'})
+// -----------------
+// ----- print -----
+// -----------------
 
-    angle_templates = list()
-    angle_templates.append({'TypeName': 'LimitedRangeAngle'})
-    angle_templates.append({'TypeName': 'Declination'})
-    angle_templates.append({'TypeName': 'Latitude'})
-    angle_templates.append({'TypeName': 'Longitude'})
-    angle_templates.append({'TypeName': 'RA'})
+PyObject* %(TypeName)s_str(PyObject* self) {
+  char result[Angles::MAX_SEXAGESIMAL_STRING];
+  Angles::value2DMSString(((%(TypeName)s*)self)->m_angle.value(), result, sizeof(result), sPrintPrecision);
+  return PyString_FromString(result);
+}
 
-    flnm = 'angles.cpp'
-    afp = open(flnm, 'w')
 
-    afp.write(module_header)
+// ----------------
+// ----- hash -----
+// ----------------
 
+static long %(TypeName)s_hash(PyObject* self) {
+  long result(static_cast<long>(((%(TypeName)s*)self)->m_angle.hash()));
+  return result == -1 ? -2 : result; // -1 is an error
+}
 
-    for angle_class in angle_classes:
-        afp.write(angle_class_template % angle_class)
 
-    for angle_template in angle_templates:
-        afp.write(angle_template_template % angle_template)
+// -------------------------------
+// ----- getters and setters -----
+// -------------------------------
 
+static PyObject* %(TypeName)s_getValue(%(TypeName)s* self, void* closure) {
+  return PyFloat_FromDouble(self->m_angle.value());
+}
 
-    afp.write(module_init)
+static int %(TypeName)s_setValue(%(TypeName)s* self, PyObject* value, void* closure) {
 
-    for angle_class in angle_classes:
+  if (value == NULL) {
+    PyErr_SetString(PyExc_TypeError, "Cannot delete value");
+    return -1;
+  }
+
+  double a_value(PyFloat_AsDouble(value));
+  if (a_value == -1 && PyErr_Occurred())
+    return -1;
+
+  try {
+    self->m_angle.value(a_value);
+  } catch (Angles::RangeError& err) {
+    PyErr_SetString(sAngleException, err.what());
+    return -1;
+  }
+
+  return 0;
+}
+
+static PyObject* %(TypeName)s_getCount(%(TypeName)s* self, void* closure) {
+  return countObject(self->m_angle.count());
+}
+
+static int %(TypeName)s_setCount(%(TypeName)s* self, PyObject* value, void* closure) {
+
+  if (value == NULL) {
+    PyErr_SetString(PyExc_TypeError, "Cannot delete count");
+    return -1;
+  }
+
+  %(CountType)s a_count(0);
+  if (toCount(value, &a_count) < 0)
+    return -1;
+
+  self->m_angle.count(a_count);
+
+  return 0;
+}
+
+
+// -------------------
+// ----- methods -----
+// -------------------
+
+static PyObject* %(TypeName)s_perUnit(PyObject* unused) {
+  return countObject(Angles::%(TypeName)s::perUnit());
+}
+
+static PyObject* %(TypeName)s_resolution(PyObject* unused) {
+  return PyFloat_FromDouble(Angles::%(TypeName)s::resolution());
+}
+
+// to(type=Angle), e.g. a.to(angles.Declination)
+static PyObject* %(TypeName)s_to(%(TypeName)s* self, PyObject* args, PyObject* kwds) {
+
+  PyObject* a_type((PyObject*)&AngleType);
+
+  static char* kwlist[] = {sTypeStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "|O", kwlist, &a_type))
+    return NULL;
+
+  return PyObject_CallFunction(a_type, (char*)"d", self->m_angle.value());
+}
+
+static PyObject* %(TypeName)s_normalize(%(TypeName)s* self, PyObject* args, PyObject* kwds) {
+
+  int a_wrap(Angles::WRAP_0_360);
+
+  static char* kwlist[] = {sWrapStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "|i", kwlist, &a_wrap))
+    return NULL;
+
+  Angles::Wrap wrap;
+  if (toWrap(a_wrap, &wrap) < 0)
+    return NULL;
+
+  self->m_angle.normalize(wrap);
+
+  Py_RETURN_NONE;
+}
+
+
+// --------------------------
+// ----- number methods -----
+// --------------------------
+
+// Only %(TypeName)s + - %(TypeName)s and %(TypeName)s * int, so the
+// results are exact.
+
+static PyObject* %(TypeName)s_nb_add(PyObject* o1, PyObject* o2) {
+
+  if (!is_%(TypeName)sType(o1) || !is_%(TypeName)sType(o2)) {
+    Py_INCREF(Py_NotImplemented);
+    return Py_NotImplemented;
+  }
+
+  try {
+    return new_%(TypeName)sType(((%(TypeName)s*)o1)->m_angle + ((%(TypeName)s*)o2)->m_angle);
+  } catch (Angles::RangeError& err) {
+    PyErr_SetString(sAngleException, err.what());
+    return NULL;
+  }
+}
+
+static PyObject* %(TypeName)s_nb_subtract(PyObject* o1, PyObject* o2) {
+
+  if (!is_%(TypeName)sType(o1) || !is_%(TypeName)sType(o2)) {
+    Py_INCREF(Py_NotImplemented);
+    return Py_NotImplemented;
+  }
+
+  try {
+    return new_%(TypeName)sType(((%(TypeName)s*)o1)->m_angle - ((%(TypeName)s*)o2)->m_angle);
+  } catch (Angles::RangeError& err) {
+    PyErr_SetString(sAngleException, err.what());
+    return NULL;
+  }
+}
+
+static PyObject* %(TypeName)s_nb_multiply(PyObject* o1, PyObject* o2) {
+
+  PyObject* an_angle(is_%(TypeName)sType(o1) ? o1 : o2);
+  PyObject* a_factor(an_angle == o1 ? o2 : o1);
+
+  if (!is_%(TypeName)sType(an_angle) || !(PyInt_Check(a_factor) || PyLong_Check(a_factor))) {
+    Py_INCREF(Py_NotImplemented);
+    return Py_NotImplemented;
+  }
+
+  %(CountType)s a_count(0);
+  if (toCount(a_factor, &a_count) < 0)
+    return NULL;
+
+  try {
+    return new_%(TypeName)sType(((%(TypeName)s*)an_angle)->m_angle*a_count);
+  } catch (Angles::RangeError& err) {
+    PyErr_SetString(sAngleException, err.what());
+    return NULL;
+  }
+}
+
+static PyObject* %(TypeName)s_nb_negative(PyObject* o1) {
+  try {
+    return new_%(TypeName)sType(-((%(TypeName)s*)o1)->m_angle);
+  } catch (Angles::RangeError& err) {
+    PyErr_SetString(sAngleException, err.what());
+    return NULL;
+  }
+}
+
+
+static PyObject* %(TypeName)s_tp_richcompare(PyObject* o1, PyObject* o2, int op) {
+
+  if (!is_%(TypeName)sType(o1) || !is_%(TypeName)sType(o2)) {
+    Py_INCREF(Py_NotImplemented);
+    return Py_NotImplemented;
+  }
+
+  const Angles::%(TypeName)s& lhs(((%(TypeName)s*)o1)->m_angle);
+  const Angles::%(TypeName)s& rhs(((%(TypeName)s*)o2)->m_angle);
+
+  bool result(false);
+
+  switch (op) {
+  case Py_LT: result = lhs < rhs;  break;
+  case Py_LE: result = lhs <= rhs; break;
+  case Py_EQ: result = lhs == rhs; break;
+  case Py_NE: result = lhs != rhs; break;
+  case Py_GT: result = lhs > rhs;  break;
+  case Py_GE: result = lhs >= rhs; break;
+  default:
+    PyErr_SetString(PyExc_TypeError, "richcompare op not supported");
+    return NULL;
+  }
+
+  if (result)
+    Py_RETURN_TRUE;
+  Py_RETURN_FALSE;
+}
+
+
+// ---------------------------
+// ----- copy and pickle -----
+// ---------------------------
+
+// a new angle of self's type with its value
+static PyObject* %(TypeName)s_duplicate(%(TypeName)s* self, PyObject* a_memo) {
+
+  PyObject* result(NULL);
+  if (is_%(TypeName)sTypeExact((PyObject*)self))
+    result = new_%(TypeName)sType(self->m_angle);
+  else if ((result = %(TypeName)s_new(Py_TYPE(self), NULL, NULL)) != NULL)
+    ((%(TypeName)s*)result)->m_angle = self->m_angle;
+  if (result == NULL)
+    return NULL;
+
+  if (copyDict((PyObject*)self, result, a_memo) < 0) {
+    Py_DECREF(result);
+    return NULL;
+  }
+
+  return result;
+}
+
+static PyObject* %(TypeName)s_copy(%(TypeName)s* self) {
+  return %(TypeName)s_duplicate(self, NULL);
+}
+
+static PyObject* %(TypeName)s_deepcopy(%(TypeName)s* self, PyObject* a_memo) {
+  return %(TypeName)s_duplicate(self, a_memo);
+}
+
+// (type, (), state), see pickleState()
+static PyObject* %(TypeName)s_reduce(%(TypeName)s* self) {
+  PyObject* a_state(pickleState((PyObject*)self, countObject(self->m_angle.count())));
+  if (a_state == NULL)
+    return NULL;
+  return Py_BuildValue("(O()N)", Py_TYPE(self), a_state);
+}
+
+static PyObject* %(TypeName)s_setstate(%(TypeName)s* self, PyObject* a_state) {
+
+  PyObject* a_value(unpickleState((PyObject*)self, a_state));
+  if (a_value == NULL)
+    return NULL;
+
+  %(CountType)s a_count(0);
+  if (toCount(a_value, &a_count) < 0)
+    return NULL;
+
+  self->m_angle.count(a_count);
+
+  Py_RETURN_NONE;
+}
+
+// --------------------------
+// ----- Python structs -----
+// --------------------------
+
+static PyMethodDef %(TypeName)s_methods[] = {
+    {"perUnit", (PyCFunction)%(TypeName)s_perUnit, METH_NOARGS | METH_STATIC,
+     "returns the counts per degree, or hour"},
+    {"resolution", (PyCFunction)%(TypeName)s_resolution, METH_NOARGS | METH_STATIC,
+     "returns one count in degrees, or hours"},
+    {"to", (PyCFunction)%(TypeName)s_to, METH_VARARGS | METH_KEYWORDS,
+     "to(type=Angle), returns the value as another angle type, e.g. to(Declination)"},
+    {"normalize", (PyCFunction)%(TypeName)s_normalize, METH_VARARGS | METH_KEYWORDS,
+     "normalize(wrap=WRAP_0_360), wraps the count into the given convention exactly"},
+    {"__copy__", (PyCFunction)%(TypeName)s_copy, METH_NOARGS, "returns a copy"},
+    {"__deepcopy__", (PyCFunction)%(TypeName)s_deepcopy, METH_O, "returns a copy, the value is not shared"},
+    {"__reduce__", (PyCFunction)%(TypeName)s_reduce, METH_NOARGS, "pickles the raw value"},
+    {"__setstate__", (PyCFunction)%(TypeName)s_setstate, METH_O, "sets the pickled raw value"},
+    {NULL}  /* Sentinel */
+};
+
+
+static PyGetSetDef %(TypeName)s_getseters[] = {
+    {sValueStr, (getter)%(TypeName)s_getValue, (setter)%(TypeName)s_setValue, sValueStr, NULL},
+    {sCountStr, (getter)%(TypeName)s_getCount, (setter)%(TypeName)s_setCount, sCountStr, NULL},
+    {NULL}  /* Sentinel */
+};
+
+
+// see http://docs.python.org/c-api/typeobj.html
+static PyNumberMethods %(TypeName)s_as_number = {
+  (binaryfunc) %(TypeName)s_nb_add,
+  (binaryfunc) %(TypeName)s_nb_subtract,
+  (binaryfunc) %(TypeName)s_nb_multiply,
+  (binaryfunc) 0,  // nb_divide
+  (binaryfunc) 0,  // nb_remainder
+  (binaryfunc) 0,  // nb_divmod
+  (ternaryfunc) 0, // nb_power
+  (unaryfunc) %(TypeName)s_nb_negative,
+  (unaryfunc) 0,   // nb_positive
+  (unaryfunc) 0,   // nb_absolute
+  (inquiry) 0,     // nb_nonzero. Used by PyObject_IsTrue.
+  (unaryfunc) 0,   // nb_invert
+  (binaryfunc) 0,  // nb_lshift
+  (binaryfunc) 0,  // nb_rshift
+  (binaryfunc) 0,  // nb_and
+  (binaryfunc) 0,  // nb_xor
+  (binaryfunc) 0,  // nb_or
+  (coercion) 0,    // Used by the coerce() function
+  (unaryfunc) 0,   // nb_int
+  (unaryfunc) 0,   // nb_long
+  (unaryfunc) 0,   // nb_float
+  (unaryfunc) 0,   // nb_oct
+  (unaryfunc) 0,   // nb_hex
+};
+
+
+PyTypeObject %(TypeName)sType = {
+  PyObject_HEAD_INIT(NULL)
+  0,                                        /* ob_size */
+  "angles.%(TypeName)s",                    /* tp_name, with the module for pickle */
+  sizeof(%(TypeName)s),                     /* tp_basicsize */
+  0,                                        /* tp_itemsize */
+  (destructor) %(TypeName)s_dealloc,        /* tp_dealloc */
+  0,                                        /* tp_print */
+  0,                                        /* tp_getattr */
+  0,                                        /* tp_setattr */
+  0,                                        /* tp_compare */
+  %(TypeName)s_str,                         /* tp_repr */
+  &%(TypeName)s_as_number,                  /* tp_as_number */
+  0,                                        /* tp_as_sequence */
+  0,                                        /* tp_as_mapping */
+  (hashfunc) %(TypeName)s_hash,             /* tp_hash */
+  0,                                        /* tp_call */
+  %(TypeName)s_str,                         /* tp_str */
+  0,                                        /* tp_getattro */
+  0,                                        /* tp_setattro */
+  0,                                        /* tp_as_buffer */
+  Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_CHECKTYPES, /* tp_flags */
+  "%(TypeName)s(value=0), a fixed point angle", /* tp_doc */
+  0,                                        /* tp_traverse */
+  0,                                        /* tp_clear */
+  %(TypeName)s_tp_richcompare,              /* tp_richcompare */
+  0,                                        /* tp_weaklistoffset */
+  0,                                        /* tp_iter */
+  0,                                        /* tp_iternext */
+  %(TypeName)s_methods,                     /* tp_methods */
+  0,                                        /* tp_members */
+  %(TypeName)s_getseters,                   /* tp_getset */
+  0,                                        /* tp_base */
+  0,                                        /* tp_dict */
+  0,                                        /* tp_descr_get */
+  0,                                        /* tp_descr_set */
+  0,                                        /* tp_dictoffset */
+  (initproc)%(TypeName)s_init,              /* tp_init */
+  0,                                        /* tp_alloc */
+  %(TypeName)s_new,                         /* tp_new */
+};
+
+
+static PyObject* new_%(TypeName)sType(const Angles::%(TypeName)s& an_angle) {
+  %(TypeName)s* result(PyObject_New(%(TypeName)s, &%(TypeName)sType));
+  if (result != NULL)
+    new (&result->m_angle) Angles::%(TypeName)s(an_angle);
+  return (PyObject*)result;
+}
+
+static int is_%(TypeName)sType(PyObject* an_angle) {
+  //wrapper for type check
+  return PyObject_TypeCheck(an_angle, &%(TypeName)sType);
+}
+
+static int is_%(TypeName)sTypeExact(PyObject* an_angle) {
+  return Py_TYPE(an_angle) == &%(TypeName)sType;
+}
+
+""" # end fixed_angle_template
+
+
+
+# ------------------------
+# ----- angle values -----
+# ------------------------
+
+# angleValue() accepts any of the generated types, so it is written
+# after all of them.
+
+angle_value_header = """
+
+// ------------------------
+// ----- angle values -----
+// ------------------------
+
+// Returns 1 on success, 0 for an unsupported type and -1 on error,
+// see toNumber().
+static int angleValue(PyObject* an_object, double* a_value) {
+"""
+
+angle_value_template = """
+  if (is_%(TypeName)sType(an_object)) {
+    *a_value = ((%(TypeName)s*)an_object)->m_angle.value();
+    return 1;
+  }
+"""
+
+angle_value_footer = """
+  return toNumber(an_object, a_value);
+}
+"""
+
+
+# -------------------------
+# ----- packed angles -----
+# -------------------------
+
+# dumps() and loads() accept any of the generated types, so they are
+# written after all of them, like angleValue().
+
+packed_angle_header = """
+
+// -------------------------
+// ----- packed angles -----
+// -------------------------
+
+// Gets the pack type and raw value of an angle. Returns 1 on success
+// and 0 if an_object is not an angle. An instance of a subclass packs
+// as its base type.
+static int packedAngle(PyObject* an_object, Angles::PackType* a_type, Angles::PackedValue* a_value) {
+"""
+
+packed_angle_template = """
+  if (is_%(TypeName)sType(an_object)) {
+    *a_type = Angles::%(PackType)s;
+    a_value->m_value = ((%(TypeName)s*)an_object)->m_angle.value();
+    return 1;
+  }
+"""
+
+packed_fixed_angle_template = """
+  if (is_%(TypeName)sType(an_object)) {
+    *a_type = Angles::%(PackType)s;
+    a_value->m_count = ((%(TypeName)s*)an_object)->m_angle.count();
+    return 1;
+  }
+"""
+
+unpacked_angle_header = """
+  return 0;
+}
+
+// A new angle from a pack type and raw value, which unpackAngles() has
+// checked. NULL on error.
+static PyObject* unpackedAngle(const Angles::PackType& a_type, const Angles::PackedValue& a_value) {
+
+  switch (a_type) {
+"""
+
+unpacked_angle_template = """
+  case Angles::%(PackType)s: {
+    %(TypeName)s* an_angle(NULL);
+    new_%(TypeName)sType(&an_angle);
+    if (an_angle != NULL)
+      an_angle->m_angle.value(a_value.m_value);
+    return (PyObject*)an_angle;
+  }
+"""
+
+unpacked_fixed_angle_template = """
+  case Angles::%(PackType)s: {
+    Angles::%(TypeName)s an_angle;
+    an_angle.count(static_cast<%(CountType)s>(a_value.m_count));
+    return new_%(TypeName)sType(an_angle);
+  }
+"""
+
+packed_angle_footer = """
+  default:
+    PyErr_SetString(sAngleException, "unknown packed angle type");
+    return NULL;
+  }
+}
+
+
+PyDoc_STRVAR(angles_dumps__doc__,
+	     "dumps(angles), packs a sequence of angles of any types into one string of their raw"
+	     " values, 8 bytes an angle, see loads()");
+
+static PyObject* dumps(PyObject* self, PyObject* args, PyObject* kwds) {
+
+  PyObject* some_angles(NULL);
+
+  static char* kwlist[] = {sAnglesStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "O", kwlist, &some_angles))
+    return NULL;
+
+  PyObject* a_sequence(PySequence_Fast(some_angles, "angles must be a sequence"));
+  if (a_sequence == NULL)
+    return NULL;
+
+  const Py_ssize_t a_size(PySequence_Fast_GET_SIZE(a_sequence));
+  std::vector<Angles::PackType> some_types(a_size);
+  std::vector<Angles::PackedValue> some_values(a_size);
+
+  for (Py_ssize_t i = 0; i < a_size; ++i) {
+    if (!packedAngle(PySequence_Fast_GET_ITEM(a_sequence, i), &some_types[i], &some_values[i])) {
+      Py_DECREF(a_sequence);
+      PyErr_Format(PyExc_TypeError, "angles[%zd] is not an angle", i);
+      return NULL;
+    }
+  }
+
+  Py_DECREF(a_sequence);
+
+  std::string a_buffer;
+  try {
+    a_buffer = Angles::packAngles(a_size > 0 ? &some_types[0] : NULL,
+				  a_size > 0 ? &some_values[0] : NULL, a_size);
+  } catch (Angles::Error& err) {
+    PyErr_SetString(sAngleException, err.what());
+    return NULL;
+  }
+
+  return PyString_FromStringAndSize(a_buffer.data(), a_buffer.size());
+}
+
+
+PyDoc_STRVAR(angles_loads__doc__,
+	     "loads(data), returns the list of angles packed by dumps(), data is a string or other"
+	     " buffer");
+
+static PyObject* loads(PyObject* self, PyObject* args, PyObject* kwds) {
+
+  Py_buffer a_data;
+
+  static char* kwlist[] = {sDataStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "s*", kwlist, &a_data))
+    return NULL;
+
+  std::vector<Angles::PackType> some_types;
+  std::vector<Angles::PackedValue> some_values;
+
+  try {
+    Angles::unpackAngles(static_cast<const char*>(a_data.buf), a_data.len, some_types, some_values);
+  } catch (Angles::Error& err) {
+    PyBuffer_Release(&a_data);
+    PyErr_SetString(sAngleException, err.what());
+    return NULL;
+  }
+
+  PyBuffer_Release(&a_data);
+
+  PyObject* result(PyList_New(some_values.size()));
+  if (result == NULL)
+    return NULL;
+
+  for (size_t i = 0; i < some_values.size(); ++i) {
+    PyObject* an_angle(unpackedAngle(some_types[i], some_values[i]));
+    if (an_angle == NULL) {
+      Py_DECREF(result);
+      return NULL;
+    }
+    PyList_SET_ITEM(result, i, an_angle);
+  }
+
+  return result;
+}
+"""
+
+
+# ----------------------
+# ----- AngleIndex -----
+# ----------------------
+
+# Not a % template, it is written as is.
+
+angle_index_class = """
+
+// ----------------------
+// ----- AngleIndex -----
+// ----------------------
+
+// Maps angle keys to python objects. A key is any of the angle types
+// or a float or int, compared by value, so Angle(45.5),
+// Declination(45.5) and 45.5 are the same key. With a quantum keys are
+// rounded to its nearest multiple first. keys() returns the first key
+// inserted for each as a float. See angle_index.h.
+
+typedef Angles::AngleIndex<PyObject*> PyAngleIndex;
+
+typedef struct {
+  PyObject_HEAD
+  PyAngleIndex m_index;
+} AngleIndex;
+
+
+static int AngleIndex_key(PyObject* a_key, double* a_value) {
+  int status(angleValue(a_key, a_value));
+  if (status == 0)
+    PyErr_SetString(PyExc_TypeError, "key must be an angle, float or int");
+  return status > 0 ? 0 : -1;
+}
+
+
+static PyObject* AngleIndex_new(PyTypeObject* type, PyObject* args, PyObject* kwds) {
+  AngleIndex* self(NULL);
+  self = (AngleIndex*)type->tp_alloc(type, 0);
+  if (self != NULL)
+    new (&self->m_index) PyAngleIndex(); // tp_alloc does not run constructors
+  return (PyObject*)self;
+}
+
+
+// Empties the index before releasing the values, which may refer back
+// to it.
+static int AngleIndex_clear(AngleIndex* self) {
+
+  std::vector<PyObject*> some_values;
+  some_values.reserve(self->m_index.size());
+
+  for (size_t i = 0; i < self->m_index.slots(); ++i)
+    if (self->m_index.isUsed(i))
+      some_values.push_back(self->m_index.value(i));
+
+  self->m_index.clear();
+
+  for (size_t i = 0; i < some_values.size(); ++i)
+    Py_DECREF(some_values[i]);
+
+  return 0;
+}
+
+
+static int AngleIndex_traverse(AngleIndex* self, visitproc visit, void* arg) {
+  for (size_t i = 0; i < self->m_index.slots(); ++i)
+    if (self->m_index.isUsed(i))
+      Py_VISIT(self->m_index.value(i));
+  return 0;
+}
+
+
+static int AngleIndex_init(AngleIndex* self, PyObject* args, PyObject* kwds) {
+
+  double a_quantum(0);
+
+  static char* kwlist[] = {sQuantumStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "|d", kwlist, &a_quantum))
+    return -1;
+
+  try {
+
+    PyAngleIndex an_index(a_quantum);
+    AngleIndex_clear(self);
+    self->m_index = an_index;
+
+  } catch (Angles::Error& err) {
+    PyErr_SetString(sAngleException, err.what());
+    return -1;
+  }
+
+  return 0;
+}
+
+
+static void AngleIndex_dealloc(AngleIndex* self) {
+  PyObject_GC_UnTrack(self);
+  AngleIndex_clear(self);
+  self->m_index.~PyAngleIndex();
+  Py_TYPE(self)->tp_free((PyObject*)self);
+}
+
+
+// ---------------------------
+// ----- mapping methods -----
+// ---------------------------
+
+static Py_ssize_t AngleIndex_length(AngleIndex* self) {
+  return self->m_index.size();
+}
+
+
+static PyObject* AngleIndex_getItem(AngleIndex* self, PyObject* a_key) {
+
+  double key(0);
+  if (AngleIndex_key(a_key, &key) < 0)
+    return NULL;
+
+  PyObject** a_value(self->m_index.find(key));
+  if (a_value == NULL) {
+    PyErr_SetObject(PyExc_KeyError, a_key);
+    return NULL;
+  }
+
+  Py_INCREF(*a_value);
+  return *a_value;
+}
+
+
+// sets, or deletes if a_value is NULL
+static int AngleIndex_setItem(AngleIndex* self, PyObject* a_key, PyObject* a_value) {
+
+  double key(0);
+  if (AngleIndex_key(a_key, &key) < 0)
+    return -1;
+
+  PyObject** an_old_value(self->m_index.find(key));
+
+  if (a_value == NULL) {
+
+    if (an_old_value == NULL) {
+      PyErr_SetObject(PyExc_KeyError, a_key);
+      return -1;
+    }
+
+    PyObject* a_released(*an_old_value);
+    self->m_index.erase(key);
+    Py_DECREF(a_released);
+    return 0;
+  }
+
+  Py_INCREF(a_value);
+
+  if (an_old_value != NULL) {
+    PyObject* a_released(*an_old_value);
+    *an_old_value = a_value;
+    Py_DECREF(a_released);
+    return 0;
+  }
+
+  try {
+    self->m_index.insert(key, a_value);
+  } catch (Angles::Error& err) {
+    Py_DECREF(a_value);
+    PyErr_SetString(sAngleException, err.what());
+    return -1;
+  }
+
+  return 0;
+}
+
+
+static int AngleIndex_contains(AngleIndex* self, PyObject* a_key) {
+  double key(0);
+  if (AngleIndex_key(a_key, &key) < 0)
+    return -1;
+  return self->m_index.contains(key);
+}
+
+
+// -------------------
+// ----- methods -----
+// -------------------
+
+static PyObject* AngleIndex_get(AngleIndex* self, PyObject* args, PyObject* kwds) {
+
+  PyObject* a_key(NULL);
+  PyObject* a_default(Py_None);
+
+  static char* kwlist[] = {sKeyStr, sDefaultStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|O", kwlist, &a_key, &a_default))
+    return NULL;
+
+  double key(0);
+  if (AngleIndex_key(a_key, &key) < 0)
+    return NULL;
+
+  PyObject** a_value(self->m_index.find(key));
+  PyObject* result(a_value != NULL ? *a_value : a_default);
+
+  Py_INCREF(result);
+  return result;
+}
+
+
+// Looks up each value of a float64 buffer, returns a list of the
+// values found or default.
+static PyObject* AngleIndex_lookup(AngleIndex* self, PyObject* args, PyObject* kwds) {
+
+  PyObject* a_buffer(NULL);
+  PyObject* a_default(Py_None);
+
+  static char* kwlist[] = {sBufferStr, sDefaultStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|O", kwlist, &a_buffer, &a_default))
+    return NULL;
+
+  DoubleBuffer keys;
+  if (keys.acquire(a_buffer, false) < 0)
+    return NULL;
+
+  PyObject* result(PyList_New(keys.size()));
+  if (result == NULL)
+    return NULL;
+
+  for (Py_ssize_t i = 0; i < keys.size(); ++i) {
+    PyObject** a_value(self->m_index.find(keys.data()[i]));
+    PyObject* an_item(a_value != NULL ? *a_value : a_default);
+    Py_INCREF(an_item);
+    PyList_SET_ITEM(result, i, an_item);
+  }
+
+  return result;
+}
+
+
+// Inserts the keys in a float64 buffer with the items of a sequence
+// of the same length.
+static PyObject* AngleIndex_insert(AngleIndex* self, PyObject* args, PyObject* kwds) {
+
+  PyObject* a_buffer(NULL);
+  PyObject* some_values(NULL);
+
+  static char* kwlist[] = {sBufferStr, sValuesStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "OO", kwlist, &a_buffer, &some_values))
+    return NULL;
+
+  DoubleBuffer keys;
+  if (keys.acquire(a_buffer, false) < 0)
+    return NULL;
+
+  PyObject* a_sequence(PySequence_Fast(some_values, "values must be a sequence"));
+  if (a_sequence == NULL)
+    return NULL;
+
+  if (PySequence_Fast_GET_SIZE(a_sequence) != keys.size()) {
+    Py_DECREF(a_sequence);
+    PyErr_SetString(sAngleException, "buffer and values sizes do not match");
+    return NULL;
+  }
+
+  self->m_index.reserve(self->m_index.size() + keys.size());
+
+  for (Py_ssize_t i = 0; i < keys.size(); ++i) {
+    PyObject* a_key(PyFloat_FromDouble(keys.data()[i]));
+    if (a_key == NULL) {
+      Py_DECREF(a_sequence);
+      return NULL;
+    }
+    int status(AngleIndex_setItem(self, a_key, PySequence_Fast_GET_ITEM(a_sequence, i)));
+    Py_DECREF(a_key);
+    if (status < 0) {
+      Py_DECREF(a_sequence);
+      return NULL;
+    }
+  }
+
+  Py_DECREF(a_sequence);
+
+  Py_RETURN_NONE;
+}
+
+
+typedef PyObject* (*AngleIndexItem)(AngleIndex*, const size_t&);
+
+static PyObject* AngleIndex_keyItem(AngleIndex* self, const size_t& a_slot) {
+  return PyFloat_FromDouble(self->m_index.key(a_slot));
+}
+
+static PyObject* AngleIndex_valueItem(AngleIndex* self, const size_t& a_slot) {
+  Py_INCREF(self->m_index.value(a_slot));
+  return self->m_index.value(a_slot);
+}
+
+static PyObject* AngleIndex_pairItem(AngleIndex* self, const size_t& a_slot) {
+  return Py_BuildValue("dO", self->m_index.key(a_slot), self->m_index.value(a_slot));
+}
+
+// a list of an_item for each entry
+static PyObject* AngleIndex_list(AngleIndex* self, AngleIndexItem an_item) {
+
+  PyObject* result(PyList_New(self->m_index.size()));
+  if (result == NULL)
+    return NULL;
+
+  Py_ssize_t j(0);
+  for (size_t i = 0; i < self->m_index.slots(); ++i) {
+    if (!self->m_index.isUsed(i))
+      continue;
+    PyObject* an_object(an_item(self, i));
+    if (an_object == NULL) {
+      Py_DECREF(result);
+      return NULL;
+    }
+    PyList_SET_ITEM(result, j++, an_object);
+  }
+
+  return result;
+}
+
+static PyObject* AngleIndex_keys(AngleIndex* self) {
+  return AngleIndex_list(self, AngleIndex_keyItem);
+}
+
+static PyObject* AngleIndex_values(AngleIndex* self) {
+  return AngleIndex_list(self, AngleIndex_valueItem);
+}
+
+static PyObject* AngleIndex_items(AngleIndex* self) {
+  return AngleIndex_list(self, AngleIndex_pairItem);
+}
+
+static PyObject* AngleIndex_iter(AngleIndex* self) {
+  // over a copy of the keys, so the index can change while iterating
+  PyObject* some_keys(AngleIndex_keys(self));
+  if (some_keys == NULL)
+    return NULL;
+  PyObject* result(PyObject_GetIter(some_keys));
+  Py_DECREF(some_keys);
+  return result;
+}
+
+static PyObject* AngleIndex_clearMethod(AngleIndex* self) {
+  AngleIndex_clear(self);
+  Py_RETURN_NONE;
+}
+
+static PyObject* AngleIndex_getQuantum(AngleIndex* self, void* closure) {
+  return PyFloat_FromDouble(self->m_index.quantum());
+}
+
+
+// --------------------------
+// ----- Python structs -----
+// --------------------------
+
+static PyMethodDef AngleIndex_methods[] = {
+    {"get", (PyCFunction)AngleIndex_get, METH_VARARGS | METH_KEYWORDS,
+     "get(key, default=None), returns the value for key or default"},
+    {"lookup", (PyCFunction)AngleIndex_lookup, METH_VARARGS | METH_KEYWORDS,
+     "lookup(buffer, default=None), returns a list of the values for each key in a float64 buffer"},
+    {"insert", (PyCFunction)AngleIndex_insert, METH_VARARGS | METH_KEYWORDS,
+     "insert(buffer, values), sets the value for each key in a float64 buffer"},
+    {"keys", (PyCFunction)AngleIndex_keys, METH_NOARGS, "returns a list of the keys as floats"},
+    {"values", (PyCFunction)AngleIndex_values, METH_NOARGS, "returns a list of the values"},
+    {"items", (PyCFunction)AngleIndex_items, METH_NOARGS, "returns a list of (key, value) tuples"},
+    {"clear", (PyCFunction)AngleIndex_clearMethod, METH_NOARGS, "removes all the entries"},
+    {NULL}  /* Sentinel */
+};
+
+static PyGetSetDef AngleIndex_getseters[] = {
+    {sQuantumStr, (getter)AngleIndex_getQuantum, NULL, sQuantumStr, NULL},
+    {NULL}  /* Sentinel */
+};
+
+static PyMappingMethods AngleIndex_as_mapping = {
+  (lenfunc) AngleIndex_length,           // mp_length
+  (binaryfunc) AngleIndex_getItem,       // mp_subscript
+  (objobjargproc) AngleIndex_setItem,    // mp_ass_subscript
+};
+
+static PySequenceMethods AngleIndex_as_sequence = {
+  0,                                     // sq_length
+  0,                                     // sq_concat
+  0,                                     // sq_repeat
+  0,                                     // sq_item
+  0,                                     // sq_slice
+  0,                                     // sq_ass_item
+  0,                                     // sq_ass_slice
+  (objobjproc) AngleIndex_contains,      // sq_contains
+};
+
+
+PyTypeObject AngleIndexType = {
+  PyObject_HEAD_INIT(NULL)
+  0,                                        /* ob_size */
+  "AngleIndex",                             /* tp_name */
+  sizeof(AngleIndex),                       /* tp_basicsize */
+  0,                                        /* tp_itemsize */
+  (destructor) AngleIndex_dealloc,          /* tp_dealloc */
+  0,                                        /* tp_print */
+  0,                                        /* tp_getattr */
+  0,                                        /* tp_setattr */
+  0,                                        /* tp_compare */
+  0,                                        /* tp_repr */
+  0,                                        /* tp_as_number */
+  &AngleIndex_as_sequence,                  /* tp_as_sequence */
+  &AngleIndex_as_mapping,                   /* tp_as_mapping */
+  PyObject_HashNotImplemented,              /* tp_hash */
+  0,                                        /* tp_call */
+  0,                                        /* tp_str */
+  0,                                        /* tp_getattro */
+  0,                                        /* tp_setattro */
+  0,                                        /* tp_as_buffer */
+  Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC, /* tp_flags */
+  "AngleIndex(quantum=0), a hash table of angle keys to objects", /* tp_doc */
+  (traverseproc) AngleIndex_traverse,       /* tp_traverse */
+  (inquiry) AngleIndex_clear,               /* tp_clear */
+  0,                                        /* tp_richcompare */
+  0,                                        /* tp_weaklistoffset */
+  (getiterfunc) AngleIndex_iter,            /* tp_iter */
+  0,                                        /* tp_iternext */
+  AngleIndex_methods,                       /* tp_methods */
+  0,                                        /* tp_members */
+  AngleIndex_getseters,                     /* tp_getset */
+  0,                                        /* tp_base */
+  0,                                        /* tp_dict */
+  0,                                        /* tp_descr_get */
+  0,                                        /* tp_descr_set */
+  0,                                        /* tp_dictoffset */
+  (initproc) AngleIndex_init,               /* tp_init */
+  0,                                        /* tp_alloc */
+  AngleIndex_new,                           /* tp_new */
+  PyObject_GC_Del,                          /* tp_free */
+};
+
+""" # end angle_index_class
+
+
+
+# --------------------
+# ----- HTMIndex -----
+# --------------------
+
+# Not a % template, it is written as is.
+
+htm_index_class = """
+
+// --------------------
+// ----- HTMIndex -----
+// --------------------
+
+// A Hierarchical Triangular Mesh index of RA and Declination
+// positions, numbered in insertion order. See htm.h.
+
+typedef struct {
+  PyObject_HEAD
+  Angles::HTMIndex m_index;
+} HTMIndex;
+
+
+static PyObject* HTMIndex_new(PyTypeObject* type, PyObject* args, PyObject* kwds) {
+  HTMIndex* self(NULL);
+  self = (HTMIndex*)type->tp_alloc(type, 0);
+  if (self != NULL)
+    new (&self->m_index) Angles::HTMIndex(); // tp_alloc does not run constructors
+  return (PyObject*)self;
+}
+
+
+static int HTMIndex_init(HTMIndex* self, PyObject* args, PyObject* kwds) {
+
+  int a_depth(12);
+
+  static char* kwlist[] = {sDepthStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "|i", kwlist, &a_depth))
+    return -1;
+
+  try {
+    self->m_index = Angles::HTMIndex(a_depth);
+  } catch (Angles::Error& err) {
+    PyErr_SetString(sAngleException, err.what());
+    return -1;
+  }
+
+  return 0;
+}
+
+
+static void HTMIndex_dealloc(HTMIndex* self) {
+  self->m_index.~HTMIndex();
+  Py_TYPE(self)->tp_free((PyObject*)self);
+}
+
+
+static Py_ssize_t HTMIndex_length(HTMIndex* self) {
+  return self->m_index.size();
+}
+
+
+// parses a pair of float64 buffers of the same size
+static int HTMIndex_buffers(PyObject* args, PyObject* kwds, DoubleBuffer& some_ras, DoubleBuffer& some_decs) {
+
+  PyObject* a_ra(NULL);
+  PyObject* a_dec(NULL);
+
+  static char* kwlist[] = {sRaStr, sDecStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "OO", kwlist, &a_ra, &a_dec))
+    return -1;
+
+  if (some_ras.acquire(a_ra, false) < 0 || some_decs.acquire(a_dec, false) < 0)
+    return -1;
+
+  if (some_ras.size() != some_decs.size()) {
+    PyErr_SetString(sAngleException, "buffer sizes do not match");
+    return -1;
+  }
+
+  return 0;
+}
+
+
+// -------------------
+// ----- methods -----
+// -------------------
+
+static PyObject* HTMIndex_insert(HTMIndex* self, PyObject* args, PyObject* kwds) {
+
+  DoubleBuffer some_ras;
+  DoubleBuffer some_decs;
+
+  if (HTMIndex_buffers(args, kwds, some_ras, some_decs) < 0)
+    return NULL;
+
+  try {
+    self->m_index.insert(some_ras.data(), some_decs.data(), some_ras.size());
+  } catch (Angles::Error& err) {
+    PyErr_SetString(sAngleException, err.what());
+    return NULL;
+  }
+
+  Py_RETURN_NONE;
+}
+
+
+static PyObject* HTMIndex_circle(HTMIndex* self, PyObject* args, PyObject* kwds) {
+
+  PyObject* a_ra(NULL);
+  PyObject* a_dec(NULL);
+  PyObject* a_radius(NULL);
+
+  static char* kwlist[] = {sRaStr, sDecStr, sRadiusStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "OOO", kwlist, &a_ra, &a_dec, &a_radius))
+    return NULL;
+
+  double ra(0);
+  double dec(0);
+  double radius(0);
+
+  if (angleValue(a_ra, &ra) <= 0 || angleValue(a_dec, &dec) <= 0 || angleValue(a_radius, &radius) <= 0) {
+    if (!PyErr_Occurred())
+      PyErr_SetString(PyExc_TypeError, "ra, dec and radius must be angles, floats or ints");
+    return NULL;
+  }
+
+  std::vector<size_t> some_positions;
+  self->m_index.circle(ra, dec, radius, some_positions);
+
+  return newPositionList(some_positions);
+}
+
+
+static PyObject* HTMIndex_polygon(HTMIndex* self, PyObject* args, PyObject* kwds) {
+
+  DoubleBuffer some_ras;
+  DoubleBuffer some_decs;
+
+  if (HTMIndex_buffers(args, kwds, some_ras, some_decs) < 0)
+    return NULL;
+
+  std::vector<size_t> some_positions;
+
+  try {
+    self->m_index.polygon(some_ras.data(), some_decs.data(), some_ras.size(), some_positions);
+  } catch (Angles::Error& err) {
+    PyErr_SetString(sAngleException, err.what());
+    return NULL;
+  }
+
+  return newPositionList(some_positions);
+}
+
+
+static PyObject* HTMIndex_clear(HTMIndex* self) {
+  self->m_index.clear();
+  Py_RETURN_NONE;
+}
+
+
+static PyObject* HTMIndex_getDepth(HTMIndex* self, void* closure) {
+  return PyInt_FromLong(self->m_index.depth());
+}
+
+
+// --------------------------
+// ----- Python structs -----
+// --------------------------
+
+static PyMethodDef HTMIndex_methods[] = {
+    {"insert", (PyCFunction)HTMIndex_insert, METH_VARARGS | METH_KEYWORDS,
+     "insert(ra, dec), appends the positions in float64 buffers of hours and degrees"},
+    {"circle", (PyCFunction)HTMIndex_circle, METH_VARARGS | METH_KEYWORDS,
+     "circle(ra, dec, radius), returns a sorted list of the positions within radius degrees"},
+    {"polygon", (PyCFunction)HTMIndex_polygon, METH_VARARGS | METH_KEYWORDS,
+     "polygon(ra, dec), returns a sorted list of the positions inside the convex polygon"
+     " with vertices in float64 buffers"},
+    {"clear", (PyCFunction)HTMIndex_clear, METH_NOARGS, "removes all the positions"},
+    {NULL}  /* Sentinel */
+};
+
+static PyGetSetDef HTMIndex_getseters[] = {
+    {sDepthStr, (getter)HTMIndex_getDepth, NULL, sDepthStr, NULL},
+    {NULL}  /* Sentinel */
+};
+
+static PySequenceMethods HTMIndex_as_sequence = {
+  (lenfunc) HTMIndex_length,                // sq_length
+};
+
+
+PyTypeObject HTMIndexType = {
+  PyObject_HEAD_INIT(NULL)
+  0,                                        /* ob_size */
+  "HTMIndex",                               /* tp_name */
+  sizeof(HTMIndex),                         /* tp_basicsize */
+  0,                                        /* tp_itemsize */
+  (destructor) HTMIndex_dealloc,            /* tp_dealloc */
+  0,                                        /* tp_print */
+  0,                                        /* tp_getattr */
+  0,                                        /* tp_setattr */
+  0,                                        /* tp_compare */
+  0,                                        /* tp_repr */
+  0,                                        /* tp_as_number */
+  &HTMIndex_as_sequence,                    /* tp_as_sequence */
+  0,                                        /* tp_as_mapping */
+  PyObject_HashNotImplemented,              /* tp_hash */
+  0,                                        /* tp_call */
+  0,                                        /* tp_str */
+  0,                                        /* tp_getattro */
+  0,                                        /* tp_setattro */
+  0,                                        /* tp_as_buffer */
+  Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE, /* tp_flags */
+  "HTMIndex(depth=12), a spatial index of RA and Declination positions", /* tp_doc */
+  0,                                        /* tp_traverse */
+  0,                                        /* tp_clear */
+  0,                                        /* tp_richcompare */
+  0,                                        /* tp_weaklistoffset */
+  0,                                        /* tp_iter */
+  0,                                        /* tp_iternext */
+  HTMIndex_methods,                         /* tp_methods */
+  0,                                        /* tp_members */
+  HTMIndex_getseters,                       /* tp_getset */
+  0,                                        /* tp_base */
+  0,                                        /* tp_dict */
+  0,                                        /* tp_descr_get */
+  0,                                        /* tp_descr_set */
+  0,                                        /* tp_dictoffset */
+  (initproc) HTMIndex_init,                 /* tp_init */
+  0,                                        /* tp_alloc */
+  HTMIndex_new,                             /* tp_new */
+};
+
+""" # end htm_index_class
+
+
+# ---------------------
+# ----- ZoneIndex -----
+# ---------------------
+
+# Not a % template, it is written as is.
+
+zone_index_class = """
+
+// ---------------------
+// ----- ZoneIndex -----
+// ---------------------
+
+// A declination zone index of RA and Declination positions for cone
+// searches, numbered in insertion order. See zone_index.h.
+
+typedef struct {
+  PyObject_HEAD
+  Angles::ZoneIndex m_index;
+} ZoneIndex;
+
+
+// A cursor over one cone search. It holds a reference to its
+// ZoneIndex so the index outlives it.
+
+typedef struct {
+  PyObject_HEAD
+  PyObject* m_owner;
+  Angles::ConeSearch m_search;
+} ConeSearch;
+
+extern PyTypeObject ConeSearchType;
+
+
+static PyObject* ZoneIndex_new(PyTypeObject* type, PyObject* args, PyObject* kwds) {
+  ZoneIndex* self(NULL);
+  self = (ZoneIndex*)type->tp_alloc(type, 0);
+  if (self != NULL)
+    new (&self->m_index) Angles::ZoneIndex(); // tp_alloc does not run constructors
+  return (PyObject*)self;
+}
+
+
+static int ZoneIndex_init(ZoneIndex* self, PyObject* args, PyObject* kwds) {
+
+  double a_height(0.5);
+
+  static char* kwlist[] = {sHeightStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "|d", kwlist, &a_height))
+    return -1;
+
+  try {
+    self->m_index = Angles::ZoneIndex(a_height);
+  } catch (Angles::Error& err) {
+    PyErr_SetString(sAngleException, err.what());
+    return -1;
+  }
+
+  return 0;
+}
+
+
+static void ZoneIndex_dealloc(ZoneIndex* self) {
+  self->m_index.~ZoneIndex();
+  Py_TYPE(self)->tp_free((PyObject*)self);
+}
+
+
+static Py_ssize_t ZoneIndex_length(ZoneIndex* self) {
+  return self->m_index.size();
+}
+
+
+// -------------------
+// ----- methods -----
+// -------------------
+
+static PyObject* ZoneIndex_insert(ZoneIndex* self, PyObject* args, PyObject* kwds) {
+
+  DoubleBuffer some_ras;
+  DoubleBuffer some_decs;
+
+  if (HTMIndex_buffers(args, kwds, some_ras, some_decs) < 0)
+    return NULL;
+
+  try {
+    self->m_index.insert(some_ras.data(), some_decs.data(), some_ras.size());
+  } catch (Angles::Error& err) {
+    PyErr_SetString(sAngleException, err.what());
+    return NULL;
+  }
+
+  Py_RETURN_NONE;
+}
+
+
+static PyObject* ZoneIndex_cone(ZoneIndex* self, PyObject* args, PyObject* kwds) {
+
+  PyObject* a_ra(NULL);
+  PyObject* a_dec(NULL);
+  PyObject* a_radius(NULL);
+
+  static char* kwlist[] = {sRaStr, sDecStr, sRadiusStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "OOO", kwlist, &a_ra, &a_dec, &a_radius))
+    return NULL;
+
+  double ra(0);
+  double dec(0);
+  double radius(0);
+
+  if (angleValue(a_ra, &ra) <= 0 || angleValue(a_dec, &dec) <= 0 || angleValue(a_radius, &radius) <= 0) {
+    if (!PyErr_Occurred())
+      PyErr_SetString(PyExc_TypeError, "ra, dec and radius must be angles, floats or ints");
+    return NULL;
+  }
+
+  ConeSearch* result((ConeSearch*)ConeSearchType.tp_alloc(&ConeSearchType, 0));
+  if (result == NULL)
+    return NULL;
+
+  new (&result->m_search) Angles::ConeSearch(self->m_index, ra, dec, radius);
+  Py_INCREF(self);
+  result->m_owner = (PyObject*)self;
+
+  return (PyObject*)result;
+}
+
+
+static PyObject* ZoneIndex_clear(ZoneIndex* self) {
+  self->m_index.clear();
+  Py_RETURN_NONE;
+}
+
+
+static PyObject* ZoneIndex_getHeight(ZoneIndex* self, void* closure) {
+  return PyFloat_FromDouble(self->m_index.height());
+}
+
+
+// ----------------------
+// ----- ConeSearch -----
+// ----------------------
+
+static void ConeSearch_dealloc(ConeSearch* self) {
+  self->m_search.~ConeSearch();
+  Py_XDECREF(self->m_owner);
+  Py_TYPE(self)->tp_free((PyObject*)self);
+}
+
+
+static PyObject* ConeSearch_iternext(ConeSearch* self) {
+
+  size_t a_position(0);
+
+  try {
+    if (self->m_search.next(&a_position, 1) == 0)
+      return NULL; // StopIteration
+  } catch (Angles::Error& err) {
+    PyErr_SetString(sAngleException, err.what());
+    return NULL;
+  }
+
+  return PyInt_FromSize_t(a_position);
+}
+
+
+static PyObject* ConeSearch_read(ConeSearch* self, PyObject* args, PyObject* kwds) {
+
+  Py_ssize_t a_size(1024);
+
+  static char* kwlist[] = {sSizeStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "|n", kwlist, &a_size))
+    return NULL;
+
+  if (a_size < 0) {
+    PyErr_SetString(PyExc_ValueError, "size must not be negative");
+    return NULL;
+  }
+
+  std::vector<size_t> some_positions(a_size);
+
+  try {
+    some_positions.resize(self->m_search.next(some_positions.empty() ? NULL : &some_positions[0],
+					      some_positions.size()));
+  } catch (Angles::Error& err) {
+    PyErr_SetString(sAngleException, err.what());
+    return NULL;
+  }
+
+  return newPositionList(some_positions);
+}
+
+
+static PyObject* ConeSearch_getDone(ConeSearch* self, void* closure) {
+  return PyBool_FromLong(self->m_search.done());
+}
+
+
+// --------------------------
+// ----- Python structs -----
+// --------------------------
+
+static PyMethodDef ZoneIndex_methods[] = {
+    {"insert", (PyCFunction)ZoneIndex_insert, METH_VARARGS | METH_KEYWORDS,
+     "insert(ra, dec), appends the positions in float64 buffers of hours and degrees"},
+    {"cone", (PyCFunction)ZoneIndex_cone, METH_VARARGS | METH_KEYWORDS,
+     "cone(ra, dec, radius), returns a ConeSearch over the positions within radius degrees"},
+    {"clear", (PyCFunction)ZoneIndex_clear, METH_NOARGS, "removes all the positions"},
+    {NULL}  /* Sentinel */
+};
+
+static PyGetSetDef ZoneIndex_getseters[] = {
+    {sHeightStr, (getter)ZoneIndex_getHeight, NULL, sHeightStr, NULL},
+    {NULL}  /* Sentinel */
+};
+
+static PySequenceMethods ZoneIndex_as_sequence = {
+  (lenfunc) ZoneIndex_length,               // sq_length
+};
+
+
+PyTypeObject ZoneIndexType = {
+  PyObject_HEAD_INIT(NULL)
+  0,                                        /* ob_size */
+  "ZoneIndex",                              /* tp_name */
+  sizeof(ZoneIndex),                        /* tp_basicsize */
+  0,                                        /* tp_itemsize */
+  (destructor) ZoneIndex_dealloc,           /* tp_dealloc */
+  0,                                        /* tp_print */
+  0,                                        /* tp_getattr */
+  0,                                        /* tp_setattr */
+  0,                                        /* tp_compare */
+  0,                                        /* tp_repr */
+  0,                                        /* tp_as_number */
+  &ZoneIndex_as_sequence,                   /* tp_as_sequence */
+  0,                                        /* tp_as_mapping */
+  PyObject_HashNotImplemented,              /* tp_hash */
+  0,                                        /* tp_call */
+  0,                                        /* tp_str */
+  0,                                        /* tp_getattro */
+  0,                                        /* tp_setattro */
+  0,                                        /* tp_as_buffer */
+  Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE, /* tp_flags */
+  "ZoneIndex(height=0.5), a declination zone index of RA and Declination positions", /* tp_doc */
+  0,                                        /* tp_traverse */
+  0,                                        /* tp_clear */
+  0,                                        /* tp_richcompare */
+  0,                                        /* tp_weaklistoffset */
+  0,                                        /* tp_iter */
+  0,                                        /* tp_iternext */
+  ZoneIndex_methods,                        /* tp_methods */
+  0,                                        /* tp_members */
+  ZoneIndex_getseters,                      /* tp_getset */
+  0,                                        /* tp_base */
+  0,                                        /* tp_dict */
+  0,                                        /* tp_descr_get */
+  0,                                        /* tp_descr_set */
+  0,                                        /* tp_dictoffset */
+  (initproc) ZoneIndex_init,                /* tp_init */
+  0,                                        /* tp_alloc */
+  ZoneIndex_new,                            /* tp_new */
+};
+
+
+static PyMethodDef ConeSearch_methods[] = {
+    {"read", (PyCFunction)ConeSearch_read, METH_VARARGS | METH_KEYWORDS,
+     "read(size=1024), returns a list of up to size more positions, empty when done"},
+    {NULL}  /* Sentinel */
+};
+
+static PyGetSetDef ConeSearch_getseters[] = {
+    {(char*)"done", (getter)ConeSearch_getDone, NULL, (char*)"done", NULL},
+    {NULL}  /* Sentinel */
+};
+
+
+PyTypeObject ConeSearchType = {
+  PyObject_HEAD_INIT(NULL)
+  0,                                        /* ob_size */
+  "ConeSearch",                             /* tp_name */
+  sizeof(ConeSearch),                       /* tp_basicsize */
+  0,                                        /* tp_itemsize */
+  (destructor) ConeSearch_dealloc,          /* tp_dealloc */
+  0,                                        /* tp_print */
+  0,                                        /* tp_getattr */
+  0,                                        /* tp_setattr */
+  0,                                        /* tp_compare */
+  0,                                        /* tp_repr */
+  0,                                        /* tp_as_number */
+  0,                                        /* tp_as_sequence */
+  0,                                        /* tp_as_mapping */
+  PyObject_HashNotImplemented,              /* tp_hash */
+  0,                                        /* tp_call */
+  0,                                        /* tp_str */
+  0,                                        /* tp_getattro */
+  0,                                        /* tp_setattro */
+  0,                                        /* tp_as_buffer */
+  Py_TPFLAGS_DEFAULT,                       /* tp_flags */
+  "an iterator over the positions of a ZoneIndex.cone search", /* tp_doc */
+  0,                                        /* tp_traverse */
+  0,                                        /* tp_clear */
+  0,                                        /* tp_richcompare */
+  0,                                        /* tp_weaklistoffset */
+  PyObject_SelfIter,                        /* tp_iter */
+  (iternextfunc) ConeSearch_iternext,       /* tp_iternext */
+  ConeSearch_methods,                       /* tp_methods */
+  0,                                        /* tp_members */
+  ConeSearch_getseters,                     /* tp_getset */
+};
+
+""" # end zone_index_class
+
+
+# ---------------------------
+# ----- CatalogueReader -----
+# ---------------------------
+
+# Not a % template, it is written as is.
+
+catalogue_reader_class = """
+
+// ---------------------------
+// ----- CatalogueReader -----
+// ---------------------------
+
+// An iterator over the chunks of a delimited text catalogue. See
+// catalogue.h.
+
+typedef struct {
+  PyObject_HEAD
+  Angles::CatalogueReader* m_reader; // no default constructor
+} CatalogueReader;
+
+
+static PyObject* CatalogueReader_new(PyTypeObject* type, PyObject* args, PyObject* kwds) {
+  CatalogueReader* self(NULL);
+  self = (CatalogueReader*)type->tp_alloc(type, 0);
+  if (self != NULL)
+    self->m_reader = NULL;
+  return (PyObject*)self;
+}
+
+
+// Adds a column for a field number or a (field, type) tuple, where
+// type is Angle or one of the limited range angle types for its
+// range check.
+static int CatalogueReader_addColumn(Angles::CatalogueReader* a_reader, PyObject* a_column) {
+
+  PyObject* a_field(a_column);
+  PyObject* a_type((PyObject*)&AngleType);
+
+  if (PyTuple_Check(a_column) && !PyArg_ParseTuple(a_column, "OO", &a_field, &a_type))
+    return -1;
+
+  Py_ssize_t field(PyNumber_AsSsize_t(a_field, PyExc_OverflowError));
+  if (field == -1 && PyErr_Occurred())
+    return -1;
+
+  if (field < 0) {
+    PyErr_SetString(sAngleException, "field must not be negative");
+    return -1;
+  }
+
+  try {
+    if (a_type == (PyObject*)&AngleType)
+      a_reader->addColumn(field);
+    else if (a_type == (PyObject*)&LimitedRangeAngleType)
+      a_reader->addColumn<Angles::LimitedRangeAngle>(field);
+    else if (a_type == (PyObject*)&DeclinationType)
+      a_reader->addColumn<Angles::Declination>(field);
+    else if (a_type == (PyObject*)&LatitudeType)
+      a_reader->addColumn<Angles::Latitude>(field);
+    else if (a_type == (PyObject*)&LongitudeType)
+      a_reader->addColumn<Angles::Longitude>(field);
+    else if (a_type == (PyObject*)&RAType)
+      a_reader->addColumn<Angles::RA>(field);
+    else {
+      PyErr_SetString(PyExc_TypeError, "column type must be Angle or a limited range angle type");
+      return -1;
+    }
+  } catch (Angles::Error& err) {
+    PyErr_SetString(sAngleException, err.what());
+    return -1;
+  }
+
+  return 0;
+}
+
+
+static int CatalogueReader_init(CatalogueReader* self, PyObject* args, PyObject* kwds) {
+
+  const char* a_path(NULL);
+  PyObject* some_columns(NULL);
+  char a_delimiter(',');
+  Py_ssize_t a_chunk(65536);
+  Py_ssize_t a_skip(0);
+
+  static char* kwlist[] = {sPathStr, sColumnsStr, sDelimiterStr, sChunkStr, sSkipStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "sO|cnn", kwlist,
+				   &a_path, &some_columns, &a_delimiter, &a_chunk, &a_skip))
+    return -1;
+
+  if (a_chunk < 0 || a_skip < 0) {
+    PyErr_SetString(PyExc_ValueError, "chunk and skip must not be negative");
+    return -1;
+  }
+
+  PyObject* a_sequence(PySequence_Fast(some_columns, "columns must be a sequence"));
+  if (a_sequence == NULL)
+    return -1;
+
+  Angles::CatalogueReader* a_reader(NULL);
+
+  try {
+    a_reader = new Angles::CatalogueReader(a_path, a_delimiter, a_chunk, a_skip);
+  } catch (Angles::Error& err) {
+    Py_DECREF(a_sequence);
+    PyErr_SetString(sAngleException, err.what());
+    return -1;
+  }
+
+  for (Py_ssize_t i = 0; i < PySequence_Fast_GET_SIZE(a_sequence); ++i) {
+    if (CatalogueReader_addColumn(a_reader, PySequence_Fast_GET_ITEM(a_sequence, i)) < 0) {
+      Py_DECREF(a_sequence);
+      delete a_reader;
+      return -1;
+    }
+  }
+
+  Py_DECREF(a_sequence);
+
+  delete self->m_reader;
+  self->m_reader = a_reader;
+
+  return 0;
+}
+
+
+static void CatalogueReader_dealloc(CatalogueReader* self) {
+  delete self->m_reader;
+  Py_TYPE(self)->tp_free((PyObject*)self);
+}
+
+
+// -------------------
+// ----- methods -----
+// -------------------
+
+// Returns a tuple of an array('d') per column and a list of (line,
+// offset, column, reason) tuples of the bad values, which are NaN in
+// the arrays.
+static PyObject* CatalogueReader_iternext(CatalogueReader* self) {
+
+  if (self->m_reader == NULL) {
+    PyErr_SetString(sAngleException, "CatalogueReader is not initialized");
+    return NULL;
+  }
+
+  size_t a_rows(0);
+
+  try {
+    a_rows = self->m_reader->next();
+  } catch (Angles::Error& err) {
+    PyErr_SetString(sAngleException, err.what());
+    return NULL;
+  }
+
+  if (a_rows == 0)
+    return NULL; // StopIteration
+
+  PyObject* some_values(PyTuple_New(self->m_reader->columns()));
+  if (some_values == NULL)
+    return NULL;
+
+  for (size_t i = 0; i < self->m_reader->columns(); ++i) {
+    double* a_data(NULL);
+    PyObject* an_array(newDoubleArray(a_rows, &a_data));
+    if (an_array == NULL) {
+      Py_DECREF(some_values);
+      return NULL;
+    }
+    std::copy(self->m_reader->values(i), self->m_reader->values(i) + a_rows, a_data);
+    PyTuple_SET_ITEM(some_values, i, an_array);
+  }
+
+  const std::vector<Angles::CatalogueError>& some_errors(self->m_reader->errors());
+
+  PyObject* an_error_list(PyList_New(some_errors.size()));
+  if (an_error_list == NULL) {
+    Py_DECREF(some_values);
+    return NULL;
+  }
+
+  for (size_t i = 0; i < some_errors.size(); ++i) {
+    PyObject* an_error(Py_BuildValue("nKns",
+				     (Py_ssize_t)some_errors[i].m_line,
+				     (unsigned PY_LONG_LONG)some_errors[i].m_offset,
+				     (Py_ssize_t)some_errors[i].m_column,
+				     some_errors[i].m_reason));
+    if (an_error == NULL) {
+      Py_DECREF(some_values);
+      Py_DECREF(an_error_list);
+      return NULL;
+    }
+    PyList_SET_ITEM(an_error_list, i, an_error);
+  }
+
+  return Py_BuildValue("NN", some_values, an_error_list);
+}
+
+
+static PyObject* CatalogueReader_getLine(CatalogueReader* self, void* closure) {
+  if (self->m_reader == NULL)
+    return PyInt_FromLong(0);
+  return PyInt_FromSize_t(self->m_reader->line());
+}
+
+
+// --------------------------
+// ----- Python structs -----
+// --------------------------
+
+static PyGetSetDef CatalogueReader_getseters[] = {
+    {(char*)"line", (getter)CatalogueReader_getLine, NULL, (char*)"lines read so far", NULL},
+    {NULL}  /* Sentinel */
+};
+
+
+PyTypeObject CatalogueReaderType = {
+  PyObject_HEAD_INIT(NULL)
+  0,                                        /* ob_size */
+  "CatalogueReader",                        /* tp_name */
+  sizeof(CatalogueReader),                  /* tp_basicsize */
+  0,                                        /* tp_itemsize */
+  (destructor) CatalogueReader_dealloc,     /* tp_dealloc */
+  0,                                        /* tp_print */
+  0,                                        /* tp_getattr */
+  0,                                        /* tp_setattr */
+  0,                                        /* tp_compare */
+  0,                                        /* tp_repr */
+  0,                                        /* tp_as_number */
+  0,                                        /* tp_as_sequence */
+  0,                                        /* tp_as_mapping */
+  PyObject_HashNotImplemented,              /* tp_hash */
+  0,                                        /* tp_call */
+  0,                                        /* tp_str */
+  0,                                        /* tp_getattro */
+  0,                                        /* tp_setattro */
+  0,                                        /* tp_as_buffer */
+  Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE, /* tp_flags */
+  "CatalogueReader(path, columns, delimiter=',', chunk=65536, skip=0), an iterator over"
+  " chunks of a delimited text catalogue. columns is a sequence of field numbers, from 0,"
+  " or (field, type) tuples, e.g. (3, RA). Each chunk is a tuple of an array('d') per column"
+  " and a list of (line, offset, column, reason) tuples of the bad values, NaN in the arrays", /* tp_doc */
+  0,                                        /* tp_traverse */
+  0,                                        /* tp_clear */
+  0,                                        /* tp_richcompare */
+  0,                                        /* tp_weaklistoffset */
+  PyObject_SelfIter,                        /* tp_iter */
+  (iternextfunc) CatalogueReader_iternext,  /* tp_iternext */
+  0,                                        /* tp_methods */
+  0,                                        /* tp_members */
+  CatalogueReader_getseters,                /* tp_getset */
+  0,                                        /* tp_base */
+  0,                                        /* tp_dict */
+  0,                                        /* tp_descr_get */
+  0,                                        /* tp_descr_set */
+  0,                                        /* tp_dictoffset */
+  (initproc) CatalogueReader_init,          /* tp_init */
+  0,                                        /* tp_alloc */
+  CatalogueReader_new,                      /* tp_new */
+};
+
+""" # end catalogue_reader_class
+
+
+# ---------------------------
+# ----- BinaryCatalogue -----
+# ---------------------------
+
+# Not a % template, it is written as is.
+
+binary_catalogue_class = """
+
+// ---------------------------
+// ----- BinaryCatalogue -----
+// ---------------------------
+
+// A memory mapped binary catalogue, columns are read only float64
+// memoryviews of the mapping. See binary_catalogue.h.
+
+typedef struct {
+  PyObject_HEAD
+  Angles::BinaryCatalogue* m_catalogue; // no default constructor
+} BinaryCatalogue;
+
+
+// A column of a BinaryCatalogue. It exports the mapping as a new
+// style buffer for the memoryviews and holds a reference to its
+// catalogue so the mapping outlives them.
+
+typedef struct {
+  PyObject_HEAD
+  PyObject*     m_owner;
+  const double* m_values;
+  Py_ssize_t    m_shape;
+  Py_ssize_t    m_stride;
+} BinaryCatalogueColumn;
+
+extern PyTypeObject BinaryCatalogueColumnType;
+
+
+// the catalogue type of an angle type object
+static int catalogueType(PyObject* a_type, Angles::CatalogueType* a_result) {
+  if (a_type == (PyObject*)&AngleType)
+    *a_result = Angles::CATALOGUE_ANGLE;
+  else if (a_type == (PyObject*)&LimitedRangeAngleType)
+    *a_result = Angles::CATALOGUE_LIMITED_RANGE_ANGLE;
+  else if (a_type == (PyObject*)&DeclinationType)
+    *a_result = Angles::CATALOGUE_DECLINATION;
+  else if (a_type == (PyObject*)&LatitudeType)
+    *a_result = Angles::CATALOGUE_LATITUDE;
+  else if (a_type == (PyObject*)&LongitudeType)
+    *a_result = Angles::CATALOGUE_LONGITUDE;
+  else if (a_type == (PyObject*)&RAType)
+    *a_result = Angles::CATALOGUE_RA;
+  else {
+    PyErr_SetString(PyExc_TypeError, "column type must be Angle or a limited range angle type");
+    return -1;
+  }
+  return 0;
+}
+
+
+// and back, a borrowed reference
+static PyObject* catalogueTypeObject(const Angles::CatalogueType& a_type) {
+  switch (a_type) {
+  case Angles::CATALOGUE_LIMITED_RANGE_ANGLE: return (PyObject*)&LimitedRangeAngleType;
+  case Angles::CATALOGUE_DECLINATION:         return (PyObject*)&DeclinationType;
+  case Angles::CATALOGUE_LATITUDE:            return (PyObject*)&LatitudeType;
+  case Angles::CATALOGUE_LONGITUDE:           return (PyObject*)&LongitudeType;
+  case Angles::CATALOGUE_RA:                  return (PyObject*)&RAType;
+  default:                                    return (PyObject*)&AngleType;
+  }
+}
+
+
+static PyObject* BinaryCatalogue_new(PyTypeObject* type, PyObject* args, PyObject* kwds) {
+  BinaryCatalogue* self(NULL);
+  self = (BinaryCatalogue*)type->tp_alloc(type, 0);
+  if (self != NULL)
+    self->m_catalogue = NULL;
+  return (PyObject*)self;
+}
+
+
+static int BinaryCatalogue_init(BinaryCatalogue* self, PyObject* args, PyObject* kwds) {
+
+  const char* a_path(NULL);
+
+  static char* kwlist[] = {sPathStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "s", kwlist, &a_path))
+    return -1;
+
+  if (self->m_catalogue != NULL) {
+    // views of the old mapping may still be in use
+    PyErr_SetString(sAngleException, "BinaryCatalogue is already open");
+    return -1;
+  }
+
+  try {
+    self->m_catalogue = new Angles::BinaryCatalogue(a_path);
+  } catch (Angles::Error& err) {
+    PyErr_SetString(sAngleException, err.what());
+    return -1;
+  }
+
+  return 0;
+}
+
+
+static void BinaryCatalogue_dealloc(BinaryCatalogue* self) {
+  delete self->m_catalogue; // the views hold a reference, so none are left
+  Py_TYPE(self)->tp_free((PyObject*)self);
+}
+
+
+// the column number of a name or an int
+static Py_ssize_t BinaryCatalogue_column(BinaryCatalogue* self, PyObject* a_key) {
+
+  if (self->m_catalogue == NULL) {
+    PyErr_SetString(sAngleException, "BinaryCatalogue is not open");
+    return -1;
+  }
+
+  if (PyString_Check(a_key)) {
+    try {
+      return self->m_catalogue->column(PyString_AsString(a_key));
+    } catch (Angles::Error& err) {
+      PyErr_SetString(PyExc_KeyError, err.what());
+      return -1;
+    }
+  }
+
+  Py_ssize_t a_column(PyNumber_AsSsize_t(a_key, PyExc_IndexError));
+  if (a_column == -1 && PyErr_Occurred())
+    return -1;
+
+  if (a_column < 0 || a_column >= (Py_ssize_t)self->m_catalogue->columns()) {
+    PyErr_SetString(PyExc_IndexError, "no such column");
+    return -1;
+  }
+
+  return a_column;
+}
+
+
+// ---------------------------
+// ----- mapping methods -----
+// ---------------------------
+
+static Py_ssize_t BinaryCatalogue_length(BinaryCatalogue* self) {
+  return self->m_catalogue == NULL ? 0 : self->m_catalogue->columns();
+}
+
+
+// a read only float64 memoryview of the column, no copy
+static PyObject* BinaryCatalogue_getItem(BinaryCatalogue* self, PyObject* a_key) {
+
+  Py_ssize_t a_column(BinaryCatalogue_column(self, a_key));
+  if (a_column < 0)
+    return NULL;
+
+  BinaryCatalogueColumn* a_view_column((BinaryCatalogueColumn*)
+					BinaryCatalogueColumnType.tp_alloc(&BinaryCatalogueColumnType, 0));
+  if (a_view_column == NULL)
+    return NULL;
+
+  Py_INCREF(self);
+  a_view_column->m_owner = (PyObject*)self;
+  a_view_column->m_values = self->m_catalogue->values(a_column);
+  a_view_column->m_shape = self->m_catalogue->rows();
+  a_view_column->m_stride = sizeof(double);
+
+  PyObject* result(PyMemoryView_FromObject((PyObject*)a_view_column));
+  Py_DECREF(a_view_column);
+  return result;
+}
+
+
+// -------------------
+// ----- methods -----
+// -------------------
+
+static PyObject* BinaryCatalogue_type(BinaryCatalogue* self, PyObject* args, PyObject* kwds) {
+
+  PyObject* a_key(NULL);
+
+  static char* kwlist[] = {sColumnStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "O", kwlist, &a_key))
+    return NULL;
+
+  Py_ssize_t a_column(BinaryCatalogue_column(self, a_key));
+  if (a_column < 0)
+    return NULL;
+
+  PyObject* result(catalogueTypeObject(self->m_catalogue->type(a_column)));
+  Py_INCREF(result);
+  return result;
+}
+
+
+static PyObject* BinaryCatalogue_getRows(BinaryCatalogue* self, void* closure) {
+  return PyInt_FromSize_t(self->m_catalogue == NULL ? 0 : self->m_catalogue->rows());
+}
+
+
+// ---------------------------------
+// ----- BinaryCatalogueColumn -----
+// ---------------------------------
+
+static void BinaryCatalogueColumn_dealloc(BinaryCatalogueColumn* self) {
+  Py_XDECREF(self->m_owner);
+  Py_TYPE(self)->tp_free((PyObject*)self);
+}
+
+
+static int BinaryCatalogueColumn_getBuffer(BinaryCatalogueColumn* self, Py_buffer* a_view, int flags) {
+
+  if (flags & PyBUF_WRITABLE) {
+    PyErr_SetString(PyExc_BufferError, "catalogue columns are read only");
+    return -1;
+  }
+
+  Py_INCREF(self);
+  a_view->obj = (PyObject*)self;
+  a_view->buf = (void*)self->m_values;
+  a_view->len = self->m_shape*sizeof(double);
+  a_view->readonly = 1;
+  a_view->itemsize = sizeof(double);
+  a_view->format = (flags & PyBUF_FORMAT) ? (char*)"d" : NULL;
+  a_view->ndim = 1;
+  a_view->shape = (flags & PyBUF_ND) ? &self->m_shape : NULL;
+  a_view->strides = (flags & PyBUF_STRIDES) == PyBUF_STRIDES ? &self->m_stride : NULL;
+  a_view->suboffsets = NULL;
+  a_view->internal = NULL;
+
+  return 0;
+}
+
+
+static PyObject* BinaryCatalogue_getColumns(BinaryCatalogue* self, void* closure) {
+
+  const size_t a_size(self->m_catalogue == NULL ? 0 : self->m_catalogue->columns());
+
+  PyObject* result(PyList_New(a_size));
+  if (result == NULL)
+    return NULL;
+
+  for (size_t i = 0; i < a_size; ++i) {
+    PyObject* a_name(PyString_FromString(self->m_catalogue->name(i).c_str()));
+    if (a_name == NULL) {
+      Py_DECREF(result);
+      return NULL;
+    }
+    PyList_SET_ITEM(result, i, a_name);
+  }
+
+  return result;
+}
+
+
+// --------------------------
+// ----- Python structs -----
+// --------------------------
+
+static PyMethodDef BinaryCatalogue_methods[] = {
+    {"type", (PyCFunction)BinaryCatalogue_type, METH_VARARGS | METH_KEYWORDS,
+     "type(column), returns the angle type of a column, by name or number"},
+    {NULL}  /* Sentinel */
+};
+
+static PyGetSetDef BinaryCatalogue_getseters[] = {
+    {(char*)"rows", (getter)BinaryCatalogue_getRows, NULL, (char*)"rows", NULL},
+    {sColumnsStr, (getter)BinaryCatalogue_getColumns, NULL, (char*)"list of column names", NULL},
+    {NULL}  /* Sentinel */
+};
+
+static PyMappingMethods BinaryCatalogue_as_mapping = {
+  (lenfunc) BinaryCatalogue_length,         // mp_length
+  (binaryfunc) BinaryCatalogue_getItem,     // mp_subscript
+  0,                                        // mp_ass_subscript
+};
+
+
+static PyBufferProcs BinaryCatalogueColumn_as_buffer = {
+  0,                                              // bf_getreadbuffer
+  0,                                              // bf_getwritebuffer
+  0,                                              // bf_getsegcount
+  0,                                              // bf_getcharbuffer
+  (getbufferproc) BinaryCatalogueColumn_getBuffer, // bf_getbuffer
+  0,                                              // bf_releasebuffer
+};
+
+
+PyTypeObject BinaryCatalogueColumnType = {
+  PyObject_HEAD_INIT(NULL)
+  0,                                        /* ob_size */
+  "BinaryCatalogueColumn",                  /* tp_name */
+  sizeof(BinaryCatalogueColumn),            /* tp_basicsize */
+  0,                                        /* tp_itemsize */
+  (destructor) BinaryCatalogueColumn_dealloc, /* tp_dealloc */
+  0,                                        /* tp_print */
+  0,                                        /* tp_getattr */
+  0,                                        /* tp_setattr */
+  0,                                        /* tp_compare */
+  0,                                        /* tp_repr */
+  0,                                        /* tp_as_number */
+  0,                                        /* tp_as_sequence */
+  0,                                        /* tp_as_mapping */
+  PyObject_HashNotImplemented,              /* tp_hash */
+  0,                                        /* tp_call */
+  0,                                        /* tp_str */
+  0,                                        /* tp_getattro */
+  0,                                        /* tp_setattro */
+  &BinaryCatalogueColumn_as_buffer,         /* tp_as_buffer */
+  Py_TPFLAGS_DEFAULT | Py_TPFLAGS_HAVE_NEWBUFFER, /* tp_flags */
+  "the buffer behind a BinaryCatalogue column memoryview", /* tp_doc */
+};
+
+
+PyTypeObject BinaryCatalogueType = {
+  PyObject_HEAD_INIT(NULL)
+  0,                                        /* ob_size */
+  "BinaryCatalogue",                        /* tp_name */
+  sizeof(BinaryCatalogue),                  /* tp_basicsize */
+  0,                                        /* tp_itemsize */
+  (destructor) BinaryCatalogue_dealloc,     /* tp_dealloc */
+  0,                                        /* tp_print */
+  0,                                        /* tp_getattr */
+  0,                                        /* tp_setattr */
+  0,                                        /* tp_compare */
+  0,                                        /* tp_repr */
+  0,                                        /* tp_as_number */
+  0,                                        /* tp_as_sequence */
+  &BinaryCatalogue_as_mapping,              /* tp_as_mapping */
+  PyObject_HashNotImplemented,              /* tp_hash */
+  0,                                        /* tp_call */
+  0,                                        /* tp_str */
+  0,                                        /* tp_getattro */
+  0,                                        /* tp_setattro */
+  0,                                        /* tp_as_buffer */
+  Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE, /* tp_flags */
+  "BinaryCatalogue(path), a memory mapped binary catalogue."
+  " catalogue['ra'] or catalogue[0] is a read only float64 memoryview of the column", /* tp_doc */
+  0,                                        /* tp_traverse */
+  0,                                        /* tp_clear */
+  0,                                        /* tp_richcompare */
+  0,                                        /* tp_weaklistoffset */
+  0,                                        /* tp_iter */
+  0,                                        /* tp_iternext */
+  BinaryCatalogue_methods,                  /* tp_methods */
+  0,                                        /* tp_members */
+  BinaryCatalogue_getseters,                /* tp_getset */
+  0,                                        /* tp_base */
+  0,                                        /* tp_dict */
+  0,                                        /* tp_descr_get */
+  0,                                        /* tp_descr_set */
+  0,                                        /* tp_dictoffset */
+  (initproc) BinaryCatalogue_init,          /* tp_init */
+  0,                                        /* tp_alloc */
+  BinaryCatalogue_new,                      /* tp_new */
+};
+
+
+// ------------------------------------
+// ----- write a binary catalogue -----
+// ------------------------------------
+
+PyDoc_STRVAR(angles_writeBinaryCatalogue__doc__,
+	     "writes a binary catalogue for BinaryCatalogue, writeBinaryCatalogue(path, columns)."
+	     " columns is a sequence of (name, type, values) tuples, type Angle or a limited range"
+	     " angle type and values a float64 buffer, all the same size");
+
+// parses the (name, type, values) tuples into some_columns, holding
+// each values buffer in some_buffers
+static int catalogueColumns(PyObject* a_sequence, DoubleBuffer* some_buffers,
+			    std::vector<Angles::CatalogueColumn>& some_columns) {
+
+  for (size_t i = 0; i < some_columns.size(); ++i) {
+
+    const char* a_name(NULL);
+    PyObject* a_type(NULL);
+    PyObject* some_values(NULL);
+
+    if (!PyArg_ParseTuple(PySequence_Fast_GET_ITEM(a_sequence, i), "sOO", &a_name, &a_type, &some_values) ||
+	catalogueType(a_type, &some_columns[i].m_type) < 0 ||
+	some_buffers[i].acquire(some_values, false) < 0)
+      return -1;
+
+    if (some_buffers[i].size() != some_buffers[0].size()) {
+      PyErr_SetString(sAngleException, "buffer sizes do not match");
+      return -1;
+    }
+
+    some_columns[i].m_name = a_name;
+    some_columns[i].m_values = some_buffers[i].data();
+  }
+
+  return 0;
+}
+
+
+static PyObject* writeBinaryCatalogue(PyObject* self, PyObject* args, PyObject* kwds) {
+
+  const char* a_path(NULL);
+  PyObject* some_columns(NULL);
+
+  static char* kwlist[] = {sPathStr, sColumnsStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "sO", kwlist, &a_path, &some_columns))
+    return NULL;
+
+  PyObject* a_sequence(PySequence_Fast(some_columns, "columns must be a sequence"));
+  if (a_sequence == NULL)
+    return NULL;
+
+  std::vector<Angles::CatalogueColumn> catalogue_columns(PySequence_Fast_GET_SIZE(a_sequence));
+  DoubleBuffer* some_buffers(new DoubleBuffer[catalogue_columns.size()]); // not copyable
+
+  int status(catalogueColumns(a_sequence, some_buffers, catalogue_columns));
+
+  if (status == 0) {
+    try {
+      Angles::writeBinaryCatalogue(a_path, catalogue_columns,
+				   catalogue_columns.empty() ? 0 : some_buffers[0].size());
+    } catch (Angles::Error& err) {
+      PyErr_SetString(sAngleException, err.what());
+      status = -1;
+    }
+  }
+
+  delete [] some_buffers;
+  Py_DECREF(a_sequence);
+
+  if (status < 0)
+    return NULL;
+
+  Py_RETURN_NONE;
+}
+
+""" # end binary_catalogue_class
+
+
+# ----------------------------
+# ----- SharedAngleArray -----
+# ----------------------------
+
+# Not a % template, it is written as is.
+
+shared_angle_array_class = """
+
+// ----------------------------
+// ----- SharedAngleArray -----
+// ----------------------------
+
+// An array of angle values in named POSIX shared memory, a new style
+// float64 buffer. It pickles as its name, so a worker process
+// attaches to the same memory instead of receiving a copy. See
+// shared_angle_array.h.
+
+typedef struct {
+  PyObject_HEAD
+  Angles::SharedAngleArray* m_array; // no default constructor
+  Py_ssize_t                m_shape;
+  Py_ssize_t                m_stride;
+} SharedAngleArray;
+
+
+static PyObject* SharedAngleArray_new(PyTypeObject* type, PyObject* args, PyObject* kwds) {
+  SharedAngleArray* self(NULL);
+  self = (SharedAngleArray*)type->tp_alloc(type, 0);
+  if (self != NULL) {
+    self->m_array = NULL;
+    self->m_shape = 0;
+    self->m_stride = sizeof(double);
+  }
+  return (PyObject*)self;
+}
+
+
+static int SharedAngleArray_init(SharedAngleArray* self, PyObject* args, PyObject* kwds) {
+
+  PyObject* some_values(NULL);
+  PyObject* a_type((PyObject*)&AngleType);
+  const char* a_name(NULL);
+  PyObject* a_writable(NULL);
+
+  static char* kwlist[] = {sValuesStr, sTypeStr, sNameStr, sWritableStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "|OOzO", kwlist, &some_values, &a_type, &a_name, &a_writable))
+    return -1;
+
+  if (self->m_array != NULL) {
+    // views of the old memory may still be in use
+    PyErr_SetString(sAngleException, "SharedAngleArray is already attached");
+    return -1;
+  }
+
+  const bool is_writable(a_writable != NULL && PyObject_IsTrue(a_writable));
+
+  try {
+
+    if (some_values == NULL || some_values == Py_None) {
+
+      // attach
+      if (a_name == NULL) {
+	PyErr_SetString(PyExc_TypeError, "SharedAngleArray needs values or the name of one");
+	return -1;
+      }
+      self->m_array = new Angles::SharedAngleArray(a_name, is_writable);
+
+    } else {
+
+      // create
+      Angles::CatalogueType a_catalogue_type;
+      if (catalogueType(a_type, &a_catalogue_type) < 0)
+	return -1;
+
+      DoubleBuffer values;
+      if (values.acquire(some_values, false) < 0)
+	return -1;
+
+      self->m_array = new Angles::SharedAngleArray(a_name == NULL ? Angles::SharedAngleArray::uniqueName() : a_name,
+						   values.data(), values.size(), a_catalogue_type);
+    }
+
+  } catch (Angles::Error& err) {
+    PyErr_SetString(sAngleException, err.what());
+    return -1;
+  }
+
+  self->m_shape = self->m_array->size();
+
+  return 0;
+}
+
+
+static void SharedAngleArray_dealloc(SharedAngleArray* self) {
+  delete self->m_array; // the views hold a reference, so none are left
+  Py_TYPE(self)->tp_free((PyObject*)self);
+}
+
+
+static int SharedAngleArray_check(SharedAngleArray* self) {
+  if (self->m_array == NULL) {
+    PyErr_SetString(sAngleException, "SharedAngleArray is not attached");
+    return -1;
+  }
+  return 0;
+}
+
+
+// ----------------------------
+// ----- sequence methods -----
+// ----------------------------
+
+static Py_ssize_t SharedAngleArray_length(SharedAngleArray* self) {
+  return self->m_shape;
+}
+
+
+static PyObject* SharedAngleArray_getItem(SharedAngleArray* self, Py_ssize_t an_index) {
+  if (an_index < 0 || an_index >= self->m_shape) {
+    PyErr_SetString(PyExc_IndexError, "SharedAngleArray index out of range");
+    return NULL;
+  }
+  return PyFloat_FromDouble(self->m_array->values()[an_index]);
+}
+
+
+// --------------------------
+// ----- buffer methods -----
+// --------------------------
+
+static int SharedAngleArray_getBuffer(SharedAngleArray* self, Py_buffer* a_view, int flags) {
+
+  if (SharedAngleArray_check(self) < 0)
+    return -1;
+
+  if ((flags & PyBUF_WRITABLE) && !self->m_array->writable()) {
+    PyErr_SetString(PyExc_BufferError, "SharedAngleArray is read only");
+    return -1;
+  }
+
+  Py_INCREF(self);
+  a_view->obj = (PyObject*)self;
+  a_view->buf = (void*)self->m_array->values();
+  a_view->len = self->m_shape*sizeof(double);
+  a_view->readonly = self->m_array->writable() ? 0 : 1;
+  a_view->itemsize = sizeof(double);
+  a_view->format = (flags & PyBUF_FORMAT) ? (char*)"d" : NULL;
+  a_view->ndim = 1;
+  a_view->shape = (flags & PyBUF_ND) ? &self->m_shape : NULL;
+  a_view->strides = (flags & PyBUF_STRIDES) == PyBUF_STRIDES ? &self->m_stride : NULL;
+  a_view->suboffsets = NULL;
+  a_view->internal = NULL;
+
+  return 0;
+}
+
+
+// -------------------
+// ----- methods -----
+// -------------------
+
+static PyObject* SharedAngleArray_unlink(SharedAngleArray* self) {
+
+  if (SharedAngleArray_check(self) < 0)
+    return NULL;
+
+  try {
+    self->m_array->unlink();
+  } catch (Angles::Error& err) {
+    PyErr_SetString(sAngleException, err.what());
+    return NULL;
+  }
+
+  Py_RETURN_NONE;
+}
+
+
+// pickles the name, unpickling attaches to it and reads the type
+static PyObject* SharedAngleArray_reduce(SharedAngleArray* self) {
+
+  if (SharedAngleArray_check(self) < 0)
+    return NULL;
+
+  return Py_BuildValue("(O(OOsO))", Py_TYPE(self), Py_None, Py_None,
+		       self->m_array->name().c_str(), self->m_array->writable() ? Py_True : Py_False);
+}
+
+
+static PyObject* SharedAngleArray_getName(SharedAngleArray* self, void* closure) {
+  if (SharedAngleArray_check(self) < 0)
+    return NULL;
+  return PyString_FromString(self->m_array->name().c_str());
+}
+
+
+static PyObject* SharedAngleArray_getType(SharedAngleArray* self, void* closure) {
+  if (SharedAngleArray_check(self) < 0)
+    return NULL;
+  PyObject* result(catalogueTypeObject(self->m_array->type()));
+  Py_INCREF(result);
+  return result;
+}
+
+
+static PyObject* SharedAngleArray_getWritable(SharedAngleArray* self, void* closure) {
+  return PyBool_FromLong(self->m_array != NULL && self->m_array->writable());
+}
+
+
+static PyObject* SharedAngleArray_getOwner(SharedAngleArray* self, void* closure) {
+  return PyBool_FromLong(self->m_array != NULL && self->m_array->owner());
+}
+
+
+// --------------------------
+// ----- Python structs -----
+// --------------------------
+
+static PyMethodDef SharedAngleArray_methods[] = {
+    {"unlink", (PyCFunction)SharedAngleArray_unlink, METH_NOARGS,
+     "removes the name, arrays already attached keep the memory"},
+    {"__reduce__", (PyCFunction)SharedAngleArray_reduce, METH_NOARGS, "pickles the name"},
+    {NULL}  /* Sentinel */
+};
+
+static PyGetSetDef SharedAngleArray_getseters[] = {
+    {sNameStr, (getter)SharedAngleArray_getName, NULL, (char*)"the shared memory name", NULL},
+    {sTypeStr, (getter)SharedAngleArray_getType, NULL, (char*)"the angle type of the values", NULL},
+    {sWritableStr, (getter)SharedAngleArray_getWritable, NULL, (char*)"writable", NULL},
+    {(char*)"owner", (getter)SharedAngleArray_getOwner, NULL,
+     (char*)"True in the creating process, which unlinks the name when the array is freed", NULL},
+    {NULL}  /* Sentinel */
+};
+
+static PySequenceMethods SharedAngleArray_as_sequence = {
+  (lenfunc) SharedAngleArray_length,        // sq_length
+  0,                                        // sq_concat
+  0,                                        // sq_repeat
+  (ssizeargfunc) SharedAngleArray_getItem,  // sq_item
+};
+
+
+static PyBufferProcs SharedAngleArray_as_buffer = {
+  0,                                        // bf_getreadbuffer
+  0,                                        // bf_getwritebuffer
+  0,                                        // bf_getsegcount
+  0,                                        // bf_getcharbuffer
+  (getbufferproc) SharedAngleArray_getBuffer, // bf_getbuffer
+  0,                                        // bf_releasebuffer
+};
+
+
+PyTypeObject SharedAngleArrayType = {
+  PyObject_HEAD_INIT(NULL)
+  0,                                        /* ob_size */
+  "angles.SharedAngleArray",                /* tp_name, with the module for pickle */
+  sizeof(SharedAngleArray),                 /* tp_basicsize */
+  0,                                        /* tp_itemsize */
+  (destructor) SharedAngleArray_dealloc,    /* tp_dealloc */
+  0,                                        /* tp_print */
+  0,                                        /* tp_getattr */
+  0,                                        /* tp_setattr */
+  0,                                        /* tp_compare */
+  0,                                        /* tp_repr */
+  0,                                        /* tp_as_number */
+  &SharedAngleArray_as_sequence,            /* tp_as_sequence */
+  0,                                        /* tp_as_mapping */
+  PyObject_HashNotImplemented,              /* tp_hash */
+  0,                                        /* tp_call */
+  0,                                        /* tp_str */
+  0,                                        /* tp_getattro */
+  0,                                        /* tp_setattro */
+  &SharedAngleArray_as_buffer,              /* tp_as_buffer */
+  Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_NEWBUFFER, /* tp_flags */
+  "SharedAngleArray(values, type=Angle, name=None) copies a float64 buffer into new named shared memory,"
+  " checked against type's range. SharedAngleArray(name=name, writable=False) attaches to one."
+  " It is a float64 buffer and pickles as its name", /* tp_doc */
+  0,                                        /* tp_traverse */
+  0,                                        /* tp_clear */
+  0,                                        /* tp_richcompare */
+  0,                                        /* tp_weaklistoffset */
+  0,                                        /* tp_iter */
+  0,                                        /* tp_iternext */
+  SharedAngleArray_methods,                 /* tp_methods */
+  0,                                        /* tp_members */
+  SharedAngleArray_getseters,               /* tp_getset */
+  0,                                        /* tp_base */
+  0,                                        /* tp_dict */
+  0,                                        /* tp_descr_get */
+  0,                                        /* tp_descr_set */
+  0,                                        /* tp_dictoffset */
+  (initproc) SharedAngleArray_init,         /* tp_init */
+  0,                                        /* tp_alloc */
+  SharedAngleArray_new,                     /* tp_new */
+};
+
+""" # end shared_angle_array_class
+
+
+# -----------------------
+# ----- SortedIndex -----
+# -----------------------
+
+sorted_index_template = """
+
+// ------------------------------------
+// ----- %(TypeName)sSortedIndex -----
+// ------------------------------------
+
+// A sorted index of a float64 buffer of %(TypeName)s values. Queries
+// return positions in that buffer. See sorted_index.h for the wrap
+// rules.
+
+typedef Angles::SortedIndex<Angles::%(TypeName)s> Py%(TypeName)sSortedIndex;
+
+typedef struct {
+  PyObject_HEAD
+  Py%(TypeName)sSortedIndex m_index;
+} %(TypeName)sSortedIndex;
+
+
+static int %(TypeName)sSortedIndex_bound(PyObject* a_bound, double* a_value) {
+  int status(angleValue(a_bound, a_value));
+  if (status == 0)
+    PyErr_SetString(PyExc_TypeError, "bound must be an angle, float or int");
+  return status > 0 ? 0 : -1;
+}
+
+
+static PyObject* %(TypeName)sSortedIndex_new(PyTypeObject* type, PyObject* args, PyObject* kwds) {
+  %(TypeName)sSortedIndex* self(NULL);
+  self = (%(TypeName)sSortedIndex*)type->tp_alloc(type, 0);
+  if (self != NULL)
+    new (&self->m_index) Py%(TypeName)sSortedIndex(); // tp_alloc does not run constructors
+  return (PyObject*)self;
+}
+
+
+static int %(TypeName)sSortedIndex_init(%(TypeName)sSortedIndex* self, PyObject* args, PyObject* kwds) {
+
+  PyObject* a_buffer(NULL);
+
+  static char* kwlist[] = {sBufferStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "|O", kwlist, &a_buffer))
+    return -1;
+
+  if (a_buffer == NULL) {
+    self->m_index.clear();
+    return 0;
+  }
+
+  DoubleBuffer values;
+  if (values.acquire(a_buffer, false) < 0)
+    return -1;
+
+  try {
+    self->m_index.assign(values.data(), values.size());
+  } catch (Angles::Error& err) {
+    PyErr_SetString(sAngleException, err.what());
+    return -1;
+  }
+
+  return 0;
+}
+
+
+static void %(TypeName)sSortedIndex_dealloc(%(TypeName)sSortedIndex* self) {
+  self->m_index.~Py%(TypeName)sSortedIndex();
+  Py_TYPE(self)->tp_free((PyObject*)self);
+}
+
+
+static Py_ssize_t %(TypeName)sSortedIndex_length(%(TypeName)sSortedIndex* self) {
+  return self->m_index.size();
+}
+
+
+// -------------------
+// ----- methods -----
+// -------------------
+
+static PyObject* %(TypeName)sSortedIndex_assign(%(TypeName)sSortedIndex* self, PyObject* args, PyObject* kwds) {
+  if (%(TypeName)sSortedIndex_init(self, args, kwds) < 0)
+    return NULL;
+  Py_RETURN_NONE;
+}
+
+
+// parses lower and upper for count and range
+static int %(TypeName)sSortedIndex_bounds(PyObject* args, PyObject* kwds, double* a_lower, double* an_upper) {
+
+  PyObject* a_lower_bound(NULL);
+  PyObject* an_upper_bound(NULL);
+
+  static char* kwlist[] = {sLowerStr, sUpperStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "OO", kwlist, &a_lower_bound, &an_upper_bound))
+    return -1;
+
+  if (%(TypeName)sSortedIndex_bound(a_lower_bound, a_lower) < 0 ||
+      %(TypeName)sSortedIndex_bound(an_upper_bound, an_upper) < 0)
+    return -1;
+
+  return 0;
+}
+
+
+static PyObject* %(TypeName)sSortedIndex_count(%(TypeName)sSortedIndex* self, PyObject* args, PyObject* kwds) {
+
+  double a_lower(0);
+  double an_upper(0);
+
+  if (%(TypeName)sSortedIndex_bounds(args, kwds, &a_lower, &an_upper) < 0)
+    return NULL;
+
+  return PyInt_FromSize_t(self->m_index.count(a_lower, an_upper));
+}
+
+
+static PyObject* %(TypeName)sSortedIndex_range(%(TypeName)sSortedIndex* self, PyObject* args, PyObject* kwds) {
+
+  double a_lower(0);
+  double an_upper(0);
+
+  if (%(TypeName)sSortedIndex_bounds(args, kwds, &a_lower, &an_upper) < 0)
+    return NULL;
+
+  std::vector<size_t> some_positions;
+  self->m_index.range(a_lower, an_upper, some_positions);
+
+  return newPositionList(some_positions);
+}
+
+
+static PyObject* %(TypeName)sSortedIndex_nearest(%(TypeName)sSortedIndex* self, PyObject* args, PyObject* kwds) {
+
+  PyObject* a_target(NULL);
+
+  static char* kwlist[] = {sValueStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "O", kwlist, &a_target))
+    return NULL;
+
+  double a_value(0);
+  if (%(TypeName)sSortedIndex_bound(a_target, &a_value) < 0)
+    return NULL;
+
+  try {
+    return PyInt_FromSize_t(self->m_index.position(self->m_index.nearest(a_value)));
+  } catch (Angles::Error& err) {
+    PyErr_SetString(sAngleException, err.what());
+    return NULL;
+  }
+}
+
+
+static PyObject* %(TypeName)sSortedIndex_values(%(TypeName)sSortedIndex* self) {
+  // an array('d') in sorted order
+  double* some_values(NULL);
+  PyObject* result(newDoubleArray(self->m_index.size(), &some_values));
+  for (size_t i = 0; result != NULL && i < self->m_index.size(); ++i)
+    some_values[i] = self->m_index.value(i);
+  return result;
+}
+
+
+// --------------------------
+// ----- Python structs -----
+// --------------------------
+
+static PyMethodDef %(TypeName)sSortedIndex_methods[] = {
+    {"assign", (PyCFunction)%(TypeName)sSortedIndex_assign, METH_VARARGS | METH_KEYWORDS,
+     "assign(buffer), replaces the contents with a float64 buffer of values"},
+    {"count", (PyCFunction)%(TypeName)sSortedIndex_count, METH_VARARGS | METH_KEYWORDS,
+     "count(lower, upper), returns the number of values in [lower, upper]"},
+    {"range", (PyCFunction)%(TypeName)sSortedIndex_range, METH_VARARGS | METH_KEYWORDS,
+     "range(lower, upper), returns a list of the positions of the values in [lower, upper]"},
+    {"nearest", (PyCFunction)%(TypeName)sSortedIndex_nearest, METH_VARARGS | METH_KEYWORDS,
+     "nearest(value), returns the position of the nearest value"},
+    {"values", (PyCFunction)%(TypeName)sSortedIndex_values, METH_NOARGS,
+     "returns the values in sorted order as an array('d')"},
+    {NULL}  /* Sentinel */
+};
+
+static PySequenceMethods %(TypeName)sSortedIndex_as_sequence = {
+  (lenfunc) %(TypeName)sSortedIndex_length, // sq_length
+};
+
+
+PyTypeObject %(TypeName)sSortedIndexType = {
+  PyObject_HEAD_INIT(NULL)
+  0,                                        /* ob_size */
+  "%(TypeName)sSortedIndex",                /* tp_name */
+  sizeof(%(TypeName)sSortedIndex),          /* tp_basicsize */
+  0,                                        /* tp_itemsize */
+  (destructor) %(TypeName)sSortedIndex_dealloc, /* tp_dealloc */
+  0,                                        /* tp_print */
+  0,                                        /* tp_getattr */
+  0,                                        /* tp_setattr */
+  0,                                        /* tp_compare */
+  0,                                        /* tp_repr */
+  0,                                        /* tp_as_number */
+  &%(TypeName)sSortedIndex_as_sequence,     /* tp_as_sequence */
+  0,                                        /* tp_as_mapping */
+  PyObject_HashNotImplemented,              /* tp_hash */
+  0,                                        /* tp_call */
+  0,                                        /* tp_str */
+  0,                                        /* tp_getattro */
+  0,                                        /* tp_setattro */
+  0,                                        /* tp_as_buffer */
+  Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE, /* tp_flags */
+  "%(TypeName)sSortedIndex(buffer=None), a sorted index of a float64 buffer of %(TypeName)s values", /* tp_doc */
+  0,                                        /* tp_traverse */
+  0,                                        /* tp_clear */
+  0,                                        /* tp_richcompare */
+  0,                                        /* tp_weaklistoffset */
+  0,                                        /* tp_iter */
+  0,                                        /* tp_iternext */
+  %(TypeName)sSortedIndex_methods,          /* tp_methods */
+  0,                                        /* tp_members */
+  0,                                        /* tp_getset */
+  0,                                        /* tp_base */
+  0,                                        /* tp_dict */
+  0,                                        /* tp_descr_get */
+  0,                                        /* tp_descr_set */
+  0,                                        /* tp_dictoffset */
+  (initproc) %(TypeName)sSortedIndex_init,  /* tp_init */
+  0,                                        /* tp_alloc */
+  %(TypeName)sSortedIndex_new,              /* tp_new */
+};
+
+"""
+
+
+
+module_init = """
+// --------------------------
+// ----- module methods -----
+// --------------------------
+
+// -----------------------------
+// ----- batch dispatchers -----
+// -----------------------------
+
+// Module functions take either a float, and return a float, or a
+// float64 buffer and return a float64 buffer. The result is written
+// to the optional out buffer, which may be the input buffer, or to a
+// new array.array('d').
+
+typedef double (*ScalarFunction)(const double&);
+typedef void (*BatchFunction)(const double*, double*, const size_t&);
+
+static PyObject* unaryFunction(PyObject* args, PyObject* kwds,
+			       ScalarFunction a_scalar, BatchFunction a_batch) {
+
+  PyObject* a_value(NULL);
+  PyObject* an_out(NULL);
+
+  static char* kwlist[] = {sValueStr, sOutStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|O", kwlist, &a_value, &an_out))
+    return NULL;
+
+  if (!isBuffer(a_value)) {
+    double d_value(PyFloat_AsDouble(a_value));
+    if (d_value == -1 && PyErr_Occurred())
+      return NULL;
+    return PyFloat_FromDouble(a_scalar(d_value));
+  }
+
+  DoubleBuffer values;
+  if (values.acquire(a_value, false) < 0)
+    return NULL;
+
+  DoubleBuffer out;
+  double* out_data(NULL);
+  PyObject* result(batchOutput(an_out, values.size(), out, &out_data));
+  if (result == NULL)
+    return NULL;
+
+  {
+    AllowThreads allow(values.pinned() && out.pinned());
+    a_batch(values.data(), out_data, values.size());
+  }
+
+  return result;
+}
+
+
+// -------------------
+// ----- deg2rad -----
+// -------------------
+
+PyDoc_STRVAR(angles_deg2rad__doc__, "converts degrees into radians, deg2rad(value or buffer, out=None)");
+
+static PyObject* deg2rad(PyObject* self, PyObject* args, PyObject* kwds) {
+  return unaryFunction(args, kwds, Angles::Angle::deg2rad, Angles::deg2rad);
+}
+
+
+// -------------------
+// ----- rad2deg -----
+// -------------------
+
+PyDoc_STRVAR(angles_rad2deg__doc__, "converts radians into degrees, rad2deg(value or buffer, out=None)");
+
+static PyObject* rad2deg(PyObject* self, PyObject* args, PyObject* kwds) {
+  return unaryFunction(args, kwds, Angles::Angle::rad2deg, Angles::rad2deg);
+}
+
+
+// ---------------------
+// ----- normalize -----
+// ---------------------
+
+PyDoc_STRVAR(angles_normalize__doc__,
+	     "normalizes angles, normalize(value or buffer, wrap=WRAP_0_360, out=None)."
+	     " wrap is one of WRAP_0_360, WRAP_180 or WRAP_0_24");
+
+static PyObject* normalize(PyObject* self, PyObject* args, PyObject* kwds) {
+
+  PyObject* a_value(NULL);
+  int a_wrap(Angles::WRAP_0_360);
+  PyObject* an_out(NULL);
+
+  static char* kwlist[] = {sValueStr, sWrapStr, sOutStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|iO", kwlist, &a_value, &a_wrap, &an_out))
+    return NULL;
+
+  Angles::Wrap wrap;
+  if (toWrap(a_wrap, &wrap) < 0)
+    return NULL;
+
+  if (!isBuffer(a_value)) {
+    double d_value(PyFloat_AsDouble(a_value));
+    if (d_value == -1 && PyErr_Occurred())
+      return NULL;
+    return PyFloat_FromDouble(Angles::normalize(d_value, wrap));
+  }
+
+  DoubleBuffer values;
+  if (values.acquire(a_value, false) < 0)
+    return NULL;
+
+  DoubleBuffer out;
+  double* out_data(NULL);
+  PyObject* result(batchOutput(an_out, values.size(), out, &out_data));
+  if (result == NULL)
+    return NULL;
+
+  {
+    AllowThreads allow(values.pinned() && out.pinned());
+    Angles::normalize(values.data(), out_data, values.size(), wrap);
+  }
+
+  return result;
+}
+
+
+// ---------------------------
+// ----- degrees2seconds -----
+// ---------------------------
+
+PyDoc_STRVAR(angles_degrees2seconds__doc__,
+	     "converts degrees, minutes and seconds into seconds,"
+	     " degrees2seconds(degrees, minutes=0, seconds=0, out=None)."
+	     " Takes floats or float64 buffers of the same size");
+
+static PyObject* degrees2seconds(PyObject* self, PyObject* args, PyObject* kwds) {
+
+  PyObject* some_degrees(NULL);
+  PyObject* some_minutes(NULL);
+  PyObject* some_seconds(NULL);
+  PyObject* an_out(NULL);
+
+  static char* kwlist[] = {sDegreeStr, sMinuteStr, sSecondStr, sOutStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|OOO", kwlist,
+				   &some_degrees, &some_minutes, &some_seconds, &an_out))
+    return NULL;
+
+  if (!isBuffer(some_degrees)) {
+    double degrees(0);
+    double minutes(0);
+    double seconds(0);
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "d|ddO", kwlist, &degrees, &minutes, &seconds, &an_out))
+      return NULL;
+    return PyFloat_FromDouble(Angles::degrees2seconds(degrees, minutes, seconds));
+  }
+
+  if (some_minutes == NULL || some_seconds == NULL) {
+    PyErr_SetString(sAngleException, "minutes and seconds buffers are required with a degrees buffer");
+    return NULL;
+  }
+
+  DoubleBuffer degrees;
+  DoubleBuffer minutes;
+  DoubleBuffer seconds;
+
+  if (degrees.acquire(some_degrees, false) < 0 ||
+      minutes.acquire(some_minutes, false) < 0 ||
+      seconds.acquire(some_seconds, false) < 0)
+    return NULL;
+
+  if (minutes.size() != degrees.size() || seconds.size() != degrees.size()) {
+    PyErr_SetString(sAngleException, "buffer sizes do not match");
+    return NULL;
+  }
+
+  DoubleBuffer out;
+  double* out_data(NULL);
+  PyObject* result(batchOutput(an_out, degrees.size(), out, &out_data));
+  if (result == NULL)
+    return NULL;
+
+  {
+    AllowThreads allow(degrees.pinned() && minutes.pinned() && seconds.pinned() && out.pinned());
+    Angles::degrees2seconds(degrees.data(), minutes.data(), seconds.data(), out_data, degrees.size());
+  }
+
+  return result;
+}
+
+
+// -------------------
+// ----- parsing -----
+// -------------------
+
+PyDoc_STRVAR(angles_parseAngle__doc__,
+	     "parses an angle string, e.g. '12:30:45.6', '12h30m45.6s',"
+	     " '+45d30m15s' or '-45.5', into a float. Raises angles.Error on a bad string");
+
+static PyObject* parseAngle(PyObject* self, PyObject* args) {
+
+  PyObject* a_string(NULL);
+
+  if (!PyArg_ParseTuple(args, "O", &a_string))
+    return NULL;
+
+  if (!PyString_Check(a_string) && !PyUnicode_Check(a_string)) {
+    PyErr_SetString(sAngleException, "parseAngle needs a string");
+    return NULL;
+  }
+
+  double a_value(0);
+  if (toValue(a_string, &a_value) < 0)
+    return NULL;
+
+  return PyFloat_FromDouble(a_value);
+}
+
+
+PyDoc_STRVAR(angles_parseAngles__doc__,
+	     "parses a string or byte buffer of delimited angle strings,"
+	     " parseAngles(buffer, delimiter='\\\\n'). Returns an array('d') of values"
+	     " and a bytearray error mask, 1 for each bad field, whose value is nan");
+
+static PyObject* parseAngles(PyObject* self, PyObject* args, PyObject* kwds) {
+
+  PyObject* some_text(NULL);
+  char a_delimiter('\\n');
+
+  static char* kwlist[] = {sBufferStr, sDelimiterStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|c", kwlist, &some_text, &a_delimiter))
+    return NULL;
+
+  // str, bytearray, mmap, ... are used in place. unicode is encoded.
+  if (PyUnicode_Check(some_text))
+    some_text = PyUnicode_AsUTF8String(some_text);
+  else
+    Py_INCREF(some_text);
+  if (some_text == NULL)
+    return NULL;
+
+  const char* a_buffer(NULL);
+  Py_ssize_t a_size(0);
+  if (PyObject_AsCharBuffer(some_text, &a_buffer, &a_size) < 0) {
+    Py_DECREF(some_text);
+    return NULL;
+  }
+
+  size_t a_count(Angles::countFields(a_buffer, a_size, a_delimiter));
+
+  double* values_data(NULL);
+  PyObject* values(newDoubleArray(a_count, &values_data));
+  PyObject* errors(PyByteArray_FromStringAndSize(NULL, a_count));
+
+  PyObject* result(NULL);
+
+  if (values != NULL && errors != NULL) {
+    Angles::parseAngles(a_buffer, a_size, values_data,
+			(unsigned char*)PyByteArray_AS_STRING(errors), a_delimiter);
+    result = PyTuple_Pack(2, values, errors);
+  }
+
+  Py_XDECREF(values);
+  Py_XDECREF(errors);
+  Py_DECREF(some_text);
+  return result;
+}
+
+
+// ----------------------
+// ----- formatting -----
+// ----------------------
+
+// Formats a whole buffer of values into one string, each value
+// followed by the delimiter. The text is written straight into the
+// new string object.
+
+typedef size_t (*BulkFormatter)(const double*, const size_t&, char*, const size_t&, const int&, const char&);
+
+static PyObject* formatValues(PyObject* args, PyObject* kwds, BulkFormatter a_formatter) {
+
+  PyObject* some_values(NULL);
+  int a_precision(6);
+  char a_delimiter('\\n');
+
+  static char* kwlist[] = {sValueStr, sPrecisionStr, sDelimiterStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|ic", kwlist, &some_values, &a_precision, &a_delimiter))
+    return NULL;
+
+  if (a_precision < 0 || a_precision > 17) {
+    PyErr_SetString(sAngleException, "precision must be between 0 and 17");
+    return NULL;
+  }
+
+  DoubleBuffer values;
+  if (values.acquire(some_values, false) < 0)
+    return NULL;
+
+  // room for the terminating null too
+  size_t a_size(values.size() * Angles::MAX_SEXAGESIMAL_STRING + 1);
+
+  PyObject* result(PyString_FromStringAndSize(NULL, a_size));
+  if (result == NULL)
+    return NULL;
+
+  size_t length(a_formatter(values.data(), values.size(), PyString_AS_STRING(result), a_size,
+			    a_precision, a_delimiter));
+
+  if (_PyString_Resize(&result, length) < 0)
+    return NULL;
+
+  return result;
+}
+
+PyDoc_STRVAR(angles_values2DMSString__doc__,
+	     "formats a float64 buffer of degrees as one string,"
+	     " values2DMSString(buffer, precision=6, delimiter='\\\\n')");
+
+static PyObject* values2DMSString(PyObject* self, PyObject* args, PyObject* kwds) {
+  return formatValues(args, kwds, Angles::values2DMSString);
+}
+
+PyDoc_STRVAR(angles_values2HMSString__doc__,
+	     "formats a float64 buffer of hours as one string,"
+	     " values2HMSString(buffer, precision=6, delimiter='\\\\n')");
+
+static PyObject* values2HMSString(PyObject* self, PyObject* args, PyObject* kwds) {
+  return formatValues(args, kwds, Angles::values2HMSString);
+}
+
+
+// ----------------------
+// ----- arithmetic -----
+// ----------------------
+
+// Element-wise arithmetic. Either operand may be a float64 buffer or a
+// float, e.g. add(values, 0.5) or subtract(360.0, values), so there is
+// no per element object. Two buffers must be the same size. Two floats
+// return a float.
+
+typedef void (*ArrayArrayKernel)(const double*, const double*, double*, const size_t&);
+typedef void (*ArrayScalarKernel)(const double*, const double&, double*, const size_t&);
+typedef void (*ScalarArrayKernel)(const double&, const double*, double*, const size_t&);
+
+static PyObject* binaryFunction(PyObject* args, PyObject* kwds,
+				ArrayArrayKernel an_array_array,
+				ArrayScalarKernel an_array_scalar,
+				ScalarArrayKernel a_scalar_array) {
+
+  PyObject* a_lhs(NULL);
+  PyObject* a_rhs(NULL);
+  PyObject* an_out(NULL);
+
+  static char* kwlist[] = {sLhsStr, sRhsStr, sOutStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "OO|O", kwlist, &a_lhs, &a_rhs, &an_out))
+    return NULL;
+
+  DoubleBuffer lhs_values;
+  DoubleBuffer rhs_values;
+  double lhs(0);
+  double rhs(0);
+
+  if (isBuffer(a_lhs)) {
+    if (lhs_values.acquire(a_lhs, false) < 0)
+      return NULL;
+  } else {
+    lhs = PyFloat_AsDouble(a_lhs);
+    if (lhs == -1 && PyErr_Occurred())
+      return NULL;
+  }
+
+  if (isBuffer(a_rhs)) {
+    if (rhs_values.acquire(a_rhs, false) < 0)
+      return NULL;
+  } else {
+    rhs = PyFloat_AsDouble(a_rhs);
+    if (rhs == -1 && PyErr_Occurred())
+      return NULL;
+  }
+
+  if (!isBuffer(a_lhs) && !isBuffer(a_rhs)) {
+    double result(0);
+    try {
+      an_array_scalar(&lhs, rhs, &result, 1);
+    } catch (Angles::Error& err) {
+      PyErr_SetString(sAngleException, err.what());
+      return NULL;
+    }
+    return PyFloat_FromDouble(result);
+  }
+
+  if (isBuffer(a_lhs) && isBuffer(a_rhs) && lhs_values.size() != rhs_values.size()) {
+    PyErr_SetString(sAngleException, "buffer sizes do not match");
+    return NULL;
+  }
+
+  Py_ssize_t a_size(isBuffer(a_lhs) ? lhs_values.size() : rhs_values.size());
+
+  DoubleBuffer out;
+  double* out_data(NULL);
+  PyObject* result(batchOutput(an_out, a_size, out, &out_data));
+  if (result == NULL)
+    return NULL;
+
+  try {
+    AllowThreads allow(lhs_values.pinned() && rhs_values.pinned() && out.pinned());
+    if (!isBuffer(a_rhs))
+      an_array_scalar(lhs_values.data(), rhs, out_data, a_size);
+    else if (!isBuffer(a_lhs))
+      a_scalar_array(lhs, rhs_values.data(), out_data, a_size);
+    else
+      an_array_array(lhs_values.data(), rhs_values.data(), out_data, a_size);
+  } catch (Angles::Error& err) {
+    Py_DECREF(result);
+    PyErr_SetString(sAngleException, err.what());
+    return NULL;
+  }
+
+  return result;
+}
+
+
+PyDoc_STRVAR(angles_add__doc__, "element-wise lhs + rhs, add(buffer or float, buffer or float, out=None)");
+
+static PyObject* add(PyObject* self, PyObject* args, PyObject* kwds) {
+  return binaryFunction(args, kwds, Angles::add, Angles::add, Angles::add);
+}
+
+PyDoc_STRVAR(angles_subtract__doc__, "element-wise lhs - rhs, subtract(buffer or float, buffer or float, out=None)");
+
+static PyObject* subtract(PyObject* self, PyObject* args, PyObject* kwds) {
+  return binaryFunction(args, kwds, Angles::subtract, Angles::subtract, Angles::subtract);
+}
+
+PyDoc_STRVAR(angles_multiply__doc__, "element-wise lhs * rhs, multiply(buffer or float, buffer or float, out=None)");
+
+static PyObject* multiply(PyObject* self, PyObject* args, PyObject* kwds) {
+  return binaryFunction(args, kwds, Angles::multiply, Angles::multiply, Angles::multiply);
+}
+
+PyDoc_STRVAR(angles_divide__doc__,
+	     "element-wise lhs / rhs, divide(buffer or float, buffer or float, out=None)."
+	     " Raises angles.Error, and leaves out unchanged, if any rhs is zero");
+
+static PyObject* divide(PyObject* self, PyObject* args, PyObject* kwds) {
+  return binaryFunction(args, kwds, Angles::divide, Angles::divide, Angles::divide);
+}
+
+
+// ----------------------
+// ----- separation -----
+// ----------------------
+
+// A position is a right ascension and declination, both angles or
+// floats, or both float64 buffers of the same size. Returns 1 for
+// buffers, 0 for values and -1 on error.
+static int toPosition(PyObject* a_ra, PyObject* a_dec,
+		      DoubleBuffer& some_ras, DoubleBuffer& some_decs,
+		      double* an_ra, double* a_dec_value) {
+
+  if (isBuffer(a_ra) != isBuffer(a_dec)) {
+    PyErr_SetString(sAngleException, "ra and dec must both be buffers or both be values");
+    return -1;
+  }
+
+  if (isBuffer(a_ra)) {
+    if (some_ras.acquire(a_ra, false) < 0 || some_decs.acquire(a_dec, false) < 0)
+      return -1;
+    if (some_ras.size() != some_decs.size()) {
+      PyErr_SetString(sAngleException, "buffer sizes do not match");
+      return -1;
+    }
+    return 1;
+  }
+
+  int status(angleValue(a_ra, an_ra));
+  if (status > 0)
+    status = angleValue(a_dec, a_dec_value);
+  if (status == 0)
+    PyErr_SetString(PyExc_TypeError, "ra and dec must be angles, floats or float64 buffers");
+
+  return status > 0 ? 0 : -1;
+}
+
+
+PyDoc_STRVAR(angles_separation__doc__,
+	     "great circle distance in degrees, separation(ra1, dec1, ra2, dec2, out=None)."
+	     " ra in hours, dec in degrees, each position either angles or floats, or float64 buffers."
+	     " One position and a buffer of positions is one to many, two buffers of the same size pairwise");
+
+static PyObject* separation(PyObject* self, PyObject* args, PyObject* kwds) {
+
+  PyObject* a_ra1(NULL);
+  PyObject* a_dec1(NULL);
+  PyObject* a_ra2(NULL);
+  PyObject* a_dec2(NULL);
+  PyObject* an_out(NULL);
+
+  static char* kwlist[] = {sRa1Str, sDec1Str, sRa2Str, sDec2Str, sOutStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "OOOO|O", kwlist,
+				   &a_ra1, &a_dec1, &a_ra2, &a_dec2, &an_out))
+    return NULL;
+
+  DoubleBuffer ras1;
+  DoubleBuffer decs1;
+  DoubleBuffer ras2;
+  DoubleBuffer decs2;
+  double ra1(0);
+  double dec1(0);
+  double ra2(0);
+  double dec2(0);
+
+  int are_buffers1(toPosition(a_ra1, a_dec1, ras1, decs1, &ra1, &dec1));
+  if (are_buffers1 < 0)
+    return NULL;
+
+  int are_buffers2(toPosition(a_ra2, a_dec2, ras2, decs2, &ra2, &dec2));
+  if (are_buffers2 < 0)
+    return NULL;
+
+  if (!are_buffers1 && !are_buffers2)
+    return PyFloat_FromDouble(Angles::separation(ra1, dec1, ra2, dec2));
+
+  if (are_buffers1 && are_buffers2 && ras1.size() != ras2.size()) {
+    PyErr_SetString(sAngleException, "buffer sizes do not match");
+    return NULL;
+  }
+
+  Py_ssize_t a_size(are_buffers1 ? ras1.size() : ras2.size());
+
+  DoubleBuffer out;
+  double* out_data(NULL);
+  PyObject* result(batchOutput(an_out, a_size, out, &out_data));
+  if (result == NULL)
+    return NULL;
+
+  // separation is symmetric, so one to many covers many to one too
+  {
+    AllowThreads allow(ras1.pinned() && decs1.pinned() && ras2.pinned() && decs2.pinned() && out.pinned());
+    if (!are_buffers1)
+      Angles::separation(ra1, dec1, ras2.data(), decs2.data(), out_data, a_size);
+    else if (!are_buffers2)
+      Angles::separation(ra2, dec2, ras1.data(), decs1.data(), out_data, a_size);
+    else
+      Angles::separation(ras1.data(), decs1.data(), ras2.data(), decs2.data(), out_data, a_size);
+  }
+
+  return result;
+}
+
+
+// ----------------------
+// ----- horizontal -----
+// ----------------------
+
+PyDoc_STRVAR(angles_horizontal__doc__,
+	     "altitude and azimuth in degrees, horizontal(latitude, lst, ra, dec, altitude=None, azimuth=None)."
+	     " latitude in degrees, local sidereal time in hours, angles or floats. ra and dec are a position,"
+	     " for an (altitude, azimuth) tuple of floats, or float64 buffers for a tuple of arrays."
+	     " Azimuth is from north through east");
+
+static PyObject* horizontal(PyObject* self, PyObject* args, PyObject* kwds) {
+
+  PyObject* a_latitude(NULL);
+  PyObject* a_lst(NULL);
+  PyObject* a_ra(NULL);
+  PyObject* a_dec(NULL);
+  PyObject* an_altitude(NULL);
+  PyObject* an_azimuth(NULL);
+
+  static char* kwlist[] = {sLatitudeStr, sLstStr, sRaStr, sDecStr, sAltitudeStr, sAzimuthStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "OOOO|OO", kwlist,
+				   &a_latitude, &a_lst, &a_ra, &a_dec, &an_altitude, &an_azimuth))
+    return NULL;
+
+  double latitude(0);
+  double lst(0);
+
+  if (angleValue(a_latitude, &latitude) <= 0 || angleValue(a_lst, &lst) <= 0) {
+    if (!PyErr_Occurred())
+      PyErr_SetString(PyExc_TypeError, "latitude and lst must be angles, floats or ints");
+    return NULL;
+  }
+
+  DoubleBuffer some_ras;
+  DoubleBuffer some_decs;
+  double ra(0);
+  double dec(0);
+
+  int are_buffers(toPosition(a_ra, a_dec, some_ras, some_decs, &ra, &dec));
+  if (are_buffers < 0)
+    return NULL;
+
+  if (!are_buffers) {
+    double altitude(0);
+    double azimuth(0);
+    Angles::horizontal(latitude, lst, ra, dec, altitude, azimuth);
+    return Py_BuildValue("dd", altitude, azimuth);
+  }
+
+  DoubleBuffer altitudes;
+  DoubleBuffer azimuths;
+  double* altitude_data(NULL);
+  double* azimuth_data(NULL);
+
+  PyObject* an_altitude_result(batchOutput(an_altitude, some_ras.size(), altitudes, &altitude_data));
+  if (an_altitude_result == NULL)
+    return NULL;
+
+  PyObject* an_azimuth_result(batchOutput(an_azimuth, some_ras.size(), azimuths, &azimuth_data));
+  if (an_azimuth_result == NULL) {
+    Py_DECREF(an_altitude_result);
+    return NULL;
+  }
+
+  {
+    AllowThreads allow(some_ras.pinned() && some_decs.pinned() && altitudes.pinned() && azimuths.pinned());
+    Angles::horizontal(latitude, lst, some_ras.data(), some_decs.data(),
+		       altitude_data, azimuth_data, some_ras.size());
+  }
+
+  PyObject* result(PyTuple_Pack(2, an_altitude_result, an_azimuth_result));
+  Py_DECREF(an_altitude_result);
+  Py_DECREF(an_azimuth_result);
+  return result;
+}
+
+
+PyDoc_STRVAR(angles_horizontalGrid__doc__,
+	     "altitudes and azimuths of every target from every observer,"
+	     " horizontalGrid(latitude, longitude, gst, ra, dec, altitude=None, azimuth=None)."
+	     " latitude and longitude, east positive, are float64 buffers of the observers in degrees,"
+	     " gst the Greenwich sidereal time in hours and ra and dec float64 buffers of the targets."
+	     " Returns a tuple of two arrays of one row of targets per observer");
+
+static PyObject* horizontalGrid(PyObject* self, PyObject* args, PyObject* kwds) {
+
+  PyObject* a_latitude(NULL);
+  PyObject* a_longitude(NULL);
+  PyObject* a_gst(NULL);
+  PyObject* a_ra(NULL);
+  PyObject* a_dec(NULL);
+  PyObject* an_altitude(NULL);
+  PyObject* an_azimuth(NULL);
+
+  static char* kwlist[] = {sLatitudeStr, sLongitudeStr, sGstStr, sRaStr, sDecStr,
+			   sAltitudeStr, sAzimuthStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "OOOOO|OO", kwlist, &a_latitude, &a_longitude,
+				   &a_gst, &a_ra, &a_dec, &an_altitude, &an_azimuth))
+    return NULL;
+
+  double gst(0);
+
+  if (angleValue(a_gst, &gst) <= 0) {
+    if (!PyErr_Occurred())
+      PyErr_SetString(PyExc_TypeError, "gst must be an angle, float or int");
+    return NULL;
+  }
+
+  DoubleBuffer some_latitudes;
+  DoubleBuffer some_longitudes;
+  DoubleBuffer some_ras;
+  DoubleBuffer some_decs;
+
+  if (some_latitudes.acquire(a_latitude, false) < 0 || some_longitudes.acquire(a_longitude, false) < 0 ||
+      some_ras.acquire(a_ra, false) < 0 || some_decs.acquire(a_dec, false) < 0)
+    return NULL;
+
+  if (some_latitudes.size() != some_longitudes.size() || some_ras.size() != some_decs.size()) {
+    PyErr_SetString(sAngleException, "buffer sizes do not match");
+    return NULL;
+  }
+
+  Py_ssize_t a_size(some_latitudes.size()*some_ras.size());
+
+  DoubleBuffer altitudes;
+  DoubleBuffer azimuths;
+  double* altitude_data(NULL);
+  double* azimuth_data(NULL);
+
+  PyObject* an_altitude_result(batchOutput(an_altitude, a_size, altitudes, &altitude_data));
+  if (an_altitude_result == NULL)
+    return NULL;
+
+  PyObject* an_azimuth_result(batchOutput(an_azimuth, a_size, azimuths, &azimuth_data));
+  if (an_azimuth_result == NULL) {
+    Py_DECREF(an_altitude_result);
+    return NULL;
+  }
+
+  {
+    AllowThreads allow(some_latitudes.pinned() && some_longitudes.pinned() &&
+		       some_ras.pinned() && some_decs.pinned() && altitudes.pinned() && azimuths.pinned());
+    Angles::horizontal(some_latitudes.data(), some_longitudes.data(), some_latitudes.size(), gst,
+		       some_ras.data(), some_decs.data(), some_ras.size(), altitude_data, azimuth_data);
+  }
+
+  PyObject* result(PyTuple_Pack(2, an_altitude_result, an_azimuth_result));
+  Py_DECREF(an_altitude_result);
+  Py_DECREF(an_azimuth_result);
+  return result;
+}
+
+// ---------------
+// ----- HTM -----
+// ---------------
+
+PyDoc_STRVAR(angles_htmId__doc__,
+	     "the Hierarchical Triangular Mesh trixel id of a position, htmId(ra, dec, depth=12)."
+	     " ra in hours and dec in degrees, angles or floats, or float64 buffers for a list of ids");
+
+static PyObject* htmId(PyObject* self, PyObject* args, PyObject* kwds) {
+
+  PyObject* a_ra(NULL);
+  PyObject* a_dec(NULL);
+  int a_depth(12);
+
+  static char* kwlist[] = {sRaStr, sDecStr, sDepthStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "OO|i", kwlist, &a_ra, &a_dec, &a_depth))
+    return NULL;
+
+  DoubleBuffer some_ras;
+  DoubleBuffer some_decs;
+  double ra(0);
+  double dec(0);
+
+  int are_buffers(toPosition(a_ra, a_dec, some_ras, some_decs, &ra, &dec));
+  if (are_buffers < 0)
+    return NULL;
+
+  try {
+
+    if (!are_buffers)
+      return PyLong_FromUnsignedLongLong(Angles::htmId(ra, dec, a_depth));
+
+    std::vector<uint64_t> some_ids(some_ras.size());
+    {
+      AllowThreads allow(some_ras.pinned() && some_decs.pinned());
+      Angles::htmIds(some_ras.data(), some_decs.data(), some_ids.empty() ? NULL : &some_ids[0],
+		     some_ids.size(), a_depth);
+    }
+
+    PyObject* result(PyList_New(some_ids.size()));
+    if (result == NULL)
+      return NULL;
+
+    for (size_t i = 0; i < some_ids.size(); ++i) {
+      PyObject* an_id(PyLong_FromUnsignedLongLong(some_ids[i]));
+      if (an_id == NULL) {
+	Py_DECREF(result);
+	return NULL;
+      }
+      PyList_SET_ITEM(result, i, an_id);
+    }
+
+    return result;
+
+  } catch (Angles::Error& err) {
+    PyErr_SetString(sAngleException, err.what());
+    return NULL;
+  }
+}
+
+
+PyDoc_STRVAR(angles_htmName__doc__, "the name of a trixel id, e.g. htmName(15) is 'N3'");
+
+static PyObject* htmName(PyObject* self, PyObject* args, PyObject* kwds) {
+
+  unsigned PY_LONG_LONG an_id(0);
+
+  static char* kwlist[] = {sIdStr, NULL};
+
+  if (!PyArg_ParseTupleAndKeywords(args, kwds, "K", kwlist, &an_id))
+    return NULL;
+
+  try {
+    return PyString_FromString(Angles::htmName(an_id).c_str());
+  } catch (Angles::Error& err) {
+    PyErr_SetString(sAngleException, err.what());
+    return NULL;
+  }
+}
+
+
+// -------------------
+// ----- threads -----
+// -------------------
+
+// The batch functions release the GIL while they run, when their
+// buffers are new style, e.g. numpy arrays or memoryviews, and split
+// arrays of at least the parallel threshold across a pool of threads,
+// see parallel.h.
+
+PyDoc_STRVAR(angles_getThreads__doc__, "the number of threads batch functions split large arrays across");
+
+static PyObject* getThreads(PyObject* self) {
+  return PyInt_FromSize_t(Angles::threads());
+}
+
+PyDoc_STRVAR(angles_setThreads__doc__,
+	     "setThreads(threads), 1 for none, 0 for the default, the number of processors online");
+
+static PyObject* setThreads(PyObject* self, PyObject* args) {
+  int a_threads(0);
+  if (!PyArg_ParseTuple(args, "i", &a_threads))
+    return NULL;
+  if (a_threads < 0) {
+    PyErr_SetString(sAngleException, "minimum exceeded");
+    return NULL;
+  }
+  Angles::setThreads(a_threads);
+  Py_RETURN_NONE;
+}
+
+PyDoc_STRVAR(angles_getParallelThreshold__doc__,
+	     "the size of the smallest array that batch functions split across threads");
+
+static PyObject* getParallelThreshold(PyObject* self) {
+  return PyInt_FromSize_t(Angles::parallelThreshold());
+}
+
+PyDoc_STRVAR(angles_setParallelThreshold__doc__, "setParallelThreshold(size)");
+
+static PyObject* setParallelThreshold(PyObject* self, PyObject* args) {
+  Py_ssize_t a_threshold(0);
+  if (!PyArg_ParseTuple(args, "n", &a_threshold))
+    return NULL;
+  if (a_threshold < 0) {
+    PyErr_SetString(sAngleException, "minimum exceeded");
+    return NULL;
+  }
+  Angles::setParallelThreshold(a_threshold);
+  Py_RETURN_NONE;
+}
+
+
+// ---------------------
+// ----- free list -----
+// ---------------------
+
+PyDoc_STRVAR(angles_freeListStats__doc__,
+	     "returns a dict of type name to the size, hits and misses of its free list of result objects");
+
+static PyObject* freeListStats(PyObject* self) {
+
+  PyObject* result(PyDict_New());
+  if (result == NULL)
+    return NULL;
+
+  for (const FreeList* a_list = FreeList::first(); a_list != NULL; a_list = a_list->next()) {
+    PyObject* some_stats(a_list->stats());
+    if (some_stats == NULL || PyDict_SetItemString(result, a_list->name(), some_stats) < 0) {
+      Py_XDECREF(some_stats);
+      Py_DECREF(result);
+      return NULL;
+    }
+    Py_DECREF(some_stats);
+  }
+
+  return result;
+}
+
+
+PyDoc_STRVAR(angles_clearFreeLists__doc__,
+	     "frees the cached result objects and resets the free list counters");
+
+static PyObject* clearFreeLists(PyObject* self) {
+  for (FreeList* a_list = FreeList::first(); a_list != NULL; a_list = a_list->next())
+    a_list->clear();
+  Py_RETURN_NONE;
+}
+
+
+// -----------------------
+// ----- method list -----
+// -----------------------
+
+PyMethodDef angles_module_methods[] = {
+  {"deg2rad", (PyCFunction) deg2rad, METH_VARARGS | METH_KEYWORDS, angles_deg2rad__doc__},
+  {"rad2deg", (PyCFunction) rad2deg, METH_VARARGS | METH_KEYWORDS, angles_rad2deg__doc__},
+  {"normalize", (PyCFunction) normalize, METH_VARARGS | METH_KEYWORDS, angles_normalize__doc__},
+  {"degrees2seconds", (PyCFunction) degrees2seconds, METH_VARARGS | METH_KEYWORDS, angles_degrees2seconds__doc__},
+  {"parseAngle", (PyCFunction) parseAngle, METH_VARARGS, angles_parseAngle__doc__},
+  {"parseAngles", (PyCFunction) parseAngles, METH_VARARGS | METH_KEYWORDS, angles_parseAngles__doc__},
+  {"values2DMSString", (PyCFunction) values2DMSString, METH_VARARGS | METH_KEYWORDS, angles_values2DMSString__doc__},
+  {"values2HMSString", (PyCFunction) values2HMSString, METH_VARARGS | METH_KEYWORDS, angles_values2HMSString__doc__},
+  {"add", (PyCFunction) add, METH_VARARGS | METH_KEYWORDS, angles_add__doc__},
+  {"subtract", (PyCFunction) subtract, METH_VARARGS | METH_KEYWORDS, angles_subtract__doc__},
+  {"multiply", (PyCFunction) multiply, METH_VARARGS | METH_KEYWORDS, angles_multiply__doc__},
+  {"divide", (PyCFunction) divide, METH_VARARGS | METH_KEYWORDS, angles_divide__doc__},
+  {"separation", (PyCFunction) separation, METH_VARARGS | METH_KEYWORDS, angles_separation__doc__},
+  {"horizontal", (PyCFunction) horizontal, METH_VARARGS | METH_KEYWORDS, angles_horizontal__doc__},
+  {"horizontalGrid", (PyCFunction) horizontalGrid, METH_VARARGS | METH_KEYWORDS, angles_horizontalGrid__doc__},
+  {"htmId", (PyCFunction) htmId, METH_VARARGS | METH_KEYWORDS, angles_htmId__doc__},
+  {"htmName", (PyCFunction) htmName, METH_VARARGS | METH_KEYWORDS, angles_htmName__doc__},
+  {"writeBinaryCatalogue", (PyCFunction) writeBinaryCatalogue, METH_VARARGS | METH_KEYWORDS,
+   angles_writeBinaryCatalogue__doc__},
+  {"dumps", (PyCFunction) dumps, METH_VARARGS | METH_KEYWORDS, angles_dumps__doc__},
+  {"loads", (PyCFunction) loads, METH_VARARGS | METH_KEYWORDS, angles_loads__doc__},
+  {"getThreads", (PyCFunction) getThreads, METH_NOARGS, angles_getThreads__doc__},
+  {"setThreads", (PyCFunction) setThreads, METH_VARARGS, angles_setThreads__doc__},
+  {"getParallelThreshold", (PyCFunction) getParallelThreshold, METH_NOARGS, angles_getParallelThreshold__doc__},
+  {"setParallelThreshold", (PyCFunction) setParallelThreshold, METH_VARARGS, angles_setParallelThreshold__doc__},
+  {"freeListStats", (PyCFunction) freeListStats, METH_NOARGS, angles_freeListStats__doc__},
+  {"clearFreeLists", (PyCFunction) clearFreeLists, METH_NOARGS, angles_clearFreeLists__doc__},
+  {NULL, NULL}  /* Sentinel */
+};
+
+
+// ------------------------------
+// ----- init angles module -----
+// ------------------------------
+
+// PyMODINIT_FUNC declares extern "C" too.
+PyMODINIT_FUNC initangles(void) {
+
+  PyObject* m(Py_InitModule3("angles", angles_module_methods, "python wrappers for angle objects."));
+
+  // error
+  char eMsgStr[] = "angles.Error";
+  sAngleException = PyErr_NewException(eMsgStr, NULL, NULL);
+  Py_INCREF(sAngleException);
+  PyModule_AddObject(m, "Error", sAngleException);
+
+  // normalize wrap conventions
+  PyModule_AddIntConstant(m, "WRAP_0_360", Angles::WRAP_0_360);
+  PyModule_AddIntConstant(m, "WRAP_180", Angles::WRAP_180);
+  PyModule_AddIntConstant(m, "WRAP_0_24", Angles::WRAP_0_24);
+
+  // range status codes
+  PyModule_AddIntConstant(m, "SUCCESS", Angles::SUCCESS);
+  PyModule_AddIntConstant(m, "MINIMUM_EXCEEDED", Angles::MINIMUM_EXCEEDED);
+  PyModule_AddIntConstant(m, "MAXIMUM_EXCEEDED", Angles::MAXIMUM_EXCEEDED);
+  PyModule_AddIntConstant(m, "DIVIDE_BY_ZERO", Angles::DIVIDE_BY_ZERO);
+
+  // out of range policies
+  PyModule_AddIntConstant(m, "POLICY_RAISE", Angles::POLICY_RAISE);
+  PyModule_AddIntConstant(m, "POLICY_WRAP", Angles::POLICY_WRAP);
+  PyModule_AddIntConstant(m, "POLICY_CLAMP", Angles::POLICY_CLAMP);
+  PyModule_AddIntConstant(m, "POLICY_NAN", Angles::POLICY_NAN);
+
+  // deepest HTM trixels, about 20 milliarcseconds across
+  PyModule_AddIntConstant(m, "MAX_HTM_DEPTH", Angles::MAX_HTM_DEPTH);
+
+  // array.array for batch results
+  PyObject* array_module(PyImport_ImportModule("array"));
+  if (array_module == NULL)
+    return;
+  sArrayType = PyObject_GetAttrString(array_module, "array");
+  Py_DECREF(array_module);
+  if (sArrayType == NULL)
+    return;
+
+"""
+
+module_type_init = """
+
+  if (PyType_Ready(&%(TypeName)sType) < 0)
+    return;
+  Py_INCREF(&%(TypeName)sType);
+  PyModule_AddObject(m, "%(TypeName)s", (PyObject *)&%(TypeName)sType);
+
+"""
+
+# ================
+# ===== main =====
+# ================
+
+if __name__ == '__main__':
+
+    angle_classes = list()
+    angle_classes.append({'TypeName': 'Angle', 'Sexagesimal': 'DMS', 'PackType': 'PACK_ANGLE'})
+
+    angle_templates = list()
+    angle_templates.append({'TypeName': 'LimitedRangeAngle', 'Sexagesimal': 'DMS',
+                            'PackType': 'PACK_LIMITED_RANGE_ANGLE'})
+    angle_templates.append({'TypeName': 'Declination', 'Sexagesimal': 'DMS', 'PackType': 'PACK_DECLINATION'})
+    angle_templates.append({'TypeName': 'Latitude', 'Sexagesimal': 'DMS', 'PackType': 'PACK_LATITUDE'})
+    angle_templates.append({'TypeName': 'Longitude', 'Sexagesimal': 'DMS', 'PackType': 'PACK_LONGITUDE'})
+    angle_templates.append({'TypeName': 'RA', 'Sexagesimal': 'HMS', 'PackType': 'PACK_RA'})
+
+    fixed_angles = list()
+    fixed_angles.append({'TypeName': 'MilliarcsecondAngle', 'CountType': 'int32_t',
+                         'PackType': 'PACK_MILLIARCSECOND_ANGLE'})
+    fixed_angles.append({'TypeName': 'MicroarcsecondAngle', 'CountType': 'int64_t',
+                         'PackType': 'PACK_MICROARCSECOND_ANGLE'})
+
+    flnm = 'angles.cpp'
+    afp = open(flnm, 'w')
+
+    afp.write(module_header)
+
+
+    for angle_class in angle_classes:
+        afp.write(angle_class_template % angle_class)
+
+    for angle_template in angle_templates:
+        afp.write(angle_template_template % angle_template)
+
+    for fixed_angle in fixed_angles:
+        afp.write(fixed_angle_template % fixed_angle)
+
+    afp.write(angle_value_header)
+
+    for angle_class in angle_classes + angle_templates + fixed_angles:
+        afp.write(angle_value_template % angle_class)
+
+    afp.write(angle_value_footer)
+
+    afp.write(packed_angle_header)
+
+    for angle_class in angle_classes + angle_templates:
+        afp.write(packed_angle_template % angle_class)
+
+    for fixed_angle in fixed_angles:
+        afp.write(packed_fixed_angle_template % fixed_angle)
+
+    afp.write(unpacked_angle_header)
+
+    for angle_class in angle_classes + angle_templates:
+        afp.write(unpacked_angle_template % angle_class)
+
+    for fixed_angle in fixed_angles:
+        afp.write(unpacked_fixed_angle_template % fixed_angle)
+
+    afp.write(packed_angle_footer)
+
+    afp.write(angle_index_class)
+
+    for angle_template in angle_templates:
+        afp.write(sorted_index_template % angle_template)
+
+    afp.write(htm_index_class)
+
+    afp.write(zone_index_class)
+
+    afp.write(catalogue_reader_class)
+
+    afp.write(binary_catalogue_class)
+
+    afp.write(shared_angle_array_class)
+
+
+    afp.write(module_init)
+
+    for angle_class in angle_classes:
         afp.write(module_type_init % angle_class)
 
     for angle_template in angle_templates:
         afp.write(module_type_init % angle_template)
 
+    for fixed_angle in fixed_angles:
+        afp.write(module_type_init % fixed_angle)
+
+    afp.write(module_type_init % {'TypeName': 'AngleIndex'})
+
+    for angle_template in angle_templates:
+        afp.write(module_type_init % {'TypeName': angle_template['TypeName'] + 'SortedIndex'})
+
+    afp.write(module_type_init % {'TypeName': 'HTMIndex'})
+
+    afp.write(module_type_init % {'TypeName': 'ZoneIndex'})
+
+    afp.write(module_type_init % {'TypeName': 'ConeSearch'})
+
+    afp.write(module_type_init % {'TypeName': 'CatalogueReader'})
+
+    afp.write(module_type_init % {'TypeName': 'BinaryCatalogue'})
+
+    afp.write(module_type_init % {'TypeName': 'BinaryCatalogueColumn'})
+
+    afp.write(module_type_init % {'TypeName': 'SharedAngleArray'})
+
     afp.write('\n}\n') # final brace
 
 
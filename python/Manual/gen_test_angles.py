@@ -11,9 +11,17 @@ which case the test should be investigated.
 
 \"\"\"
 
+import array
 import copy
 import math
+import multiprocessing
+import os
+import pickle
 import random
+import struct
+import sys
+import tempfile
+import threading
 import time
 import unittest
 
@@ -139,6 +147,29 @@ class TestAngle(unittest.TestCase):
         b = angles.Angle(20.6)
         self.assertFalse(b >= a)
 
+    # hash
+
+    def test_hash(self):
+        \"\"\"Test equal angles hash the same\"\"\"
+        a1 = angles.%(TypeName)s(self.rd1)
+        a2 = angles.%(TypeName)s(self.rd1)
+        self.assertEqual(hash(a1), hash(a2))
+        self.assertEqual(hash(a1.value), hash(a1))
+        self.assertEqual(hash(angles.%(TypeName)s(0)), hash(-angles.%(TypeName)s(0)))
+        a_dict = {a1: 'a1'}
+        self.assertEqual('a1', a_dict[a2])
+        self.assertEqual(1, len(set([a1, a2])))
+
+    def test_hash_is_exact(self):
+        \"\"\"Test keys are exact, like ==, and AngleIndex is to a quantum\"\"\"
+        a_mas = 1/3600000.0
+        a_dict = {angles.%(TypeName)s(1): 'a1'}
+        self.assertTrue(angles.%(TypeName)s(1) in a_dict)
+        self.assertFalse(angles.%(TypeName)s(1 + a_mas/4) in a_dict)
+        an_index = angles.AngleIndex(quantum=a_mas)
+        an_index[angles.%(TypeName)s(1)] = 'a1'
+        self.assertEqual('a1', an_index[angles.%(TypeName)s(1 + a_mas/4)])
+
     # constructors
 
     @unittest.skip('TODO Not yet available in Manual, but it is in Boost')
@@ -157,13 +188,31 @@ class TestAngle(unittest.TestCase):
         self.assertAlmostEqual(self.rd1, another_angle.value, self.places)
 
 
-    @unittest.skip('TODO: Not yet available')
     def test_deep_copy(self):
         \"\"\"Test deep copy\"\"\"
         an_angle = angles.Angle(self.rd1)
         another_angle = copy.deepcopy(an_angle)
         self.assertAlmostEqual(self.rd1, another_angle.value, self.places)
 
+    def test_copy(self):
+        \"\"\"Test copies are new objects with the same value\"\"\"
+        an_angle = angles.Angle(self.rd1)
+        a_value = an_angle.value
+        another_angle = copy.copy(an_angle)
+        self.assertFalse(another_angle is an_angle)
+        self.assertTrue(type(another_angle) is angles.Angle)
+        self.assertEqual(a_value, another_angle.value)
+        another_angle.value = 0
+        self.assertEqual(a_value, an_angle.value)
+
+    def test_pickle(self):
+        \"\"\"Test pickles restore the exact value\"\"\"
+        an_angle = angles.Angle(self.rd1)
+        for a_protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            another_angle = pickle.loads(pickle.dumps(an_angle, a_protocol))
+            self.assertTrue(type(another_angle) is angles.Angle)
+            self.assertEqual(an_angle.value, another_angle.value)
+
     def test_default_constructor(self):
         \"\"\"Test default constructor\"\"\"
         an_angle = angles.Angle()
@@ -188,6 +237,23 @@ class TestAngle(unittest.TestCase):
         self.assertEqual(-45.0, an_angle.value)
 
 
+    def test_construct_string(self):
+        \"\"\"Test construct from string\"\"\"
+        an_angle = angles.Angle('-44:59:60')
+        self.assertAlmostEqual(-45, an_angle.value, self.places)
+
+
+    def test_construct_strings(self):
+        \"\"\"Test construct from degrees, minutes and seconds strings\"\"\"
+        an_angle = angles.Angle('-44', '59', '60')
+        self.assertAlmostEqual(-45, an_angle.value, self.places)
+
+
+    def test_construct_string_error(self):
+        \"\"\"Test construct from bad string\"\"\"
+        self.assertRaises(angles.Error, angles.Angle, 'forty five')
+
+
     def test_mixed_sign_constructor_1(self):
         \"\"\"Test mixed sign constructor 1\"\"\"
         # divide 2 to keep in range
@@ -238,6 +304,18 @@ class TestAngle(unittest.TestCase):
         a1 += a2
         self.assertAlmostEqual(self.rd1 + self.rd2, a1.value, self.places)
 
+    def test_inplace_is_self(self):
+        \"\"\"Test inplace operators update the object\"\"\"
+        a1 = angles.Angle(self.rd1)
+        a0 = a1
+        a1 += angles.Angle(1)
+        a1 -= angles.Angle(1)
+        a1 *= angles.Angle(2)
+        a1 /= angles.Angle(2)
+        self.assertTrue(a0 is a1)
+        self.assertAlmostEqual(self.rd1, a0.value, self.places)
+        self.assertRaises(angles.Error, a1.__idiv__, angles.Angle(0))
+
     def test_angle_plus_angle(self):
         \"\"\"Test angle + angle\"\"\"
         a1 = angles.Angle(self.rd1)
@@ -315,6 +393,55 @@ class TestAngle(unittest.TestCase):
         self.assertRaises(angles.Error, lambda a, b: a / b, a1, a2)
 
 
+    def test_angle_and_float(self):
+        \"\"\"Test angle arithmetic with floats and ints\"\"\"
+        a1 = angles.Angle(self.rd1)
+        self.assertAlmostEqual(self.rd1 + 0.5, (a1 + 0.5).value, self.places)
+        self.assertAlmostEqual(0.5 + self.rd1, (0.5 + a1).value, self.places)
+        self.assertAlmostEqual(1 - self.rd1, (1 - a1).value, self.places)
+        self.assertAlmostEqual(2 * self.rd1, (2 * a1).value, self.places)
+        self.assertAlmostEqual(self.rd1 / 2, (a1 / 2).value, self.places)
+        self.assertTrue(isinstance(2L * a1, angles.Angle))
+        self.assertRaises(angles.Error, lambda a: a / 0, a1)
+        self.assertRaises(TypeError, lambda a: a + 'x', a1)
+
+    def test_inplace_float(self):
+        \"\"\"Test inplace arithmetic with floats\"\"\"
+        a1 = angles.Angle(self.rd1)
+        a0 = a1
+        a1 += 0.5
+        a1 *= 2
+        a1 -= 1
+        a1 /= 2.0
+        self.assertTrue(a0 is a1)
+        self.assertAlmostEqual(self.rd1, a1.value, self.places)
+        self.assertRaises(angles.Error, a1.__idiv__, 0)
+
+    # normalize
+
+    def test_normalize(self):
+        \"\"\"Test normalize\"\"\"
+        an_angle = angles.Angle(45 - 720)
+        an_angle.normalize()
+        self.assertAlmostEqual(45, an_angle.value, self.places)
+
+    def test_normalize_180(self):
+        \"\"\"Test normalize -180 to 180\"\"\"
+        an_angle = angles.Angle(-180)
+        an_angle.normalize(angles.WRAP_180)
+        self.assertEqual(180, an_angle.value)
+
+    def test_normalize_24(self):
+        \"\"\"Test normalize hours\"\"\"
+        an_angle = angles.Angle(-1)
+        an_angle.normalize(wrap=angles.WRAP_0_24)
+        self.assertAlmostEqual(23, an_angle.value, self.places)
+
+    def test_normalize_wrap_error(self):
+        \"\"\"Test normalize invalid wrap\"\"\"
+        an_angle = angles.Angle(self.rd1)
+        self.assertRaises(angles.Error, an_angle.normalize, 42)
+
    # strings
 
     def test_str(self):
@@ -330,6 +457,12 @@ class TestAngle(unittest.TestCase):
         a_repr = '''0* 0' 0\"'''
         self.assertEqual(a_repr, repr(an_angle))
 
+    def test_str_precision(self):
+        \"\"\"Test str precision\"\"\"
+        an_angle = angles.Angle(-53, 42, 23.6)
+        a_str = '''-53* 42' 23.6\"'''
+        self.assertEqual(a_str, str(an_angle))
+
 """ # end angle class template
 
 # ===================================
@@ -471,6 +604,29 @@ class Test%(TypeName)s(unittest.TestCase):
         b = angles.%(TypeName)s(6)
         self.assertFalse(b >= a)
 
+    # hash
+
+    def test_hash(self):
+        \"\"\"Test equal angles hash the same\"\"\"
+        a1 = angles.%(TypeName)s(self.rd1)
+        a2 = angles.%(TypeName)s(self.rd1)
+        self.assertEqual(hash(a1), hash(a2))
+        self.assertEqual(hash(a1.value), hash(a1))
+        self.assertEqual(hash(angles.%(TypeName)s(0)), hash(-angles.%(TypeName)s(0)))
+        a_dict = {a1: 'a1'}
+        self.assertEqual('a1', a_dict[a2])
+        self.assertEqual(1, len(set([a1, a2])))
+
+    def test_hash_is_exact(self):
+        \"\"\"Test keys are exact, like ==, and AngleIndex is to a quantum\"\"\"
+        a_mas = 1/3600000.0
+        a_dict = {angles.%(TypeName)s(1): 'a1'}
+        self.assertTrue(angles.%(TypeName)s(1) in a_dict)
+        self.assertFalse(angles.%(TypeName)s(1 + a_mas/4) in a_dict)
+        an_index = angles.AngleIndex(quantum=a_mas)
+        an_index[angles.%(TypeName)s(1)] = 'a1'
+        self.assertEqual('a1', an_index[angles.%(TypeName)s(1 + a_mas/4)])
+
     # constructors
 
     @unittest.skip('TODO Not yet available in Manual, but it is in Boost')
@@ -488,13 +644,31 @@ class Test%(TypeName)s(unittest.TestCase):
         another_angle = an_angle
         self.assertAlmostEqual(self.rd1, another_angle.value, self.places)
 
-    @unittest.skip('TODO: Not yet available in Boost or Manual')
     def test_deep_copy(self):
         \"\"\"Test deep copy\"\"\"
         an_angle = angles.%(TypeName)s(self.rd1)
         another_angle = copy.deepcopy(an_angle)
         self.assertAlmostEqual(self.rd1, another_angle.value, self.places)
 
+    def test_copy(self):
+        \"\"\"Test copies are new objects with the same value\"\"\"
+        an_angle = angles.%(TypeName)s(self.rd1)
+        a_value = an_angle.value
+        another_angle = copy.copy(an_angle)
+        self.assertFalse(another_angle is an_angle)
+        self.assertTrue(type(another_angle) is angles.%(TypeName)s)
+        self.assertEqual(a_value, another_angle.value)
+        another_angle.value = 0
+        self.assertEqual(a_value, an_angle.value)
+
+    def test_pickle(self):
+        \"\"\"Test pickles restore the exact value\"\"\"
+        an_angle = angles.%(TypeName)s(self.rd1)
+        for a_protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            another_angle = pickle.loads(pickle.dumps(an_angle, a_protocol))
+            self.assertTrue(type(another_angle) is angles.%(TypeName)s)
+            self.assertEqual(an_angle.value, another_angle.value)
+
     def test_default_constructor(self):
         \"\"\"Test default constructor\"\"\"
         an_angle = angles.%(TypeName)s()
@@ -519,6 +693,22 @@ class Test%(TypeName)s(unittest.TestCase):
         self.assertEqual(15.0, an_angle.value)
 
 
+    def test_construct_string(self):
+        \"\"\"Test construct from string\"\"\"
+        an_angle = angles.%(TypeName)s(str(self.rd1))
+        self.assertAlmostEqual(self.rd1, an_angle.value, self.places)
+
+
+    def test_object_size(self):
+        \"\"\"Test object is no bigger than a float\"\"\"
+        self.assertEqual(sys.getsizeof(1.0), sys.getsizeof(angles.%(TypeName)s()))
+
+
+    def test_construct_string_range_error(self):
+        \"\"\"Test construct from string out of range\"\"\"
+        self.assertRaises(angles.Error, angles.%(TypeName)s, '%(upper_range_limit)s:0:1')
+
+
     def test_mixed_sign_constructor_1(self):
         \"\"\"Test mixed sign constructor 1\"\"\"
         # divide 2 to keep in range
@@ -598,6 +788,18 @@ class Test%(TypeName)s(unittest.TestCase):
             self.assertTrue(False) # correct behavior skips this line
         except angles.Error, err:
             self.assertTrue(angles.Error == type(err))
+        self.assertEqual(%(upper_range_limit)s, a1.value) # unchanged
+
+    def test_inplace_is_self(self):
+        \"\"\"Test inplace operators update the object\"\"\"
+        a1 = angles.%(TypeName)s(self.rd1)
+        a0 = a1
+        a1 += angles.%(TypeName)s(0.5)
+        a1 -= angles.%(TypeName)s(0.5)
+        a1 *= angles.%(TypeName)s(0.5)
+        a1 /= angles.%(TypeName)s(0.5)
+        self.assertTrue(a0 is a1)
+        self.assertAlmostEqual(self.rd1, a0.value, self.places)
 
     def test_angle_plus_angle(self):
         \"\"\"Test angle + angle\"\"\"
@@ -749,6 +951,146 @@ class Test%(TypeName)s(unittest.TestCase):
         a2 = angles.%(TypeName)s(0)
         self.assertRaises(angles.Error, lambda a, b: a / b, a1, a2)
 
+    def test_angle_and_float(self):
+        \"\"\"Test angle arithmetic with floats and ints\"\"\"
+        a1 = angles.%(TypeName)s(self.rd1)
+        self.assertAlmostEqual(self.rd1 / 2 + 0.5, (a1 / 2 + 0.5).value, self.places)
+        self.assertAlmostEqual(0.5 + self.rd1 / 2, (0.5 + a1 / 2).value, self.places)
+        self.assertAlmostEqual(self.rd1 * 0.5, (0.5 * a1).value, self.places)
+        self.assertTrue(isinstance(1 * a1, angles.%(TypeName)s))
+        self.assertRaises(angles.Error, lambda a: a / 0, a1)
+        self.assertRaises(TypeError, lambda a: a + 'x', a1)
+
+    def test_angle_and_float_exception(self):
+        \"\"\"Test angle arithmetic with floats range errors\"\"\"
+        a1 = angles.%(TypeName)s(%(upper_range_limit)s)
+        self.assertRaises(angles.Error, lambda a: a + 1.0, a1)
+        self.assertRaises(angles.Error, lambda a: 1.0 + a, a1)
+        self.assertRaises(angles.Error, lambda a: a * 2, a1)
+        try:
+            a1 += 1.0
+            self.assertTrue(False) # correct behavior skips this line
+        except angles.Error, err:
+            self.assertTrue(angles.Error == type(err))
+        self.assertEqual(%(upper_range_limit)s, a1.value) # unchanged
+
+    # batch
+
+    def test_valid_range(self):
+        \"\"\"Test batch valid range\"\"\"
+        values = array.array('d', [%(lower_range_limit)s, self.rd1, %(upper_range_limit)s])
+        self.assertEqual(None, angles.%(TypeName)s.validRange(values))
+
+    def test_valid_range_error_lo(self):
+        \"\"\"Test batch valid range error lo\"\"\"
+        values = array.array('d', [self.rd1, %(lower_range_limit)s - 1])
+        self.assertRaises(angles.Error, angles.%(TypeName)s.validRange, values)
+
+    def test_valid_range_error_hi(self):
+        \"\"\"Test batch valid range error hi\"\"\"
+        values = array.array('d', [%(upper_range_limit)s + 1, self.rd1])
+        self.assertRaises(angles.Error, angles.%(TypeName)s.validRange, values)
+
+    def test_is_valid_range(self):
+        \"\"\"Test non-throwing range check\"\"\"
+        self.assertTrue(angles.%(TypeName)s.isValidRange(self.rd1))
+        self.assertFalse(angles.%(TypeName)s.isValidRange(%(upper_range_limit)s + 1))
+        values = array.array('d', [%(lower_range_limit)s, self.rd1, %(upper_range_limit)s])
+        self.assertTrue(angles.%(TypeName)s.isValidRange(values))
+        values.append(%(lower_range_limit)s - 1)
+        self.assertFalse(angles.%(TypeName)s.isValidRange(values))
+
+    def test_range_status(self):
+        \"\"\"Test batch range status\"\"\"
+        values = array.array('d', [%(lower_range_limit)s - 1, self.rd1, %(upper_range_limit)s + 1])
+        self.assertEqual(bytearray([angles.MINIMUM_EXCEEDED, angles.SUCCESS, angles.MAXIMUM_EXCEEDED]),
+                         angles.%(TypeName)s.rangeStatus(values))
+        self.assertEqual(angles.MAXIMUM_EXCEEDED, angles.%(TypeName)s.rangeStatus(%(upper_range_limit)s + 1))
+
+    def test_range_status_out(self):
+        \"\"\"Test batch range status into an out buffer\"\"\"
+        values = array.array('d', [self.rd1, %(upper_range_limit)s + 1])
+        statuses = bytearray(2)
+        self.assertTrue(statuses is angles.%(TypeName)s.rangeStatus(values, out=statuses))
+        self.assertEqual(bytearray([angles.SUCCESS, angles.MAXIMUM_EXCEEDED]), statuses)
+        self.assertRaises(angles.Error, angles.%(TypeName)s.rangeStatus, values, bytearray(3))
+
+    def test_normalize(self):
+        \"\"\"Test normalize stays in range\"\"\"
+        an_angle = angles.%(TypeName)s(self.rd1)
+        an_angle.normalize()
+        self.assertTrue(%(lower_range_limit)s <= an_angle.value <= %(upper_range_limit)s)
+
+    # out of range policy
+
+    def wrapped(self, a_value):
+        \"\"\"Expected POLICY_WRAP result\"\"\"
+        width = %(upper_range_limit)s - %(lower_range_limit)s
+        return %(lower_range_limit)s + (a_value - %(lower_range_limit)s) %% width
+
+    def test_policy_default(self):
+        \"\"\"Test the default policy raises\"\"\"
+        self.assertEqual(angles.POLICY_RAISE, angles.%(TypeName)s.getPolicy())
+
+    def test_policy_error(self):
+        \"\"\"Test invalid policy\"\"\"
+        self.assertRaises(angles.Error, angles.%(TypeName)s.setPolicy, 42)
+        self.assertEqual(angles.POLICY_RAISE, angles.%(TypeName)s.getPolicy())
+
+    def test_policy_wrap(self):
+        \"\"\"Test add and inplace subtract with POLICY_WRAP\"\"\"
+        angles.%(TypeName)s.setPolicy(angles.POLICY_WRAP)
+        try:
+            a1 = angles.%(TypeName)s(%(upper_range_limit)s * 0.75)
+            a2 = a1 + a1
+            self.assertAlmostEqual(self.wrapped(%(upper_range_limit)s * 1.5), a2.value, self.places)
+            a3 = angles.%(TypeName)s(%(lower_range_limit)s)
+            a3 -= a1
+            self.assertAlmostEqual(self.wrapped(%(lower_range_limit)s - %(upper_range_limit)s * 0.75),
+                                   a3.value, self.places)
+        finally:
+            angles.%(TypeName)s.setPolicy(angles.POLICY_RAISE)
+
+    def test_policy_clamp(self):
+        \"\"\"Test multiply with POLICY_CLAMP\"\"\"
+        angles.%(TypeName)s.setPolicy(angles.POLICY_CLAMP)
+        try:
+            a1 = angles.%(TypeName)s(%(upper_range_limit)s)
+            self.assertEqual(%(upper_range_limit)s, (a1 * a1).value)
+        finally:
+            angles.%(TypeName)s.setPolicy(angles.POLICY_RAISE)
+
+    def test_policy_nan(self):
+        \"\"\"Test add with POLICY_NAN\"\"\"
+        angles.%(TypeName)s.setPolicy(angles.POLICY_NAN)
+        try:
+            a1 = angles.%(TypeName)s(%(upper_range_limit)s)
+            self.assertTrue(math.isnan((a1 + a1).value))
+            self.assertRaises(angles.Error, lambda a, b: a / b, a1, angles.%(TypeName)s(0))
+        finally:
+            angles.%(TypeName)s.setPolicy(angles.POLICY_RAISE)
+
+    def test_add_policy(self):
+        \"\"\"Test per call policy\"\"\"
+        a1 = angles.%(TypeName)s(%(upper_range_limit)s)
+        self.assertRaises(angles.Error, a1.add, a1)
+        self.assertEqual(%(upper_range_limit)s, a1.add(a1, angles.POLICY_CLAMP).value)
+        self.assertAlmostEqual(self.wrapped(2 * %(upper_range_limit)s),
+                               a1.add(a1, policy=angles.POLICY_WRAP).value, self.places)
+        self.assertEqual(%(upper_range_limit)s, a1.value)
+        self.assertRaises(TypeError, a1.add, 'x')
+        self.assertEqual(%(upper_range_limit)s, a1.add(1.0, angles.POLICY_CLAMP).value)
+
+    def test_apply_policy(self):
+        \"\"\"Test batch policy\"\"\"
+        values = array.array('d', [%(lower_range_limit)s - 1, self.rd1, %(upper_range_limit)s + 1])
+        self.assertRaises(angles.Error, angles.%(TypeName)s.applyPolicy, values)
+        result = angles.%(TypeName)s.applyPolicy(values, angles.POLICY_CLAMP)
+        self.assertEqual([%(lower_range_limit)s, self.rd1, %(upper_range_limit)s], list(result))
+        angles.%(TypeName)s.applyPolicy(values, angles.POLICY_WRAP, out=values)
+        self.assertAlmostEqual(self.wrapped(%(lower_range_limit)s - 1), values[0], self.places)
+        self.assertAlmostEqual(self.wrapped(%(upper_range_limit)s + 1), values[2], self.places)
+
 
 """
 
@@ -787,6 +1129,1173 @@ test_hms_string = """
 
 """
 
+# ==========================
+# ===== Batch Template =====
+# ==========================
+
+batch_template = """
+
+# -----------------
+# ----- batch -----
+# -----------------
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+
+        \"\"\"Set up test parameters.\"\"\"
+
+        self.places = 7 # precision
+
+        self.size = 100
+
+        self.lower_range = -720
+        self.upper_range = 720
+
+        self.degrees = array.array('d', [random.uniform(self.lower_range, self.upper_range)
+                                         for i in range(self.size)])
+
+    def test_deg2rad_scalar(self):
+        \"\"\"Test deg2rad still takes a float\"\"\"
+        self.assertAlmostEqual(math.pi/2.0, angles.deg2rad(90), self.places)
+
+    def test_deg2rad(self):
+        \"\"\"Test deg2rad buffer into new array\"\"\"
+        radians = angles.deg2rad(self.degrees)
+        self.assertEqual(self.size, len(radians))
+        for d, r in zip(self.degrees, radians):
+            self.assertAlmostEqual(math.radians(d), r, self.places)
+
+    def test_deg2rad_out(self):
+        \"\"\"Test deg2rad into preallocated out\"\"\"
+        out = array.array('d', [0]) * self.size
+        result = angles.deg2rad(self.degrees, out)
+        self.assertTrue(result is out)
+        for d, r in zip(self.degrees, out):
+            self.assertAlmostEqual(math.radians(d), r, self.places)
+
+    def test_deg2rad_in_place(self):
+        \"\"\"Test deg2rad with out same as input\"\"\"
+        expected = [math.radians(d) for d in self.degrees]
+        angles.deg2rad(self.degrees, out=self.degrees)
+        for e, r in zip(expected, self.degrees):
+            self.assertAlmostEqual(e, r, self.places)
+
+    def test_rad2deg(self):
+        \"\"\"Test rad2deg round trip\"\"\"
+        degrees = angles.rad2deg(angles.deg2rad(self.degrees))
+        for d1, d2 in zip(self.degrees, degrees):
+            self.assertAlmostEqual(d1, d2, self.places)
+
+    def test_out_size_error(self):
+        \"\"\"Test out buffer size mismatch\"\"\"
+        out = array.array('d', [0]) * (self.size - 1)
+        self.assertRaises(angles.Error, angles.deg2rad, self.degrees, out)
+
+    def test_format_error(self):
+        \"\"\"Test non float64 buffer\"\"\"
+        self.assertRaises(angles.Error, angles.deg2rad, array.array('f', [1, 2]))
+
+    def test_degrees2seconds_scalar(self):
+        \"\"\"Test degrees2seconds floats\"\"\"
+        self.assertEqual(-3723, angles.degrees2seconds(-1, 2, 3))
+
+    def test_degrees2seconds(self):
+        \"\"\"Test degrees2seconds buffers\"\"\"
+        degrees = array.array('d', [1, -1, 0])
+        minutes = array.array('d', [2, 2, -2])
+        seconds = array.array('d', [3, 3, 3])
+        self.assertEqual([3723, -3723, -123],
+                         list(angles.degrees2seconds(degrees, minutes, seconds)))
+
+    def test_degrees2seconds_size_error(self):
+        \"\"\"Test degrees2seconds buffer size mismatch\"\"\"
+        degrees = array.array('d', [1, -1, 0])
+        minutes = array.array('d', [2, 2])
+        self.assertRaises(angles.Error, angles.degrees2seconds, degrees, minutes, degrees)
+
+    def test_normalize(self):
+        \"\"\"Test normalize buffer\"\"\"
+        values = angles.normalize(array.array('d', [45 + 360, 45]))
+        self.assertAlmostEqual(45, values[0], self.places)
+        self.assertAlmostEqual(45, values[1], self.places)
+
+    def test_normalize_scalar(self):
+        \"\"\"Test normalize float\"\"\"
+        self.assertAlmostEqual(325, angles.normalize(1e9 + 45), self.places)
+
+    def test_normalize_wrap(self):
+        \"\"\"Test normalize buffer with wrap convention\"\"\"
+        values = array.array('d', [-180, 190, 360])
+        angles.normalize(values, angles.WRAP_180, out=values)
+        self.assertEqual([180, -170, 0], list(values))
+
+    def test_normalize_wrap_error(self):
+        \"\"\"Test normalize invalid wrap\"\"\"
+        self.assertRaises(angles.Error, angles.normalize, 1.0, wrap=-1)
+
+    def test_free_list(self):
+        \"\"\"Test result objects are reused\"\"\"
+        angles.clearFreeLists()
+        a1 = angles.Longitude(10)
+        for i in range(10):
+            a2 = a1 + a1
+            a1 += a2
+            a1 -= a2
+        self.assertEqual(10, a1.value)
+        stats = angles.freeListStats()['Longitude']
+        self.assertTrue(stats['hits'] > 0)
+        self.assertTrue(stats['size'] <= 256)
+        self.assertEqual(set(['Angle', 'LimitedRangeAngle', 'Declination', 'Latitude', 'Longitude', 'RA']),
+                         set(angles.freeListStats().keys()))
+
+    def test_free_list_clear(self):
+        \"\"\"Test clearing the free lists\"\"\"
+        a1 = angles.Angle(10)
+        a1 + a1
+        angles.clearFreeLists()
+        self.assertEqual({'size': 0, 'hits': 0, 'misses': 0}, angles.freeListStats()['Angle'])
+        self.assertEqual(20, (a1 + a1).value)
+
+    def test_add_scalar(self):
+        \"\"\"Test batch add buffer and scalar\"\"\"
+        result = angles.add(self.degrees, 1.5)
+        for d, r in zip(self.degrees, result):
+            self.assertEqual(d + 1.5, r)
+        result = angles.subtract(1.5, self.degrees)
+        for d, r in zip(self.degrees, result):
+            self.assertEqual(1.5 - d, r)
+        self.assertEqual(3.0, angles.multiply(1.5, 2))
+
+    def test_add_buffers(self):
+        \"\"\"Test batch add two buffers into out\"\"\"
+        out = array.array('d', [0]) * self.size
+        result = angles.add(self.degrees, self.degrees, out=out)
+        self.assertTrue(result is out)
+        for d, r in zip(self.degrees, out):
+            self.assertEqual(2 * d, r)
+
+    def test_add_size_error(self):
+        \"\"\"Test batch add buffers of different sizes\"\"\"
+        self.assertRaises(angles.Error, angles.add, self.degrees, array.array('d', [1, 2]))
+
+    def test_divide_zero(self):
+        \"\"\"Test batch divide by zero\"\"\"
+        values = array.array('d', [1, 0, 2])
+        self.assertRaises(angles.Error, angles.divide, self.degrees[:3], values)
+        self.assertRaises(angles.Error, angles.divide, 1.0, values)
+        self.assertRaises(angles.Error, angles.divide, values, 0)
+        self.assertEqual([0.5, 0, 1], list(angles.divide(values, 2)))
+
+    def test_separation(self):
+        \"\"\"Test separation of values and angles\"\"\"
+        self.assertAlmostEqual(90, angles.separation(0, 0, 6, 0), self.places)
+        self.assertAlmostEqual(180, angles.separation(0, -90, 12, 90), self.places)
+        self.assertAlmostEqual(1, angles.separation(angles.RA(23, 59, 0), angles.Declination(10),
+                                                    angles.RA(23, 59, 0), 11), self.places)
+        self.assertAlmostEqual(15, angles.separation(23.5, 0, 0.5, 0), self.places) # across 0h
+        self.assertRaises(TypeError, angles.separation, 'x', 0, 0, 0)
+
+    def test_separation_buffers(self):
+        \"\"\"Test one to many and pairwise separation\"\"\"
+        ras = array.array('d', [random.uniform(0, 24) for i in range(self.size)])
+        decs = array.array('d', [random.uniform(-90, 90) for i in range(self.size)])
+        result = angles.separation(ras[0], decs[0], ras, decs)
+        self.assertEqual(self.size, len(result))
+        self.assertAlmostEqual(0, result[0], self.places)
+        i = random.randrange(self.size)
+        self.assertAlmostEqual(angles.separation(ras[0], decs[0], ras[i], decs[i]), result[i], self.places)
+        out = array.array('d', [0] * self.size)
+        angles.separation(ras, decs, ras[0], decs[0], out=out)
+        self.assertEqual(list(result), list(out))
+        pairwise = angles.separation(ras, decs, ras[::-1], decs[::-1])
+        self.assertAlmostEqual(angles.separation(ras[i], decs[i], ras[-1 - i], decs[-1 - i]),
+                               pairwise[i], self.places)
+        self.assertRaises(angles.Error, angles.separation, ras, decs, ras[:2], decs[:2])
+        self.assertRaises(angles.Error, angles.separation, ras, 0, 0, 0)
+
+    def test_horizontal(self):
+        \"\"\"Test altitude and azimuth of values and angles\"\"\"
+        altitude, azimuth = angles.horizontal(45, 3, 3, 0) # on the meridian
+        self.assertAlmostEqual(45, altitude, self.places)
+        self.assertAlmostEqual(180, azimuth, self.places)
+        altitude, azimuth = angles.horizontal(angles.Latitude(0), angles.RA(6), angles.RA(0), 0)
+        self.assertAlmostEqual(0, altitude, self.places)
+        self.assertAlmostEqual(270, azimuth, self.places) # setting in the west
+        self.assertRaises(TypeError, angles.horizontal, 'x', 0, 0, 0)
+
+    def test_horizontal_buffers(self):
+        \"\"\"Test altitude and azimuth of many targets and observers\"\"\"
+        ras = array.array('d', [random.uniform(0, 24) for i in range(self.size)])
+        decs = array.array('d', [random.uniform(-90, 90) for i in range(self.size)])
+        altitudes, azimuths = angles.horizontal(37.5, 20.25, ras, decs)
+        self.assertEqual(self.size, len(altitudes))
+        i = random.randrange(self.size)
+        altitude, azimuth = angles.horizontal(37.5, 20.25, ras[i], decs[i])
+        self.assertAlmostEqual(altitude, altitudes[i], self.places)
+        self.assertAlmostEqual(azimuth, azimuths[i], self.places)
+        out = array.array('d', [0] * self.size)
+        result = angles.horizontal(37.5, 20.25, ras, decs, altitude=out)
+        self.assertTrue(result[0] is out)
+        latitudes = array.array('d', [37.5, -30, 0])
+        longitudes = array.array('d', [-122, 70.5, 180])
+        altitudes, azimuths = angles.horizontalGrid(latitudes, longitudes, 5.5, ras, decs)
+        self.assertEqual(3 * self.size, len(altitudes))
+        altitude, azimuth = angles.horizontal(latitudes[1], 5.5 + longitudes[1] / 15, ras[i], decs[i])
+        self.assertAlmostEqual(altitude, altitudes[self.size + i], self.places)
+        self.assertAlmostEqual(azimuth, azimuths[self.size + i], self.places)
+        self.assertRaises(angles.Error, angles.horizontalGrid, latitudes, longitudes[:2], 0, ras, decs)
+        self.assertRaises(angles.Error, angles.horizontal, 0, 0, ras, decs[:2])
+
+    def test_values2DMSString(self):
+        \"\"\"Test bulk DMS formatting\"\"\"
+        values = array.array('d', [44.5, -1.25, 0])
+        self.assertEqual('''44* 30' 0\"\\n-1* 15' 0\"\\n0* 0' 0\"\\n''',
+                         angles.values2DMSString(values))
+
+    def test_values2DMSString_matches_str(self):
+        \"\"\"Test bulk DMS formatting matches str\"\"\"
+        a_str = angles.values2DMSString(self.degrees, precision=12)
+        an_angle = angles.Angle()
+        for d, a_line in zip(self.degrees, a_str.split('\\n')):
+            an_angle.value = d
+            self.assertEqual(str(an_angle), a_line)
+
+    def test_values2HMSString(self):
+        \"\"\"Test bulk HMS formatting with delimiter\"\"\"
+        values = array.array('d', [16.5, 23.75])
+        self.assertEqual('16:30:0,23:45:0,', angles.values2HMSString(values, delimiter=','))
+
+    def test_values2DMSString_empty(self):
+        \"\"\"Test bulk formatting of an empty buffer\"\"\"
+        self.assertEqual('', angles.values2DMSString(array.array('d')))
+
+    def test_values2DMSString_precision_error(self):
+        \"\"\"Test bulk formatting invalid precision\"\"\"
+        self.assertRaises(angles.Error, angles.values2DMSString, self.degrees, 42)
+
+    def test_parseAngle(self):
+        \"\"\"Test parse sexagesimal string\"\"\"
+        self.assertAlmostEqual(12 + 30/60.0 + 45.6/3600, angles.parseAngle('12:30:45.6'), self.places)
+        self.assertAlmostEqual(12 + 30/60.0 + 45.6/3600, angles.parseAngle('12h30m45.6s'), self.places)
+        self.assertAlmostEqual(45 + 30/60.0 + 15/3600.0, angles.parseAngle(u'+45\\u00b030\\'15"'), self.places)
+        self.assertEqual(-45.5, angles.parseAngle('-45.5'))
+
+    def test_parseAngle_error(self):
+        \"\"\"Test parse bad string\"\"\"
+        self.assertRaises(angles.Error, angles.parseAngle, '12:30:')
+
+    def test_parseAngles(self):
+        \"\"\"Test bulk parse with error mask\"\"\"
+        values, errors = angles.parseAngles('12:30\\n-45.5\\r\\nbad\\n1h\\n')
+        self.assertEqual(4, len(values))
+        self.assertEqual([12.5, -45.5], list(values[:2]))
+        self.assertTrue(math.isnan(values[2]))
+        self.assertEqual(1, values[3])
+        self.assertEqual(bytearray([0, 0, 1, 0]), errors)
+
+    def test_parseAngles_delimiter(self):
+        \"\"\"Test bulk parse of a bytearray with delimiter\"\"\"
+        values, errors = angles.parseAngles(bytearray('1,2:30, 3'), delimiter=',')
+        self.assertEqual([1, 2.5, 3], list(values))
+        self.assertEqual(bytearray(3), errors)
+
+    def test_parseAngles_round_trip(self):
+        \"\"\"Test bulk parse of bulk formatted values\"\"\"
+        values, errors = angles.parseAngles(angles.values2DMSString(self.degrees, precision=17))
+        for d1, d2 in zip(self.degrees, values):
+            self.assertAlmostEqual(d1, d2, self.places)
+        self.assertEqual(bytearray(self.size), errors)
+
+"""
+
+
+fixed_angle_template = """
+
+# -----------------------------
+# ----- %(TypeName)s -----
+# -----------------------------
+
+
+class Test%(TypeName)s(unittest.TestCase):
+
+    def setUp(self):
+
+        \"\"\"Set up test parameters.\"\"\"
+
+        self.places = %(places)s # precision, half a count
+
+        self.lower_range = -180
+        self.upper_range = 180
+
+        self.rd1 = random.uniform(self.lower_range, self.upper_range)
+
+    def test_construct(self):
+        \"\"\"Test construction rounds to the nearest count\"\"\"
+        a1 = angles.%(TypeName)s(self.rd1)
+        self.assertEqual(int(math.floor(self.rd1 * %(per_unit)s + 0.5)), a1.count)
+        self.assertAlmostEqual(self.rd1, a1.value, self.places)
+        self.assertEqual(%(per_unit)s, angles.%(TypeName)s.perUnit())
+        self.assertEqual(1.0/%(per_unit)s, angles.%(TypeName)s.resolution())
+        self.assertEqual(0, angles.%(TypeName)s().count)
+
+    def test_construct_angles(self):
+        \"\"\"Test construction from angles and strings\"\"\"
+        self.assertEqual(-45.5, angles.%(TypeName)s(angles.Declination(-45.5)).value)
+        self.assertEqual(12.5, angles.%(TypeName)s(angles.RA(12.5)).value)
+        self.assertEqual(12.5, angles.%(TypeName)s('12:30').value)
+        a1 = angles.%(TypeName)s(self.rd1)
+        self.assertEqual(a1, angles.%(TypeName)s(a1))
+        self.assertRaises(angles.Error, angles.%(TypeName)s, 'x')
+        self.assertRaises(angles.Error, angles.%(TypeName)s, float('nan'))
+
+    def test_to(self):
+        \"\"\"Test conversion to the other angle types\"\"\"
+        a1 = angles.%(TypeName)s(-45.5)
+        self.assertTrue(isinstance(a1.to(), angles.Angle))
+        self.assertEqual(-45.5, a1.to().value)
+        self.assertEqual(-45.5, a1.to(angles.Declination).value)
+        self.assertRaises(angles.Error, a1.to, angles.RA)
+
+    def test_count(self):
+        \"\"\"Test count accessors\"\"\"
+        a1 = angles.%(TypeName)s()
+        a1.count = -3
+        self.assertEqual(-3, a1.count)
+        self.assertEqual(-3.0/%(per_unit)s, a1.value)
+        a1.value = 1.5
+        self.assertEqual(1.5 * %(per_unit)s, a1.count)
+        self.assertRaises(angles.Error, setattr, a1, 'count', %(max_count)s + 1)
+
+    def test_copy_and_pickle(self):
+        \"\"\"Test copies and pickles keep the count\"\"\"
+        a1 = angles.%(TypeName)s()
+        a1.count = %(max_count)s
+        for a2 in (copy.copy(a1), copy.deepcopy(a1), pickle.loads(pickle.dumps(a1, pickle.HIGHEST_PROTOCOL))):
+            self.assertFalse(a2 is a1)
+            self.assertTrue(type(a2) is angles.%(TypeName)s)
+            self.assertEqual(%(max_count)s, a2.count)
+
+    def test_exact_add(self):
+        \"\"\"Test add and subtract are exact\"\"\"
+        a1 = angles.%(TypeName)s(0.1)
+        a2 = angles.%(TypeName)s(0.2)
+        self.assertEqual(angles.%(TypeName)s(0.3), a1 + a2)
+        self.assertEqual(a1, a1 + a2 - a2)
+        self.assertEqual(-0.1, (-a1).value)
+        self.assertRaises(TypeError, lambda a: a + 0.1, a1)
+
+    def test_multiply(self):
+        \"\"\"Test multiply by an int\"\"\"
+        a1 = angles.%(TypeName)s(0.1)
+        self.assertEqual(angles.%(TypeName)s(0.3), a1 * 3)
+        self.assertEqual(angles.%(TypeName)s(0.3), 3 * a1)
+        self.assertEqual(angles.%(TypeName)s(0.3), 3L * a1)
+        self.assertRaises(TypeError, lambda a: a * 3.0, a1)
+
+    def test_overflow(self):
+        \"\"\"Test arithmetic past the count range\"\"\"
+        a1 = angles.%(TypeName)s()
+        a1.count = %(max_count)s
+        a2 = angles.%(TypeName)s()
+        a2.count = 1
+        self.assertRaises(angles.Error, lambda a, b: a + b, a1, a2)
+        self.assertRaises(angles.Error, lambda a: a * 2, a1)
+        self.assertRaises(angles.Error, lambda a, b: -a - b - b, a1, a2)
+
+    def test_compare_hash(self):
+        \"\"\"Test compare and hash by count\"\"\"
+        a1 = angles.%(TypeName)s(self.rd1)
+        a2 = angles.%(TypeName)s(self.rd1)
+        a3 = angles.%(TypeName)s()
+        a3.count = a1.count + 1
+        self.assertTrue(a1 == a2)
+        self.assertTrue(a1 < a3)
+        self.assertTrue(a3 >= a1)
+        self.assertTrue(a1 != a3)
+        self.assertEqual(hash(a1), hash(a2))
+        self.assertEqual('a1', {a1: 'a1'}[a2])
+
+    def test_normalize(self):
+        \"\"\"Test exact normalize\"\"\"
+        a1 = angles.%(TypeName)s(-90.001)
+        a1.normalize()
+        self.assertEqual(angles.%(TypeName)s(269.999), a1)
+        a1.normalize(angles.WRAP_180)
+        self.assertEqual(angles.%(TypeName)s(-90.001), a1)
+        a2 = angles.%(TypeName)s(25)
+        a2.normalize(angles.WRAP_0_24)
+        self.assertEqual(1, a2.value)
+
+    def test_str(self):
+        \"\"\"Test str\"\"\"
+        self.assertEqual('-1* 15\\' 0"', str(angles.%(TypeName)s(-1.25)))
+
+"""
+
+
+sorted_index_template = """
+
+# ------------------------------------
+# ----- %(TypeName)sSortedIndex -----
+# ------------------------------------
+
+
+class Test%(TypeName)sSortedIndex(unittest.TestCase):
+
+    def setUp(self):
+
+        \"\"\"Set up test parameters.\"\"\"
+
+        self.size = 1000
+
+        self.lower_range = %(lower_range_limit)s
+        self.upper_range = %(upper_range_limit)s
+
+        self.values = array.array('d', [random.uniform(self.lower_range, self.upper_range)
+                                        for i in range(self.size)])
+
+    def test_range(self):
+        \"\"\"Test range and count match a linear scan\"\"\"
+        an_index = angles.%(TypeName)sSortedIndex(self.values)
+        self.assertEqual(self.size, len(an_index))
+        lower, upper = sorted([random.uniform(self.lower_range, self.upper_range) for i in range(2)])
+        expected = [i for i, v in enumerate(self.values) if lower <= v <= upper]
+        positions = an_index.range(lower, upper)
+        self.assertEqual(sorted(expected), sorted(positions))
+        self.assertEqual([self.values[i] for i in positions],
+                         sorted(self.values[i] for i in positions))
+        self.assertEqual(len(expected), an_index.count(angles.%(TypeName)s(lower), upper))
+
+    def test_nearest(self):
+        \"\"\"Test nearest finds an exact value\"\"\"
+        an_index = angles.%(TypeName)sSortedIndex(self.values)
+        i = random.randrange(self.size)
+        self.assertEqual(self.values[i], self.values[an_index.nearest(self.values[i])])
+
+    def test_values(self):
+        \"\"\"Test values are sorted\"\"\"
+        an_index = angles.%(TypeName)sSortedIndex(self.values)
+        self.assertEqual(sorted(self.values), list(an_index.values()))
+        an_index.assign(array.array('d', [self.lower_range]))
+        self.assertEqual(1, len(an_index))
+
+    def test_errors(self):
+        \"\"\"Test out of range values and invalid bounds\"\"\"
+        an_index = angles.%(TypeName)sSortedIndex()
+        self.assertEqual(0, len(an_index))
+        self.assertRaises(angles.Error, an_index.nearest, self.lower_range)
+        self.assertRaises(angles.Error, an_index.assign,
+                          array.array('d', [self.upper_range + 1]))
+        self.assertRaises(angles.Error, an_index.assign, array.array('d', [float('nan')]))
+        self.assertRaises(TypeError, an_index.count, 'x', self.upper_range)
+
+
+"""
+
+
+sorted_index_wrap_template = """
+
+class TestSortedIndexWrap(unittest.TestCase):
+
+    def test_ra(self):
+        \"\"\"Test RA ranges across 24h to 0h\"\"\"
+        an_index = angles.RASortedIndex(array.array('d', [23.9, 0.1, 12, 23.7, 0, 24]))
+        self.assertEqual([0, 5, 4, 1], an_index.range(angles.RA(23, 50, 0), angles.RA(0, 10, 0)))
+        self.assertEqual(4, an_index.count(-1/6.0, 1/6.0))
+        self.assertEqual(6, an_index.count(0, 24))
+        self.assertEqual(0, an_index.nearest(23.9))
+        self.assertEqual(4, an_index.nearest(23.99)) # 24 ties 0, lowest rank
+        self.assertEqual(3, an_index.nearest(23.75))
+
+    def test_longitude(self):
+        \"\"\"Test Longitude ranges across 180 to -180\"\"\"
+        an_index = angles.LongitudeSortedIndex(array.array('d', [179, -179, 0]))
+        self.assertEqual([0, 1], an_index.range(170, -170))
+        self.assertEqual([0, 1], an_index.range(170, 190))
+        self.assertEqual(1, an_index.nearest(-178))
+        self.assertEqual(0, an_index.nearest(-181))
+
+    def test_declination(self):
+        \"\"\"Test Declination does not wrap\"\"\"
+        an_index = angles.DeclinationSortedIndex(array.array('d', [-30, -25, -20, 10]))
+        self.assertEqual([0, 1, 2], an_index.range(-30, -20))
+        self.assertEqual([], an_index.range(-20, -30))
+        self.assertEqual(3, an_index.nearest(89))
+
+
+"""
+
+
+htm_template = """
+
+# ---------------
+# ----- HTM -----
+# ---------------
+
+
+class TestHTM(unittest.TestCase):
+
+    def setUp(self):
+
+        \"\"\"Set up test parameters.\"\"\"
+
+        self.size = 2000
+
+        self.ras = array.array('d', [random.uniform(0, 24) for i in range(self.size)])
+        self.decs = array.array('d', [math.degrees(math.asin(random.uniform(-1, 1)))
+                                      for i in range(self.size)])
+
+    def test_htm_id(self):
+        \"\"\"Test trixel ids and names\"\"\"
+        self.assertEqual(15, angles.htmId(3, 45, 0))
+        self.assertEqual('N3', angles.htmName(15))
+        an_id = angles.htmId(angles.RA(3), angles.Declination(45), depth=5)
+        self.assertEqual(15, an_id >> 10)
+        self.assertEqual(7, len(angles.htmName(an_id)))
+        ids = angles.htmId(self.ras, self.decs)
+        self.assertEqual(self.size, len(ids))
+        self.assertEqual(angles.htmId(self.ras[-1], self.decs[-1]), ids[-1])
+        self.assertRaises(angles.Error, angles.htmId, 25, 0)
+        self.assertRaises(angles.Error, angles.htmId, 0, 0, angles.MAX_HTM_DEPTH + 1)
+        self.assertRaises(angles.Error, angles.htmName, 7)
+
+    def test_circle(self):
+        \"\"\"Test circle queries match a linear scan\"\"\"
+        an_index = angles.HTMIndex(depth=8)
+        an_index.insert(self.ras[:1000], self.decs[:1000])
+        an_index.insert(self.ras[1000:], self.decs[1000:])
+        self.assertEqual(self.size, len(an_index))
+        self.assertEqual(8, an_index.depth)
+        ra = random.uniform(0, 24)
+        dec = random.uniform(-90, 90)
+        radius = random.uniform(0, 30)
+        distances = angles.separation(ra, dec, self.ras, self.decs)
+        expected = [i for i, d in enumerate(distances) if d <= radius]
+        self.assertEqual(expected, an_index.circle(angles.RA(ra), dec, radius))
+        self.assertEqual(self.size, len(an_index.circle(0, 0, 180)))
+
+    def test_polygon(self):
+        \"\"\"Test polygon queries\"\"\"
+        an_index = angles.HTMIndex()
+        an_index.insert(self.ras, self.decs)
+        positions = an_index.polygon(array.array('d', [10, 10, 12, 12]),
+                                     array.array('d', [20, 40, 40, 20]))
+        for i in positions:
+            self.assertTrue(10 <= self.ras[i] <= 12)
+            self.assertTrue(20 <= self.decs[i])
+        self.assertRaises(angles.Error, an_index.polygon,
+                          array.array('d', [10, 11]), array.array('d', [20, 30]))
+
+    def test_errors(self):
+        \"\"\"Test invalid depths and positions\"\"\"
+        self.assertRaises(angles.Error, angles.HTMIndex, -1)
+        an_index = angles.HTMIndex(4)
+        self.assertRaises(angles.Error, an_index.insert,
+                          array.array('d', [1, 25]), array.array('d', [0, 0]))
+        self.assertEqual(0, len(an_index))
+        self.assertRaises(angles.Error, an_index.insert,
+                          array.array('d', [1, 2]), array.array('d', [0]))
+        self.assertRaises(TypeError, an_index.circle, 'x', 0, 1)
+        an_index.insert(array.array('d', [1]), array.array('d', [0]))
+        an_index.clear()
+        self.assertEqual(0, len(an_index))
+
+
+"""
+
+
+zone_index_template = """
+
+# ---------------------
+# ----- ZoneIndex -----
+# ---------------------
+
+
+class TestZoneIndex(unittest.TestCase):
+
+    def setUp(self):
+
+        \"\"\"Set up test parameters.\"\"\"
+
+        self.size = 2000
+
+        self.ras = array.array('d', [random.uniform(0, 24) for i in range(self.size)])
+        self.decs = array.array('d', [math.degrees(math.asin(random.uniform(-1, 1)))
+                                      for i in range(self.size)])
+
+        self.an_index = angles.ZoneIndex(height=2)
+        self.an_index.insert(self.ras, self.decs)
+
+    def test_cone(self):
+        \"\"\"Test cone searches match a linear scan\"\"\"
+        self.assertEqual(self.size, len(self.an_index))
+        self.assertEqual(2, self.an_index.height)
+        for ra, dec in ((random.uniform(0, 24), random.uniform(-90, 90)), (23.9, 10), (0, 89)):
+            radius = random.uniform(0, 30)
+            distances = angles.separation(ra, dec, self.ras, self.decs)
+            expected = [i for i, d in enumerate(distances) if d <= radius]
+            self.assertEqual(expected, sorted(self.an_index.cone(angles.RA(ra), dec, radius)))
+        self.assertEqual(self.size, len(list(self.an_index.cone(0, 0, 180))))
+
+    def test_read(self):
+        \"\"\"Test reading a cone search in chunks\"\"\"
+        expected = sorted(self.an_index.cone(12, 0, 40))
+        a_search = self.an_index.cone(12, 0, 40)
+        positions = list()
+        chunk = a_search.read(10)
+        while chunk:
+            self.assertTrue(len(chunk) == 10 or a_search.done)
+            positions.extend(chunk)
+            chunk = a_search.read(10)
+        self.assertTrue(a_search.done)
+        self.assertEqual(expected, sorted(positions))
+
+    def test_stale(self):
+        \"\"\"Test an insert invalidates cone searches\"\"\"
+        a_search = self.an_index.cone(12, 0, 40)
+        self.an_index.insert(array.array('d', [1]), array.array('d', [0]))
+        self.assertRaises(angles.Error, a_search.read)
+        self.assertRaises(angles.Error, list, a_search)
+
+    def test_errors(self):
+        \"\"\"Test invalid heights and positions\"\"\"
+        self.assertRaises(angles.Error, angles.ZoneIndex, 0)
+        self.assertRaises(angles.Error, angles.ZoneIndex, 181)
+        an_index = angles.ZoneIndex()
+        self.assertRaises(angles.Error, an_index.insert,
+                          array.array('d', [1, 25]), array.array('d', [0, 0]))
+        self.assertEqual(0, len(an_index))
+        self.assertRaises(TypeError, an_index.cone, 'x', 0, 1)
+        self.assertEqual([], list(self.an_index.cone(0, 0, -1)))
+        self.assertRaises(ValueError, self.an_index.cone(0, 0, 1).read, -1)
+        self.an_index.clear()
+        self.assertEqual(0, len(self.an_index))
+
+
+"""
+
+
+catalogue_reader_template = """
+
+# ---------------------------
+# ----- CatalogueReader -----
+# ---------------------------
+
+
+class TestCatalogueReader(unittest.TestCase):
+
+    def setUp(self):
+
+        \"\"\"Set up test parameters.\"\"\"
+
+        self.size = 1000
+
+        self.ras = [random.uniform(0, 24) for i in range(self.size)]
+        self.decs = [random.uniform(-90, 90) for i in range(self.size)]
+
+        a_file = tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False)
+        a_file.write('id,ra,dec\\n')
+        for i, (ra, dec) in enumerate(zip(self.ras, self.decs)):
+            a_file.write('%d,%r,%r\\n' % (i, ra, dec))
+        a_file.close()
+        self.path = a_file.name
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_chunks(self):
+        \"\"\"Test reading columns in chunks\"\"\"
+        a_reader = angles.CatalogueReader(self.path, [(1, angles.RA), (2, angles.Declination)],
+                                          chunk=300, skip=1)
+        ras = array.array('d')
+        decs = array.array('d')
+        sizes = list()
+        for (some_ras, some_decs), errors in a_reader:
+            self.assertEqual([], errors)
+            sizes.append(len(some_ras))
+            ras.extend(some_ras)
+            decs.extend(some_decs)
+        self.assertEqual([300, 300, 300, 100], sizes)
+        self.assertEqual(self.ras, list(ras))
+        self.assertEqual(self.decs, list(decs))
+        self.assertEqual(self.size + 1, a_reader.line)
+
+    def test_bad_rows(self):
+        \"\"\"Test bad values are NaN and reported by line and offset\"\"\"
+        a_text = '1\\t12:30:00\\n2\\t25\\n3\\tx\\n4\\n'
+        a_file = tempfile.NamedTemporaryFile(mode='w', suffix='.tsv', delete=False)
+        a_file.write(a_text)
+        a_file.close()
+        try:
+            a_reader = angles.CatalogueReader(a_file.name, [0, (1, angles.RA)], delimiter='\\t')
+            (ids, ras), errors = next(a_reader)
+            self.assertEqual([1, 2, 3, 4], list(ids))
+            self.assertEqual(12.5, ras[0])
+            self.assertTrue(math.isnan(ras[1]))
+            self.assertEqual([(2, a_text.index('2\\t'), 1, 'maximum exceeded'),
+                              (3, a_text.index('3\\t'), 1, 'invalid angle'),
+                              (4, a_text.index('4\\n'), 1, 'missing field')], errors)
+            self.assertRaises(StopIteration, next, a_reader)
+        finally:
+            os.remove(a_file.name)
+
+    def test_errors(self):
+        \"\"\"Test invalid files and columns\"\"\"
+        self.assertRaises(angles.Error, angles.CatalogueReader, self.path + '.missing', [0])
+        self.assertRaises(TypeError, angles.CatalogueReader, self.path, [(1, angles.MilliarcsecondAngle)])
+        self.assertRaises(angles.Error, angles.CatalogueReader, self.path, [1, 1])
+        self.assertRaises(angles.Error, angles.CatalogueReader, self.path, [-1])
+        self.assertRaises(angles.Error, angles.CatalogueReader, self.path, [0], chunk=0)
+        self.assertRaises(angles.Error, next, angles.CatalogueReader(self.path, []))
+
+
+"""
+
+
+binary_catalogue_template = """
+
+# ---------------------------
+# ----- BinaryCatalogue -----
+# ---------------------------
+
+
+class TestBinaryCatalogue(unittest.TestCase):
+
+    def setUp(self):
+
+        \"\"\"Set up test parameters.\"\"\"
+
+        self.size = 1000
+
+        self.ras = array.array('d', [random.uniform(0, 24) for i in range(self.size)])
+        self.decs = array.array('d', [random.uniform(-90, 90) for i in range(self.size)])
+
+        a_file = tempfile.NamedTemporaryFile(suffix='.cat', delete=False)
+        a_file.close()
+        self.path = a_file.name
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_write_and_map(self):
+        \"\"\"Test columns map back as zero copy views\"\"\"
+        angles.writeBinaryCatalogue(self.path, [('ra', angles.RA, self.ras),
+                                                ('dec', angles.Declination, self.decs)])
+        a_catalogue = angles.BinaryCatalogue(self.path)
+        self.assertEqual(self.size, a_catalogue.rows)
+        self.assertEqual(['ra', 'dec'], a_catalogue.columns)
+        self.assertEqual(2, len(a_catalogue))
+        self.assertTrue(a_catalogue.type('ra') is angles.RA)
+        self.assertTrue(a_catalogue.type(1) is angles.Declination)
+        ras = a_catalogue['ra']
+        self.assertTrue(isinstance(ras, memoryview))
+        self.assertTrue(ras.readonly)
+        self.assertEqual('d', ras.format)
+        self.assertEqual(self.ras.tostring(), ras.tobytes())
+        self.assertEqual(self.decs.tostring(), a_catalogue[1].tobytes())
+        del a_catalogue # the view keeps the mapping
+        self.assertEqual(self.ras.tostring(), ras.tobytes())
+
+    def test_views_are_buffers(self):
+        \"\"\"Test views pass straight to the batch functions\"\"\"
+        angles.writeBinaryCatalogue(self.path, [('ra', angles.RA, self.ras),
+                                                ('dec', angles.Declination, self.decs)])
+        a_catalogue = angles.BinaryCatalogue(self.path)
+        self.assertEqual(list(angles.separation(1, 2, self.ras, self.decs)),
+                         list(angles.separation(1, 2, a_catalogue['ra'], a_catalogue['dec'])))
+
+    def test_errors(self):
+        \"\"\"Test invalid columns and files\"\"\"
+        self.assertRaises(angles.Error, angles.writeBinaryCatalogue, self.path,
+                          [('dec', angles.Declination, array.array('d', [0, 95]))])
+        self.assertRaises(TypeError, angles.writeBinaryCatalogue, self.path,
+                          [('ra', angles.MilliarcsecondAngle, self.ras)])
+        self.assertRaises(angles.Error, angles.writeBinaryCatalogue, self.path,
+                          [('ra', angles.RA, self.ras), ('dec', angles.Angle, self.decs[:2])])
+        self.assertRaises(angles.Error, angles.BinaryCatalogue, self.path) # empty
+        angles.writeBinaryCatalogue(self.path, [('ra', angles.Angle, self.ras)])
+        a_catalogue = angles.BinaryCatalogue(self.path)
+        self.assertTrue(a_catalogue.type(0) is angles.Angle)
+        self.assertRaises(KeyError, a_catalogue.__getitem__, 'dec')
+        self.assertRaises(IndexError, a_catalogue.__getitem__, 1)
+        self.assertRaises(angles.Error, a_catalogue.__init__, self.path)
+
+
+"""
+
+threads_template = """
+
+# -------------------
+# ----- Threads -----
+# -------------------
+
+
+class TestThreads(unittest.TestCase):
+
+    def setUp(self):
+
+        \"\"\"Set up test parameters.\"\"\"
+
+        self.size = 10007
+
+        self.ras = array.array('d', [random.uniform(0, 24) for i in range(self.size)])
+        self.decs = array.array('d', [random.uniform(-90, 90) for i in range(self.size)])
+
+    def tearDown(self):
+        angles.setThreads(0)
+        angles.setParallelThreshold(32768)
+
+    def test_settings(self):
+        \"\"\"Test the thread settings\"\"\"
+        self.assertTrue(angles.getThreads() >= 1)
+        angles.setThreads(3)
+        self.assertEqual(3, angles.getThreads())
+        angles.setParallelThreshold(100)
+        self.assertEqual(100, angles.getParallelThreshold())
+        self.assertRaises(angles.Error, angles.setThreads, -1)
+        self.assertRaises(angles.Error, angles.setParallelThreshold, -1)
+
+    def test_split(self):
+        \"\"\"Test batch functions split across threads match one thread\"\"\"
+        angles.setThreads(1)
+        separations = angles.separation(1, 2, self.ras, self.decs)
+        normalized = angles.normalize(self.decs, angles.WRAP_0_360)
+        statuses = angles.Latitude.rangeStatus(self.ras)
+
+        angles.setThreads(4)
+        angles.setParallelThreshold(16)
+        self.assertEqual(separations, angles.separation(1, 2, self.ras, self.decs))
+        self.assertEqual(normalized, angles.normalize(self.decs, angles.WRAP_0_360))
+        self.assertEqual(statuses, angles.Latitude.rangeStatus(self.ras))
+
+        # an error in any part, out is unchanged
+        divisors = array.array('d', [1] * self.size)
+        divisors[-1] = 0
+        out = array.array('d', self.decs)
+        self.assertRaises(angles.Error, angles.divide, self.ras, divisors, out)
+        self.assertEqual(self.decs, out)
+        self.assertRaises(angles.Error, angles.Declination.validRange, angles.multiply(self.decs, 2))
+
+    def test_python_threads(self):
+        \"\"\"Test batch functions run from many python threads at once\"\"\"
+        a_file = tempfile.NamedTemporaryFile(suffix='.cat', delete=False)
+        a_file.close()
+        angles.writeBinaryCatalogue(a_file.name, [('ra', angles.RA, self.ras),
+                                                  ('dec', angles.Declination, self.decs)])
+        a_catalogue = angles.BinaryCatalogue(a_file.name)
+        os.remove(a_file.name)
+
+        angles.setParallelThreshold(16)
+        expected = angles.separation(1, 2, self.ras, self.decs)
+        results = []
+
+        # memoryviews are new style buffers, so the GIL is released
+        def run():
+            for i in range(10):
+                results.append(angles.separation(1, 2, a_catalogue['ra'], a_catalogue['dec']))
+
+        some_threads = [threading.Thread(target=run) for i in range(4)]
+        for a_thread in some_threads:
+            a_thread.start()
+        for a_thread in some_threads:
+            a_thread.join()
+
+        self.assertEqual(40, len(results))
+        for a_result in results:
+            self.assertEqual(expected, a_result)
+
+
+"""
+
+shared_angle_array_template = """
+
+# ----------------------------
+# ----- SharedAngleArray -----
+# ----------------------------
+
+
+def sharedSum(a_shared):
+    \"\"\"Sums a SharedAngleArray in a worker process.\"\"\"
+    return os.getpid(), a_shared.name, a_shared.owner, sum(a_shared)
+
+
+class TestSharedAngleArray(unittest.TestCase):
+
+    def setUp(self):
+
+        \"\"\"Set up test parameters.\"\"\"
+
+        self.size = 1000
+
+        self.ras = array.array('d', [random.uniform(0, 24) for i in range(self.size)])
+        self.decs = array.array('d', [random.uniform(-90, 90) for i in range(self.size)])
+
+    def test_create_and_attach(self):
+        \"\"\"Test attaching by name shares the memory\"\"\"
+        a_shared = angles.SharedAngleArray(self.decs, angles.Declination)
+        self.assertEqual(self.size, len(a_shared))
+        self.assertTrue(a_shared.type is angles.Declination)
+        self.assertTrue(a_shared.owner)
+        self.assertTrue(a_shared.writable)
+        self.assertEqual(self.decs[3], a_shared[3])
+        self.assertEqual(self.decs.tostring(), memoryview(a_shared).tobytes())
+
+        an_attached = angles.SharedAngleArray(name=a_shared.name)
+        self.assertFalse(an_attached.owner)
+        self.assertFalse(an_attached.writable)
+        self.assertTrue(memoryview(an_attached).readonly)
+        self.assertTrue(an_attached.type is angles.Declination)
+
+        angles.multiply(a_shared, 0.5, out=a_shared)
+        self.assertEqual(self.decs[3] * 0.5, an_attached[3])
+        self.assertRaises(BufferError, angles.multiply, an_attached, 0.5, an_attached)
+
+    def test_pickle(self):
+        \"\"\"Test pickling sends the name, not the values\"\"\"
+        a_shared = angles.SharedAngleArray(self.ras, angles.RA, writable=True)
+        a_pickle = pickle.dumps(a_shared, pickle.HIGHEST_PROTOCOL)
+        self.assertTrue(len(a_pickle) < 200)
+        an_attached = pickle.loads(a_pickle)
+        self.assertEqual(a_shared.name, an_attached.name)
+        self.assertTrue(an_attached.type is angles.RA)
+        self.assertFalse(an_attached.owner)
+        self.assertTrue(an_attached.writable)
+        self.assertEqual(list(self.ras), list(an_attached))
+
+    def test_processes(self):
+        \"\"\"Test worker processes read the same memory\"\"\"
+        a_shared = angles.SharedAngleArray(self.decs, angles.Declination)
+        a_pool = multiprocessing.Pool(2)
+        try:
+            results = a_pool.map(sharedSum, [a_shared] * 4)
+        finally:
+            a_pool.close()
+            a_pool.join()
+        for a_pid, a_name, is_owner, a_sum in results:
+            self.assertNotEqual(os.getpid(), a_pid)
+            self.assertEqual(a_shared.name, a_name)
+            self.assertFalse(is_owner)
+            self.assertEqual(sum(self.decs), a_sum)
+        self.assertTrue(a_shared.owner) # the workers did not unlink it
+
+    def test_batch(self):
+        \"\"\"Test shared arrays pass straight to the batch functions\"\"\"
+        ras = angles.SharedAngleArray(self.ras, angles.RA)
+        decs = angles.SharedAngleArray(self.decs, angles.Declination)
+        self.assertEqual(angles.separation(1, 2, self.ras, self.decs), angles.separation(1, 2, ras, decs))
+
+    def test_errors(self):
+        \"\"\"Test invalid values and names\"\"\"
+        self.assertRaises(angles.Error, angles.SharedAngleArray, array.array('d', [0, 95]), angles.Declination)
+        self.assertRaises(TypeError, angles.SharedAngleArray, self.decs, angles.MilliarcsecondAngle)
+        self.assertRaises(TypeError, angles.SharedAngleArray)
+        a_shared = angles.SharedAngleArray(self.decs)
+        self.assertTrue(a_shared.type is angles.Angle)
+        self.assertRaises(angles.Error, angles.SharedAngleArray, self.decs, name=a_shared.name) # exists
+        self.assertRaises(IndexError, a_shared.__getitem__, self.size)
+        a_shared.unlink()
+        self.assertFalse(a_shared.owner)
+        self.assertRaises(angles.Error, a_shared.unlink)
+        self.assertRaises(angles.Error, angles.SharedAngleArray, name=a_shared.name)
+        self.assertEqual(self.decs[0], a_shared[0]) # still mapped
+
+
+"""
+
+
+pickle_template = """
+
+# ---------------------------
+# ----- copy and pickle -----
+# ---------------------------
+
+
+class TaggedAngle(angles.Angle):
+    \"\"\"A subclass with a __dict__ to pickle.\"\"\"
+    pass
+
+
+class TestPickle(unittest.TestCase):
+
+    def setUp(self):
+
+        \"\"\"Set up test parameters.\"\"\"
+
+        self.size = 1000
+
+        self.ras = [angles.RA(random.uniform(0, 24)) for i in range(self.size)]
+        self.decs = [angles.Declination(random.uniform(-90, 90)) for i in range(self.size)]
+
+    def test_subclass(self):
+        \"\"\"Test subclass instances keep their type and attributes\"\"\"
+        an_angle = TaggedAngle(12.5)
+        an_angle.tags = ['a']
+        an_angle.me = an_angle
+        for another_angle in (copy.deepcopy(an_angle), pickle.loads(pickle.dumps(an_angle, 2))):
+            self.assertTrue(type(another_angle) is TaggedAngle)
+            self.assertEqual(12.5, another_angle.value)
+            self.assertEqual(['a'], another_angle.tags)
+            self.assertFalse(another_angle.tags is an_angle.tags)
+            self.assertTrue(another_angle.me is another_angle)
+        self.assertTrue(copy.copy(an_angle).tags is an_angle.tags)
+
+    def test_dumps_and_loads(self):
+        \"\"\"Test packing a list of one type, 8 bytes an angle\"\"\"
+        a_buffer = angles.dumps(self.ras)
+        self.assertEqual(24 + 8 * self.size, len(a_buffer))
+        some_ras = angles.loads(a_buffer)
+        self.assertEqual(self.size, len(some_ras))
+        self.assertTrue(all(type(an_ra) is angles.RA for an_ra in some_ras))
+        self.assertEqual([an_ra.value for an_ra in self.ras], [an_ra.value for an_ra in some_ras])
+        self.assertEqual(self.decs, angles.loads(buffer(angles.dumps(tuple(self.decs)))))
+        self.assertEqual([], angles.loads(angles.dumps([])))
+
+    def test_mixed(self):
+        \"\"\"Test packing a list of different types\"\"\"
+        some_angles = [angles.Angle(-720.5), angles.Latitude(45), angles.Longitude(-170),
+                       angles.LimitedRangeAngle(300), angles.MilliarcsecondAngle(1.5),
+                       angles.MicroarcsecondAngle(-1e-6)]
+        the_angles = angles.loads(angles.dumps(some_angles))
+        self.assertEqual([type(an_angle) for an_angle in some_angles],
+                         [type(an_angle) for an_angle in the_angles])
+        self.assertEqual([an_angle.value for an_angle in some_angles],
+                         [an_angle.value for an_angle in the_angles])
+
+    def test_pickle_size(self):
+        \"\"\"Test a packed list pickles smaller than the angles\"\"\"
+        a_packed = pickle.dumps(angles.dumps(self.ras), pickle.HIGHEST_PROTOCOL)
+        self.assertTrue(len(a_packed) < 24 + 8 * self.size + 32)
+        self.assertTrue(len(a_packed) * 2 < len(pickle.dumps(self.ras, pickle.HIGHEST_PROTOCOL)))
+
+    def test_errors(self):
+        \"\"\"Test non angles and invalid buffers\"\"\"
+        self.assertRaises(TypeError, angles.dumps, [angles.RA(1), 1.0])
+        self.assertRaises(TypeError, angles.dumps, None)
+        a_buffer = angles.dumps(self.decs)
+        self.assertRaises(angles.Error, angles.loads, a_buffer[:-1])
+        self.assertRaises(angles.Error, angles.loads, 'x' * len(a_buffer))
+        an_invalid = a_buffer[:24] + struct.pack('<d', 95) + a_buffer[32:]
+        self.assertRaises(angles.Error, angles.loads, an_invalid)
+
+
+"""
+
+
+angle_index_template = """
+
+# ----------------------
+# ----- AngleIndex -----
+# ----------------------
+
+
+class TestAngleIndex(unittest.TestCase):
+
+    def setUp(self):
+
+        \"\"\"Set up test parameters.\"\"\"
+
+        self.size = 1000
+
+        self.lower_range = -90
+        self.upper_range = 90
+
+        self.degrees = array.array('d', [random.uniform(self.lower_range, self.upper_range)
+                                         for i in range(self.size)])
+
+    def test_mapping(self):
+        \"\"\"Test set, get and delete\"\"\"
+        an_index = angles.AngleIndex()
+        an_index[angles.Declination(45.5)] = 'a'
+        an_index[-1] = 'b'
+        self.assertEqual(2, len(an_index))
+        self.assertEqual('a', an_index[45.5])
+        self.assertEqual('a', an_index[angles.Angle(45.5)])
+        self.assertTrue(-1.0 in an_index)
+        self.assertFalse(1 in an_index)
+        self.assertEqual(None, an_index.get(1))
+        self.assertEqual('c', an_index.get(1, 'c'))
+        an_index[-1] = 'd'
+        self.assertEqual('d', an_index[angles.Longitude(-1)])
+        del an_index[-1]
+        self.assertEqual(1, len(an_index))
+        self.assertRaises(KeyError, lambda i: i[-1], an_index)
+        self.assertRaises(KeyError, an_index.__delitem__, -1)
+
+    def test_key_errors(self):
+        \"\"\"Test invalid keys\"\"\"
+        an_index = angles.AngleIndex()
+        self.assertRaises(TypeError, an_index.__setitem__, 'x', 1)
+        self.assertRaises(TypeError, lambda i: i['x'], an_index)
+        self.assertRaises(angles.Error, an_index.__setitem__, float('nan'), 1)
+        self.assertRaises(TypeError, hash, an_index)
+
+    def test_quantum(self):
+        \"\"\"Test keys to the nearest milliarcsecond\"\"\"
+        a_mas = 1/3600000.0
+        an_index = angles.AngleIndex(quantum=a_mas)
+        self.assertEqual(a_mas, an_index.quantum)
+        an_index[10] = 'a'
+        self.assertEqual('a', an_index[10 + a_mas/4])
+        self.assertFalse(10 + a_mas in an_index)
+        an_index[10 - a_mas/4] = 'b'
+        self.assertEqual([(10, 'b')], an_index.items())
+        self.assertRaises(angles.Error, angles.AngleIndex, -1)
+
+    def test_keys_values_items(self):
+        \"\"\"Test keys, values, items and iteration\"\"\"
+        an_index = angles.AngleIndex()
+        for i, d in enumerate(self.degrees):
+            an_index[d] = i
+        self.assertEqual(sorted(set(self.degrees)), sorted(an_index.keys()))
+        self.assertEqual(sorted(an_index.keys()), sorted(an_index))
+        self.assertEqual(len(an_index), len(an_index.values()))
+        for d, i in an_index.items():
+            self.assertEqual(an_index[d], i)
+        an_index.clear()
+        self.assertEqual(0, len(an_index))
+
+    def test_insert_lookup(self):
+        \"\"\"Test bulk insert and lookup\"\"\"
+        an_index = angles.AngleIndex()
+        an_index.insert(self.degrees, range(self.size))
+        self.assertEqual(range(self.size), an_index.lookup(self.degrees))
+        self.assertEqual(['x', 0], an_index.lookup(array.array('d', [91, self.degrees[0]]), 'x'))
+        self.assertRaises(angles.Error, an_index.insert, self.degrees, [1])
+
+    def test_refcounts(self):
+        \"\"\"Test values are released\"\"\"
+        a_value = object()
+        count = sys.getrefcount(a_value)
+        an_index = angles.AngleIndex()
+        an_index[1] = a_value
+        an_index[2] = a_value
+        self.assertEqual(count + 2, sys.getrefcount(a_value))
+        an_index[1] = None
+        del an_index[2]
+        self.assertEqual(count, sys.getrefcount(a_value))
+        an_index[1] = a_value
+        del an_index
+        self.assertEqual(count, sys.getrefcount(a_value))
+
+    def test_cycle(self):
+        \"\"\"Test an index that contains itself is collected\"\"\"
+        import gc
+        import weakref
+        class Holder(object):
+            pass
+        a_holder = Holder()
+        a_holder.index = angles.AngleIndex()
+        a_holder.index[0] = a_holder
+        a_ref = weakref.ref(a_holder)
+        del a_holder
+        gc.collect()
+        self.assertEqual(None, a_ref())
+
+"""
+
+
 test_main = """
 
 if __name__ == '__main__':
@@ -835,6 +2344,18 @@ if __name__ == '__main__':
                             'dms string': False,
                             'unsigned': True})
 
+    fixed_angles = list()
+
+    fixed_angles.append({'TypeName': 'MilliarcsecondAngle',
+                         'per_unit': 3600000,
+                         'places': 6,
+                         'max_count': 2**31 - 1})
+
+    fixed_angles.append({'TypeName': 'MicroarcsecondAngle',
+                         'per_unit': 3600000000,
+                         'places': 9,
+                         'max_count': 2**63 - 1})
+
 
     flnm = 'test_angles.py'
     afp = open(flnm, 'w')
@@ -853,6 +2374,32 @@ if __name__ == '__main__':
 
     # TODO different string template for RA
 
+    for fixed_angle in fixed_angles:
+        afp.write(fixed_angle_template % fixed_angle)
+
+    afp.write(batch_template)
+
+    afp.write(angle_index_template)
+
+    for angle_template in angle_templates:
+        afp.write(sorted_index_template % angle_template)
+
+    afp.write(sorted_index_wrap_template)
+
+    afp.write(htm_template)
+
+    afp.write(zone_index_template)
+
+    afp.write(catalogue_reader_template)
+
+    afp.write(binary_catalogue_template)
+
+    afp.write(threads_template)
+
+    afp.write(shared_angle_array_template)
+
+    afp.write(pickle_template)
+
     afp.write(test_main)
 
     afp.close()
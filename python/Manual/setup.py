@@ -1,11 +1,17 @@
 # builds python angles module
 # from http://docs.python.org/extending/building.html
 
+import sys
+
 from distutils.core import setup, Extension
 
+libraries = ['Angles', 'pthread']
+if sys.platform.startswith('linux'):
+    libraries.append('rt') # shm_open
+
 angles_module = Extension('angles',
                           include_dirs=['../../libAngles'], # TODO meh.
-                          libraries=['Angles'],
+                          libraries=libraries,
                           library_dirs=['../../libAngles'], # TODO meh**2.
                           sources=['angles.cpp'])
 
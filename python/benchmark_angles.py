@@ -0,0 +1,321 @@
+#!/usr/bin/env python
+
+"""Benchmarks the angles module, either the Manual or the Boost build.
+
+Runs the same workloads against whichever angles module is on the
+python path, so running it from each build directory compares the
+bindings head to head, e.g.
+
+    $ cd Boost; ./benchmark_angles.sh --json boost.json
+    $ cd ../Manual; ./benchmark_angles.sh --baseline ../Boost/boost.json
+
+Each workload is timed with timeit, the garbage collector off, after a
+warm up. Every repetition runs --number ops and gives one sample of the
+time per op, so the report is a distribution of per op latencies over
+the repetitions: min, median, p90, p99, max, mean and standard
+deviation. Times include timeit's loop, about the cost of the
+"loop overhead" workload.
+
+Allocations per op are measured the same way for both bindings, by
+the first of these counters that the python has:
+
+    objects allocated  sys.getcounts(), only in a python built with
+                       COUNT_ALLOCS, every object of every type, e.g.
+                       the float a.value returns as well as new angles
+    net blocks         sys.getallocatedblocks(), python 3.4 and later,
+                       the change in blocks still allocated, so it
+                       misses objects freed within the op
+
+A stock python 2.7 has neither, so there the allocation column is left
+out. Allocations are only compared with a baseline that used the same
+counter.
+
+--baseline compares the medians with a results file from an earlier
+run, or the other binding, and flags workloads slower by more than
+--threshold. The exit status is 1 if any are.
+"""
+
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import sys
+import timeit
+
+import angles
+
+
+# ---------------------
+# ----- workloads -----
+# ---------------------
+
+# (name, statement, setup), the setup runs once per repetition
+
+setup_angles = """
+import angles
+a = angles.Angle(12.5)
+b = angles.Angle(-45.25)
+d = angles.Declination(-45.25)
+r = angles.RA(6.5)
+"""
+
+workloads = [
+    ('loop overhead', 'pass', ''),
+
+    ('Angle(float)', 'angles.Angle(12.5)', setup_angles),
+    ('Angle(deg, min, sec)', 'angles.Angle(12, 30, 45.5)', setup_angles),
+    ('Angle(str)', 'angles.Angle("12:30:45.5")', setup_angles),
+    ('Declination(float)', 'angles.Declination(-45.25)', setup_angles),
+    ('RA(float)', 'angles.RA(6.5)', setup_angles),
+
+    ('Angle.value', 'a.value', setup_angles),
+    ('Angle.radians', 'a.radians', setup_angles),
+    ('Angle.value = float', 'a.value = 30.5', setup_angles),
+    ('Declination.value', 'd.value', setup_angles),
+
+    ('Angle + Angle', 'a + b', setup_angles),
+    ('Angle - Angle', 'a - b', setup_angles),
+    ('Angle + float', 'a + 1.5', setup_angles),
+    ('Angle * float', 'a * 2.0', setup_angles),
+    ('Angle / float', 'a / 2.0', setup_angles),
+    ('Declination + float', 'd + 1.5', setup_angles),
+
+    ('Angle == Angle', 'a == b', setup_angles),
+    ('Angle < Angle', 'a < b', setup_angles),
+
+    ('str(Angle)', 'str(a)', setup_angles),
+    ('str(RA)', 'str(r)', setup_angles),
+]
+
+
+# -----------------------
+# ----- allocations -----
+# -----------------------
+
+# counter name to its column heading
+
+allocation_columns = {'objects allocated': 'allocs/op',
+                      'net blocks': 'net blks/op'}
+
+
+def allocation_counter():
+    """Returns (name, function) for counting allocations, or (None, None)."""
+
+    if hasattr(sys, 'getcounts'):
+        def allocated():
+            # (type name, allocs, frees, max in use) per type
+            return sum(counts[1] for counts in sys.getcounts())
+        return 'objects allocated', allocated
+
+    if hasattr(sys, 'getallocatedblocks'):
+        return 'net blocks', sys.getallocatedblocks
+
+    return None, None
+
+
+# -------------------
+# ----- binding -----
+# -------------------
+
+def binding_name():
+    """Returns Manual or Boost from the path of the angles module."""
+    path = os.path.abspath(getattr(angles, '__file__', ''))
+    for name in ('Manual', 'Boost'):
+        if name in path.split(os.sep):
+            return name
+    return 'unknown'
+
+
+# ----------------------
+# ----- statistics -----
+# ----------------------
+
+def percentile(samples, fraction):
+    """Returns the fraction percentile of sorted samples, interpolated."""
+    position = (len(samples) - 1) * fraction
+    lower = int(math.floor(position))
+    upper = min(lower + 1, len(samples) - 1)
+    return samples[lower] + (samples[upper] - samples[lower]) * (position - lower)
+
+
+def distribution(samples):
+    """Returns the summary statistics of a list of samples."""
+    samples = sorted(samples)
+    mean = sum(samples) / len(samples)
+    variance = sum((sample - mean)**2 for sample in samples) / len(samples)
+    return {'min': samples[0],
+            'median': percentile(samples, 0.5),
+            'p90': percentile(samples, 0.9),
+            'p99': percentile(samples, 0.99),
+            'max': samples[-1],
+            'mean': mean,
+            'stdev': math.sqrt(variance)}
+
+
+# -------------------
+# ----- running -----
+# -------------------
+
+def run(name, statement, setup, number, repetitions, warmup, counter):
+    """Returns the results of one workload, times in ns per op."""
+
+    timer = timeit.Timer(statement, setup)
+
+    timer.timeit(warmup)
+
+    samples = [seconds * 1e9 / number for seconds in timer.repeat(repetitions, number)]
+
+    allocations = None
+    if counter is not None:
+        gc.collect()
+        first = counter()
+        overhead = counter() - first # the counter's own objects
+        before = counter()
+        timer.timeit(number)
+        allocations = (counter() - before - overhead) / number
+
+    return {'workload': name,
+            'ns_per_op': distribution(samples),
+            'ops_per_sec': 1e9 / distribution(samples)['median'],
+            'allocations_per_op': allocations}
+
+
+def compare(results, baseline, threshold, counter_name):
+    """Returns (name, baseline, current, ratio, regressed, allocations) for each workload in both.
+
+    allocations is (baseline, current) allocations per op, or None
+    unless both counted them with counter_name.
+    """
+
+    same_counter = counter_name is not None and baseline.get('allocation_counter') == counter_name
+
+    baseline_results = dict((result['workload'], result) for result in baseline['results'])
+
+    comparisons = list()
+    for result in results:
+        if result['workload'] not in baseline_results:
+            continue
+        before = baseline_results[result['workload']]['ns_per_op']['median']
+        after = result['ns_per_op']['median']
+        ratio = after / before if before > 0 else float('inf')
+        allocations = (baseline_results[result['workload']].get('allocations_per_op'),
+                       result['allocations_per_op'])
+        if not same_counter or None in allocations:
+            allocations = None
+        comparisons.append((result['workload'], before, after, ratio, ratio > 1 + threshold, allocations))
+
+    return comparisons
+
+
+# -------------------
+# ----- reports -----
+# -------------------
+
+def print_results(report):
+    """Prints the results as a table, with allocations if they were counted."""
+
+    counter_name = report['allocation_counter']
+    counted = counter_name is not None
+
+    print('# binding %s, python %s, %s' % (report['binding'], report['python'], report['machine']))
+    print('# %d repetitions of %d ops, %s' %
+          (report['repetitions'], report['number'],
+           'allocations are %s per op' % counter_name if counted else
+           'allocations not counted, this python has no counter, see --help'))
+    print()
+    print('%-24s %10s %10s %10s %10s %10s %14s' %
+          ('workload', 'min ns', 'median ns', 'p90 ns', 'p99 ns', 'max ns', 'ops/sec') +
+          (' %11s' % allocation_columns[counter_name] if counted else ''))
+
+    for result in report['results']:
+        times = result['ns_per_op']
+        print('%-24s %10.1f %10.1f %10.1f %10.1f %10.1f %14.0f' %
+              (result['workload'], times['min'], times['median'], times['p90'], times['p99'], times['max'],
+               result['ops_per_sec']) +
+              (' %11.2f' % result['allocations_per_op'] if counted else ''))
+
+
+def print_comparisons(comparisons, baseline, threshold, counter_name):
+    """Prints the comparisons with a baseline."""
+
+    counted = comparisons and all(allocations is not None
+                                  for name, before, after, ratio, regressed, allocations in comparisons)
+
+    print()
+    print('# compared with %s, regressions are more than %d%% slower' %
+          (baseline.get('binding', 'the baseline'), round(threshold * 100)))
+    if counted:
+        print('# allocations are %s per op' % counter_name)
+    elif counter_name is not None or baseline.get('allocation_counter') is not None:
+        print('# allocations not compared, the baseline used a different counter')
+    print()
+
+    print('%-24s %12s %12s %8s' % ('workload', 'baseline ns', 'current ns', 'ratio') +
+          (' %16s %16s' % ('baseline allocs', 'current allocs') if counted else ''))
+
+    for name, before, after, ratio, regressed, allocations in comparisons:
+        print('%-24s %12.1f %12.1f %8.2f' % (name, before, after, ratio) +
+              (' %16.2f %16.2f' % allocations if counted else '') +
+              ('  REGRESSION' if regressed else ''))
+
+
+# ================
+# ===== main =====
+# ================
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0],
+                                     epilog='allocations per op need a counter. A stock python 2.7 has none, '
+                                     'so the allocation column is left out. A python built with COUNT_ALLOCS '
+                                     'counts every object allocated. Python 3.4 and later counts net blocks, '
+                                     'which misses objects freed within the op.')
+    parser.add_argument('--number', type=int, default=10000, help='ops per repetition')
+    parser.add_argument('--repetitions', type=int, default=30, help='samples per workload')
+    parser.add_argument('--warmup', type=int, default=10000, help='untimed ops before the samples')
+    parser.add_argument('--filter', default='', help='only workloads whose names contain this')
+    parser.add_argument('--json', metavar='PATH', help='write the results to PATH')
+    parser.add_argument('--baseline', metavar='PATH', help='compare with the results in PATH')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='the slowdown flagged as a regression, default 0.10')
+    args = parser.parse_args()
+
+    if args.number < 1 or args.repetitions < 1:
+        parser.error('--number and --repetitions must be positive')
+
+    counter_name, counter = allocation_counter()
+
+    report = {'binding': binding_name(),
+              'module': getattr(angles, '__file__', None),
+              'python': platform.python_version(),
+              'machine': platform.machine(),
+              'processor': platform.processor(),
+              'number': args.number,
+              'repetitions': args.repetitions,
+              'warmup': args.warmup,
+              'allocation_counter': counter_name,
+              'results': list()}
+
+    for name, statement, setup in workloads:
+        if args.filter in name:
+            report['results'].append(run(name, statement, setup, args.number, args.repetitions,
+                                         args.warmup, counter))
+
+    print_results(report)
+
+    if args.json:
+        with open(args.json, 'w') as a_file:
+            json.dump(report, a_file, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as a_file:
+            baseline = json.load(a_file)
+        comparisons = compare(report['results'], baseline, args.threshold, counter_name)
+        print_comparisons(comparisons, baseline, args.threshold, counter_name)
+        if any(regressed for name, before, after, ratio, regressed, allocations in comparisons):
+            sys.exit(1)